@@ -189,6 +189,7 @@ class WithdrawTokensView(APIView):
 
             # Import services
             from services.teocoin_withdrawal_service import teocoin_withdrawal_service
+            from services.mint_settlement_service import mint_settlement_service
             from decimal import Decimal
             
             try:
@@ -214,6 +215,19 @@ class WithdrawTokensView(APIView):
             if result['success']:
                 withdrawal_id = result['withdrawal_id']
                 
+                if mint_settlement_service.enabled:
+                    # Minted with the wallet's other credits by the next settlement
+                    mint_settlement_service.queue_withdrawal(TeoCoinWithdrawalRequest.objects.get(id=withdrawal_id))
+                    return Response({
+                        'success': True,
+                        'message': f'{amount_decimal} TEO will be minted to your MetaMask wallet within a few minutes',
+                        'withdrawal_id': withdrawal_id,
+                        'amount': str(amount_decimal),
+                        'wallet_address': wallet_address,
+                        'status': 'processing',
+                        'queued': True
+                    })
+                
                 # 🚀 AUTO-PROCESS: Immediately mint the tokens
                 logger.info(f"🎯 Auto-processing withdrawal #{withdrawal_id} for {request.user.email}")
                 
@@ -9,6 +9,7 @@ from rest_framework.permissions import IsAuthenticated
 from services.db_teocoin_service import DBTeoCoinService
 from django.shortcuts import get_object_or_404
 from services.teacher_discount_absorption_service import TeacherDiscountAbsorptionService
+from services.teacher_payout_service import teacher_payout_service
 from rewards.models import TeacherDiscountAbsorption
 import logging
 
@@ -264,6 +265,8 @@ class AdminAbsorptionOverviewView(APIView):
             return Response({
                 'success': True,
                 'platform_savings': platform_savings,
+                # Teacher payouts of the latest closed month, from the payout summaries
+                'payouts': teacher_payout_service.get_period_overview('monthly')['totals'],
                 'recent_absorptions': recent_data
             })
             
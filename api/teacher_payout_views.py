@@ -0,0 +1,83 @@
+"""
+API Views for Teacher Payout Summaries
+"""
+from datetime import date
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from services.teacher_payout_service import teacher_payout_service
+from services.exceptions import TeoArtServiceException
+from core.db_routing import replica_reads
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TeacherPayoutSummaryView(APIView):
+    """
+    Get teacher's weekly/monthly payout summaries
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            if getattr(request.user, 'role', None) != 'teacher' and not request.user.is_staff:
+                return Response({
+                    'success': False,
+                    'error': 'Only teachers can access payout summaries'
+                }, status=status.HTTP_403_FORBIDDEN)
+
+            period_type = request.GET.get('period_type', 'monthly')
+            limit = min(int(request.GET.get('limit', 12)), 52)
+
+            summaries = teacher_payout_service.get_teacher_summaries(
+                request.user, period_type=period_type, limit=limit
+            )
+            return Response({
+                'success': True,
+                'period_type': period_type,
+                'summaries': summaries
+            })
+
+        except (TeoArtServiceException, ValueError) as e:
+            return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Error fetching payout summaries: {str(e)}")
+            return Response({
+                'success': False,
+                'error': 'Failed to fetch payout summaries'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AdminPayoutOverviewView(APIView):
+    """
+    Admin view of all teachers' payouts for one closed period
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            if not request.user.is_staff:
+                return Response({
+                    'success': False,
+                    'error': 'Only admin users can access payout statistics'
+                }, status=status.HTTP_403_FORBIDDEN)
+
+            period_start = request.GET.get('period_start')
+            with replica_reads(request.user):
+                overview = teacher_payout_service.get_period_overview(
+                    period_type=request.GET.get('period_type', 'monthly'),
+                    period_start=date.fromisoformat(period_start) if period_start else None
+                )
+            return Response({'success': True, **overview})
+
+        except (TeoArtServiceException, ValueError) as e:
+            return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Error fetching admin payout overview: {str(e)}")
+            return Response({
+                'success': False,
+                'error': 'Failed to fetch payout overview'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
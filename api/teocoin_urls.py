@@ -34,6 +34,10 @@ from .teacher_absorption_views import (
     TeacherAbsorptionHistoryView,
     AdminAbsorptionOverviewView
 )
+from .teacher_payout_views import (
+    TeacherPayoutSummaryView,
+    AdminPayoutOverviewView
+)
 
 app_name = 'teocoin_api'
 
@@ -68,6 +72,7 @@ urlpatterns = [
     path('teacher/absorptions/choose/', TeacherMakeAbsorptionChoiceView.as_view(), name='teacher_make_absorption_choice'),
     path('teacher/choice/', TeacherMakeAbsorptionChoiceView.as_view(), name='teacher_choice_shortcut'),
     path('teacher/absorptions/history/', TeacherAbsorptionHistoryView.as_view(), name='teacher_absorption_history'),
+    path('teacher/payouts/', TeacherPayoutSummaryView.as_view(), name='teacher_payout_summaries'),
     
     # Legacy endpoints (for backward compatibility)
     path('legacy/withdraw/', CreateWithdrawalView.as_view(), name='legacy_create_withdrawal'),
@@ -85,4 +90,5 @@ urlpatterns = [
     path('admin/withdrawals/stats/', AdminWithdrawalStatsView.as_view(), name='admin_withdrawal_stats'),
     path('admin/platform/stats/', AdminPlatformStatsView.as_view(), name='admin_platform_stats'),
     path('admin/absorptions/overview/', AdminAbsorptionOverviewView.as_view(), name='admin_absorption_overview'),
+    path('admin/payouts/overview/', AdminPayoutOverviewView.as_view(), name='admin_payout_overview'),
 ]
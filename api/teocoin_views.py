@@ -13,6 +13,7 @@ import logging
 
 from services.teocoin_withdrawal_service import teocoin_withdrawal_service
 from services.hybrid_teocoin_service import hybrid_teocoin_service
+from core.db_routing import replica_reads
 from blockchain.models import DBTeoCoinTransaction
 
 logger = logging.getLogger(__name__)
@@ -320,7 +321,8 @@ class AdminWithdrawalStatsView(APIView):
     def get(self, request):
         """Get withdrawal statistics (admin only)"""
         try:
-            stats = teocoin_withdrawal_service.get_withdrawal_statistics()
+            with replica_reads(request.user):
+                stats = teocoin_withdrawal_service.get_withdrawal_statistics()
             
             return Response({
                 'success': True,
@@ -342,7 +344,8 @@ class AdminPlatformStatsView(APIView):
     def get(self, request):
         """Get platform TeoCoin statistics (admin only)"""
         try:
-            stats = hybrid_teocoin_service.get_platform_statistics()
+            with replica_reads(request.user):
+                stats = hybrid_teocoin_service.get_platform_statistics()
             
             return Response({
                 'success': True,
@@ -15,6 +15,8 @@ import logging
 
 from services.teocoin_withdrawal_service import teocoin_withdrawal_service
 from services.db_teocoin_service import db_teocoin_service
+from services.mint_settlement_service import mint_settlement_service
+from core.db_routing import replica_reads
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +85,21 @@ class CreateWithdrawalView(APIView):
             if result['success']:
                 withdrawal_id = result['withdrawal_id']
                 
+                if mint_settlement_service.enabled:
+                    # Minted with the wallet's other credits by the next settlement
+                    from blockchain.models import TeoCoinWithdrawalRequest
+                    mint_settlement_service.queue_withdrawal(TeoCoinWithdrawalRequest.objects.get(id=withdrawal_id))
+                    return Response({
+                        'success': True,
+                        'withdrawal_id': withdrawal_id,
+                        'amount': result['amount'],
+                        'metamask_address': result['metamask_address'],
+                        'status': 'processing',
+                        'daily_withdrawal_count': result['daily_withdrawal_count'],
+                        'message': f'{amount_decimal} TEO will be minted to your MetaMask wallet within a few minutes',
+                        'queued': True
+                    }, status=status.HTTP_201_CREATED)
+                
                 # 🚀 NEW: Automatically process the withdrawal immediately
                 logger.info(f"🎯 Auto-processing withdrawal #{withdrawal_id} for {request.user.email}")
                 
@@ -409,7 +426,8 @@ class AdminWithdrawalStatsView(APIView):
             days = int(request.query_params.get('days', 30))
             days = min(days, 365)  # Cap at 1 year
             
-            stats = teocoin_withdrawal_service.get_withdrawal_statistics(days)
+            with replica_reads(request.user):
+                stats = teocoin_withdrawal_service.get_withdrawal_statistics(days)
             
             return Response({
                 'success': True,
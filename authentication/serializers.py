@@ -92,15 +92,19 @@ class RegisterSerializer(serializers.ModelSerializer):
             token = default_token_generator.make_token(user)
             verify_url = f"{request.scheme}://{request.get_host()}/api/auth/verify-email/{uid}/{token}/" # type: ignore
             
-            # Send verification email to user
+            # Queue verification email (sent by the outbox worker, registration doesn't wait on SMTP)
             try:
-                user.email_user(
+                from services.email_outbox_service import email_outbox_service
+                email_outbox_service.queue_email(
+                    to_email=user.email,
                     subject='Verifica la tua email',  # Subject: Verify your email
-                    message=f'Visita {verify_url} per verificare la tua email.'  # Message: Visit URL to verify email
+                    body=f'Visita {verify_url} per verificare la tua email.',  # Message: Visit URL to verify email
+                    user=user,
+                    category='transactional'
                 )
-                logger.info(f"✅ Email sent successfully to {user.email}")
+                logger.info(f"✅ Verification email queued for {user.email}")
             except Exception as email_error:
-                logger.warning(f"⚠️ Email sending failed: {email_error}, but user was created successfully")
+                logger.warning(f"⚠️ Email queueing failed: {email_error}, but user was created successfully")
                 # Don't fail the registration if email fails
             
             return user
@@ -10,7 +10,11 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from decimal import Decimal
-from .models import UserWallet, DBTeoCoinBalance, DBTeoCoinTransaction, TeoCoinWithdrawalRequest
+from .models import (
+    UserWallet, DBTeoCoinBalance, DBTeoCoinTransaction, TeoCoinWithdrawalRequest,
+    TeoCoinTransferEvent, BurnDepositClaim, MintSettlement, PendingMint,
+)
+from core.admin_performance import LargeTableAdminMixin, RecentDateFilter
 from services.db_teocoin_service import DBTeoCoinService
 
 User = get_user_model()
@@ -56,7 +60,7 @@ class UserWalletAdmin(admin.ModelAdmin):
 
 
 @admin.register(DBTeoCoinBalance)
-class DBTeoCoinBalanceAdmin(admin.ModelAdmin):
+class DBTeoCoinBalanceAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for DBTeoCoinBalance model.
     Allows admins to view and manage user TeoCoin balances.
@@ -66,7 +70,9 @@ class DBTeoCoinBalanceAdmin(admin.ModelAdmin):
         'pending_withdrawal', 'total_balance_display', 'updated_at'
     )
     list_filter = ('updated_at', 'user__role')
-    search_fields = ('user__username', 'user__email', 'user__first_name', 'user__last_name')
+    list_select_related = ('user',)
+    exact_search_fields = ('user__username', 'user__email', 'user__id')
+    ordering = ('-id',)
     readonly_fields = ('total_balance_display', 'updated_at', 'created_at')
     
     fieldsets = (
@@ -155,7 +161,7 @@ class DBTeoCoinBalanceAdmin(admin.ModelAdmin):
 
 
 @admin.register(DBTeoCoinTransaction)
-class DBTeoCoinTransactionAdmin(admin.ModelAdmin):
+class DBTeoCoinTransactionAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for DBTeoCoinTransaction model.
     Provides detailed transaction history and analytics.
@@ -164,10 +170,14 @@ class DBTeoCoinTransactionAdmin(admin.ModelAdmin):
         'id', 'user_info', 'transaction_type', 'amount_display', 
         'description', 'created_at'
     )
-    list_filter = ('transaction_type', 'created_at', 'user__role')
-    search_fields = ('user__username', 'user__email', 'description', 'course_id')
+    list_filter = (RecentDateFilter, 'transaction_type', 'user__role')
+    list_select_related = ('user',)
+    exact_search_fields = ('user__username', 'user__email', 'id', 'course')
+    search_help_text = 'Ricerca esatta (username, email, ID transazione o ID corso)'
     readonly_fields = ('created_at',)
     date_hierarchy = 'created_at'
+    # Primary key order follows insertion order and needs no tie-breaker
+    ordering = ('-id',)
     
     fieldsets = (
         ('Transaction Details', {
@@ -211,7 +221,7 @@ class DBTeoCoinTransactionAdmin(admin.ModelAdmin):
 
 
 @admin.register(TeoCoinWithdrawalRequest)
-class TeoCoinWithdrawalRequestAdmin(admin.ModelAdmin):
+class TeoCoinWithdrawalRequestAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for TeoCoinWithdrawalRequest model.
     Manages withdrawal requests to MetaMask wallets.
@@ -220,9 +230,13 @@ class TeoCoinWithdrawalRequestAdmin(admin.ModelAdmin):
         'id', 'user_info', 'amount', 'wallet_address_display', 
         'status', 'created_at', 'completed_at'
     )
-    list_filter = ('status', 'created_at', 'completed_at')
-    search_fields = ('user__username', 'user__email', 'metamask_address')
+    list_filter = (RecentDateFilter, 'status', 'completed_at')
+    list_select_related = ('user',)
+    exact_search_fields = ('user__username', 'user__email', 'id', 'metamask_address')
+    search_help_text = 'Ricerca esatta (username, email, ID richiesta o indirizzo wallet)'
     readonly_fields = ('created_at',)
+    date_hierarchy = 'created_at'
+    ordering = ('-id',)
     
     fieldsets = (
         ('Withdrawal Details', {
@@ -274,3 +288,73 @@ class TeoCoinWithdrawalRequestAdmin(admin.ModelAdmin):
 admin.site.site_header = "TeoCoin Platform Administration"
 admin.site.site_title = "TeoCoin Admin"
 admin.site.index_title = "Welcome to TeoCoin Platform Administration"
+
+
+@admin.register(TeoCoinTransferEvent)
+class TeoCoinTransferEventAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """
+    Confirmed on-chain transfers stored by the chain indexer (read-only).
+    """
+    list_display = ('block_number', 'kind', 'amount', 'from_address', 'to_address', 'tx_hash')
+    list_filter = ('kind',)
+    exact_search_fields = ('tx_hash', 'from_address', 'to_address', 'block_number')
+    search_help_text = 'Ricerca esatta (hash transazione, indirizzo in minuscolo o numero di blocco)'
+    ordering = ('-block_number', '-log_index')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(BurnDepositClaim)
+class BurnDepositClaimAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """
+    Burn deposit claims and their crediting status.
+    """
+    list_display = ('id', 'user', 'amount', 'status', 'tx_hash', 'created_at', 'credited_at')
+    list_filter = ('status', RecentDateFilter)
+    list_select_related = ('user',)
+    exact_search_fields = ('user__username', 'user__email', 'tx_hash', 'metamask_address')
+    search_help_text = 'Ricerca esatta (username, email, hash transazione o indirizzo in minuscolo)'
+    raw_id_fields = ('user', 'event', 'deposit_transaction')
+    ordering = ('-id',)
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(MintSettlement)
+class MintSettlementAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """
+    Aggregated mint transactions sent by the settlement engine (read-only).
+    """
+    list_display = ('id', 'status', 'wallet_count', 'amount', 'tx_hash', 'gas_used', 'created_at', 'confirmed_at')
+    list_filter = ('status', RecentDateFilter)
+    exact_search_fields = ('tx_hash',)
+    search_help_text = 'Ricerca esatta (hash transazione)'
+    ordering = ('-id',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(PendingMint)
+class PendingMintAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """
+    Credits waiting for (or minted by) a settlement.
+    """
+    list_display = ('id', 'user', 'source', 'object_id', 'amount', 'wallet_address', 'status', 'attempts', 'created_at')
+    list_filter = ('status', 'source', RecentDateFilter)
+    list_select_related = ('user',)
+    exact_search_fields = ('user__username', 'user__email', 'wallet_address', 'settlement__tx_hash')
+    search_help_text = 'Ricerca esatta (username, email, indirizzo in minuscolo o hash transazione)'
+    raw_id_fields = ('user', 'settlement')
+    ordering = ('-id',)
+
+    def has_add_permission(self, request):
+        return False
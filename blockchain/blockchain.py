@@ -41,6 +41,10 @@ from typing import Optional, Dict, Any
 from web3 import Web3
 from django.conf import settings
 from .teocoin_abi import TEOCOIN_ABI
+from .web3_provider import make_web3
+from services.gas_oracle_service import gas_oracle_service
+from services.exceptions import BlockchainTransactionError
+from services.registry import lazy_service
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +72,7 @@ class TeoCoinService:
             raise ValueError("TEOCOIN_CONTRACT_ADDRESS must be set in environment variables")
         
         # Initialize Web3 connection
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        self.w3 = make_web3(self.rpc_url)
         
         # Add middleware for PoA chains (Polygon Amoy)
         try:
@@ -77,10 +81,8 @@ class TeoCoinService:
         except ImportError:
             logger.warning("Could not load PoA middleware - using fallback")
         
-        # Verify blockchain connection
-        if not self.w3.is_connected():
-            logger.error("Unable to connect to Polygon Amoy network")
-            raise ConnectionError("Blockchain connection failed")
+        # No connection check here: the service is built lazily on first use
+        # and RPC errors surface from the call that needs the network.
         
         # Initialize contract instance
         self.contract = self.w3.eth.contract(
@@ -133,7 +135,6 @@ class TeoCoinService:
             return None
         
         max_retries = 3
-        base_gas_price = self.get_optimized_gas_price()
         
         for attempt in range(max_retries):
             try:
@@ -141,18 +142,13 @@ class TeoCoinService:
                 amount_wei = Web3.to_wei(amount, 'ether')
                 checksum_to = Web3.to_checksum_address(to_address)
                 
-                # Dynamic gas price for each attempt
-                gas_price = int(base_gas_price * (1.2 ** attempt))
-                
-                # Build transaction
-                transaction = self.contract.functions.mint(
-                    checksum_to,
-                    amount_wei
-                ).build_transaction({
+                # Build transaction: cached gas limit and fees, raised for each attempt
+                mint_function = self.contract.functions.mint(checksum_to, amount_wei)
+                transaction = mint_function.build_transaction({
                     'from': admin_account.address,
-                    'gas': 150000,
-                    'gasPrice': gas_price,
+                    'gas': gas_oracle_service.estimate_gas(mint_function, {'from': admin_account.address}, 150000),
                     'nonce': self.w3.eth.get_transaction_count(admin_account.address, 'pending'),
+                    **gas_oracle_service.get_fee_params(self.w3, bump=1.2 ** attempt),
                 })
                 
                 # Sign and send transaction
@@ -162,6 +158,10 @@ class TeoCoinService:
                 logger.info(f"✅ Minted {amount} TEO to {to_address} - TX: {tx_hash.hex()}")
                 return tx_hash.hex()
                 
+            except BlockchainTransactionError as e:
+                # Fees are at the cap: another attempt would send the same fees
+                logger.error(f"Mint attempt {attempt + 1}/{max_retries} stopped: {e}")
+                break
             except Exception as e:
                 logger.error(f"Mint attempt {attempt + 1}/{max_retries} failed: {e}")
                 if attempt < max_retries - 1:
@@ -232,47 +232,21 @@ class TeoCoinService:
     
     def get_optimized_gas_price(self) -> int:
         """
-        Get optimized gas price for the network.
+        Get optimized gas price for the network (cached by the gas oracle).
         
         Returns:
             int: Gas price in wei
         """
-        try:
-            gas_price = self.w3.eth.gas_price
-            # Add 10% for reliability
-            gas_price = int(gas_price * 1.1)
-            
-            # Set reasonable limits
-            min_gas_price = self.w3.to_wei('25', 'gwei')
-            max_gas_price = self.w3.to_wei('50', 'gwei')
-            
-            if gas_price < min_gas_price:
-                gas_price = min_gas_price
-            elif gas_price > max_gas_price:
-                gas_price = max_gas_price
-                
-            return gas_price
-        except:
-            return self.w3.to_wei('30', 'gwei')
+        return gas_oracle_service.get_gas_price(self.w3)
 
 
-# Global service instance for backward compatibility
-teocoin_service = None
+# Global service instance for backward compatibility, built on first use
+teocoin_service = lazy_service('teocoin_service', TeoCoinService)
 
 def get_teocoin_service():
-    """Get or create the global TeoCoin service instance."""
-    global teocoin_service
-    if teocoin_service is None:
-        teocoin_service = TeoCoinService()
+    """Get the global TeoCoin service instance."""
     return teocoin_service
 
-# Initialize service instance
-try:
-    teocoin_service = TeoCoinService()
-except Exception as e:
-    logger.error(f"Failed to initialize TeoCoin service: {e}")
-    teocoin_service = None
-
 
 # Legacy compatibility functions - DEPRECATED
 def check_course_payment_prerequisites(student_address: str, course_price: Decimal):
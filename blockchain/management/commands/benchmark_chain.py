@@ -0,0 +1,34 @@
+"""
+Management command to benchmark the TeoCoin chain flows offline, on the local test chain
+"""
+
+from django.core.management.base import BaseCommand
+
+from blockchain.testing import benchmark
+
+
+class Command(BaseCommand):
+    help = 'Measure mint, withdrawal, burn deposit and settlement throughput and RPC calls on an in-process chain'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mints', type=int, default=50, help='Mints to send')
+        parser.add_argument('--withdrawals', type=int, default=20, help='Withdrawals to send')
+        parser.add_argument('--deposits', type=int, default=20, help='Burn deposits to verify')
+        parser.add_argument('--credits', type=int, default=100, help='Queued credits per settlement run')
+        parser.add_argument('--wallets', type=int, default=10, help='Wallets the queued credits are spread over')
+
+    def handle(self, *args, **options):
+        self.stdout.write('⛓️ Running TeoCoin flows against the local chain (no network, database rolled back)')
+        results = benchmark(
+            options['mints'], options['withdrawals'], options['deposits'], options['credits'], options['wallets']
+        )
+
+        for flow, result in results.items():
+            calls = ', '.join(f'{method}={count}' for method, count in sorted(result['rpc_calls'].items()))
+            self.stdout.write(
+                f"📊 {flow}: {result['ops']} ops in {result['seconds']:.3f}s "
+                f"({result['ops_per_second']:.1f} ops/s), {result['rpc_per_op']:.2f} RPC calls/op"
+                + (f", {result['transactions']} transactions" if 'transactions' in result else '')
+            )
+            self.stdout.write(f"   {calls or 'no RPC calls'}")
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark complete'))
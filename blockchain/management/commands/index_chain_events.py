@@ -0,0 +1,45 @@
+"""
+Management command to index confirmed TeoCoin transfers and credit burn deposits
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from services.chain_indexer_service import chain_indexer_service
+
+
+class Command(BaseCommand):
+    help = 'Index confirmed TeoCoin Transfer events and credit pending burn deposits'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running as a worker, following new blocks'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds between polls when caught up with --loop'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = chain_indexer_service.index()
+            claims = result['claims']
+            if result['events'] or claims['credited'] or claims['rejected'] or not options['loop']:
+                self.stdout.write(
+                    f"⛓️ Block {result['last_block']}: {result['events']} transfers indexed, "
+                    f"{claims['credited']} deposits credited, {claims['rejected']} rejected"
+                )
+            if result['rewound']:
+                self.stdout.write(self.style.WARNING(f"⚠️ Reorg detected: rewound {result['rewound']} blocks"))
+
+            if not options['loop']:
+                break
+            # Catch up without pausing, poll when at the confirmed head
+            if not result['caught_up']:
+                continue
+            time.sleep(options['interval'])
@@ -0,0 +1,46 @@
+"""
+Management command to mint queued TeoCoin credits in aggregated settlements
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from services.mint_settlement_service import mint_settlement_service
+
+
+class Command(BaseCommand):
+    help = 'Mint queued rewards and withdrawals with one transaction per wallet (or multicall batch)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Settle every wallet now, not only those over the threshold or delay'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running as a worker'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=30.0,
+            help='Seconds between runs with --loop'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = mint_settlement_service.settle(force=options['all'])
+            if result.get('skipped'):
+                self.stdout.write(self.style.WARNING(f"⚠️ {result['skipped']}"))
+            elif result['submitted'] or result['confirmed'] or result['failed'] or not options['loop']:
+                self.stdout.write(
+                    f"🪙 {result['credits']} credits for {result['wallets']} wallets in "
+                    f"{result['submitted']} transactions: {result['confirmed']} confirmed, {result['failed']} failed"
+                )
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0005_alter_dbteocoinbalance_available_balance_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChainIndexerCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_block', models.BigIntegerField()),
+                ('last_block_hash', models.CharField(blank=True, max_length=66)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'blockchain_chain_indexer_cursor',
+            },
+        ),
+        migrations.CreateModel(
+            name='TeoCoinTransferEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tx_hash', models.CharField(max_length=66)),
+                ('log_index', models.PositiveIntegerField()),
+                ('block_number', models.BigIntegerField()),
+                ('block_hash', models.CharField(max_length=66)),
+                ('from_address', models.CharField(help_text='Lowercase address', max_length=42)),
+                ('to_address', models.CharField(help_text='Lowercase address', max_length=42)),
+                ('kind', models.CharField(choices=[('transfer', 'Transfer'), ('mint', 'Mint'), ('burn', 'Burn')], max_length=10)),
+                ('value_wei', models.CharField(help_text='Exact amount in wei', max_length=78)),
+                ('amount', models.DecimalField(decimal_places=18, help_text='Amount in TEO', max_digits=36)),
+                ('indexed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'blockchain_teocoin_transfer_event',
+                'ordering': ['-block_number', '-log_index'],
+                'indexes': [models.Index(fields=['block_number'], name='blockchain__block_n_d47f3d_idx'), models.Index(fields=['from_address', 'kind'], name='blockchain__from_ad_f2bc60_idx'), models.Index(fields=['to_address', 'kind'], name='blockchain__to_addr_1207c1_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tx_hash', 'log_index'), name='unique_teocoin_transfer_log')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BurnDepositClaim',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tx_hash', models.CharField(max_length=66, unique=True)),
+                ('metamask_address', models.CharField(help_text='Lowercase address', max_length=42)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('status', models.CharField(choices=[('pending', 'Pending confirmation'), ('credited', 'Credited'), ('rejected', 'Rejected')], default='pending', max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('credited_at', models.DateTimeField(blank=True, null=True)),
+                ('deposit_transaction', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blockchain.dbteocointransaction')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='burn_deposit_claims', to=settings.AUTH_USER_MODEL)),
+                ('event', models.OneToOneField(blank=True, help_text='Burn event credited by this claim (credited once)', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='deposit_claim', to='blockchain.teocointransferevent')),
+            ],
+            options={
+                'db_table': 'blockchain_burn_deposit_claim',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='blockchain__status_cf1507_idx'), models.Index(fields=['user', 'tx_hash'], name='blockchain__user_id_d453da_idx')],
+            },
+        ),
+    ]
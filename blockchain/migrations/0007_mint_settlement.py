@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0006_chain_event_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MintSettlement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tx_hash', models.CharField(blank=True, max_length=66, null=True, unique=True)),
+                ('nonce', models.BigIntegerField(blank=True, null=True)),
+                ('wallet_count', models.PositiveIntegerField(default=1)),
+                ('amount', models.DecimalField(decimal_places=8, help_text='Total TEO minted', max_digits=20)),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('confirmed', 'Confirmed'), ('failed', 'Failed')], default='submitted', max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('gas_used', models.BigIntegerField(blank=True, null=True)),
+                ('block_number', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('confirmed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'blockchain_mint_settlement',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='blockchain__status_b4ca6a_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PendingMint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('wallet_address', models.CharField(help_text='Lowercase address', max_length=42)),
+                ('amount', models.DecimalField(decimal_places=8, max_digits=20)),
+                ('source', models.CharField(choices=[('withdrawal', 'Withdrawal request'), ('reward', 'Reward transaction')], max_length=20)),
+                ('object_id', models.CharField(blank=True, help_text='Primary key of the ledger row paid by this mint', max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('submitted', 'Submitted'), ('settled', 'Settled'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('settled_at', models.DateTimeField(blank=True, null=True)),
+                ('settlement', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='credits', to='blockchain.mintsettlement')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pending_mints', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'blockchain_pending_mint',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'wallet_address'], name='blockchain__status_0f3d7a_idx'), models.Index(fields=['status', 'created_at'], name='blockchain__status_ff035c_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('object_id', ''), _negated=True), fields=('source', 'object_id'), name='unique_pending_mint_ledger_row')],
+            },
+        ),
+    ]
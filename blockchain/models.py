@@ -438,3 +438,201 @@ class TeoCoinWithdrawalRequest(models.Model):
             return "1-5 minutes"
         else:
             return "Completed"
+
+
+class ChainIndexerCursor(models.Model):
+    """
+    Last confirmed block processed by an on-chain event indexer
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_block = models.BigIntegerField()
+    last_block_hash = models.CharField(max_length=66, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "blockchain_chain_indexer_cursor"
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_block}"
+
+
+class TeoCoinTransferEvent(models.Model):
+    """
+    Confirmed TeoCoin ``Transfer`` log, stored by the chain indexer.
+    Mints come from and burns go to the zero address.
+    """
+    KIND_CHOICES = [
+        ('transfer', 'Transfer'),
+        ('mint', 'Mint'),
+        ('burn', 'Burn'),
+    ]
+
+    tx_hash = models.CharField(max_length=66)
+    log_index = models.PositiveIntegerField()
+    block_number = models.BigIntegerField()
+    block_hash = models.CharField(max_length=66)
+    from_address = models.CharField(max_length=42, help_text="Lowercase address")
+    to_address = models.CharField(max_length=42, help_text="Lowercase address")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value_wei = models.CharField(max_length=78, help_text="Exact amount in wei")
+    amount = models.DecimalField(max_digits=36, decimal_places=18, help_text="Amount in TEO")
+    indexed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "blockchain_teocoin_transfer_event"
+        ordering = ['-block_number', '-log_index']
+        constraints = [
+            models.UniqueConstraint(fields=['tx_hash', 'log_index'], name='unique_teocoin_transfer_log'),
+        ]
+        indexes = [
+            models.Index(fields=['block_number']),
+            models.Index(fields=['from_address', 'kind']),
+            models.Index(fields=['to_address', 'kind']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.amount} TEO {self.from_address} -> {self.to_address} ({self.tx_hash[:10]}...)"
+
+
+class BurnDepositClaim(models.Model):
+    """
+    A user's claim that a burn transaction should be credited to their
+    platform balance. Credited once the burn is indexed and confirmed.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending confirmation'),
+        ('credited', 'Credited'),
+        ('rejected', 'Rejected'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='burn_deposit_claims'
+    )
+    tx_hash = models.CharField(max_length=66, unique=True)
+    metamask_address = models.CharField(max_length=42, help_text="Lowercase address")
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    error = models.TextField(blank=True)
+
+    event = models.OneToOneField(
+        TeoCoinTransferEvent,
+        null=True, blank=True,
+        on_delete=models.PROTECT,
+        related_name='deposit_claim',
+        help_text="Burn event credited by this claim (credited once)"
+    )
+    deposit_transaction = models.ForeignKey(
+        DBTeoCoinTransaction,
+        null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    credited_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "blockchain_burn_deposit_claim"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['user', 'tx_hash']),
+        ]
+
+    def __str__(self):
+        return f"Burn deposit {self.tx_hash[:10]}... - {self.user.email} - {self.amount} TEO - {self.status}"
+
+
+class MintSettlement(models.Model):
+    """
+    One settlement transaction: an aggregated ``mintTo`` for a wallet, or a
+    ``multicall`` of ``mintTo`` calls for several wallets.
+    """
+    STATUS_CHOICES = [
+        ('submitted', 'Submitted'),
+        ('confirmed', 'Confirmed'),
+        ('failed', 'Failed'),
+    ]
+
+    tx_hash = models.CharField(max_length=66, unique=True, null=True, blank=True)
+    nonce = models.BigIntegerField(null=True, blank=True)
+    wallet_count = models.PositiveIntegerField(default=1)
+    amount = models.DecimalField(max_digits=20, decimal_places=8, help_text="Total TEO minted")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='submitted')
+    error = models.TextField(blank=True)
+    gas_used = models.BigIntegerField(null=True, blank=True)
+    block_number = models.BigIntegerField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    confirmed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "blockchain_mint_settlement"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Settlement {self.tx_hash or self.pk} - {self.wallet_count} wallets - {self.amount} TEO - {self.status}"
+
+
+class PendingMint(models.Model):
+    """
+    TEO owed on-chain to a wallet (reward, withdrawal, payment bonus), minted
+    together with the wallet's other credits by the next settlement. The
+    ledger row it pays (``source`` / ``object_id``) is updated on settlement.
+    """
+    SOURCE_CHOICES = [
+        ('withdrawal', 'Withdrawal request'),
+        ('reward', 'Reward transaction'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('submitted', 'Submitted'),
+        ('settled', 'Settled'),
+        ('failed', 'Failed'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='pending_mints'
+    )
+    wallet_address = models.CharField(max_length=42, help_text="Lowercase address")
+    amount = models.DecimalField(max_digits=20, decimal_places=8)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    object_id = models.CharField(max_length=64, blank=True, help_text="Primary key of the ledger row paid by this mint")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    settlement = models.ForeignKey(
+        MintSettlement,
+        null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='credits'
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    settled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "blockchain_pending_mint"
+        ordering = ['created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'object_id'],
+                condition=~models.Q(object_id=''),
+                name='unique_pending_mint_ledger_row'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'wallet_address']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.amount} TEO -> {self.wallet_address} - {self.status}"
@@ -0,0 +1,628 @@
+"""
+Local TeoCoin chain for tests and benchmarks
+
+``local_teocoin_chain()`` runs a deterministic chain in-process and points
+every chain-facing service (``teocoin_service``, the consolidated and
+withdrawal services, the chain indexer, burn deposit views) at it through
+``blockchain.web3_provider.override_provider``::
+
+    with local_teocoin_chain() as chain:
+        teocoin_service.mint_tokens(chain.account('alice').address, Decimal('10'))
+        chain.rpc_calls  # Counter of JSON-RPC methods called by the services
+
+The chain answers the JSON-RPC methods the services use and executes the
+TeoCoin token ABI (``mint``/``mintTo`` by the admin account, ``burn``,
+``burnFrom``, ``transfer``, ``transferFrom``, ``approve``, ``multicall`` and
+the views) with ERC-20 semantics, emitting the same
+``Transfer``/``Approval``/``TokensMinted`` logs. Every transaction is mined in its own block; ``mine()`` adds empty
+blocks, e.g. for confirmations. Signed raw transactions are decoded and
+checked (chain id, nonce, fee cap, gas limit) like a node would.
+
+Gas used is a fixed schedule per method, close to the deployed token, so
+numbers are stable between runs. Accounts, keys, block hashes and
+timestamps are deterministic. This is not an EVM: it does not run contract
+bytecode (the repository only ships the ABI), and calls always see the
+latest state.
+
+``benchmark()`` (``manage.py benchmark_chain``) measures mint, withdrawal, burn
+deposit and mint settlement throughput and RPC calls per operation on the
+local chain.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.test.utils import override_settings
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_account._utils.legacy_transactions import Transaction as LegacyTransaction
+from eth_account.typed_transactions import TypedTransaction
+from eth_utils import function_abi_to_4byte_selector, keccak, to_checksum_address
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.providers.base import BaseProvider
+
+from blockchain.teocoin_abi import TEOCOIN_ABI
+from blockchain.web3_provider import override_provider
+
+CHAIN_ID = 80002  # Polygon Amoy
+GENESIS_TIMESTAMP = 1_700_000_000
+BLOCK_TIME = 2
+BLOCK_GAS_LIMIT = 30_000_000
+NATIVE_BALANCE = Web3.to_wei(1000, 'ether')
+ZERO_ADDRESS = '0x' + '0' * 40
+CONTRACT_ADDRESS = to_checksum_address(keccak(text='teoart-local-teocoin')[12:])
+
+TRANSFER_TOPIC = keccak(text='Transfer(address,address,uint256)')
+APPROVAL_TOPIC = keccak(text='Approval(address,address,uint256)')
+TOKENS_MINTED_TOPIC = keccak(text='TokensMinted(address,uint256)')
+
+# Gas used on top of the 21000 intrinsic cost; writing a new holder's balance adds NEW_SLOT_GAS
+GAS_SCHEDULE = {
+    'mint': 35000,
+    'mintTo': 35000,
+    'burn': 15000,
+    'burnFrom': 20000,
+    'transfer': 17000,
+    'transferFrom': 25000,
+    'approve': 24000,
+    'multicall': 5000,  # plus the calls
+}
+INTRINSIC_GAS = 21000
+NEW_SLOT_GAS = 20000
+VIEWS = {'name', 'symbol', 'decimals', 'totalSupply', 'balanceOf', 'allowance'}
+
+
+class RPCError(Exception):
+    def __init__(self, message: str, code: int = -32000):
+        super().__init__(message)
+        self.code = code
+
+
+class Revert(RPCError):
+    def __init__(self, reason: str):
+        super().__init__(f'execution reverted: {reason}', code=3)
+
+
+class OutOfGas(Exception):
+    pass
+
+
+def _hex(value) -> str:
+    if isinstance(value, int):
+        return hex(value)
+    return '0x' + bytes(value).hex()
+
+
+def _int(value) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def _topic(address: str) -> bytes:
+    return b'\0' * 12 + bytes.fromhex(address[2:])
+
+
+def _functions() -> Dict[bytes, dict]:
+    """Selector -> function ABI for the token functions of both TeoCoin ABIs."""
+    abis = list(TEOCOIN_ABI)
+    with open(os.path.join(settings.BASE_DIR, 'blockchain', 'abi', 'teoCoin2_ABI.json')) as f:
+        abis += json.load(f)
+    return {
+        function_abi_to_4byte_selector(item): item
+        for item in abis
+        if item.get('type') == 'function' and item['name'] in GAS_SCHEDULE.keys() | VIEWS
+    }
+
+
+class LocalTeoCoinChain:
+    """Deterministic in-process chain with the TeoCoin token deployed."""
+
+    def __init__(self, base_fee_gwei: int = 30, priority_fees_gwei: Tuple[int, int, int] = (25, 30, 35)):
+        self.address = CONTRACT_ADDRESS
+        self.base_fee = Web3.to_wei(base_fee_gwei, 'gwei')
+        self.priority_fees = [Web3.to_wei(fee, 'gwei') for fee in priority_fees_gwei]
+        self.functions = _functions()
+
+        self.balances: Dict[str, int] = {}
+        self.allowances: Dict[Tuple[str, str], int] = {}
+        self.total_supply = 0
+        self.nonces: Dict[str, int] = {}
+        self.blocks: List[dict] = []
+        self.transactions: Dict[str, dict] = {}
+        self.receipts: Dict[str, dict] = {}
+        self.logs: List[dict] = []
+        self._accounts: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+        self.minters = {self.account('admin').address.lower()}
+        self._new_block([])
+        self.provider = LocalChainProvider(self)
+        self.w3 = Web3(self.provider)
+        self.contract = self.w3.eth.contract(address=self.address, abi=[
+            item for item in self.functions.values()
+        ] + [item for item in TEOCOIN_ABI if item.get('type') == 'event'])
+
+    # Accounts and helpers
+
+    def account(self, name: str):
+        """Deterministic funded account; ``admin`` may mint."""
+        if name not in self._accounts:
+            self._accounts[name] = Account.from_key(keccak(text=f'teoart-local-chain-{name}'))
+        return self._accounts[name]
+
+    @property
+    def rpc_calls(self) -> Counter:
+        return self.provider.calls
+
+    @property
+    def block_number(self) -> int:
+        return len(self.blocks) - 1
+
+    def mine(self, blocks: int = 1) -> int:
+        with self._lock:
+            for _ in range(blocks):
+                self._new_block([])
+            return self.block_number
+
+    def balance_of(self, address: str) -> Decimal:
+        return Decimal(self.balances.get(address.lower(), 0)) / Decimal(10 ** 18)
+
+    def send(self, account, function: str, *args) -> str:
+        """Sign and send a token transaction from ``account`` (e.g. a user's burn); returns the hash."""
+        tx = getattr(self.contract.functions, function)(*args).build_transaction({
+            'from': account.address,
+            'nonce': self.nonces.get(account.address.lower(), 0),
+            'gas': 200000,
+            'maxFeePerGas': 2 * self.base_fee + self.priority_fees[1],
+            'maxPriorityFeePerGas': self.priority_fees[1],
+            'chainId': CHAIN_ID,
+        })
+        signed = account.sign_transaction(tx)
+        return self.rpc('eth_sendRawTransaction', [_hex(signed.raw_transaction)])
+
+    # JSON-RPC
+
+    def rpc(self, method: str, params: list) -> Any:
+        handler = getattr(self, f'_rpc_{method}', None)
+        if handler is None:
+            raise RPCError(f'the method {method} does not exist/is not available', code=-32601)
+        with self._lock:
+            return handler(*params)
+
+    def _rpc_web3_clientVersion(self):
+        return 'TeoArtLocalChain/1.0'
+
+    def _rpc_net_version(self):
+        return str(CHAIN_ID)
+
+    def _rpc_eth_chainId(self):
+        return hex(CHAIN_ID)
+
+    def _rpc_eth_blockNumber(self):
+        return hex(self.block_number)
+
+    def _rpc_eth_gasPrice(self):
+        return hex(self.base_fee + self.priority_fees[1])
+
+    def _rpc_eth_maxPriorityFeePerGas(self):
+        return hex(self.priority_fees[1])
+
+    def _rpc_eth_getBalance(self, address, block='latest'):
+        return hex(NATIVE_BALANCE)
+
+    def _rpc_eth_getTransactionCount(self, address, block='latest'):
+        number = self._block_number(block)
+        if number >= self.block_number:
+            return hex(self.nonces.get(address.lower(), 0))
+        return hex(sum(
+            1 for tx in self.transactions.values()
+            if tx['from'].lower() == address.lower() and _int(tx['blockNumber']) <= number
+        ))
+
+    def _rpc_eth_getBlockByNumber(self, block, full_transactions=False):
+        number = self._block_number(block)
+        if number > self.block_number:
+            return None
+        block = dict(self.blocks[number])
+        if full_transactions:
+            block['transactions'] = [self.transactions[h] for h in block['transactions']]
+        return block
+
+    def _rpc_eth_getBlockByHash(self, block_hash, full_transactions=False):
+        for block in self.blocks:
+            if block['hash'] == block_hash.lower():
+                return self._rpc_eth_getBlockByNumber(block['number'], full_transactions)
+        return None
+
+    def _rpc_eth_feeHistory(self, block_count, newest_block, percentiles):
+        newest = self._block_number(newest_block)
+        count = min(_int(block_count), newest + 1)
+        tips = [hex(self.priority_fees[min(i, len(self.priority_fees) - 1)]) for i in range(len(percentiles))]
+        return {
+            'oldestBlock': hex(newest - count + 1),
+            'baseFeePerGas': [hex(self.base_fee)] * (count + 1),
+            'gasUsedRatio': [0.5] * count,
+            'reward': [tips] * count,
+        }
+
+    def _rpc_eth_call(self, tx, block='latest'):
+        output, _, _ = self._execute(tx.get('from', ZERO_ADDRESS), tx.get('to'), tx.get('data') or tx.get('input') or '0x')
+        return _hex(output)
+
+    def _rpc_eth_estimateGas(self, tx, block='latest'):
+        _, gas, _ = self._execute(tx.get('from', ZERO_ADDRESS), tx.get('to'), tx.get('data') or tx.get('input') or '0x')
+        return hex(gas)
+
+    def _rpc_eth_sendRawTransaction(self, raw):
+        raw = bytes.fromhex(raw[2:])
+        sender = Account.recover_transaction(raw)
+        if raw[0] < 0x80:
+            tx = TypedTransaction.from_bytes(HexBytes(raw)).as_dict()
+            fee_cap, tip = tx['maxFeePerGas'], tx['maxPriorityFeePerGas']
+        else:
+            tx = LegacyTransaction.from_bytes(raw).as_dict()
+            tx['chainId'] = (tx['v'] - 35) // 2 if tx['v'] >= 35 else CHAIN_ID
+            fee_cap = tip = tx['gasPrice']
+        tx_hash = _hex(keccak(raw))
+        to = to_checksum_address(tx['to']) if tx['to'] else None
+
+        if tx['chainId'] != CHAIN_ID:
+            raise RPCError(f"invalid chain id {tx['chainId']}")
+        nonce = self.nonces.get(sender.lower(), 0)
+        if tx['nonce'] != nonce:
+            raise RPCError(f"nonce too {'low' if tx['nonce'] < nonce else 'high'}: next nonce {nonce}, tx nonce {tx['nonce']}")
+        if fee_cap < self.base_fee:
+            raise RPCError(f'max fee per gas less than block base fee: maxFeePerGas: {fee_cap} baseFee: {self.base_fee}')
+        if tx['gas'] < INTRINSIC_GAS:
+            raise RPCError('intrinsic gas too low')
+
+        self.nonces[sender.lower()] = nonce + 1
+        status, logs = 1, []
+        try:
+            _, gas_used, logs = self._execute(sender, to, _hex(tx['data']), apply_with_limit=tx['gas'])
+        except Revert:
+            status, gas_used = 0, min(tx['gas'], INTRINSIC_GAS + GAS_SCHEDULE['transfer'])
+        except OutOfGas:
+            status, gas_used = 0, tx['gas']
+
+        number = self.block_number + 1
+        effective_price = min(fee_cap, self.base_fee + tip)
+        self.transactions[tx_hash] = {
+            'hash': tx_hash, 'nonce': hex(tx['nonce']), 'from': sender, 'to': to,
+            'value': hex(tx['value']), 'gas': hex(tx['gas']), 'input': _hex(tx['data']),
+            'gasPrice': hex(effective_price), 'chainId': hex(CHAIN_ID), 'type': hex(tx.get('type', 0)),
+            'v': hex(tx['v']), 'r': hex(tx['r']), 's': hex(tx['s']),
+            'transactionIndex': '0x0', 'blockNumber': hex(number),
+        }
+        block = self._new_block([tx_hash])
+        self.transactions[tx_hash]['blockHash'] = block['hash']
+        for index, log in enumerate(logs):
+            log.update({
+                'blockNumber': hex(number), 'blockHash': block['hash'], 'transactionHash': tx_hash,
+                'transactionIndex': '0x0', 'logIndex': hex(index), 'removed': False,
+            })
+            self.logs.append(log)
+        self.receipts[tx_hash] = {
+            'transactionHash': tx_hash, 'transactionIndex': '0x0',
+            'blockHash': block['hash'], 'blockNumber': hex(number),
+            'from': sender, 'to': to, 'contractAddress': None,
+            'cumulativeGasUsed': hex(gas_used), 'gasUsed': hex(gas_used),
+            'effectiveGasPrice': hex(effective_price), 'logs': logs,
+            'logsBloom': '0x' + '00' * 256, 'status': hex(status), 'type': hex(tx.get('type', 0)),
+        }
+        return tx_hash
+
+    def _rpc_eth_getTransactionReceipt(self, tx_hash):
+        return self.receipts.get(tx_hash.lower())
+
+    def _rpc_eth_getTransactionByHash(self, tx_hash):
+        return self.transactions.get(tx_hash.lower())
+
+    def _rpc_eth_getLogs(self, params):
+        start = self._block_number(params.get('fromBlock', 'latest'))
+        end = self._block_number(params.get('toBlock', 'latest'))
+        addresses = params.get('address')
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {a.lower() for a in addresses} if addresses else None
+        topics = params.get('topics') or []
+
+        def matches(log):
+            if not start <= _int(log['blockNumber']) <= end:
+                return False
+            if addresses is not None and log['address'].lower() not in addresses:
+                return False
+            for position, wanted in enumerate(topics):
+                if wanted is None:
+                    continue
+                wanted = {w.lower() for w in ([wanted] if isinstance(wanted, str) else wanted)}
+                if position >= len(log['topics']) or log['topics'][position] not in wanted:
+                    return False
+            return True
+
+        return [log for log in self.logs if matches(log)]
+
+    # Blocks
+
+    def _block_number(self, block) -> int:
+        if block in ('latest', 'pending', 'safe', 'finalized', None):
+            return self.block_number
+        if block == 'earliest':
+            return 0
+        return _int(block)
+
+    def _new_block(self, tx_hashes: List[str]) -> dict:
+        number = len(self.blocks)
+        parent = self.blocks[-1]['hash'] if self.blocks else '0x' + '00' * 32
+        block_hash = _hex(keccak(text=f'{parent}-{number}-{",".join(tx_hashes)}'))
+        gas_used = sum(_int(self.receipts[h]['gasUsed']) for h in tx_hashes if h in self.receipts)
+        block = {
+            'number': hex(number), 'hash': block_hash, 'parentHash': parent,
+            'timestamp': hex(GENESIS_TIMESTAMP + number * BLOCK_TIME),
+            'baseFeePerGas': hex(self.base_fee), 'gasLimit': hex(BLOCK_GAS_LIMIT), 'gasUsed': hex(gas_used),
+            'miner': ZERO_ADDRESS, 'extraData': '0x', 'nonce': '0x0000000000000000',
+            'difficulty': '0x0', 'totalDifficulty': '0x0', 'size': '0x0', 'uncles': [],
+            'sha3Uncles': '0x' + '00' * 32, 'mixHash': '0x' + '00' * 32,
+            'logsBloom': '0x' + '00' * 256, 'transactionsRoot': '0x' + '00' * 32,
+            'stateRoot': '0x' + '00' * 32, 'receiptsRoot': '0x' + '00' * 32,
+            'transactions': tx_hashes,
+        }
+        self.blocks.append(block)
+        return block
+
+    # Token execution
+
+    def _execute(self, sender: str, to: Optional[str], data: str, apply_with_limit: Optional[int] = None):
+        """
+        Run a call; returns (output, gas used, logs). State changes are only
+        kept with ``apply_with_limit`` (the transaction gas limit).
+        """
+        data = bytes.fromhex(data[2:]) if isinstance(data, str) else bytes(data)
+        if to is None or to.lower() != self.address.lower():
+            return b'', INTRINSIC_GAS, []
+        state = {
+            'balances': dict(self.balances),
+            'allowances': dict(self.allowances),
+            'total_supply': self.total_supply,
+        }
+        output, logs, gas = self._dispatch(state, sender.lower(), data)
+        gas += INTRINSIC_GAS
+
+        if apply_with_limit is not None:
+            if gas > apply_with_limit:
+                raise OutOfGas()
+            self.balances = state['balances']
+            self.allowances = state['allowances']
+            self.total_supply = state['total_supply']
+        return output, gas, logs
+
+    def _dispatch(self, state, sender: str, data: bytes) -> Tuple[bytes, List[dict], int]:
+        """Run one token call on ``state``; returns (output, logs, gas above the intrinsic cost)."""
+        function = self.functions.get(data[:4])
+        if function is None:
+            raise Revert('function not supported by the local chain')
+
+        name = function['name']
+        args = decode([i['type'] for i in function['inputs']], data[4:])
+        output, logs, extra_gas = getattr(self, f'_token_{name}')(state, sender, *args)
+        output = encode([o['type'] for o in function['outputs']], output) if function['outputs'] else b''
+        return output, logs, GAS_SCHEDULE.get(name, 0) + extra_gas
+
+    def _log(self, topics: List[bytes], data: bytes) -> dict:
+        return {'address': self.address, 'topics': [_hex(t) for t in topics], 'data': _hex(data)}
+
+    def _move(self, state, sender: str, receiver: str, amount: int) -> Tuple[List[dict], int]:
+        balances = state['balances']
+        new_slots = 0
+        if sender == ZERO_ADDRESS:
+            state['total_supply'] += amount
+        else:
+            if balances.get(sender, 0) < amount:
+                raise Revert('ERC20: transfer amount exceeds balance')
+            balances[sender] -= amount
+        if receiver == ZERO_ADDRESS:
+            state['total_supply'] -= amount
+        else:
+            new_slots = int(not balances.get(receiver) and amount > 0)
+            balances[receiver] = balances.get(receiver, 0) + amount
+        return [self._log([TRANSFER_TOPIC, _topic(sender), _topic(receiver)], encode(['uint256'], [amount]))], new_slots
+
+    def _spend_allowance(self, state, owner: str, spender: str, amount: int) -> None:
+        allowed = state['allowances'].get((owner, spender), 0)
+        if allowed < amount:
+            raise Revert('ERC20: insufficient allowance')
+        state['allowances'][(owner, spender)] = allowed - amount
+
+    def _token_mint(self, state, sender, to, amount):
+        if sender not in self.minters:
+            raise Revert('not minter.')
+        logs, new_slots = self._move(state, ZERO_ADDRESS, to.lower(), amount)
+        logs.append(self._log([TOKENS_MINTED_TOPIC, _topic(to.lower())], encode(['uint256'], [amount])))
+        return [], logs, NEW_SLOT_GAS * new_slots
+
+    _token_mintTo = _token_mint
+
+    def _token_burn(self, state, sender, amount):
+        logs, _ = self._move(state, sender, ZERO_ADDRESS, amount)
+        return [], logs, 0
+
+    def _token_burnFrom(self, state, sender, owner, amount):
+        self._spend_allowance(state, owner.lower(), sender, amount)
+        logs, _ = self._move(state, owner.lower(), ZERO_ADDRESS, amount)
+        return [], logs, 0
+
+    def _token_transfer(self, state, sender, to, amount):
+        logs, new_slots = self._move(state, sender, to.lower(), amount)
+        return [True], logs, NEW_SLOT_GAS * new_slots
+
+    def _token_transferFrom(self, state, sender, owner, to, amount):
+        self._spend_allowance(state, owner.lower(), sender, amount)
+        logs, new_slots = self._move(state, owner.lower(), to.lower(), amount)
+        return [True], logs, NEW_SLOT_GAS * new_slots
+
+    def _token_approve(self, state, sender, spender, amount):
+        state['allowances'][(sender, spender.lower())] = amount
+        log = self._log([APPROVAL_TOPIC, _topic(sender), _topic(spender.lower())], encode(['uint256'], [amount]))
+        return [True], [log], 0
+
+    def _token_multicall(self, state, sender, calls):
+        """thirdweb ``multicall``: the calls run as the sender, all or nothing."""
+        outputs, logs, gas = [], [], 0
+        for data in calls:
+            output, call_logs, call_gas = self._dispatch(state, sender, data)
+            outputs.append(output)
+            logs += call_logs
+            gas += call_gas
+        return [outputs], logs, gas
+
+    def _token_name(self, state, sender):
+        return ['TeoCoin'], [], 0
+
+    def _token_symbol(self, state, sender):
+        return ['TEO'], [], 0
+
+    def _token_decimals(self, state, sender):
+        return [18], [], 0
+
+    def _token_totalSupply(self, state, sender):
+        return [state['total_supply']], [], 0
+
+    def _token_balanceOf(self, state, sender, account):
+        return [state['balances'].get(account.lower(), 0)], [], 0
+
+    def _token_allowance(self, state, sender, owner, spender):
+        return [state['allowances'].get((owner.lower(), spender.lower()), 0)], [], 0
+
+
+class LocalChainProvider(BaseProvider):
+    """Web3 provider answering from a ``LocalTeoCoinChain``, counting the calls per method."""
+
+    def __init__(self, chain: LocalTeoCoinChain):
+        super().__init__()
+        self.chain = chain
+        self.calls: Counter = Counter()
+        self.endpoint_uri = f'local://teocoin-chain/{id(chain):x}'
+        self._request_ids = iter(range(1, 2 ** 63))
+
+    def make_request(self, method, params):
+        self.calls[method] += 1
+        response = {'jsonrpc': '2.0', 'id': next(self._request_ids)}
+        try:
+            response['result'] = self.chain.rpc(method, list(params or []))
+        except RPCError as e:
+            response['error'] = {'code': e.code, 'message': str(e)}
+        return response
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+
+@contextmanager
+def local_teocoin_chain(**chain_options):
+    """
+    Run the services against a fresh ``LocalTeoCoinChain`` inside the block.
+
+    The admin account is both the TeoCoin minter and the platform wallet.
+    """
+    chain = LocalTeoCoinChain(**chain_options)
+    admin = chain.account('admin')
+    with override_settings(
+        POLYGON_AMOY_RPC_URL=chain.provider.endpoint_uri,
+        TEOCOIN_CONTRACT_ADDRESS=chain.address,
+        TEO_CONTRACT_ADDRESS=chain.address,
+        ADMIN_PRIVATE_KEY=admin.key.hex(),
+        PLATFORM_PRIVATE_KEY=admin.key.hex(),
+        PLATFORM_WALLET_ADDRESS=admin.address,
+    ), override_provider(chain.provider):
+        yield chain
+
+
+def _measure(chain: LocalTeoCoinChain, ops: int, run) -> Dict[str, Any]:
+    chain.rpc_calls.clear()
+    started = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - started
+    calls = dict(chain.rpc_calls)
+    return {
+        'ops': ops,
+        'seconds': seconds,
+        'ops_per_second': ops / seconds if seconds else 0.0,
+        'rpc_calls': calls,
+        'rpc_per_op': sum(calls.values()) / ops if ops else 0.0,
+    }
+
+
+def benchmark(
+    mints: int = 50, withdrawals: int = 20, deposits: int = 20, credits: int = 100, wallets: int = 10
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Time the platform's chain flows against a fresh local chain and count
+    their JSON-RPC calls:
+
+    - ``mint``: ``teocoin_service.mint_tokens``
+    - ``withdrawal``: ``teocoin_withdrawal_service.mint_tokens_to_address`` (sent and confirmed)
+    - ``deposit``: one indexer run over the confirmed burns, then ``claim_deposit`` per burn
+    - ``settlement``/``settlement_multicall``: ``credits`` queued credits for
+      ``wallets`` wallets minted by one ``mint_settlement_service.settle`` run
+
+    Each flow is warmed up once first (gas oracle, gas estimates). Database
+    changes are rolled back.
+    """
+    from django.db import transaction
+
+    from blockchain.blockchain import teocoin_service
+    from services.chain_indexer_service import chain_indexer_service
+    from services.mint_settlement_service import mint_settlement_service
+    from services.teocoin_withdrawal_service import teocoin_withdrawal_service
+    from users.models import User
+
+    results = {}
+    with local_teocoin_chain() as chain, transaction.atomic():
+        receiver = chain.account('benchmark-receiver').address
+        teocoin_service.mint_tokens(receiver, Decimal('1'))
+        results['mint'] = _measure(chain, mints, lambda: [
+            teocoin_service.mint_tokens(receiver, Decimal('1')) for _ in range(mints)
+        ])
+
+        teocoin_withdrawal_service.mint_tokens_to_address(Decimal('1'), receiver)
+        results['withdrawal'] = _measure(chain, withdrawals, lambda: [
+            teocoin_withdrawal_service.mint_tokens_to_address(Decimal('1'), receiver) for _ in range(withdrawals)
+        ])
+
+        admin = chain.account('admin')
+        burns = []
+        for i in range(deposits):
+            depositor = chain.account(f'benchmark-depositor-{i}')
+            user = User.objects.create_user(
+                username=f'benchmark-depositor-{i}', email=f'benchmark-depositor-{i}@example.com',
+                password=None, role='student',
+            )
+            chain.send(admin, 'mintTo', depositor.address, Web3.to_wei(5, 'ether'))
+            burns.append((user, depositor.address, chain.send(depositor, 'burn', Web3.to_wei(5, 'ether'))))
+        chain.mine(chain_indexer_service.confirmations)
+
+        def verify():
+            chain_indexer_service.index()
+            for user, address, tx_hash in burns:
+                claim = chain_indexer_service.claim_deposit(user, tx_hash, Decimal('5'), address)
+                if claim.status != 'credited':
+                    raise RuntimeError(f'Benchmark deposit {tx_hash} not credited: {claim.error}')
+
+        results['deposit'] = _measure(chain, deposits, verify)
+
+        for flow, multicall in (('settlement', False), ('settlement_multicall', True)):
+            for i in range(credits):
+                wallet = chain.account(f'benchmark-wallet-{i % wallets}').address
+                mint_settlement_service.enqueue(wallet, Decimal('1'), 'reward')
+            with override_settings(MINT_SETTLEMENT_MULTICALL=multicall):
+                results[flow] = _measure(chain, credits, lambda: mint_settlement_service.settle(force=True))
+            results[flow]['transactions'] = results[flow]['rpc_calls'].get('eth_sendRawTransaction', 0)
+        transaction.set_rollback(True)
+    return results
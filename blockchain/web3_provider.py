@@ -0,0 +1,43 @@
+"""
+Web3 construction shared by the chain-facing services
+
+``TeoCoinService``, ``ConsolidatedTeoCoinService`` and
+``TeoCoinWithdrawalService`` build their ``Web3`` through ``make_web3``.
+Normally that is an HTTP provider for the configured RPC URL, whose requests
+time out after ``WEB3_RPC_TIMEOUT`` seconds;
+``override_provider`` points every service at another provider (the
+in-process chain of ``blockchain.testing``) and rebuilds the lazy service
+singletons so they pick it up.
+"""
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from web3 import Web3
+
+from services.registry import registry
+
+_provider_override = None
+
+
+def make_web3(rpc_url: str) -> Web3:
+    """Web3 for ``rpc_url``, or for the provider installed by ``override_provider``."""
+    # A hung node must not keep a dashboard worker thread busy past the
+    # chain_balance fragment timeout
+    return Web3(_provider_override or Web3.HTTPProvider(
+        rpc_url, request_kwargs={'timeout': getattr(settings, 'WEB3_RPC_TIMEOUT', 2.0)}
+    ))
+
+
+@contextmanager
+def override_provider(provider):
+    """Route every service built inside the block through ``provider``."""
+    global _provider_override
+    previous = _provider_override
+    _provider_override = provider
+    registry.reset()
+    try:
+        yield provider
+    finally:
+        _provider_override = previous
+        registry.reset()
@@ -7,12 +7,14 @@ from django.views.decorators.http import require_http_methods
 from decimal import Decimal
 from datetime import datetime, timedelta
 from courses.models import Course, CourseEnrollment
+from core.db_routing import replica_reads
 from users.models import User
 import json
 
 
 @csrf_exempt
 @require_http_methods(["GET"])
+@replica_reads()
 def analytics_dashboard(request):
     """
     Analytics dashboard for admin users - Revenue and TeoCoin metrics
@@ -142,6 +144,7 @@ def get_analytics_data():
 
 @csrf_exempt
 @require_http_methods(["GET"])
+@replica_reads()
 def revenue_chart_data(request):
     """API endpoint for revenue chart data"""
     # For development, we'll allow unauthenticated access temporarily
@@ -186,6 +189,7 @@ def revenue_chart_data(request):
 
 @csrf_exempt
 @require_http_methods(["GET"])
+@replica_reads()
 def public_stats(request):
     """Public statistics for marketing/investor pages"""
     
@@ -2,14 +2,14 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Q, Prefetch
+from django.db.models import Prefetch
 from django.core.cache import cache
-from courses.models import Course, Lesson, CourseEnrollment, LessonCompletion
+from courses.models import Course, Lesson, LessonCompletion
 from courses.serializers import CourseSerializer, LessonSerializer
-from users.models import UserProgress
-from users.serializers import UserProgressSerializer
-from notifications.models import Notification
-from notifications.serializers import NotificationSerializer
+from services.enrollment_access_service import enrollment_access_service
+from services.dashboard_service import dashboard_service
+from core.parallel import run_parallel
+from core.conditional import conditional_get, course_last_modified, lesson_last_modified
 
 
 class StudentBatchDataAPI(APIView):
@@ -21,80 +21,29 @@ class StudentBatchDataAPI(APIView):
 
     def get(self, request):
         user = request.user
-        
-        # Cache key for this user's batch data
-        cache_key = f'student_batch_data_{user.id}'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return Response(cached_data)
 
-        # ✅ OPTIMIZED - Single query for enrolled courses with progress
-        enrolled_courses = Course.objects.filter(
-            enrollments__student=user, is_approved=True
-        ).select_related('teacher').prefetch_related(
-            'lessons',
-            Prefetch(
-                'lessons__completions',
-                queryset=LessonCompletion.objects.filter(student=user),
-                to_attr='user_completions'
-            )
-        ).annotate(
-            total_lessons=Count('lessons'),
-            completed_lessons=Count('lessons__completions', filter=Q(lessons__completions__student=user))
+        # ✅ OPTIMIZED - Fragments cached and invalidated independently
+        fragments, degraded = dashboard_service.get_fragments_with_status(
+            user, ['courses', 'progress', 'notifications', 'activity'], request
         )
-
-        # Serialize courses data
-        courses_data = []
-        for course in enrolled_courses:
-            course_data = CourseSerializer(course, context={'request': request}).data
-            course_data['progress'] = {
-                'total_lessons': course.total_lessons,
-                'completed_lessons': course.completed_lessons,
-                'percentage': round((course.completed_lessons / course.total_lessons * 100) if course.total_lessons > 0 else 0, 2)
-            }
-            courses_data.append(course_data)
-
-        # ✅ OPTIMIZED - User progress data
-        user_progress, created = UserProgress.objects.get_or_create(user=user)
-        progress_data = UserProgressSerializer(user_progress, context={'request': request}).data
-
-        # ✅ OPTIMIZED - Recent notifications
-        notifications = Notification.objects.filter(
-            user=user, read=False
-        ).order_by('-created_at')[:10]
-        notifications_data = NotificationSerializer(notifications, many=True).data
-
-        # ✅ OPTIMIZED - Recent activity summary
-        recent_completions = LessonCompletion.objects.filter(
-            student=user
-        ).select_related('lesson', 'lesson__course').order_by('-completed_at')[:5]
-
-        recent_activity = []
-        for completion in recent_completions:
-            recent_activity.append({
-                'id': completion.pk,
-                'type': 'lesson_completed',
-                'title': completion.lesson.title,
-                'course_title': completion.lesson.course.title if completion.lesson.course else None,
-                'date': completion.completed_at
-            })
+        notifications = fragments['notifications']
+        recent_activity = fragments['activity']['completions']
 
         data = {
-            'courses': courses_data,
-            'progress': progress_data,
-            'notifications': notifications_data,
+            'courses': fragments['courses'],
+            'progress': fragments['progress'],
+            'notifications': notifications['unread'],
             'recent_activity': recent_activity,
             'summary': {
-                'total_courses': len(courses_data),
-                'unread_notifications': len(notifications_data),
+                'total_courses': len(fragments['courses']),
+                'unread_notifications': len(notifications['unread']),
                 'recent_completions': len(recent_activity)
             }
         }
+        if degraded:
+            # Partial data: tell the client
+            data['degraded_fragments'] = degraded
 
-        # Cache for 3 minutes
-        cache.set(cache_key, data, 180)
-        
         return Response(data)
 
 
@@ -105,6 +54,7 @@ class CourseBatchDataAPI(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(course_last_modified, embeds_stream_urls=True)
     def get(self, request, course_id):
         cache_key = f'course_batch_data_{course_id}_{request.user.id}'
         cached_data = cache.get(cache_key)
@@ -113,21 +63,10 @@ class CourseBatchDataAPI(APIView):
             return Response(cached_data)
 
         try:
-            # ✅ OPTIMIZED - Single query with all related data
-            course = Course.objects.select_related('teacher').prefetch_related(
-                'lessons',
-                'lessons__exercises',
-                Prefetch(
-                    'lessons__completions',
-                    queryset=LessonCompletion.objects.filter(student=request.user),
-                    to_attr='user_completions'
-                )
-            ).get(id=course_id, is_approved=True)
+            course = Course.objects.select_related('teacher').get(id=course_id, is_approved=True)
             
             # Check if user is enrolled
-            is_enrolled = CourseEnrollment.objects.filter(
-                student=request.user, course=course
-            ).exists()
+            is_enrolled = enrollment_access_service.is_enrolled(request.user, course)
             
             if not is_enrolled:
                 return Response({'error': 'Not enrolled in this course'}, status=403)
@@ -135,31 +74,23 @@ class CourseBatchDataAPI(APIView):
         except Course.DoesNotExist:
             return Response({'error': 'Course not found'}, status=404)
 
-        # Serialize course data
-        course_data = CourseSerializer(course, context={'request': request}).data
-
-        # ✅ OPTIMIZED - Lessons with completion status
-        lessons_data = []
-        total_lessons = course.lessons.count()
-        completed_count = 0
-
-        for lesson in course.lessons.all():
-            lesson_data = LessonSerializer(lesson, context={'request': request}).data
-            
-            # Check if user completed this lesson
-            is_completed = bool(lesson.user_completions)
-            if is_completed:
-                completed_count += 1
-            
-            lesson_data['completed'] = is_completed
-            lesson_data['exercises_count'] = lesson.exercises.count()
-            lessons_data.append(lesson_data)
+        # ✅ OPTIMIZED - Course details and lesson list are built concurrently
+        fragments, degraded = run_parallel(
+            {
+                'course': lambda: CourseSerializer(course, context={'request': request}).data,
+                'lessons': lambda: self._lessons(course_id, request),
+            },
+            fallbacks={'lessons': list}
+        )
+        lessons_data = fragments['lessons']
 
         # Calculate progress
+        total_lessons = len(lessons_data)
+        completed_count = sum(1 for lesson_data in lessons_data if lesson_data['completed'])
         progress_percentage = round((completed_count / total_lessons * 100) if total_lessons > 0 else 0, 2)
 
         data = {
-            'course': course_data,
+            'course': fragments['course'],
             'lessons': lessons_data,
             'progress': {
                 'total_lessons': total_lessons,
@@ -173,11 +104,34 @@ class CourseBatchDataAPI(APIView):
             }
         }
 
-        # Cache for 5 minutes
-        cache.set(cache_key, data, 300)
+        if degraded:
+            # Partial data: tell the client and do not cache it
+            data['degraded_fragments'] = degraded
+        else:
+            # Cache for 5 minutes
+            cache.set(cache_key, data, 300)
         
         return Response(data)
 
+    def _lessons(self, course_id, request):
+        # ✅ OPTIMIZED - Lessons with exercises and the user's completions in three queries
+        lessons = Lesson.objects.filter(courses_included__id=course_id).prefetch_related(
+            'exercises',
+            Prefetch(
+                'completions',
+                queryset=LessonCompletion.objects.filter(student=request.user),
+                to_attr='user_completions'
+            )
+        )
+
+        lessons_data = []
+        for lesson in lessons:
+            lesson_data = LessonSerializer(lesson, context={'request': request}).data
+            lesson_data['completed'] = bool(lesson.user_completions)
+            lesson_data['exercises_count'] = len(lesson.exercises.all())
+            lessons_data.append(lesson_data)
+        return lessons_data
+
 
 class LessonBatchDataAPI(APIView):
     """
@@ -185,6 +139,7 @@ class LessonBatchDataAPI(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(lesson_last_modified, embeds_stream_urls=True)
     def get(self, request, lesson_id):
         cache_key = f'lesson_batch_data_{lesson_id}_{request.user.id}'
         cached_data = cache.get(cache_key)
@@ -205,9 +160,7 @@ class LessonBatchDataAPI(APIView):
             
             # Check enrollment if course exists
             if lesson.course:
-                is_enrolled = CourseEnrollment.objects.filter(
-                    student=request.user, course=lesson.course
-                ).exists()
+                is_enrolled = enrollment_access_service.is_enrolled(request.user, lesson.course)
                 
                 if not is_enrolled and lesson.course.teacher != request.user:
                     return Response({'error': 'Not enrolled in this course'}, status=403)
@@ -0,0 +1,395 @@
+"""
+Two-tier cache backend: per-process LRU (L1) in front of a shared cache (L2).
+
+L2 is another entry of ``CACHES`` (django-redis in production), named by
+``LOCATION``. Every worker keeps its hottest entries in a small in-process
+LRU with a short TTL, so repeated reads of the same dashboard or catalog key
+skip the network round trip.
+
+Writes (set, add, delete, incr, clear, ...) go to L2 and publish the key on
+an invalidation channel; every process drops it from its L1. Pub/sub is fire
+and forget, so the L1 TTL bounds staleness if a message is lost, and a
+process clears its whole L1 when its subscription reconnects.
+
+Invalidation buses, selected with ``OPTIONS['INVALIDATION']``:
+
+- ``redis``: Redis pub/sub on ``INVALIDATION_URL`` (required with several
+  worker processes)
+- ``memory``: in-process fan-out, for dev and tests
+
+Hit/miss counters are kept per process and periodically added to shared
+counters in L2; ``manage.py cache_stats`` reports the cluster-wide hit ratio.
+
+Example::
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache_backends.TwoTierCache',
+            'LOCATION': 'shared',
+            'OPTIONS': {'L1_MAX_ENTRIES': 2000, 'L1_TIMEOUT': 10, 'INVALIDATION': 'redis',
+                        'INVALIDATION_URL': REDIS_URL},
+        },
+        'shared': {'BACKEND': 'django_redis.cache.RedisCache', 'LOCATION': REDIS_URL},
+    }
+"""
+
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('l1_hits', 'l2_hits', 'misses')
+METRICS_KEY = 'cache_metrics:{name}'
+
+
+class LRUStore:
+    """Thread-safe LRU of pickled values with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Return (found, value)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, pickled = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+        return True, pickle.loads(pickled)
+
+    def set(self, key: str, value: Any, timeout: float) -> None:
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._data[key] = (time.monotonic() + timeout, pickled)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class InMemoryInvalidationBus:
+    """Fan-out of invalidation messages to the caches of this process."""
+
+    _subscribers: Dict[str, List[weakref.WeakMethod]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, channel: str):
+        self.channel = channel
+
+    def publish(self, message: dict) -> None:
+        with self._lock:
+            # Weak references: discarded caches (e.g. after a settings override) unsubscribe
+            subscribers = [ref() for ref in self._subscribers.get(self.channel, ())]
+            self._subscribers[self.channel] = [
+                ref for ref, callback in zip(self._subscribers.get(self.channel, ()), subscribers) if callback
+            ]
+        for callback in subscribers:
+            if callback is not None:
+                callback(message)
+
+    def subscribe(self, callback: Callable[[Optional[dict]], None]) -> None:
+        with self._lock:
+            self._subscribers.setdefault(self.channel, []).append(weakref.WeakMethod(callback))
+
+
+class RedisInvalidationBus:
+    """Redis pub/sub bus; a daemon thread per process applies the messages."""
+
+    def __init__(self, channel: str, url: str):
+        import redis
+
+        self.channel = channel
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, message: dict) -> None:
+        self._client.publish(self.channel, json.dumps(message))
+
+    def subscribe(self, callback: Callable[[Optional[dict]], None]) -> None:
+        thread = threading.Thread(target=self._listen, args=(callback,), name='cache-invalidation', daemon=True)
+        thread.start()
+
+    def _listen(self, callback: Callable[[Optional[dict]], None]) -> None:
+        import redis
+
+        while True:
+            try:
+                pubsub = redis.Redis.from_url(self.url).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Messages may have been missed while disconnected
+                callback(None)
+                for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        callback(json.loads(message['data']))
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription lost, reconnecting: {e}")
+                callback(None)
+                time.sleep(1)
+
+
+class ProcessTier:
+    """
+    L1 state shared by the cache instances of one process.
+
+    Django creates a cache backend instance per thread; they all share this
+    LRU, the invalidation subscription and the hit/miss counters.
+    """
+
+    def __init__(self, channel: str, invalidation: str, invalidation_url: Optional[str],
+                 max_entries: int, metrics_flush_seconds: float):
+        self.channel = channel
+        self.invalidation = invalidation
+        self.invalidation_url = invalidation_url
+        self.metrics_flush_seconds = metrics_flush_seconds
+        self.l1 = LRUStore(max_entries)
+        self.origin = uuid.uuid4().hex
+        self.counts = dict.fromkeys(METRICS, 0)
+        self.pending = dict.fromkeys(METRICS, 0)  # not yet added to the shared counters
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        self._bus = None
+        self._pid = None
+
+    def bus(self):
+        # Subscribe once per process (workers forked after first use start their own)
+        if self._pid != os.getpid():
+            with self.lock:
+                if self._pid != os.getpid():
+                    self.l1.clear()
+                    if self.invalidation == 'redis':
+                        self._bus = RedisInvalidationBus(self.channel, self.invalidation_url)
+                    else:
+                        self._bus = InMemoryInvalidationBus(self.channel)
+                    self._bus.subscribe(self.on_message)
+                    self._pid = os.getpid()
+        return self._bus
+
+    def publish(self, message: dict) -> None:
+        try:
+            self.bus().publish({**message, 'origin': self.origin})
+        except Exception as e:
+            # Other processes fall back on the L1 TTL
+            logger.error(f"Cache invalidation publish failed: {e}")
+
+    def on_message(self, message: Optional[dict]) -> None:
+        if message is None or message.get('clear'):
+            self.l1.clear()
+        elif message.get('origin') != self.origin:
+            self.l1.delete_many(message.get('keys', ()))
+
+    def record(self, name: str, count: int = 1) -> bool:
+        """Count hits/misses; returns True when the shared counters are due a flush."""
+        with self.lock:
+            self.counts[name] += count
+            self.pending[name] += count
+            return time.monotonic() - self.last_flush >= self.metrics_flush_seconds
+
+    def take_pending(self) -> Dict[str, int]:
+        with self.lock:
+            deltas = {name: value for name, value in self.pending.items() if value}
+            self.pending = dict.fromkeys(METRICS, 0)
+            self.last_flush = time.monotonic()
+        return deltas
+
+
+_tiers: Dict[str, ProcessTier] = {}
+_tiers_lock = threading.Lock()
+
+
+def get_tier(name: str, **options) -> ProcessTier:
+    with _tiers_lock:
+        if name not in _tiers:
+            _tiers[name] = ProcessTier(**options)
+        return _tiers[name]
+
+
+class TwoTierCache(BaseCache):
+    """Django cache backend: in-process LRU (L1) in front of a shared cache (L2)."""
+
+    def __init__(self, location: str, params: Dict[str, Any]):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.l2_alias = location
+        self.l1_timeout = float(options.get('L1_TIMEOUT', 10))
+        channel = options.get('INVALIDATION_CHANNEL', f'cache_invalidation:{location}')
+        # L1_NAME separates L1 stores sharing a channel within one process (tests)
+        self.tier = get_tier(
+            f"{channel}:{options.get('L1_NAME', 'default')}",
+            channel=channel,
+            invalidation=options.get('INVALIDATION', 'memory'),
+            invalidation_url=options.get('INVALIDATION_URL'),
+            max_entries=int(options.get('L1_MAX_ENTRIES', 1000)),
+            metrics_flush_seconds=float(options.get('METRICS_FLUSH_SECONDS', 30)),
+        )
+        self.l1 = self.tier.l1
+
+    @property
+    def l2(self) -> BaseCache:
+        return caches[self.l2_alias]
+
+    # ========== READS ==========
+
+    def get(self, key, default=None, version=None):
+        self.tier.bus()
+        l1_key = self.make_and_validate_key(key, version=version)
+        found, value = self.l1.get(l1_key)
+        if found:
+            self._record('l1_hits')
+            return value
+
+        sentinel = object()
+        value = self.l2.get(key, sentinel, version=version)
+        if value is sentinel:
+            self._record('misses')
+            return default
+        self._record('l2_hits')
+        self.l1.set(l1_key, value, self.l1_timeout)
+        return value
+
+    def get_many(self, keys, version=None):
+        self.tier.bus()
+        result, missing = {}, []
+        for key in keys:
+            found, value = self.l1.get(self.make_and_validate_key(key, version=version))
+            if found:
+                result[key] = value
+            else:
+                missing.append(key)
+        self._record('l1_hits', len(result))
+
+        if missing:
+            from_l2 = self.l2.get_many(missing, version=version)
+            for key, value in from_l2.items():
+                self.l1.set(self.make_and_validate_key(key, version=version), value, self.l1_timeout)
+            result.update(from_l2)
+            self._record('l2_hits', len(from_l2))
+            self._record('misses', len(missing) - len(from_l2))
+        return result
+
+    def has_key(self, key, version=None):
+        found, _ = self.l1.get(self.make_and_validate_key(key, version=version))
+        return found or self.l2.has_key(key, version=version)
+
+    # ========== WRITES ==========
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        l1_key = self.make_and_validate_key(key, version=version)
+        self._invalidate([l1_key])
+        self._fill_l1(l1_key, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self._invalidate([self.make_and_validate_key(key, version=version)])
+        return added
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout, version=version)
+        self._invalidate([self.make_and_validate_key(key, version=version) for key in data])
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        deleted = self.l2.delete(key, version=version)
+        self._invalidate([self.make_and_validate_key(key, version=version)])
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.l2.delete_many(keys, version=version)
+        self._invalidate([self.make_and_validate_key(key, version=version) for key in keys])
+
+    def incr(self, key, delta=1, version=None):
+        value = self.l2.incr(key, delta, version=version)
+        self._invalidate([self.make_and_validate_key(key, version=version)])
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def clear(self):
+        self.l2.clear()
+        self.l1.clear()
+        self.tier.publish({'clear': True})
+
+    # ========== METRICS ==========
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts of this process and the shared (all processes) counters."""
+        self.flush_metrics()
+        with self.tier.lock:
+            local = dict(self.tier.counts)
+        shared = self.l2.get_many([METRICS_KEY.format(name=name) for name in METRICS])
+        cluster = {name: shared.get(METRICS_KEY.format(name=name), 0) for name in METRICS}
+        return {
+            'process': {**local, **self._ratios(local), 'l1_entries': len(self.l1)},
+            'cluster': {**cluster, **self._ratios(cluster)},
+        }
+
+    def flush_metrics(self) -> None:
+        """Add the counts since the last flush to the shared counters in L2."""
+        for name, delta in self.tier.take_pending().items():
+            key = METRICS_KEY.format(name=name)
+            try:
+                self.l2.add(key, 0, None)
+                self.l2.incr(key, delta)
+            except Exception as e:
+                logger.warning(f"Could not flush cache metric {name}: {e}")
+
+    # ========== PRIVATE METHODS ==========
+
+    @staticmethod
+    def _ratios(counts: Dict[str, int]) -> Dict[str, float]:
+        total = sum(counts[name] for name in METRICS)
+        if not total:
+            return {'l1_hit_ratio': 0.0, 'hit_ratio': 0.0}
+        return {
+            'l1_hit_ratio': round(counts['l1_hits'] / total, 4),
+            'hit_ratio': round((counts['l1_hits'] + counts['l2_hits']) / total, 4),
+        }
+
+    def _record(self, name: str, count: int = 1) -> None:
+        if count and self.tier.record(name, count):
+            self.flush_metrics()
+
+    def _fill_l1(self, l1_key: str, value: Any, timeout) -> None:
+        expires_at = self.get_backend_timeout(timeout)
+        if expires_at is None:
+            self.l1.set(l1_key, value, self.l1_timeout)
+        elif expires_at > time.time():
+            self.l1.set(l1_key, value, min(self.l1_timeout, expires_at - time.time()))
+
+    def _invalidate(self, l1_keys: List[str]) -> None:
+        self.l1.delete_many(l1_keys)
+        self.tier.publish({'keys': l1_keys})
@@ -2,10 +2,14 @@
 from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.core.cache import cache
-from courses.models import Course, Lesson, LessonCompletion, CourseEnrollment
+from courses.models import Course, Lesson, LessonCompletion, CourseEnrollment, Exercise
 from rewards.models import BlockchainTransaction
 from notifications.models import Notification
 from users.models import UserProgress
+from blockchain.models import DBTeoCoinBalance
+from services.enrollment_access_service import enrollment_access_service
+from services.dashboard_service import dashboard_service
+from core.conditional import CATALOG_SCOPE, bump_generation, user_scope
 
 
 @receiver([post_save, post_delete], sender=LessonCompletion)
@@ -13,9 +17,8 @@ def invalidate_student_cache_on_lesson_completion(sender, instance, **kwargs):
     """Invalidate student cache when lesson completion changes"""
     user_id = instance.student.id
     
-    # Clear student dashboard cache
-    cache.delete(f'student_dashboard_{user_id}')
-    cache.delete(f'student_batch_data_{user_id}')
+    # Clear student dashboard fragments
+    dashboard_service.invalidate(user_id, 'courses', 'activity', 'progress')
     
     # Clear course batch data cache
     if instance.lesson.course:
@@ -23,6 +26,7 @@ def invalidate_student_cache_on_lesson_completion(sender, instance, **kwargs):
     
     # Clear lesson batch data cache
     cache.delete(f'lesson_batch_data_{instance.lesson.id}_{user_id}')
+    bump_generation(user_scope(user_id))
 
 
 @receiver([post_save, post_delete], sender=CourseEnrollment)
@@ -31,10 +35,13 @@ def invalidate_student_cache_on_enrollment(sender, instance, **kwargs):
     user_id = instance.student.id
     course_id = instance.course.id
     
-    # Clear student dashboard and batch data cache
-    cache.delete(f'student_dashboard_{user_id}')
-    cache.delete(f'student_batch_data_{user_id}')
+    # Clear student dashboard fragments (enrolled courses and their lessons) and batch data cache
+    dashboard_service.invalidate(user_id, 'courses', 'lessons')
     cache.delete(f'course_batch_data_{course_id}_{user_id}')
+    enrollment_access_service.invalidate(user_id)
+    bump_generation(user_scope(user_id))
+    # Student lists and counts are part of the course payloads
+    bump_generation(CATALOG_SCOPE)
     
     # Clear teacher dashboard cache (affects student count)
     if instance.course.teacher:
@@ -47,9 +54,8 @@ def invalidate_dashboard_cache_on_transaction(sender, instance, **kwargs):
     user_id = instance.user.id
     
     # Clear user dashboard cache
-    cache.delete(f'student_dashboard_{user_id}')
+    dashboard_service.invalidate(user_id, 'activity')
     cache.delete(f'teacher_dashboard_{user_id}')
-    cache.delete(f'student_batch_data_{user_id}')
 
 
 @receiver([post_save, post_delete], sender=Notification)
@@ -57,43 +63,62 @@ def invalidate_cache_on_notification(sender, instance, **kwargs):
     """Invalidate cache when notifications change"""
     user_id = instance.user.id
     
-    # Clear dashboard cache that includes notifications
-    cache.delete(f'student_dashboard_{user_id}')
-    cache.delete(f'student_batch_data_{user_id}')
+    # Clear dashboard fragment that includes notifications
+    dashboard_service.invalidate(user_id, 'notifications')
 
 
 @receiver([post_save, post_delete], sender=Course)
 def invalidate_cache_on_course_change(sender, instance, **kwargs):
     """Invalidate cache when course data changes"""
+    bump_generation(CATALOG_SCOPE)
+    
     # Clear teacher dashboard cache
     if instance.teacher:
         cache.delete(f'teacher_dashboard_{instance.teacher.id}')
     
     # Clear course-specific cache for all enrolled students
-    enrollments = CourseEnrollment.objects.filter(course=instance)
-    for enrollment in enrollments:
-        cache.delete(f'student_dashboard_{enrollment.student.id}')
-        cache.delete(f'student_batch_data_{enrollment.student.id}')
-        cache.delete(f'course_batch_data_{instance.id}_{enrollment.student.id}')
+    student_ids = list(CourseEnrollment.objects.filter(course=instance).values_list('student_id', flat=True))
+    dashboard_service.invalidate_many(student_ids, 'courses')
+    cache.delete_many([f'course_batch_data_{instance.id}_{student_id}' for student_id in student_ids])
 
 
 @receiver([post_save, post_delete], sender=Lesson)
 def invalidate_cache_on_lesson_change(sender, instance, **kwargs):
     """Invalidate cache when lesson data changes"""
+    bump_generation(CATALOG_SCOPE)
+    
     # Clear lesson-specific cache
     lesson_id = instance.id
     
     # Clear for all students who might access this lesson
     if instance.course:
-        enrollments = CourseEnrollment.objects.filter(course=instance.course)
-        for enrollment in enrollments:
-            cache.delete(f'lesson_batch_data_{lesson_id}_{enrollment.student.id}')
-            cache.delete(f'course_batch_data_{instance.course.id}_{enrollment.student.id}')
+        student_ids = list(CourseEnrollment.objects.filter(course=instance.course).values_list('student_id', flat=True))
+        dashboard_service.invalidate_many(student_ids, 'courses', 'lessons')
+        for student_id in student_ids:
+            cache.delete(f'lesson_batch_data_{lesson_id}_{student_id}')
+            cache.delete(f'course_batch_data_{instance.course.id}_{student_id}')
 
 
 @receiver(m2m_changed, sender=Course.students.through)
-def invalidate_cache_on_course_students_change(sender, instance, action, pk_set, **kwargs):
+def invalidate_cache_on_course_students_change(sender, instance, action, pk_set, reverse, **kwargs):
     """Invalidate cache when course students change (many-to-many)"""
+    if action in ['post_add', 'post_remove', 'post_clear']:
+        bump_generation(CATALOG_SCOPE)
+
+    if reverse:
+        # user.core_students.add(...): instance is the student, pk_set the courses
+        if action in ['post_add', 'post_remove', 'post_clear']:
+            enrollment_access_service.invalidate(instance.id)
+            bump_generation(user_scope(instance.id))
+            dashboard_service.invalidate(instance.id, 'courses', 'lessons')
+        return
+
+    if action == 'pre_clear':
+        # pk_set is None on clear: invalidate whoever is enrolled before the rows go
+        for student_id in instance.students.values_list('id', flat=True):
+            enrollment_access_service.invalidate(student_id)
+            bump_generation(user_scope(student_id))
+
     if action in ['post_add', 'post_remove', 'post_clear']:
         # Clear teacher dashboard cache
         cache.delete(f'teacher_dashboard_{instance.teacher.id}')
@@ -101,9 +126,23 @@ def invalidate_cache_on_course_students_change(sender, instance, action, pk_set,
         # Clear student cache for affected students
         if pk_set:
             for student_id in pk_set:
-                cache.delete(f'student_dashboard_{student_id}')
-                cache.delete(f'student_batch_data_{student_id}')
+                dashboard_service.invalidate(student_id, 'courses', 'lessons')
                 cache.delete(f'course_batch_data_{instance.id}_{student_id}')
+                enrollment_access_service.invalidate(student_id)
+                bump_generation(user_scope(student_id))
+
+
+@receiver([post_save, post_delete], sender=Exercise)
+def invalidate_http_validators_on_exercise_change(sender, instance, **kwargs):
+    """Exercise counts are embedded in course and lesson payloads"""
+    bump_generation(CATALOG_SCOPE)
+
+
+@receiver(m2m_changed, sender=Course.lessons.through)
+def invalidate_http_validators_on_course_lessons_change(sender, action, **kwargs):
+    """Course.lessons changes do not touch updated_at"""
+    if action in ['post_add', 'post_remove', 'post_clear']:
+        bump_generation(CATALOG_SCOPE)
 
 
 @receiver([post_save, post_delete], sender=UserProgress)
@@ -111,6 +150,11 @@ def invalidate_cache_on_user_progress_change(sender, instance, **kwargs):
     """Invalidate cache when user progress changes"""
     user_id = instance.user.id
     
-    # Clear student cache
-    cache.delete(f'student_dashboard_{user_id}')
-    cache.delete(f'student_batch_data_{user_id}')
+    # Clear student progress fragment
+    dashboard_service.invalidate(user_id, 'progress')
+
+
+@receiver([post_save, post_delete], sender=DBTeoCoinBalance)
+def invalidate_cache_on_balance_change(sender, instance, **kwargs):
+    """Invalidate the balance fragment when the DB TeoCoin balance changes"""
+    dashboard_service.invalidate(instance.user_id, 'balance')
@@ -0,0 +1,130 @@
+"""
+HTTP conditional requests (ETag / Last-Modified) for catalog and lesson reads.
+
+Views decorated with ``conditional_get`` compute a validator from one small
+query (``max(updated_at)`` of the course/lesson rows) plus cache generations,
+and answer ``304 Not Modified`` before the view body and serializer run.
+
+Generations are timestamps stored in the cache and bumped by
+``core.cache_signals``:
+
+- ``catalog``: any course, lesson, exercise or enrollment change
+- ``user_<id>``: per-user state embedded in payloads (lesson completions
+  and enrollments)
+
+Using timestamps lets a generation double as a modification date, so
+``Last-Modified`` stays correct for clients that only send
+``If-Modified-Since``.
+
+Payloads embedding signed video stream URLs (``embeds_stream_urls=True``)
+also change every half ``VIDEO_STREAM_URL_TTL``: a body confirmed by a 304
+always carries a URL with at least half its lifetime left.
+"""
+
+import hashlib
+import time
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Optional
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from courses.models import Course, Lesson
+from services.video_stream_service import video_stream_service
+
+CATALOG_SCOPE = 'catalog'
+GENERATION_KEY = 'etag_generation_{scope}'
+
+
+def user_scope(user_id: int) -> str:
+    return f'user_{user_id}'
+
+
+def get_generation(scope: str) -> int:
+    """Current generation of a scope (nanosecond timestamp of its last change)."""
+    key = GENERATION_KEY.format(scope=scope)
+    generation = cache.get(key)
+    if generation is None:
+        # Unknown or evicted: start a new generation so stale validators never match
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key, time.time_ns())
+    return generation
+
+
+def bump_generation(scope: str) -> None:
+    cache.set(GENERATION_KEY.format(scope=scope), time.time_ns(), None)
+
+
+def course_last_modified(request, course_id=None, pk=None, **kwargs) -> Optional[datetime]:
+    """Latest update of a course and its lessons, or None if it does not exist."""
+    dates = Course.objects.filter(pk=course_id or pk).aggregate(
+        course=Max('updated_at'),
+        lessons=Max('lessons_in_course__updated_at'),
+    )
+    return max(filter(None, dates.values()), default=None)
+
+
+def lesson_last_modified(request, lesson_id=None, pk=None, **kwargs) -> Optional[datetime]:
+    """Latest update of a lesson and its course, or None if it does not exist."""
+    dates = Lesson.objects.filter(pk=lesson_id or pk).aggregate(
+        lesson=Max('updated_at'),
+        course=Max('course__updated_at'),
+    )
+    return max(filter(None, dates.values()), default=None)
+
+
+def stream_url_window() -> int:
+    """Start (epoch seconds) of the current half ``VIDEO_STREAM_URL_TTL`` window."""
+    window = max(video_stream_service.url_ttl // 2, 1)
+    return int(time.time() // window) * window
+
+
+def conditional_get(last_modified_func: Callable[..., Optional[datetime]], embeds_stream_urls: bool = False):
+    """
+    Decorate an APIView ``get`` with ETag/Last-Modified validation.
+
+    The validator covers the URL, the rows' ``updated_at``, the catalog
+    generation and, for authenticated users, their own generation. Only 200
+    responses are tagged; when ``last_modified_func`` returns None the view
+    runs normally (e.g. to produce its 404).
+
+    Args:
+        last_modified_func: Called with the view's request and URL kwargs
+        embeds_stream_urls: The payload contains expiring signed stream URLs,
+            so the validator also changes with ``stream_url_window``
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            last_modified = last_modified_func(request, *args, **kwargs)
+            if last_modified is None:
+                return view_method(self, request, *args, **kwargs)
+
+            generations = [get_generation(CATALOG_SCOPE)]
+            validator = [request.get_full_path(), last_modified.isoformat()]
+            if request.user.is_authenticated:
+                validator.append(request.user.pk)
+                generations.append(get_generation(user_scope(request.user.pk)))
+            validator.extend(generations)
+            window = stream_url_window() if embeds_stream_urls else 0
+            validator.append(window)
+
+            etag = quote_etag(hashlib.md5(':'.join(map(str, validator)).encode()).hexdigest())
+            timestamp = int(max(last_modified.timestamp(), max(generations) / 1e9, window))
+
+            not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if not_modified is not None:
+                return not_modified
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(timestamp)
+                # Clients may keep the body but must revalidate on every use
+                response['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -20,6 +20,9 @@ from django.core.cache import cache
 from django.views.decorators.cache import cache_page
 from decimal import Decimal
 from services.db_teocoin_service import db_teocoin_service
+from services.dashboard_service import dashboard_service
+from services.teacher_payout_service import teacher_payout_service
+from core.parallel import run_parallel
 
 
 class StudentDashboardView(APIView):
@@ -27,84 +30,25 @@ class StudentDashboardView(APIView):
 
     def get(self, request):
         user = request.user
-        
-        # ✅ OTTIMIZZATO - Cache dashboard data for 5 minutes
-        cache_key = f'student_dashboard_{user.id}'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return Response(cached_data)
-
-        # ✅ OTTIMIZZATO - Single optimized query for purchased courses using enrollments
-        from courses.models import CourseEnrollment
-        purchased_courses = Course.objects.filter(
-            enrollments__student=user, is_approved=True
-        ).select_related('teacher').prefetch_related('lessons').annotate(
-            lessons_count=Count('lessons'),
-            completed_lessons_count=Count('lessons__completions', filter=Q(lessons__completions__student=user))
-        ).distinct()
-        courses_data = CourseSerializer(purchased_courses, many=True, context={'request': request}).data
-
-        # ✅ OTTIMIZZATO - Limit and optimize transactions query
-        recent_transactions = BlockchainTransaction.objects.filter(
-            user=user
-        ).select_related().order_by('-created_at')[:10]
-        transactions_data = BlockchainTransactionSerializer(recent_transactions, many=True).data
-
-        # ✅ OTTIMIZZATO - Limit notifications query
-        notifications = Notification.objects.filter(
-            user=user, read=False
-        ).order_by('-created_at')[:5]
-        notifications_data = NotificationSerializer(notifications, many=True).data
-
-        # Get blockchain balance instead of database balance
-        blockchain_balance = "0"
-        if user.wallet_address:
-            try:
-                from blockchain.blockchain import TeoCoinService
-                teo_service = TeoCoinService()
-                blockchain_balance = str(teo_service.get_balance(user.wallet_address))
-            except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"Error getting blockchain balance: {e}")
-                blockchain_balance = "0"
 
-        # 🎯 NEW: Get TeoCoin DB balance for withdrawal functionality
-        try:
-            db_balance_data = db_teocoin_service.get_user_balance(user)
-            teocoin_balance = {
-                'available': str(db_balance_data['available_balance']),
-                'staked': str(db_balance_data['staked_balance']),
-                'pending_withdrawal': str(db_balance_data['pending_withdrawal']),
-                'total': str(db_balance_data['total_balance']),
-                'can_withdraw': float(db_balance_data['available_balance']) >= 10.0  # Minimum withdrawal
-            }
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error getting TeoCoin DB balance: {e}")
-            teocoin_balance = {
-                'available': '0.00',
-                'staked': '0.00',
-                'pending_withdrawal': '0.00',
-                'total': '0.00',
-                'can_withdraw': False
-            }
+        # ✅ OTTIMIZZATO - Fragments cached and invalidated independently
+        fragments, degraded = dashboard_service.get_fragments_with_status(
+            user, ['courses', 'activity', 'notifications', 'chain_balance', 'balance'], request
+        )
 
         data = {
             "username": user.username,
-            "blockchain_balance": blockchain_balance,
-            "teocoin_balance": teocoin_balance,  # 🎯 NEW: DB balance for withdrawal
+            "blockchain_balance": fragments['chain_balance'],
+            "teocoin_balance": fragments['balance'],  # 🎯 NEW: DB balance for withdrawal
             "wallet_address": user.wallet_address,
-            "courses": courses_data,
-            "recent_transactions": transactions_data,
-            "notifications": notifications_data,
+            "courses": fragments['courses'],
+            "recent_transactions": fragments['activity']['transactions'],
+            "notifications": fragments['notifications']['unread'][:5],
         }
-        
-        # Cache for 5 minutes
-        cache.set(cache_key, data, 300)
-        
+        if degraded:
+            # Partial data: tell the client
+            data['degraded_fragments'] = degraded
+
         return Response(data)
 
 class TeacherDashboardAPI(APIView):
@@ -119,7 +63,54 @@ class TeacherDashboardAPI(APIView):
         
         if cached_data:
             return Response(cached_data)
+
+        # ✅ OTTIMIZZATO - Independent fragments run concurrently: latency is the slowest one
+        fragments, degraded = run_parallel(
+            {
+                'courses': lambda: self._courses(user, request),
+                'earnings': lambda: teacher_payout_service.get_teacher_earnings(user),
+                'transactions': lambda: BlockchainTransactionSerializer(
+                    BlockchainTransaction.objects.filter(user=user).order_by('-created_at')[:10], many=True
+                ).data,
+                'balances': lambda: dashboard_service.get_fragments_with_status(user, ['chain_balance', 'balance']),
+            },
+            fallbacks={
+                'earnings': lambda: {
+                    period: {'total_eur_earned': '0'} for period in ['daily', 'monthly', 'yearly', 'all_time']
+                },
+                'transactions': list,
+                'balances': lambda: ({
+                    'chain_balance': "0",
+                    'balance': dashboard_service.FALLBACKS['balance'](),
+                }, []),
+            }
+        )
+        courses = fragments['courses']
+        earnings = fragments['earnings']
+        balances, balances_degraded = fragments['balances']
+        degraded += balances_degraded
+    
+        data = {
+            "blockchain_balance": balances['chain_balance'],
+            "teocoin_balance": balances['balance'],  # 🎯 NEW: DB balance for withdrawal
+            "wallet_address": user.wallet_address,
+            "stats": dict(courses['stats'], total_earnings=earnings['all_time']['total_eur_earned']),
+            # ✅ OTTIMIZZATO - EUR earned, from the payout summaries
+            "sales": {period: earnings[period]['total_eur_earned'] for period in ['daily', 'monthly', 'yearly']},
+            "courses": courses['courses'],
+            "transactions": fragments['transactions'],
+        }
+
+        if degraded:
+            # Partial data: tell the client and do not cache it
+            data['degraded_fragments'] = degraded
+        else:
+            # Cache for 10 minutes
+            cache.set(cache_key, data, 600)
         
+        return Response(data)
+
+    def _courses(self, user, request):
         # ✅ OTTIMIZZATO - Single query with annotations instead of N+1
         courses = user.courses_created.prefetch_related(
             'students', 'lessons', 'lessons__exercises'
@@ -127,99 +118,18 @@ class TeacherDashboardAPI(APIView):
             student_count=Count('students')
         )
         
-        total_courses = courses.count()
-        
-        # Calculate aggregated values from annotated queryset
-        total_earnings = Decimal('0')
         total_students_set = set()
-        
-        # Process courses data efficiently 
         for course in courses:
-            # Use annotated student_count instead of calling .count() 
-            student_count = course.student_count
-            course_earnings = (course.price_eur or Decimal('0')) * student_count * Decimal('0.9')
-            total_earnings += course_earnings
-            # Collect all unique student IDs efficiently
-            total_students_set.update(course.students.values_list('id', flat=True))
+            # Collect all unique student IDs from the prefetched students
+            total_students_set.update(student.id for student in course.students.all())
 
-        # ✅ OTTIMIZZATO - Calculate sales with single queries per period
-        now = timezone.now()
-        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        start_of_year = now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        # Single aggregated query for all sales periods
-        sales_data = BlockchainTransaction.objects.filter(
-            user=user,
-            transaction_type='course_earned'  # Only teacher earnings
-        ).aggregate(
-            daily=Sum('amount', filter=Q(created_at__gte=start_of_day)),
-            monthly=Sum('amount', filter=Q(created_at__gte=start_of_month)),
-            yearly=Sum('amount', filter=Q(created_at__gte=start_of_year))
-        )
-
-        # ✅ OTTIMIZZATO - Single query for recent transactions
-        recent_transactions = BlockchainTransaction.objects.filter(
-            user=user
-        ).select_related().order_by('-created_at')[:10]
-        transactions_data = BlockchainTransactionSerializer(recent_transactions, many=True).data
-        # Get blockchain balance
-        blockchain_balance = "0"
-        if user.wallet_address:
-            try:
-                from blockchain.blockchain import TeoCoinService
-                teo_service = TeoCoinService()
-                blockchain_balance = str(teo_service.get_balance(user.wallet_address))
-            except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"Error getting blockchain balance: {e}")
-                blockchain_balance = "0"
-    
-        # 🎯 NEW: Get TeoCoin DB balance for withdrawal functionality
-        try:
-            db_balance_data = db_teocoin_service.get_user_balance(user)
-            teocoin_balance = {
-                'available': str(db_balance_data['available_balance']),
-                'staked': str(db_balance_data['staked_balance']),
-                'pending_withdrawal': str(db_balance_data['pending_withdrawal']),
-                'total': str(db_balance_data['total_balance']),
-                'can_withdraw': float(db_balance_data['available_balance']) >= 10.0  # Minimum withdrawal
-            }
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error getting TeoCoin DB balance: {e}")
-            teocoin_balance = {
-                'available': '0.00',
-                'staked': '0.00',
-                'pending_withdrawal': '0.00',
-                'total': '0.00',
-                'can_withdraw': False
-            }
-    
-        data = {
-            "blockchain_balance": blockchain_balance,
-            "teocoin_balance": teocoin_balance,  # 🎯 NEW: DB balance for withdrawal
-            "wallet_address": user.wallet_address,
+        return {
             "stats": {
-                "total_courses": total_courses,
-                "total_earnings": str(total_earnings),  # Convert Decimal to string instead of float
+                "total_courses": len(courses),
                 "active_students": len(total_students_set),
             },
-            "sales": {
-                "daily": str(sales_data['daily'] or Decimal('0')),  # Keep as Decimal, convert to string
-                "monthly": str(sales_data['monthly'] or Decimal('0')),  # Keep as Decimal, convert to string  
-                "yearly": str(sales_data['yearly'] or Decimal('0')),  # Keep as Decimal, convert to string
-            },
             "courses": TeacherCourseSerializer(courses, many=True, context={'request': request}).data,
-            "transactions": transactions_data,
         }
-
-        # Cache for 10 minutes 
-        cache.set(cache_key, data, 600)
-        
-        return Response(data)
     
     
 def is_student_or_superuser(user):
@@ -0,0 +1,120 @@
+"""
+Read-replica routing for analytics, statistics and exports.
+
+All traffic goes to ``default`` (the primary) unless code explicitly opts in
+with ``replica_reads``::
+
+    with replica_reads(request.user):
+        stats = teocoin_withdrawal_service.get_withdrawal_statistics(days)
+
+Inside the scope, reads are sent to the ``DATABASE_REPLICA_ALIAS``
+connection. The primary is used instead when:
+
+- no replica is configured (``DATABASE_REPLICA_ALIAS`` unset)
+- the scope is entered inside a transaction (ledger and payment paths run in
+  ``transaction.atomic`` and must read what they lock and write)
+- the current request or task has already written (read-your-writes)
+- the user wrote recently: ``ReplicaStickinessMiddleware`` pins a user to the
+  primary for ``DATABASE_REPLICA_STICKY_SECONDS`` after a request that wrote,
+  to cover replication lag
+
+Writes and migrations always go to the primary: the replica is a physical
+copy of it. For local testing point the replica at a copy of the database
+(e.g. ``cp db.sqlite3 db.replica.sqlite3`` with ``DEV_REPLICA_DB``); in tests
+it mirrors ``default``.
+"""
+
+import contextvars
+from contextlib import ContextDecorator
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+STICKY_KEY = 'db_primary_pin_{user_id}'
+
+_read_alias: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('db_read_alias', default=None)
+_wrote: contextvars.ContextVar[bool] = contextvars.ContextVar('db_wrote', default=False)
+
+
+def get_replica_alias() -> Optional[str]:
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+def pin_to_primary(user_id: int) -> None:
+    """Send a user's replica reads to the primary for the next few seconds."""
+    cache.set(STICKY_KEY.format(user_id=user_id), 1, getattr(settings, 'DATABASE_REPLICA_STICKY_SECONDS', 10))
+
+
+def is_pinned_to_primary(user_id: int) -> bool:
+    return bool(cache.get(STICKY_KEY.format(user_id=user_id)))
+
+
+def has_written() -> bool:
+    """Whether the current request/task has written to the database."""
+    return _wrote.get()
+
+
+def reset_write_tracking() -> contextvars.Token:
+    return _wrote.set(False)
+
+
+def restore_write_tracking(token: contextvars.Token) -> None:
+    _wrote.reset(token)
+
+
+class replica_reads(ContextDecorator):
+    """
+    Context manager/decorator routing the reads inside it to the replica.
+
+    Args:
+        user: User whose recent writes must stay visible (optional)
+    """
+
+    def __init__(self, user=None):
+        self.user = user
+
+    def __enter__(self):
+        alias = get_replica_alias()
+        if alias and (
+            connections[DEFAULT_DB_ALIAS].in_atomic_block
+            or has_written()
+            or (self.user is not None and self.user.is_authenticated and is_pinned_to_primary(self.user.pk))
+        ):
+            alias = None
+        self._token = _read_alias.set(alias)
+        return self
+
+    def __exit__(self, *exc):
+        _read_alias.reset(self._token)
+        return False
+
+
+class ReplicaRouter:
+    """Database router: writes to the primary, opted-in reads to the replica."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias and not _wrote.get():
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes: later reads of this request/task stay on the primary
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        aliases = {DEFAULT_DB_ALIAS, get_replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        replica = get_replica_alias()
+        if replica and db == replica:
+            return False
+        return None
@@ -0,0 +1,31 @@
+"""
+Management command to report the hit ratio of the two-tier cache
+"""
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache_backends import METRICS, METRICS_KEY, TwoTierCache
+
+
+class Command(BaseCommand):
+    help = 'Show L1/L2 hit ratios of the two-tier cache across all worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alias', default='default', help='Cache alias (default: default)')
+        parser.add_argument('--reset', action='store_true', help='Reset the shared counters after reporting')
+
+    def handle(self, *args, **options):
+        cache = caches[options['alias']]
+        if not isinstance(cache, TwoTierCache):
+            raise CommandError(f"Cache '{options['alias']}' is not a TwoTierCache")
+
+        stats = cache.stats()['cluster']
+        total = sum(stats[name] for name in METRICS)
+        self.stdout.write(f"📊 Cache '{options['alias']}': {total} lookups")
+        self.stdout.write(f"   L1 hits: {stats['l1_hits']}  L2 hits: {stats['l2_hits']}  misses: {stats['misses']}")
+        self.stdout.write(f"   L1 hit ratio: {stats['l1_hit_ratio']:.1%}  overall hit ratio: {stats['hit_ratio']:.1%}")
+
+        if options['reset']:
+            cache.l2.delete_many([METRICS_KEY.format(name=name) for name in METRICS])
+            self.stdout.write(self.style.SUCCESS("✅ Counters reset"))
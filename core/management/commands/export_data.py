@@ -0,0 +1,56 @@
+"""
+Management command to stream large exports (ledger, enrollments, withdrawals) to a file
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.exceptions import TeoArtServiceException
+from services.export_service import export_service
+
+
+class Command(BaseCommand):
+    help = 'Export transactions, enrollments or withdrawals as CSV/NDJSON with constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=list(export_service.DATASETS))
+        parser.add_argument('--format', dest='file_format', choices=list(export_service.FORMATS), default='csv')
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip')
+        parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+        parser.add_argument('--since', help='Only rows from this date/datetime (ISO)')
+        parser.add_argument('--until', help='Only rows before this date/datetime (ISO)')
+        parser.add_argument(
+            '--filter', action='append', default=[], metavar='KEY=VALUE',
+            help='Dataset filter, e.g. --filter status=completed (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        filters = {}
+        for item in options['filter']:
+            key, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f"Invalid filter (expected KEY=VALUE): {item}")
+            filters[key] = value
+
+        try:
+            for key in ('since', 'until'):
+                if options[key]:
+                    filters[key] = export_service.parse_boundary(options[key])
+        except TeoArtServiceException as e:
+            raise CommandError(str(e))
+
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            written = export_service.write(
+                output, options['dataset'], options['file_format'], filters, compress=options['gzip']
+            )
+        except (TeoArtServiceException, ValueError) as e:
+            raise CommandError(str(e))
+        finally:
+            if options['output']:
+                output.close()
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f"✅ Exported {options['dataset']} to {options['output']} ({written} bytes)"))
+
@@ -0,0 +1,61 @@
+"""
+Management command to inspect and garbage-collect the deduplicated media blobs
+"""
+
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+from core.storage import ContentAddressedStorage
+
+
+class Command(BaseCommand):
+    help = 'Show deduplication stats of media storage, remove unreferenced blobs or ingest existing files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--gc', action='store_true', help='Remove blobs no stored file links to')
+        parser.add_argument('--grace-seconds', type=int, default=None,
+                            help='Keep unreferenced blobs younger than this (default: MEDIA_BLOB_GC_GRACE_SECONDS)')
+        parser.add_argument('--dry-run', action='store_true', help='With --gc, only report what would be removed')
+        parser.add_argument('--ingest', action='store_true',
+                            help='Link files stored before deduplication was enabled into blobs')
+        parser.add_argument('--loop', action='store_true', help='With --gc, keep running as a worker')
+        parser.add_argument('--interval', type=float, default=3600.0, help='Seconds between collections with --loop')
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError("The default storage is not a ContentAddressedStorage")
+
+        if options['loop']:
+            if not options['gc']:
+                raise CommandError("--loop requires --gc")
+            while True:
+                result = default_storage.collect_garbage(options['grace_seconds'], dry_run=options['dry_run'])
+                if result['removed']:
+                    self._report_gc(result, options['dry_run'])
+                time.sleep(options['interval'])
+
+        if options['ingest']:
+            result = default_storage.ingest_existing()
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Ingested {result['files']} files, deduplicated {result['deduplicated']} "
+                f"({filesizeformat(result['freed_bytes'])} freed)"
+            ))
+
+        if options['gc']:
+            result = default_storage.collect_garbage(options['grace_seconds'], dry_run=options['dry_run'])
+            self._report_gc(result, options['dry_run'])
+
+        stats = default_storage.stats()
+        saved = stats['logical_bytes'] - stats['stored_bytes']
+        self.stdout.write(f"📦 Media blobs: {stats['blobs']} ({filesizeformat(stats['stored_bytes'])} on disk)")
+        self.stdout.write(f"   References: {stats['references']}  logical size: {filesizeformat(stats['logical_bytes'])}")
+        self.stdout.write(f"   Saved by deduplication: {filesizeformat(max(saved, 0))}")
+
+    def _report_gc(self, result, dry_run):
+        verb = 'Would remove' if dry_run else 'Removed'
+        self.stdout.write(self.style.SUCCESS(
+            f"🗑️ {verb} {result['removed']} unreferenced blobs ({filesizeformat(result['freed_bytes'])})"
+        ))
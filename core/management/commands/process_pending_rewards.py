@@ -10,6 +10,7 @@ django.setup()
 
 from rewards.models import BlockchainTransaction
 from blockchain.views import mint_tokens  # Use the wrapper function
+from services.mint_settlement_service import mint_settlement_service
 from django.utils import timezone
 from decimal import Decimal
 import logging
@@ -53,6 +54,13 @@ def process_reward_transactions():
                 failed += 1
                 continue
             
+            # Minted with the wallet's other credits by the next settlement
+            if mint_settlement_service.enabled:
+                mint_settlement_service.queue_reward(tx)
+                print("🪙 Queued for the next mint settlement")
+                processed += 1
+                continue
+            
             # Mint tokens to user's wallet
             description = f"{tx.transaction_type.replace('_', ' ').title()} - {tx.notes}"
             
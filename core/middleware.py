@@ -12,6 +12,7 @@ from django.http import HttpResponseForbidden, JsonResponse
 from django.shortcuts import redirect
 from rest_framework_simplejwt.tokens import AccessToken
 from django.conf import settings
+from core.db_routing import has_written, pin_to_primary, reset_write_tracking, restore_write_tracking
 
 # Loggers
 auth_logger = logging.getLogger('authentication')
@@ -183,6 +184,32 @@ class APITimingMiddleware:
         return response
 
 
+class ReplicaStickinessMiddleware:
+    """
+    Middleware for read-your-writes consistency with the read replica.
+    
+    Tracks whether a request wrote to the database and, if so, pins the
+    user to the primary for DATABASE_REPLICA_STICKY_SECONDS so the replica
+    reads of their next requests (see core.db_routing) see their writes.
+    """
+    
+    def __init__(self, get_response):
+        """Initialize the middleware with the next middleware in the chain."""
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = reset_write_tracking()
+        try:
+            response = self.get_response(request)
+            # DRF sets the authenticated (JWT) user on the underlying request
+            user = getattr(request, 'user', None)
+            if has_written() and user is not None and user.is_authenticated:
+                pin_to_primary(user.pk)
+            return response
+        finally:
+            restore_write_tracking(token)
+
+
 class GlobalErrorHandlingMiddleware:
     """
     Middleware per gestione centralizzata degli errori
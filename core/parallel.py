@@ -0,0 +1,142 @@
+"""
+Concurrent evaluation of independent response fragments.
+
+Aggregate endpoints (dashboards, batch APIs) assemble several fragments that
+do not depend on each other: database queries, ledger balances, an RPC call
+to the chain. ``run_parallel`` evaluates them on a bounded, process-wide
+thread pool, so the latency of a request is the slowest fragment rather than
+the sum of all of them.
+
+Each fragment can have its own timeout and a fallback value. A fragment that
+raises or does not finish in time is replaced by its fallback and reported as
+degraded; fragments without a fallback are required and re-raise. Timed-out
+work is not cancelled: it finishes in the background (and may still fill a
+cache) while the response goes out with the fallback.
+
+Fragments run serially in the calling thread when:
+
+- the caller is inside a transaction: worker threads use their own database
+  connections and would not see uncommitted rows
+- the caller is itself a pool worker (no nested fan-out on a bounded pool)
+- ``PARALLEL_FRAGMENTS_ENABLED`` is off, or there is a single fragment
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+_REQUIRED = object()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Process-wide pool, created on first use (after fork in prefork servers)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'PARALLEL_FRAGMENT_WORKERS', 8),
+                    thread_name_prefix='fragment'
+                )
+    return _executor
+
+
+def run_parallel(
+    tasks: Dict[str, Callable[[], Any]],
+    timeouts: Optional[Dict[str, float]] = None,
+    fallbacks: Optional[Dict[str, Any]] = None,
+    default_timeout: Optional[float] = None
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Evaluate independent fragments concurrently.
+
+    Args:
+        tasks: Fragment name -> zero-argument callable
+        timeouts: Fragment name -> seconds (defaults to default_timeout or
+            PARALLEL_FRAGMENT_TIMEOUT)
+        fallbacks: Fragment name -> value used when the fragment fails or
+            times out; fragments without a fallback are required
+        default_timeout: Timeout for fragments missing from timeouts
+
+    Returns:
+        (results by fragment name in task order, names of degraded fragments)
+
+    Raises:
+        Exception: The error (or TimeoutError) of a failed required fragment
+    """
+    timeouts = timeouts or {}
+    fallbacks = fallbacks or {}
+    if default_timeout is None:
+        default_timeout = getattr(settings, 'PARALLEL_FRAGMENT_TIMEOUT', 5.0)
+
+    if not _can_fan_out(tasks):
+        results, degraded = {}, []
+        for name, task in tasks.items():
+            try:
+                results[name] = task()
+            except Exception as e:
+                results[name] = _fallback(name, fallbacks, e)
+                degraded.append(name)
+        return results, degraded
+
+    executor = get_executor()
+    started = time.monotonic()
+    futures = {
+        name: executor.submit(_run_in_worker, contextvars.copy_context(), task)
+        for name, task in tasks.items()
+    }
+
+    results, degraded = {}, []
+    for name, future in futures.items():
+        remaining = started + timeouts.get(name, default_timeout) - time.monotonic()
+        try:
+            results[name] = future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            future.cancel()
+            results[name] = _fallback(name, fallbacks, TimeoutError(f"Fragment '{name}' timed out"))
+            degraded.append(name)
+        except Exception as e:
+            results[name] = _fallback(name, fallbacks, e)
+            degraded.append(name)
+    return results, degraded
+
+
+def _can_fan_out(tasks: Dict[str, Callable[[], Any]]) -> bool:
+    if len(tasks) < 2 or not getattr(settings, 'PARALLEL_FRAGMENTS_ENABLED', True):
+        return False
+    if getattr(_worker_state, 'active', False):
+        return False
+    return not any(conn.in_atomic_block for conn in connections.all(initialized_only=True))
+
+
+def _run_in_worker(context: contextvars.Context, task: Callable[[], Any]) -> Any:
+    # The copied context carries the request's active language and other context locals
+    _worker_state.active = True
+    close_old_connections()
+    try:
+        return context.run(task)
+    finally:
+        # Honour CONN_MAX_AGE like the request cycle does
+        close_old_connections()
+        _worker_state.active = False
+
+
+def _fallback(name: str, fallbacks: Dict[str, Any], error: Exception) -> Any:
+    fallback = fallbacks.get(name, _REQUIRED)
+    if fallback is _REQUIRED:
+        raise error
+    logger.warning(f"Fragment '{name}' degraded to fallback: {error}")
+    return fallback() if callable(fallback) else fallback
@@ -0,0 +1,210 @@
+"""
+Content-addressed, deduplicating media storage.
+
+Teachers upload the same PDFs, images and videos to several lessons and
+courses. ``ContentAddressedStorage`` keeps each distinct file once:
+
+- uploads are hashed (SHA-256) while they are streamed to a temporary file
+  inside the blob directory, so no extra pass over the data is needed
+- the content is stored once as ``MEDIA_BLOB_DIR/<h[:2]>/<h[2:4]>/<hash>``
+  and the name Django asked for (``lesson_videos/intro.mp4``) is a hard link
+  to that blob. A re-upload of a known file only adds a link, however big it is
+- the file system link count is the reference count: deleting a file
+  (``storage.delete``, ``FieldFile.delete``) drops one reference, and
+  ``manage.py media_blobs --gc`` (``--loop`` as a worker) removes blobs
+  nobody links to anymore
+
+Because every name is still a regular file under ``MEDIA_ROOT``, URLs,
+``path()``, nginx ``X-Accel-Redirect`` and backups work unchanged. Backups
+should preserve hard links (``rsync -H``, ``tar``) to keep the savings.
+
+Files are shared: never open a stored file for writing in place.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Iterator, Optional
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASH_READ_SIZE = 1024 * 1024
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage storing each distinct content once, shared through hard links."""
+
+    def __init__(self, *args, blob_dir: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._blob_dir = blob_dir
+
+    @property
+    def blob_dir(self) -> str:
+        return self._blob_dir or getattr(settings, 'MEDIA_BLOB_DIR', '.blobs')
+
+    @property
+    def blob_root(self) -> str:
+        return os.path.join(self.location, self.blob_dir)
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_root, digest[:2], digest[2:4], digest)
+
+    def _save(self, name, content):
+        digest, staged = self._stage(content)
+        blob = self.blob_path(digest)
+        if os.path.exists(blob):
+            # Known content: drop the staged copy, the upload becomes a link
+            if staged != getattr(content, 'temporary_file_path', lambda: None)():
+                os.remove(staged)
+        else:
+            self._makedirs(os.path.dirname(blob))
+            if staged == getattr(content, 'temporary_file_path', lambda: None)():
+                file_move_safe(staged, blob, allow_overwrite=True)
+            else:
+                os.replace(staged, blob)
+            if self.file_permissions_mode is not None:
+                os.chmod(blob, self.file_permissions_mode)
+
+        return self._link(blob, name)
+
+    def _stage(self, content):
+        """Return (sha256, path of a file holding the content)."""
+        if hasattr(content, 'temporary_file_path'):
+            # Already on disk (large uploads, chunked video uploads): hash in place
+            path = content.temporary_file_path()
+            digest = getattr(content, 'content_sha256', None) or file_sha256(path)
+            return digest, path
+
+        self._makedirs(self.blob_root)
+        fd, path = tempfile.mkstemp(prefix='.incoming-', dir=self.blob_root)
+        sha256 = hashlib.sha256()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    sha256.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            os.remove(path)
+            raise
+        return sha256.hexdigest(), path
+
+    def _link(self, blob: str, name: str) -> str:
+        """Create ``name`` as a link to ``blob`` (a copy across file systems); returns the final name."""
+        while True:
+            full_path = self.path(name)
+            self._makedirs(os.path.dirname(full_path))
+            try:
+                try:
+                    os.link(blob, full_path)
+                except FileExistsError:
+                    raise
+                except OSError:
+                    # Hard links unsupported here: store a private copy
+                    with open(full_path, 'xb') as target, open(blob, 'rb') as source:
+                        shutil.copyfileobj(source, target, HASH_READ_SIZE)
+                return os.path.relpath(full_path, self.location).replace(os.sep, '/')
+            except FileExistsError:
+                # Name taken between get_available_name() and here
+                name = self.get_available_name(name)
+
+    def _makedirs(self, directory: str) -> None:
+        if self.directory_permissions_mode is None:
+            os.makedirs(directory, exist_ok=True)
+            return
+        old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+        try:
+            os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+        finally:
+            os.umask(old_umask)
+
+    def iter_blobs(self) -> Iterator[str]:
+        for root, _, files in os.walk(self.blob_root):
+            for filename in files:
+                if not filename.startswith('.incoming-'):
+                    yield os.path.join(root, filename)
+
+    def collect_garbage(self, grace_seconds: Optional[int] = None, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Remove blobs no stored file links to anymore (link count 1).
+
+        Blobs younger than ``grace_seconds`` are kept, as are staging files of
+        saves that may still be running.
+        """
+        if grace_seconds is None:
+            grace_seconds = getattr(settings, 'MEDIA_BLOB_GC_GRACE_SECONDS', 3600)
+        cutoff = time.time() - grace_seconds
+        result = {'removed': 0, 'freed_bytes': 0}
+        for root, _, files in os.walk(self.blob_root):
+            for filename in files:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if stat.st_nlink > 1 or stat.st_mtime > cutoff:
+                    continue
+                if not dry_run:
+                    os.remove(path)
+                result['removed'] += 1
+                result['freed_bytes'] += stat.st_size
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Blob count, bytes stored and bytes that would be used without deduplication."""
+        result = {'blobs': 0, 'references': 0, 'stored_bytes': 0, 'logical_bytes': 0}
+        for path in self.iter_blobs():
+            stat = os.stat(path)
+            references = stat.st_nlink - 1
+            result['blobs'] += 1
+            result['references'] += references
+            result['stored_bytes'] += stat.st_size
+            result['logical_bytes'] += stat.st_size * references
+        return result
+
+    def ingest_existing(self) -> Dict[str, int]:
+        """
+        Convert files saved before this storage was enabled into blob links,
+        deduplicating copies of the same content.
+        """
+        result = {'files': 0, 'deduplicated': 0, 'freed_bytes': 0}
+        excluded = {os.path.abspath(self.blob_root)} | {
+            os.path.abspath(os.path.join(self.location, directory))
+            for directory in getattr(settings, 'MEDIA_BLOB_INGEST_EXCLUDE', [])
+        }
+        for root, dirs, files in os.walk(self.location):
+            dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) not in excluded]
+            for filename in files:
+                path = os.path.join(root, filename)
+                stat = os.lstat(path)
+                if not os.path.isfile(path) or os.path.islink(path) or stat.st_nlink > 1:
+                    continue
+                blob = self.blob_path(file_sha256(path))
+                self._makedirs(os.path.dirname(blob))
+                if os.path.exists(blob):
+                    result['deduplicated'] += 1
+                    result['freed_bytes'] += stat.st_size
+                else:
+                    os.link(path, blob)
+                    result['files'] += 1
+                    continue
+                # Atomically replace the copy with a link to the existing blob
+                staged = f'{path}.dedupe'
+                os.link(blob, staged)
+                os.replace(staged, path)
+        return result
+
+
+def file_sha256(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_READ_SIZE), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
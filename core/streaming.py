@@ -0,0 +1,48 @@
+"""
+Streaming responses that stay streamed under ASGI.
+
+Django's ASGI handler serves a ``StreamingHttpResponse`` built on a
+synchronous iterator by consuming it with ``sync_to_async(list)``: the whole
+body is built in memory before the first byte goes out. ``streaming_response``
+hands the ASGI handler an asynchronous iterator instead, pulling one chunk at
+a time in the request's sync thread (the thread the view ran in, so database
+cursors opened by the view stay on their connection). Under WSGI the plain
+synchronous iterator is kept, as an asynchronous one would be buffered there.
+"""
+
+from typing import AsyncIterator, Iterable
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+_DONE = object()
+
+
+async def iterate_in_thread(chunks: Iterable) -> AsyncIterator:
+    """Asynchronous iterator pulling each chunk of ``chunks`` in the sync thread."""
+    iterator = iter(chunks)
+    try:
+        while True:
+            chunk = await sync_to_async(next)(iterator, _DONE)
+            if chunk is _DONE:
+                break
+            yield chunk
+    finally:
+        # Client gone or body sent: release the generator's cursor or file now
+        if hasattr(iterator, 'close'):
+            await sync_to_async(iterator.close)()
+
+
+def streaming_response(request, chunks: Iterable, **kwargs) -> StreamingHttpResponse:
+    """
+    ``StreamingHttpResponse`` over ``chunks`` that is not buffered under ASGI.
+
+    Args:
+        request: The Django or DRF request being answered
+        chunks: Synchronous iterable of body chunks
+        **kwargs: Passed to ``StreamingHttpResponse`` (status, content_type...)
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        chunks = iterate_in_thread(chunks)
+    return StreamingHttpResponse(chunks, **kwargs)
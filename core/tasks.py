@@ -1,7 +1,7 @@
 # ✅ OTTIMIZZATO - Celery background tasks for heavy operations
 from celery import shared_task
 from django.core.cache import cache
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 from datetime import timedelta
 import logging
@@ -16,7 +16,7 @@ def generate_user_progress_report(self, user_id):
     """
     try:
         from users.models import User, UserProgress
-        from courses.models import CourseEnrollment, LessonCompletion
+        from courses.models import CourseEnrollment
         
         user = User.objects.get(id=user_id)
         user_progress, created = UserProgress.objects.get_or_create(user=user)
@@ -27,19 +27,13 @@ def generate_user_progress_report(self, user_id):
         total_courses = enrollments.count()
         completed_courses = enrollments.filter(completed=True).count()
         
-        # Calculate total lessons and completed lessons
-        total_lessons = 0
-        completed_lessons = 0
-        
-        for enrollment in enrollments:
-            course_lessons = enrollment.course.lessons.count()
-            total_lessons += course_lessons
-            
-            completed_course_lessons = LessonCompletion.objects.filter(
-                student=user,
-                lesson__course=enrollment.course
-            ).count()
-            completed_lessons += completed_course_lessons
+        # Calculate total lessons and completed lessons from the enrollment counters
+        totals = enrollments.aggregate(
+            total_lessons=Sum('total_lessons'),
+            completed_lessons=Sum('completed_lessons')
+        )
+        total_lessons = totals['total_lessons'] or 0
+        completed_lessons = totals['completed_lessons'] or 0
         
         # Update user progress
         user_progress.total_courses_enrolled = total_courses
@@ -49,8 +43,8 @@ def generate_user_progress_report(self, user_id):
         user_progress.save()
         
         # Clear related cache
-        cache.delete(f'student_dashboard_{user_id}')
-        cache.delete(f'student_batch_data_{user_id}')
+        from services.dashboard_service import dashboard_service
+        dashboard_service.invalidate(user_id, 'progress')
         
         logger.info(f"Progress report generated for user {user_id}")
         
@@ -221,8 +215,8 @@ def send_progress_notification(self, user_id, achievement_type, details):
         )
         
         # Clear notification cache
-        cache.delete(f'student_dashboard_{user_id}')
-        cache.delete(f'student_batch_data_{user_id}')
+        from services.dashboard_service import dashboard_service
+        dashboard_service.invalidate(user_id, 'notifications')
         
         logger.info(f"Progress notification sent to user {user_id}")
         return {'user_id': user_id, 'notification_type': achievement_type}
@@ -230,3 +224,181 @@ def send_progress_notification(self, user_id, achievement_type, details):
     except Exception as exc:
         logger.error(f"Error sending notification to user {user_id}: {exc}")
         raise self.retry(countdown=30, exc=exc)
+
+
+@shared_task(bind=True)
+def prune_old_notifications(self):
+    """
+    Compact and archive/delete old read notifications - run periodically
+    """
+    try:
+        from services.notification_retention_service import notification_retention_service
+        
+        result = notification_retention_service.run_retention()
+        logger.info(f"Notification retention completed: {result}")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Error pruning notifications: {exc}")
+        raise exc
+
+
+@shared_task(bind=True)
+def process_email_outbox(self):
+    """
+    Deliver one batch of queued emails - run periodically
+    """
+    try:
+        from services.email_outbox_service import email_outbox_service
+        
+        email_outbox_service.release_stuck_emails()
+        result = email_outbox_service.process_outbox()
+        logger.info(f"Email outbox processed: {result}")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Error processing email outbox: {exc}")
+        raise exc
+
+
+@shared_task(bind=True)
+def refresh_leaderboards(self):
+    """
+    Apply new reward ledger rows to the leaderboard tables - run periodically
+    """
+    try:
+        from services.leaderboard_service import leaderboard_service
+        
+        result = leaderboard_service.refresh()
+        logger.info(f"Leaderboards refreshed: {result}")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Error refreshing leaderboards: {exc}")
+        raise exc
+
+
+@shared_task(bind=True)
+def close_teacher_payout_periods(self):
+    """
+    Roll up finished weekly/monthly periods into TeacherPayoutSummary - run daily
+    """
+    try:
+        from services.teacher_payout_service import teacher_payout_service
+        
+        result = {
+            period_type: teacher_payout_service.close_periods(period_type)
+            for period_type in teacher_payout_service.PERIOD_TYPES
+        }
+        logger.info(f"Teacher payout periods closed: {result}")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Error closing teacher payout periods: {exc}")
+        raise exc
+
+
+@shared_task(bind=True)
+def expire_video_uploads(self):
+    """
+    Expire idle chunked video uploads and remove their part files - run hourly
+    """
+    try:
+        from services.video_upload_service import video_upload_service
+        
+        result = video_upload_service.expire_stale_uploads()
+        logger.info(f"Video uploads expired: {result}")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Error expiring video uploads: {exc}")
+        raise exc
+
+
+@shared_task(bind=True)
+def generate_image_derivatives(self):
+    """
+    Generate resized variants of newly uploaded covers and avatars - run every minute
+    """
+    try:
+        from services.image_derivative_service import image_derivative_service
+        
+        result = image_derivative_service.process_pending()
+        logger.info(f"Image derivatives generated: {result}")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Error generating image derivatives: {exc}")
+        raise exc
+
+
+@shared_task(bind=True)
+def collect_media_blobs(self):
+    """
+    Remove deduplicated media blobs no stored file links to anymore - run daily
+    """
+    try:
+        from django.core.files.storage import default_storage
+        from core.storage import ContentAddressedStorage
+        
+        if not isinstance(default_storage, ContentAddressedStorage):
+            return {'removed': 0, 'freed_bytes': 0}
+        result = default_storage.collect_garbage()
+        logger.info(f"Media blobs collected: {result}")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Error collecting media blobs: {exc}")
+        raise exc
+
+
+@shared_task(bind=True)
+def refresh_gas_fees(self):
+    """
+    Sample eth_feeHistory into the gas oracle cache ahead of signing paths
+    """
+    try:
+        from blockchain.blockchain import teocoin_service
+        from services.gas_oracle_service import gas_oracle_service
+        
+        result = gas_oracle_service.refresh(teocoin_service.w3)
+        logger.info(f"Gas fees refreshed: {result}")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Error refreshing gas fees: {exc}")
+        raise exc
+
+
+@shared_task(bind=True)
+def index_chain_events(self):
+    """
+    Index confirmed TeoCoin transfers and credit pending burn deposits - run every 10 seconds
+    """
+    try:
+        from services.chain_indexer_service import chain_indexer_service
+        
+        result = chain_indexer_service.index()
+        logger.info(f"Chain events indexed: {result}")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Error indexing chain events: {exc}")
+        raise exc
+
+
+@shared_task(bind=True)
+def settle_pending_mints(self):
+    """
+    Mint queued TeoCoin credits in per-wallet settlements - run every 30 seconds
+    """
+    try:
+        from services.mint_settlement_service import mint_settlement_service
+        
+        result = mint_settlement_service.settle()
+        logger.info(f"Pending mints settled: {result}")
+        return result
+        
+    except Exception as exc:
+        logger.error(f"Error settling pending mints: {exc}")
+        raise exc
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blockchain.models import DBTeoCoinTransaction
+from core.admin_performance import EstimatedCountPaginator
+from users.models import User
+
+
+class LedgerAdminPerformanceTest(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@test.com',
+            password='adminpass',
+            role='admin'
+        )
+        self.student = User.objects.create_user(
+            username='student1',
+            email='student1@test.com',
+            password='testpass',
+            role='student'
+        )
+        self.client.force_login(self.admin_user)
+        self.url = reverse('admin:blockchain_dbteocointransaction_changelist')
+
+    def _create_transactions(self, count, user=None, days_ago=0):
+        transactions = DBTeoCoinTransaction.objects.bulk_create([
+            DBTeoCoinTransaction(
+                user=user or self.student,
+                transaction_type='earned',
+                amount=Decimal('1.00'),
+                description=f'reward {i}'
+            )
+            for i in range(count)
+        ])
+        if days_ago:
+            DBTeoCoinTransaction.objects.filter(
+                pk__in=[tx.pk for tx in transactions]
+            ).update(created_at=timezone.now() - timedelta(days=days_ago))
+        return transactions
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self._create_transactions(3)
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        for i in range(5):
+            user = User.objects.create_user(
+                username=f'other{i}', email=f'other{i}@test.com', password='testpass', role='student'
+            )
+            self._create_transactions(5, user=user)
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        self.assertEqual(len(small), len(large))
+
+    def test_default_window_hides_old_rows(self):
+        recent = self._create_transactions(1)[0]
+        old = self._create_transactions(1, days_ago=90)[0]
+
+        response = self.client.get(self.url)
+        ids = [tx.pk for tx in response.context['cl'].result_list]
+        self.assertEqual(ids, [recent.pk])
+
+        response = self.client.get(self.url, {'recent': 'all'})
+        ids = [tx.pk for tx in response.context['cl'].result_list]
+        self.assertCountEqual(ids, [recent.pk, old.pk])
+
+    def test_date_hierarchy_lifts_default_window(self):
+        old = self._create_transactions(1, days_ago=90)[0]
+        old.refresh_from_db()
+
+        response = self.client.get(self.url, {'created_at__year': old.created_at.year})
+        self.assertIn(old, response.context['cl'].result_list)
+
+    def test_search_is_exact(self):
+        tx = self._create_transactions(1)[0]
+
+        response = self.client.get(self.url, {'q': 'student1'})
+        self.assertEqual(list(response.context['cl'].result_list), [tx])
+
+        response = self.client.get(self.url, {'q': 'student'})
+        self.assertEqual(list(response.context['cl'].result_list), [])
+
+        response = self.client.get(self.url, {'q': 'Student1@Test.com'})
+        self.assertEqual(list(response.context['cl'].result_list), [tx])
+
+        response = self.client.get(self.url, {'q': str(tx.pk)})
+        self.assertEqual(list(response.context['cl'].result_list), [tx])
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1)
+    def test_paginator_falls_back_to_exact_count(self):
+        # SQLite has no planner estimates
+        self._create_transactions(4)
+        paginator = EstimatedCountPaginator(DBTeoCoinTransaction.objects.order_by('-id'), 2)
+        self.assertEqual(paginator.count, 4)
+        self.assertEqual(paginator.num_pages, 2)
@@ -0,0 +1,98 @@
+import io
+import time
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.cache_backends import TwoTierCache
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'two-tier-l2'},
+    'tiered': {
+        'BACKEND': 'core.cache_backends.TwoTierCache',
+        'LOCATION': 'shared',
+        'OPTIONS': {'L1_NAME': 'command', 'INVALIDATION_CHANNEL': 'test-channel'},
+    },
+}
+
+
+def _worker(name, **options):
+    """A TwoTierCache with its own L1, as in a separate worker process."""
+    return TwoTierCache('shared', {'OPTIONS': {'L1_NAME': name, 'INVALIDATION_CHANNEL': 'test-channel', **options}})
+
+
+@override_settings(CACHES=CACHES)
+class TwoTierCacheTest(SimpleTestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.worker_a = _worker('a')
+        self.worker_b = _worker('b')
+        self.worker_a.l1.clear()
+        self.worker_b.l1.clear()
+
+    def test_reads_fill_l1(self):
+        self.worker_a.set('key', {'value': 1})
+
+        self.assertEqual(self.worker_b.get('key'), {'value': 1})
+        caches['shared'].delete('key')
+        # Served from worker B's L1 without touching L2
+        self.assertEqual(self.worker_b.get('key'), {'value': 1})
+
+    def test_writes_invalidate_other_workers(self):
+        self.worker_a.set('key', 1)
+        self.assertEqual(self.worker_b.get('key'), 1)
+
+        self.worker_a.set('key', 2)
+        self.assertEqual(self.worker_b.get('key'), 2)
+
+        self.worker_a.delete_many(['key'])
+        self.assertIsNone(self.worker_b.get('key'))
+
+    def test_get_many_mixes_tiers(self):
+        self.worker_a.set_many({'x': 1, 'y': 2})
+        self.worker_b.get('x')
+
+        self.assertEqual(self.worker_b.get_many(['x', 'y', 'z']), {'x': 1, 'y': 2})
+
+    def test_l1_entries_expire(self):
+        worker = _worker('short', L1_TIMEOUT=0.05)
+        worker.set('key', 1)
+        caches['shared'].delete('key')
+        time.sleep(0.1)
+        self.assertIsNone(worker.get('key'))
+
+    def test_cached_values_are_copies(self):
+        self.worker_a.set('key', {'items': []})
+        self.worker_a.get('key')['items'].append(1)
+        self.assertEqual(self.worker_a.get('key'), {'items': []})
+
+    def test_add_and_incr(self):
+        self.assertTrue(self.worker_a.add('lock', 1))
+        self.assertFalse(self.worker_b.add('lock', 1))
+        self.worker_a.set('counter', 1)
+        self.worker_b.get('counter')
+        self.worker_a.incr('counter')
+        self.assertEqual(self.worker_b.get('counter'), 2)
+
+    def test_hit_ratio(self):
+        worker = _worker('metrics', METRICS_FLUSH_SECONDS=3600)
+        worker.set('key', 1)
+        worker.l1.clear()
+        worker.get('key')  # L2 hit
+        worker.get('key')  # L1 hit
+        worker.get('missing')
+
+        stats = worker.stats()
+        self.assertEqual(stats['process']['l1_hits'], 1)
+        self.assertEqual(stats['process']['l2_hits'], 1)
+        self.assertEqual(stats['process']['misses'], 1)
+        self.assertAlmostEqual(stats['process']['hit_ratio'], 0.6667)
+        self.assertEqual(stats['cluster']['misses'], 1)
+
+    def test_cache_stats_command(self):
+        caches['tiered'].get('missing')
+        out = io.StringIO()
+        call_command('cache_stats', '--alias', 'tiered', '--reset', stdout=out)
+        self.assertIn('misses: 1', out.getvalue())
@@ -0,0 +1,104 @@
+"""
+Tests for HTTP conditional requests on catalog and lesson reads
+"""
+
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseEnrollment, Lesson, LessonCompletion
+
+User = get_user_model()
+
+
+class ConditionalRequestTestCase(TestCase):
+    """ETag / Last-Modified handling of course and lesson endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(
+            username='teacher', email='teacher@test.com', password='testpass', role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='student', email='student@test.com', password='testpass', role='student'
+        )
+        self.course = Course.objects.create(
+            title='Corso', description='Descrizione', teacher=self.teacher,
+            price_eur=Decimal('10.00'), is_approved=True
+        )
+        self.lesson = Lesson.objects.create(
+            title='Lezione', content='Contenuto', course=self.course, teacher=self.teacher, order=1
+        )
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def test_lessons_list_returns_304_without_body(self):
+        """A matching If-None-Match is answered with one query and no body"""
+        url = f'/api/v1/courses/{self.course.id}/lessons/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_lesson_change_invalidates_etag(self):
+        """Editing a lesson changes the validator"""
+        url = f'/api/v1/lessons/{self.lesson.id}/'
+        etag = self.client.get(url)['ETag']
+
+        self.lesson.title = 'Lezione aggiornata'
+        self.lesson.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_user_state_change_invalidates_etag(self):
+        """Completing the lesson changes the per-user validator only"""
+        url = f'/api/v1/lessons/{self.lesson.id}/'
+        etag = self.client.get(url)['ETag']
+
+        LessonCompletion.objects.create(student=self.student, lesson=self.lesson)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['completed'])
+
+    def test_stream_urls_are_revalidated_before_they_expire(self):
+        """Payloads with signed stream URLs stop matching once the URL is half expired"""
+        media_root = tempfile.mkdtemp(prefix='conditional-test-')
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        with self.settings(MEDIA_ROOT=media_root):
+            self.lesson.video_file.save('intro.mp4', ContentFile(b'video'))
+        url = f'/api/v1/lessons/{self.lesson.id}/'
+        response = self.client.get(url)
+        self.assertIn('token=', response.json()['video_file_url'])
+        etag = response['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        later = time.time() + 5 * 3600
+        with self.settings(VIDEO_STREAM_URL_TTL=4 * 3600), mock.patch('core.conditional.time.time', return_value=later):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_missing_course_is_not_validated(self):
+        """Unknown ids fall through to the view's 404"""
+        response = self.client.get('/api/v1/courses/999999/lessons/')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
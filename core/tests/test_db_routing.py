@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from blockchain.models import DBTeoCoinTransaction
+from core.db_routing import (
+    ReplicaRouter, pin_to_primary, replica_reads, reset_write_tracking, restore_write_tracking
+)
+from core.middleware import ReplicaStickinessMiddleware
+
+
+class _User:
+    is_authenticated = True
+
+    def __init__(self, pk):
+        self.pk = pk
+
+
+@patch('core.db_routing.get_replica_alias', return_value='replica')
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.token = reset_write_tracking()
+
+    def tearDown(self):
+        restore_write_tracking(self.token)
+        cache.clear()
+
+    def test_reads_use_replica_only_inside_scope(self, _):
+        self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'default')
+        with replica_reads():
+            self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'replica')
+        self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'default')
+
+    def test_writes_go_to_primary_and_stick(self, _):
+        with replica_reads():
+            self.assertEqual(router.db_for_write(DBTeoCoinTransaction), 'default')
+            self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'default')
+
+    def test_recent_writer_reads_primary(self, _):
+        pin_to_primary(7)
+        with replica_reads(_User(7)):
+            self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'default')
+        with replica_reads(_User(8)):
+            self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'replica')
+
+    def test_no_migrations_on_replica(self, _):
+        self.assertFalse(ReplicaRouter().allow_migrate('replica', 'blockchain'))
+        self.assertIsNone(ReplicaRouter().allow_migrate('default', 'blockchain'))
+
+    def test_middleware_pins_users_who_wrote(self, _):
+        def writing_view(request):
+            request.user = _User(3)
+            router.db_for_write(DBTeoCoinTransaction)
+            return HttpResponse()
+
+        def reading_view(request):
+            request.user = _User(4)
+            return HttpResponse()
+
+        factory = RequestFactory()
+        ReplicaStickinessMiddleware(writing_view)(factory.post('/'))
+        ReplicaStickinessMiddleware(reading_view)(factory.get('/'))
+
+        with replica_reads(_User(3)):
+            self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'default')
+        with replica_reads(_User(4)):
+            self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'replica')
+        with replica_reads(AnonymousUser()):
+            self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'replica')
+
+    def test_no_replica_configured(self, get_replica_alias):
+        get_replica_alias.return_value = None
+        with replica_reads():
+            self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'default')
+
+
+class ReplicaTransactionTest(TestCase):
+    @patch('core.db_routing.get_replica_alias', return_value='replica')
+    def test_scope_inside_transaction_stays_on_primary(self, _):
+        with transaction.atomic():
+            with replica_reads():
+                self.assertEqual(router.db_for_read(DBTeoCoinTransaction), 'default')
@@ -0,0 +1,120 @@
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import translation
+from rest_framework.test import APIClient
+
+from core.parallel import run_parallel
+from courses.models import Course, CourseEnrollment, Lesson, LessonCompletion
+from users.models import User
+
+
+def _sleep(seconds, value):
+    def task():
+        time.sleep(seconds)
+        return value
+    return task
+
+
+def _fail():
+    raise ValueError('boom')
+
+
+class RunParallelTest(SimpleTestCase):
+    def test_latency_is_the_slowest_fragment(self):
+        started = time.monotonic()
+        results, degraded = run_parallel({'a': _sleep(0.3, 1), 'b': _sleep(0.3, 2), 'c': _sleep(0.3, 3)})
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(results, {'a': 1, 'b': 2, 'c': 3})
+        self.assertEqual(degraded, [])
+        self.assertLess(elapsed, 0.6)
+
+    def test_timeout_and_error_use_fallbacks(self):
+        started = time.monotonic()
+        results, degraded = run_parallel(
+            {'slow': _sleep(1, 'late'), 'broken': _fail, 'fast': _sleep(0, 'ok')},
+            timeouts={'slow': 0.1},
+            fallbacks={'slow': 'fallback', 'broken': list}
+        )
+
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(results, {'slow': 'fallback', 'broken': [], 'fast': 'ok'})
+        self.assertEqual(degraded, ['slow', 'broken'])
+
+    def test_required_fragment_raises(self):
+        with self.assertRaises(ValueError):
+            run_parallel({'required': _fail, 'other': _sleep(0, 1)})
+        with self.assertRaises(TimeoutError):
+            run_parallel({'required': _sleep(1, 1), 'other': _sleep(0, 1)}, default_timeout=0.1)
+
+    def test_workers_inherit_active_language(self):
+        with translation.override('it'):
+            results, _ = run_parallel({'a': translation.get_language, 'b': translation.get_language})
+        self.assertEqual(results, {'a': 'it', 'b': 'it'})
+
+    @override_settings(PARALLEL_FRAGMENTS_ENABLED=False)
+    def test_disabled_runs_serially(self):
+        started = time.monotonic()
+        results, _ = run_parallel({'a': _sleep(0.2, 1), 'b': _sleep(0.2, 2)})
+        self.assertEqual(results, {'a': 1, 'b': 2})
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+
+
+class ParallelEndpointsTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username='teacher1', email='teacher1@test.com', password='testpass', role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='student1', email='student1@test.com', password='testpass', role='student'
+        )
+        self.course = Course.objects.create(
+            title='Ceramica', description='Corso di ceramica', teacher=self.teacher,
+            price_eur=Decimal('40.00'), is_approved=True
+        )
+        self.lessons = [
+            Lesson.objects.create(title=f'Lezione {i}', content='...', teacher=self.teacher, course=self.course, order=i)
+            for i in range(1, 3)
+        ]
+        self.course.lessons.add(*self.lessons)
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+        LessonCompletion.objects.create(student=self.student, lesson=self.lessons[0])
+        self.client = APIClient()
+
+    def test_teacher_dashboard(self):
+        self.client.force_authenticate(user=self.teacher)
+        response = self.client.get('/api/v1/dashboard/teacher/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['stats']['total_courses'], 1)
+        self.assertEqual(response.data['stats']['active_students'], 1)
+        self.assertEqual(response.data['sales']['daily'], '0')
+        self.assertIn('available', response.data['teocoin_balance'])
+        self.assertNotIn('degraded_fragments', response.data)
+
+    def test_student_dashboard_reports_degraded_fragments(self):
+        cache.clear()
+        self.student.wallet_address = '0x' + 'ab' * 20
+        self.student.save(update_fields=['wallet_address'])
+        self.client.force_authenticate(user=self.student)
+
+        with mock.patch('blockchain.blockchain.teocoin_service.get_balance', side_effect=TimeoutError):
+            response = self.client.get('/api/v1/dashboard/student/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['blockchain_balance'], '0')
+        self.assertEqual(response.data['degraded_fragments'], ['chain_balance'])
+
+    def test_course_batch_data(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get(f'/api/v1/api/course/{self.course.id}/batch-data/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['course']['id'], self.course.id)
+        self.assertEqual([lesson['completed'] for lesson in response.data['lessons']], [True, False])
+        self.assertEqual(response.data['progress']['completed_lessons'], 1)
+        self.assertEqual(response.data['progress']['percentage'], 50.0)
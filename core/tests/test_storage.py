@@ -0,0 +1,140 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.storage import ContentAddressedStorage, file_sha256
+
+
+class ContentAddressedStorageTest(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='cas-test-')
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.storage = ContentAddressedStorage(location=self.root)
+
+    def _stat(self, name):
+        return os.stat(self.storage.path(name))
+
+    def test_identical_uploads_share_one_blob(self):
+        data = b'dispensa di anatomia' * 1000
+        first = self.storage.save('materials/a.pdf', ContentFile(data))
+        second = self.storage.save('other/b.pdf', ContentFile(data))
+
+        self.assertEqual(self._stat(first).st_ino, self._stat(second).st_ino)
+        blob = self.storage.blob_path(file_sha256(self.storage.path(first)))
+        self.assertEqual(os.stat(blob).st_nlink, 3)
+        with self.storage.open(second) as f:
+            self.assertEqual(f.read(), data)
+
+        stats = self.storage.stats()
+        self.assertEqual((stats['blobs'], stats['references']), (1, 2))
+        self.assertEqual(stats['logical_bytes'], 2 * len(data))
+        staged = [f for _, _, files in os.walk(self.storage.blob_root) for f in files if f.startswith('.incoming-')]
+        self.assertEqual(staged, [])
+
+    def test_name_collisions_get_available_names(self):
+        first = self.storage.save('a.txt', ContentFile(b'one'))
+        second = self.storage.save('a.txt', ContentFile(b'two'))
+        self.assertNotEqual(first, second)
+        with self.storage.open(first) as f:
+            self.assertEqual(f.read(), b'one')
+
+    def test_gc_removes_unreferenced_blobs_only(self):
+        kept = self.storage.save('kept.txt', ContentFile(b'kept'))
+        gone = self.storage.save('gone.txt', ContentFile(b'gone'))
+        self.storage.delete(gone)
+
+        self.assertEqual(self.storage.collect_garbage(grace_seconds=3600)['removed'], 0)
+        self.assertEqual(self.storage.collect_garbage(grace_seconds=0, dry_run=True)['removed'], 1)
+        result = self.storage.collect_garbage(grace_seconds=0)
+        self.assertEqual(result, {'removed': 1, 'freed_bytes': 4})
+
+        self.assertEqual(self.storage.stats()['blobs'], 1)
+        with self.storage.open(kept) as f:
+            self.assertEqual(f.read(), b'kept')
+
+    def test_temporary_file_is_moved_or_dropped(self):
+        existing = self.storage.save('video.mp4', ContentFile(b'frames'))
+
+        upload = TemporaryUploadedFile('copy.mp4', 'video/mp4', 6, None)
+        upload.write(b'frames')
+        upload.flush()
+        name = self.storage.save('copy.mp4', upload)
+        upload.close()
+
+        self.assertEqual(self._stat(existing).st_ino, self._stat(name).st_ino)
+        self.assertEqual(self.storage.stats()['blobs'], 1)
+
+    def test_trusted_hash_skips_hashing(self):
+        path = os.path.join(self.root, 'part')
+        with open(path, 'wb') as f:
+            f.write(b'verified')
+        with open(path, 'rb') as f:
+            content = ContentFile(b'')
+            content.temporary_file_path = lambda: path
+            content.content_sha256 = 'ab' * 32
+            name = self.storage.save('lesson.mp4', content)
+        self.assertTrue(os.path.exists(self.storage.blob_path('ab' * 32)))
+        self.assertFalse(os.path.exists(path))
+        with self.storage.open(name) as f:
+            self.assertEqual(f.read(), b'verified')
+
+    @override_settings(MEDIA_BLOB_INGEST_EXCLUDE=['chunked_uploads'])
+    def test_ingest_existing_files(self):
+        for name in ('a/one.pdf', 'b/one.pdf', 'b/two.pdf', 'chunked_uploads/x.part'):
+            os.makedirs(os.path.dirname(os.path.join(self.root, name)), exist_ok=True)
+            with open(os.path.join(self.root, name), 'wb') as f:
+                f.write(b'two' if 'two' in name else b'one')
+
+        result = self.storage.ingest_existing()
+        self.assertEqual(result, {'files': 2, 'deduplicated': 1, 'freed_bytes': 3})
+        self.assertEqual(self._stat('a/one.pdf').st_ino, self._stat('b/one.pdf').st_ino)
+        self.assertEqual(self._stat('chunked_uploads/x.part').st_nlink, 1)
+
+        # Idempotent
+        self.assertEqual(self.storage.ingest_existing()['files'], 0)
+
+
+class MediaBlobsCommandTest(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='cas-command-test-')
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+
+    def test_stats_and_gc(self):
+        with override_settings(
+            MEDIA_ROOT=self.root,
+            STORAGES={'default': {'BACKEND': 'core.storage.ContentAddressedStorage'},
+                      'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}},
+        ):
+            name = default_storage.save('doc.txt', ContentFile(b'x' * 10))
+            default_storage.save('copy.txt', ContentFile(b'x' * 10))
+            default_storage.delete(name)
+            default_storage.delete('copy.txt')
+
+            out = io.StringIO()
+            call_command('media_blobs', '--gc', '--grace-seconds', '0', stdout=out)
+        self.assertIn('Removed 1 unreferenced blobs', out.getvalue())
+        self.assertIn('Media blobs: 0', out.getvalue())
+
+    def test_gc_loop(self):
+        with override_settings(
+            MEDIA_ROOT=self.root,
+            STORAGES={'default': {'BACKEND': 'core.storage.ContentAddressedStorage'},
+                      'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}},
+        ):
+            with self.assertRaises(CommandError):
+                call_command('media_blobs', '--loop')
+
+            default_storage.delete(default_storage.save('doc.txt', ContentFile(b'x' * 10)))
+            out = io.StringIO()
+            with mock.patch('core.management.commands.media_blobs.time.sleep', side_effect=KeyboardInterrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    call_command('media_blobs', '--gc', '--loop', '--grace-seconds', '0', stdout=out)
+        self.assertIn('Removed 1 unreferenced blobs', out.getvalue())
@@ -21,6 +21,7 @@ from courses.serializers import TeacherDiscountDecisionSerializer, TeacherChoice
 from users.permissions import IsTeacher
 from services.teocoin_discount_service import teocoin_discount_service
 from services.payment_service import payment_service
+from services.teacher_payout_service import teacher_payout_service
 
 
 class TeacherChoiceViewSet(viewsets.ModelViewSet):
@@ -302,13 +303,9 @@ class TeacherPreferenceViewSet(viewsets.ModelViewSet):
                 decision='pending', expires_at__lte=timezone.now()
             ).count()
             
-            # Calculate earnings
-            accepted_decisions = decisions.filter(decision='accepted')
-            total_fiat_earned = sum([d.teacher_earnings_if_accepted['fiat'] for d in accepted_decisions])
-            total_teo_earned = sum([d.teacher_earnings_if_accepted['teo'] for d in accepted_decisions])
-            
-            declined_decisions = decisions.filter(decision='declined')
-            total_fiat_from_declined = sum([d.teacher_earnings_if_declined['fiat'] for d in declined_decisions])
+            # Earnings from the payout summaries instead of recomputing every decision
+            earnings = teacher_payout_service.get_teacher_earnings(request.user)['all_time']
+            total_teo_earned = Decimal(earnings['teo_from_absorbed_discounts'])
             
             return Response({
                 'success': True,
@@ -321,9 +318,9 @@ class TeacherPreferenceViewSet(viewsets.ModelViewSet):
                     'acceptance_rate': f'{(accepted/total*100):.1f}%' if total > 0 else '0%'
                 },
                 'earnings': {
-                    'total_fiat_from_teocoin': str(total_fiat_earned),
+                    'total_fiat_from_teocoin': earnings['eur_from_absorbed_discounts'],
                     'total_teo_earned': str(total_teo_earned),
-                    'total_fiat_from_declined': str(total_fiat_from_declined),
+                    'total_fiat_from_standard_sales': earnings['eur_from_standard_sales'],
                     'teo_value_estimate': f'{total_teo_earned * Decimal("1.2"):.2f} EUR' # Estimate TEO value
                 }
             })
@@ -0,0 +1,36 @@
+"""
+Management command to expire idle chunked video uploads
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from services.video_upload_service import video_upload_service
+
+
+class Command(BaseCommand):
+    help = 'Expire uploads idle for more than VIDEO_UPLOAD_EXPIRY_HOURS and remove their part files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running as a worker'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=3600.0,
+            help='Seconds between runs with --loop'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = video_upload_service.expire_stale_uploads()
+            if result['expired'] or not options['loop']:
+                self.stdout.write(f"🎬 Expired {result['expired']} stale uploads")
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,54 @@
+"""
+Management command to generate resized variants of course covers and avatars
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from services.image_derivative_service import image_derivative_service
+
+
+class Command(BaseCommand):
+    help = 'Generate WebP/JPEG variants of pending course covers and avatars'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Queue every existing image again (backfill, or after changing IMAGE_DERIVATIVE_WIDTHS)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Maximum images per target per batch (default: IMAGE_DERIVATIVE_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running as a worker, polling for new uploads'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=10.0,
+            help='Seconds between polls when running with --loop'
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            queued = image_derivative_service.mark_all_pending()
+            self.stdout.write(f'📋 Queued {queued} images')
+
+        while True:
+            result = image_derivative_service.process_pending(batch_size=options['batch_size'])
+            did_work = result['processed'] or result['failed']
+            if did_work or not options['loop']:
+                self.stdout.write(f"🖼️ Processed: {result['processed']}, failed: {result['failed']}")
+
+            # Drain the backlog quickly, poll slowly when idle
+            if did_work and (options['loop'] or options['all']):
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
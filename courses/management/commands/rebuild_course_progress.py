@@ -0,0 +1,35 @@
+"""
+Management command to rebuild the per-enrollment progress counters
+"""
+
+from django.core.management.base import BaseCommand
+
+from courses.models import CourseEnrollment
+from services.course_progress_service import course_progress_service
+
+
+class Command(BaseCommand):
+    help = 'Recompute completed_lessons/total_lessons on course enrollments from lesson completions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            type=int,
+            help='Only rebuild enrollments of this course ID'
+        )
+        parser.add_argument(
+            '--student',
+            type=int,
+            help='Only rebuild enrollments of this student ID'
+        )
+
+    def handle(self, *args, **options):
+        enrollments = CourseEnrollment.objects.all()
+        if options['course']:
+            enrollments = enrollments.filter(course_id=options['course'])
+        if options['student']:
+            enrollments = enrollments.filter(student_id=options['student'])
+
+        self.stdout.write("🔄 Rebuilding course progress counters...")
+        updated = course_progress_service.rebuild(enrollments)
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt progress for {updated} enrollments"))
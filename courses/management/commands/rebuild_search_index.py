@@ -0,0 +1,16 @@
+"""
+Management command to rebuild the course/lesson full-text search index
+"""
+
+from django.core.management.base import BaseCommand
+
+from services.search_service import search_service
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index of courses and lessons'
+
+    def handle(self, *args, **options):
+        self.stdout.write("🔄 Rebuilding search index...")
+        indexed = search_service.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"✅ Indexed {indexed} courses and lessons"))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:00
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_progress_counters(apps, schema_editor):
+    CourseEnrollment = apps.get_model('courses', 'CourseEnrollment')
+    Lesson = apps.get_model('courses', 'Lesson')
+    LessonCompletion = apps.get_model('courses', 'LessonCompletion')
+
+    completed = LessonCompletion.objects.filter(
+        student_id=OuterRef('student_id'),
+        lesson__course_id=OuterRef('course_id')
+    ).order_by().values('student_id').annotate(n=Count('*')).values('n')
+    total = Lesson.objects.filter(
+        course_id=OuterRef('course_id')
+    ).order_by().values('course_id').annotate(n=Count('*')).values('n')
+
+    CourseEnrollment.objects.update(
+        completed_lessons=Coalesce(Subquery(completed, output_field=IntegerField()), Value(0)),
+        total_lessons=Coalesce(Subquery(total, output_field=IntegerField()), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_teacherchoicepreference_teacherdiscountdecision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courseenrollment',
+            name='completed_lessons',
+            field=models.PositiveIntegerField(default=0, help_text='Numero di lezioni del corso completate dallo studente'),
+        ),
+        migrations.AddField(
+            model_name='courseenrollment',
+            name='total_lessons',
+            field=models.PositiveIntegerField(default=0, help_text='Numero di lezioni del corso'),
+        ),
+        migrations.RunPython(backfill_progress_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:04
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS courses_course_search_gin ON courses_course USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS courses_lesson_search_gin ON courses_lesson USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS courses_course_title_trgm ON courses_course USING gin (title gin_trgm_ops)",
+    """
+    UPDATE courses_course c SET search_vector =
+        setweight(to_tsvector('italian', coalesce(c.title, '')), 'A') ||
+        setweight(to_tsvector('italian', coalesce(c.description, '')), 'B') ||
+        setweight(to_tsvector('italian', coalesce(u.username, '')), 'C')
+    FROM users_user u WHERE u.id = c.teacher_id
+    """,
+    """
+    UPDATE courses_lesson SET search_vector =
+        setweight(to_tsvector('italian', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('italian', coalesce(content, '')), 'B')
+    """,
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS courses_course_search_gin",
+    "DROP INDEX IF EXISTS courses_lesson_search_gin",
+    "DROP INDEX IF EXISTS courses_course_title_trgm",
+]
+
+# rowid = 2*id for courses, 2*id+1 for lessons (see courses.search.SQLiteSearchBackend)
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS courses_search_fts USING fts5(
+        kind UNINDEXED, course_id UNINDEXED, title, body,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    INSERT INTO courses_search_fts (rowid, kind, course_id, title, body)
+    SELECT c.id * 2, 'course', c.id, c.title, c.description || ' ' || coalesce(u.username, '')
+    FROM courses_course c LEFT JOIN users_user u ON u.id = c.teacher_id
+    """,
+    """
+    INSERT INTO courses_search_fts (rowid, kind, course_id, title, body)
+    SELECT id * 2 + 1, 'lesson', course_id, title, content
+    FROM courses_lesson WHERE course_id IS NOT NULL
+    """,
+]
+SQLITE_BACKWARD = ["DROP TABLE IF EXISTS courses_search_fts"]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+create_search_index = _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD})
+drop_search_index = _run({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_enrollment_progress_counters'),
+    ]
+
+    operations = [
+        # No-op on databases other than PostgreSQL
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
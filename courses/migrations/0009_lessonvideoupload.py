@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:40
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonVideoUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('total_size', models.PositiveBigIntegerField(help_text='Dimensione totale dichiarata in byte')),
+                ('received_bytes', models.PositiveBigIntegerField(default=0, help_text='Byte ricevuti: offset del prossimo blocco')),
+                ('checksum_sha256', models.CharField(help_text='SHA-256 atteso del file completo (hex)', max_length=64)),
+                ('status', models.CharField(choices=[('uploading', 'In caricamento'), ('completed', 'Completato'), ('failed', 'Fallito'), ('expired', 'Scaduto')], db_index=True, default='uploading', max_length=20)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('lesson', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='video_uploads', to='courses.lesson')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='video_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Upload Video Lezione',
+                'verbose_name_plural': 'Upload Video Lezioni',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_lessonvideoupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='cover_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versioni ridimensionate (WebP/JPEG) della copertina'),
+        ),
+    ]
@@ -3,10 +3,12 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.core.validators import MinValueValidator
 from decimal import Decimal
+import uuid
 from users.models import User
 from notifications.models import Notification
 from rewards.models import BlockchainTransaction
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from PIL import Image
 from .validators import validate_video_file
 
@@ -49,6 +51,11 @@ class Course(models.Model):
         null=True,
         help_text="Immagine di copertina del corso (opzionale)"
     )
+    # Maintained by services/image_derivative_service.py
+    cover_image_variants = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text="Versioni ridimensionate (WebP/JPEG) della copertina"
+    )
     teacher = models.ForeignKey(User, on_delete=models.CASCADE, related_name='courses_created')
     # Removed legacy price field; use price_eur for all pricing
     
@@ -87,6 +94,8 @@ class Course(models.Model):
         default=0,
         help_text="Totale TeoCoins distribuiti come ricompensa per questo corso"
     )
+    # Maintained by courses.search (PostgreSQL only, unused on SQLite)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return self.title
@@ -218,6 +227,8 @@ class Lesson(models.Model):
         default = 1,
         help_text="Posizione della lezione all'interno del corso."
     )
+    # Maintained by courses.search (PostgreSQL only, unused on SQLite)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ['order']  # ordina automaticamente per order
@@ -480,9 +491,30 @@ class CourseEnrollment(models.Model):
         help_text="Date when course was completed"
     )
 
+    # PROGRESS COUNTERS (maintained by courses.signals, rebuilt by `rebuild_course_progress`)
+    completed_lessons = models.PositiveIntegerField(
+        default=0,
+        help_text="Numero di lezioni del corso completate dallo studente"
+    )
+    total_lessons = models.PositiveIntegerField(
+        default=0,
+        help_text="Numero di lezioni del corso"
+    )
+
     class Meta:
         unique_together = ('student', 'course')
 
+    @property
+    def progress_percentage(self):
+        """Completion percentage read from the denormalized counters"""
+        if not self.total_lessons:
+            return 0
+        return round(min(self.completed_lessons, self.total_lessons) / self.total_lessons * 100, 2)
+
+    @property
+    def all_lessons_completed(self):
+        return self.total_lessons > 0 and self.completed_lessons >= self.total_lessons
+
     def __str__(self):
         status = "Completato" if self.completed else "In corso"
         payment_info = f" - {self.payment_method}"
@@ -771,4 +803,41 @@ class TeacherChoicePreference(models.Model):
             return False
         elif self.preference == 'threshold_based' and self.minimum_teo_threshold:
             return Decimal(str(teo_amount_display)) >= self.minimum_teo_threshold
-        return False  # manual or no auto-decision
\ No newline at end of file
+        return False  # manual or no auto-decision
+
+class LessonVideoUpload(models.Model):
+    """
+    Upload a blocchi (resumable) del video di una lezione.
+
+    I blocchi vengono scritti in un file temporaneo su disco; alla chiusura
+    il checksum viene verificato e il file collegato a Lesson.video_file
+    (vedi services/video_upload_service.py).
+    """
+    STATUS_CHOICES = [
+        ('uploading', 'In caricamento'),
+        ('completed', 'Completato'),
+        ('failed', 'Fallito'),
+        ('expired', 'Scaduto'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name='video_uploads')
+    teacher = models.ForeignKey(User, on_delete=models.CASCADE, related_name='video_uploads')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    total_size = models.PositiveBigIntegerField(help_text="Dimensione totale dichiarata in byte")
+    received_bytes = models.PositiveBigIntegerField(default=0, help_text="Byte ricevuti: offset del prossimo blocco")
+    checksum_sha256 = models.CharField(max_length=64, help_text="SHA-256 atteso del file completo (hex)")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading', db_index=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Upload Video Lezione'
+        verbose_name_plural = 'Upload Video Lezioni'
+
+    def __str__(self):
+        return f"{self.filename} ({self.received_bytes}/{self.total_size}) - {self.status}"
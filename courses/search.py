@@ -0,0 +1,191 @@
+"""
+Full-text search index for courses and lessons.
+
+Two backends are available, selected from the database vendor:
+
+- ``PostgresSearchBackend``: a weighted ``search_vector`` column on Course and
+  Lesson (Italian text search configuration, GIN indexed) plus trigram
+  word-similarity on course titles for typo-tolerant matching
+- ``SQLiteSearchBackend``: an FTS5 virtual table (``courses_search_fts``) with
+  prefix matching, used in dev/CI
+
+The index is kept up to date by the signals in ``courses.signals`` and can be
+rebuilt with the ``rebuild_search_index`` command.
+"""
+
+import re
+from typing import Dict, List
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import F, Q, Value
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Course, Lesson
+
+FTS_TABLE = 'courses_search_fts'
+
+# Lesson matches count less than matches on the course itself
+LESSON_RANK_FACTOR = 0.5
+# Scales trigram similarity (0..1) to the order of magnitude of ts_rank
+TRIGRAM_RANK_FACTOR = 0.1
+
+
+def _search_config() -> str:
+    return getattr(settings, 'SEARCH_TEXT_CONFIG', 'italian')
+
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r'\w+', query.lower())
+
+
+class PostgresSearchBackend:
+    """tsvector/GIN full-text search with trigram fallback on titles."""
+
+    def _course_vector(self, teacher_username: str = ''):
+        config = _search_config()
+        return (
+            SearchVector('title', weight='A', config=config)
+            + SearchVector('description', weight='B', config=config)
+            + SearchVector(Value(teacher_username), weight='C', config=config)
+        )
+
+    def _lesson_vector(self):
+        config = _search_config()
+        return SearchVector('title', weight='A', config=config) + SearchVector('content', weight='B', config=config)
+
+    def index_course(self, course: Course) -> None:
+        username = course.teacher.username if course.teacher_id else ''
+        Course.objects.filter(pk=course.pk).update(search_vector=self._course_vector(username))
+
+    def index_lesson(self, lesson: Lesson) -> None:
+        Lesson.objects.filter(pk=lesson.pk).update(search_vector=self._lesson_vector())
+
+    def remove_course(self, course_id: int) -> None:
+        # The vector lives on the row itself
+        pass
+
+    def remove_lesson(self, lesson_id: int) -> None:
+        pass
+
+    def rebuild(self) -> int:
+        for course in Course.objects.select_related('teacher').only('id', 'teacher__username').iterator():
+            self.index_course(course)
+        Lesson.objects.update(search_vector=self._lesson_vector())
+        return Course.objects.count() + Lesson.objects.count()
+
+    def match(self, query: str, limit: int) -> Dict[int, float]:
+        search_query = SearchQuery(query, config=_search_config(), search_type='websearch')
+
+        ranks: Dict[int, float] = {}
+        # title %> query uses the trigram GIN index and tolerates typos ("acquarello")
+        course_hits = Course.objects.filter(
+            Q(search_vector=search_query) | Q(title__trigram_word_similar=query)
+        ).annotate(
+            rank=SearchRank(F('search_vector'), search_query),
+            similarity=TrigramWordSimilarity(query, 'title'),
+        ).order_by('-rank', '-similarity').values_list('id', 'rank', 'similarity')[:limit]
+        for course_id, rank, similarity in course_hits:
+            ranks[course_id] = max(rank, similarity * TRIGRAM_RANK_FACTOR)
+
+        lesson_hits = Lesson.objects.filter(
+            course__isnull=False, search_vector=search_query
+        ).annotate(
+            rank=SearchRank(F('search_vector'), search_query)
+        ).order_by('-rank').values_list('course_id', 'rank')[:limit]
+        for course_id, rank in lesson_hits:
+            ranks[course_id] = max(ranks.get(course_id, 0), rank * LESSON_RANK_FACTOR)
+        return ranks
+
+
+class SQLiteSearchBackend:
+    """FTS5 virtual table; rowid is 2*id for courses and 2*id+1 for lessons."""
+
+    def _execute(self, sql: str, params=()) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def index_course(self, course: Course) -> None:
+        username = course.teacher.username if course.teacher_id else ''
+        self.remove_course(course.pk)
+        self._execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, kind, course_id, title, body) VALUES (%s, 'course', %s, %s, %s)",
+            [course.pk * 2, course.pk, course.title, f"{course.description} {username}"]
+        )
+
+    def index_lesson(self, lesson: Lesson) -> None:
+        self.remove_lesson(lesson.pk)
+        if lesson.course_id:
+            self._execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, kind, course_id, title, body) VALUES (%s, 'lesson', %s, %s, %s)",
+                [lesson.pk * 2 + 1, lesson.course_id, lesson.title, lesson.content]
+            )
+
+    def remove_course(self, course_id: int) -> None:
+        self._execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [course_id * 2])
+
+    def remove_lesson(self, lesson_id: int) -> None:
+        self._execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [lesson_id * 2 + 1])
+
+    def rebuild(self) -> int:
+        self._execute(f"DELETE FROM {FTS_TABLE}")
+        count = 0
+        for course in Course.objects.select_related('teacher').iterator():
+            self.index_course(course)
+            count += 1
+        for lesson in Lesson.objects.filter(course__isnull=False).iterator():
+            self.index_lesson(lesson)
+            count += 1
+        return count
+
+    def match(self, query: str, limit: int) -> Dict[int, float]:
+        terms = _terms(query)
+        if not terms:
+            return {}
+        # Quoted prefix terms: no FTS syntax injection, "acquer" finds "acquerello"
+        fts_query = ' '.join(f'"{term}"*' for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT kind, course_id, -bm25({FTS_TABLE}, 0, 0, 10.0, 1.0) AS rank "
+                f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank DESC LIMIT %s",
+                [fts_query, limit]
+            )
+            rows = cursor.fetchall()
+
+        ranks: Dict[int, float] = {}
+        for kind, course_id, rank in rows:
+            if kind == 'lesson':
+                rank *= LESSON_RANK_FACTOR
+            ranks[course_id] = max(ranks.get(course_id, 0), rank)
+        return ranks
+
+
+_backends = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend():
+    """Return the search backend for the default database."""
+    backend_class = _backends.get(connection.vendor)
+    if backend_class is None:
+        raise NotImplementedError(f"Full-text search is not supported on {connection.vendor}")
+    return backend_class()
+
+
+class CourseSearchFilter(BaseFilterBackend):
+    """
+    Drop-in replacement for DRF ``SearchFilter`` on course lists: ``?search=``
+    is resolved through the search index instead of ``ILIKE`` scans.
+    """
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        limit = getattr(settings, 'SEARCH_MAX_RESULTS', 200)
+        return queryset.filter(id__in=list(get_search_backend().match(query, limit)))
@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import (
     Lesson, Exercise, Course, CourseEnrollment, ExerciseSubmission,
@@ -5,6 +6,9 @@ from .models import (
 )
 from users.models import User
 from users.serializers import UserSerializer
+from services.enrollment_access_service import enrollment_access_service
+from services.video_stream_service import video_stream_service
+from services.image_derivative_service import image_derivative_service
 
 class LessonListSerializer(serializers.ModelSerializer):
     exercises_count = serializers.SerializerMethodField()
@@ -15,6 +19,9 @@ class LessonListSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'order', 'duration', 'lesson_type', 'lesson_type_display', 'exercises_count']
     
     def get_exercises_count(self, obj):
+        # Annotated by the catalog queryset, counted otherwise
+        if hasattr(obj, 'exercises_count'):
+            return obj.exercises_count
         return obj.exercises.count()
 
 class ExerciseSubmissionSerializer(serializers.ModelSerializer):
@@ -141,10 +148,10 @@ class LessonSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'teacher']
     
     def get_video_file_url(self, obj):
-        if obj.video_file:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.video_file.url)
+        # Signed stream URL, only for users who may access the course
+        request = self.context.get('request')
+        if obj.video_file and request:
+            return video_stream_service.get_stream_url(request.user, obj, request)
         return None
     
     def validate_course(self, value):
@@ -192,6 +199,7 @@ class CourseSerializer(serializers.ModelSerializer):
     category_display = serializers.CharField(source='get_category_display', read_only=True)
     student_count = serializers.SerializerMethodField()
     cover_image_url = serializers.SerializerMethodField()
+    cover_image_srcset = serializers.SerializerMethodField()
     teocoin_price = serializers.SerializerMethodField()
     price = serializers.DecimalField(max_digits=10, decimal_places=2, source='price_eur', required=False)
 
@@ -199,7 +207,7 @@ class CourseSerializer(serializers.ModelSerializer):
         model = Course
         fields = [
             'id', 'title', 'description', 'category', 'category_display', 'cover_image', 'cover_image_url',
-            'price', 'price_eur', 'teocoin_price', 'teocoin_discount_percent', 'teocoin_reward', 'teacher', 'lessons', 'total_duration', 'students', 'student_count',
+            'cover_image_srcset', 'price', 'price_eur', 'teocoin_price', 'teocoin_discount_percent', 'teocoin_reward', 'teacher', 'lessons', 'total_duration', 'students', 'student_count',
             'created_at', 'updated_at', 'is_enrolled', 'is_approved'
         ]
         read_only_fields = ['teacher', 'students']
@@ -215,8 +223,7 @@ class CourseSerializer(serializers.ModelSerializer):
         return sum(lesson.duration for lesson in obj.lessons.all())
 
     def get_is_enrolled(self, obj):
-        user = self.context['request'].user
-        return obj.students.filter(pk=user.pk).exists()
+        return enrollment_access_service.is_enrolled(self.context['request'].user, obj)
     
     def get_student_count(self, obj):
     
@@ -230,7 +237,64 @@ class CourseSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.cover_image.url)
             return obj.cover_image.url
         return None
+
+    def get_cover_image_srcset(self, obj):
+        return image_derivative_service.get_srcset(obj, 'course_cover', self.context.get('request'))
     
+class CourseCatalogSerializer(serializers.ModelSerializer):
+    """
+    Lean catalog projection of a course.
+
+    Expects the annotations of ``CourseService.get_catalog_queryset``; lessons
+    are only included with ``expand_lessons`` in the context (``?expand=lessons``).
+    """
+    teacher = serializers.SerializerMethodField()
+    category_display = serializers.CharField(source='get_category_display', read_only=True)
+    cover_image_url = serializers.SerializerMethodField()
+    cover_image_srcset = serializers.SerializerMethodField()
+    teocoin_price = serializers.SerializerMethodField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, source='price_eur', read_only=True)
+    lesson_count = serializers.IntegerField(read_only=True)
+    student_count = serializers.IntegerField(read_only=True)
+    total_duration = serializers.IntegerField(read_only=True)
+    is_enrolled = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Course
+        fields = [
+            'id', 'title', 'description', 'category', 'category_display', 'cover_image_url', 'cover_image_srcset',
+            'price', 'price_eur', 'teocoin_price', 'teocoin_discount_percent', 'teocoin_reward', 'teacher',
+            'lesson_count', 'student_count', 'total_duration', 'created_at', 'updated_at', 'is_enrolled', 'is_approved'
+        ]
+        read_only_fields = fields
+
+    def to_representation(self, obj):
+        data = super().to_representation(obj)
+        if self.context.get('expand_lessons'):
+            data['lessons'] = LessonListSerializer(obj.catalog_lessons, many=True).data
+        return data
+
+    def get_teacher(self, obj):
+        return {
+            'id': obj.teacher.id,
+            'username': obj.teacher.username,
+            'first_name': obj.teacher.first_name,
+            'last_name': obj.teacher.last_name,
+        }
+
+    def get_teocoin_price(self, obj):
+        return obj.get_teocoin_price()
+
+    def get_cover_image_url(self, obj):
+        # Card-sized variant once generated, the original until then
+        return image_derivative_service.get_url(
+            obj, 'course_cover', getattr(settings, 'IMAGE_DERIVATIVE_CATALOG_WIDTH', 640), self.context.get('request')
+        )
+
+    def get_cover_image_srcset(self, obj):
+        return image_derivative_service.get_srcset(obj, 'course_cover', self.context.get('request'))
+
+
 class CourseEnrollmentSerializer(serializers.ModelSerializer):
     student = serializers.StringRelatedField(read_only=True)
     course = serializers.StringRelatedField(read_only=True)
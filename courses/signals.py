@@ -1,8 +1,15 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.db import transaction
 from django.dispatch import receiver
 from notifications.models import Notification
-from .models import Course, Lesson
+from .models import Course, CourseEnrollment, Lesson, LessonCompletion
 from users.models import User
+from services.course_progress_service import course_progress_service
+from services.image_derivative_service import image_derivative_service
+from .search import get_search_backend
+import logging
+
+logger = logging.getLogger(__name__)
 
 @receiver(post_save, sender=Course)
 def course_status_notification(sender, instance, created, **kwargs):
@@ -103,3 +110,108 @@ def notify_course_completion(course, student):
         notification_type='system_message',
         related_object_id=course.id
     )
+
+
+# ========== PROGRESS COUNTERS ==========
+
+@receiver(pre_save, sender=CourseEnrollment)
+def initialize_enrollment_progress(sender, instance, raw=False, **kwargs):
+    """Start a new enrollment with the current lesson and completion counts"""
+    if raw or not instance._state.adding:
+        return
+    instance.total_lessons = Lesson.objects.filter(course_id=instance.course_id).count()
+    instance.completed_lessons = LessonCompletion.objects.filter(
+        student_id=instance.student_id,
+        lesson__course_id=instance.course_id
+    ).count()
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def initialize_bulk_enrollment_progress(sender, instance, action, reverse, pk_set, **kwargs):
+    """course.students.add() bulk-creates enrollments without pre_save"""
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        enrollments = CourseEnrollment.objects.filter(student=instance, course_id__in=pk_set)
+    else:
+        enrollments = CourseEnrollment.objects.filter(course=instance, student_id__in=pk_set)
+    course_progress_service.rebuild(enrollments)
+
+
+@receiver(post_save, sender=LessonCompletion)
+def increment_completed_lessons(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.lesson.course_id:
+        course_progress_service.record_completion(instance.student_id, instance.lesson.course_id, 1)
+
+
+@receiver(post_delete, sender=LessonCompletion)
+def decrement_completed_lessons(sender, instance, **kwargs):
+    course_id = Lesson.objects.filter(pk=instance.lesson_id).values_list('course_id', flat=True).first()
+    if course_id:
+        course_progress_service.record_completion(instance.student_id, course_id, -1)
+
+
+@receiver(pre_save, sender=Lesson)
+def remember_lesson_course(sender, instance, raw=False, **kwargs):
+    """Keep the previous course so a moved lesson updates both courses"""
+    instance._previous_course_id = None
+    if instance.pk and not raw:
+        instance._previous_course_id = Lesson.objects.filter(
+            pk=instance.pk
+        ).values_list('course_id', flat=True).first()
+
+
+@receiver(post_save, sender=Lesson)
+def update_total_lessons_on_lesson_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_course_id = getattr(instance, '_previous_course_id', None)
+    if created or previous_course_id != instance.course_id:
+        for course_id in {previous_course_id, instance.course_id} - {None}:
+            course_progress_service.refresh_course_totals(course_id)
+
+
+@receiver(post_delete, sender=Lesson)
+def update_total_lessons_on_lesson_delete(sender, instance, **kwargs):
+    if instance.course_id:
+        course_progress_service.refresh_course_totals(instance.course_id)
+
+
+# ========== SEARCH INDEX ==========
+
+def _update_search_index(method, argument):
+    # Search is not critical for writes: a stale entry is fixed by rebuild_search_index.
+    # The savepoint keeps a failed index statement from breaking the outer transaction.
+    try:
+        with transaction.atomic():
+            getattr(get_search_backend(), method)(argument)
+    except Exception as e:
+        logger.error(f"Search index update failed ({method}): {e}")
+
+
+@receiver(post_save, sender=Course)
+def index_course(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _update_search_index('index_course', instance)
+
+
+@receiver(post_delete, sender=Course)
+def unindex_course(sender, instance, **kwargs):
+    _update_search_index('remove_course', instance.pk)
+
+
+@receiver(post_save, sender=Lesson)
+def index_lesson(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _update_search_index('index_lesson', instance)
+
+
+@receiver(post_delete, sender=Lesson)
+def unindex_lesson(sender, instance, **kwargs):
+    _update_search_index('remove_lesson', instance.pk)
+
+
+@receiver(post_save, sender=Course)
+def queue_cover_image_derivatives(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        image_derivative_service.mark_pending('course_cover', instance, update_fields)
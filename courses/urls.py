@@ -7,7 +7,8 @@ from courses.views.courses import (
     CourseDetailView, 
     CreateCourseAPI,
     CourseListAPIView,
-    CourseDetailAPIView
+    CourseDetailAPIView,
+    CourseSearchView
 )
 
 
@@ -42,6 +43,14 @@ from courses.views.lessons import (
     MarkLessonCompleteView
 )
 
+# === LESSON VIDEO UPLOADS ===
+from courses.views.uploads import (
+    LessonVideoUploadCreateView,
+    LessonVideoUploadDetailView,
+    LessonVideoUploadCompleteView
+)
+from courses.views.streaming import lesson_video_stream
+
 # === EXERCISES ===
 from courses.views.exercises import (
     CreateExerciseView,
@@ -76,6 +85,7 @@ urlpatterns = [
     
     # === COURSES ===
     path('courses/', CourseListCreateView.as_view(), name='course-list-create'),
+    path('courses/search/', CourseSearchView.as_view(), name='course-search'),
     path('courses/<int:pk>/', CourseDetailView.as_view(), name='course-detail'),
     path('courses/<int:course_id>/purchase/', PurchaseCourseView.as_view(), name='course-purchase'),
 
@@ -99,6 +109,12 @@ urlpatterns = [
     path('lessons/<int:lesson_id>/exercises/', LessonExercisesView.as_view(), name='lesson-exercises'),
     path('lessons/<int:lesson_id>/mark_complete/', MarkLessonCompleteView.as_view(), name='lesson-mark-complete'),
 
+    # === LESSON VIDEO UPLOADS (chunked, resumable) ===
+    path('lessons/<int:lesson_id>/video-uploads/', LessonVideoUploadCreateView.as_view(), name='lesson-video-upload-create'),
+    path('lessons/<int:lesson_id>/video-uploads/<uuid:upload_id>/', LessonVideoUploadDetailView.as_view(), name='lesson-video-upload-detail'),
+    path('lessons/<int:lesson_id>/video-uploads/<uuid:upload_id>/complete/', LessonVideoUploadCompleteView.as_view(), name='lesson-video-upload-complete'),
+    path('lessons/<int:lesson_id>/video/stream/', lesson_video_stream, name='lesson-video-stream'),
+
     # === EXERCISES ===
     path('exercises/create/', CreateExerciseView.as_view(), name='create-exercise'),
     path('exercises/<int:exercise_id>/submit/', SubmitExerciseView.as_view(), name='submit-exercise'),
@@ -1,7 +1,45 @@
 import os
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import UploadedFile
 
+VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.mkv']
+VIDEO_MIME_TYPES = [
+    'video/mp4',
+    'video/avi',
+    'video/quicktime',
+    'video/x-msvideo',
+    'video/x-flv',
+    'video/webm',
+    'video/x-matroska'
+]
+
+
+def get_video_max_size():
+    """Dimensione massima di un video in byte (VIDEO_UPLOAD_MAX_SIZE, default 200MB)"""
+    return getattr(settings, 'VIDEO_UPLOAD_MAX_SIZE', 200 * 1024 * 1024)
+
+
+def validate_video_metadata(name, size, content_type=None):
+    """
+    Controlla nome, dimensione e tipo MIME di un video.
+
+    Usato sia per gli upload diretti sia per quelli a blocchi
+    (services/video_upload_service.py), prima di ricevere i dati.
+    """
+    max_size = get_video_max_size()
+    if size > max_size:
+        raise ValidationError(f'Il file video è troppo grande. Massimo {max_size // (1024*1024)}MB permessi.')
+
+    file_extension = os.path.splitext(name)[1].lower()
+    if file_extension not in VIDEO_EXTENSIONS:
+        raise ValidationError(f'Formato file non supportato. Estensioni permesse: {", ".join(VIDEO_EXTENSIONS)}')
+
+    if content_type:
+        if not any(content_type.startswith(mime) for mime in VIDEO_MIME_TYPES):
+            raise ValidationError(f'Tipo MIME non supportato: {content_type}')
+
+
 def validate_video_file(file):
     """
     Validator per file video che controlla:
@@ -11,29 +49,5 @@ def validate_video_file(file):
     """
     if not isinstance(file, UploadedFile):
         return
-    
-    # Check file size (200MB max)
-    max_size = 200 * 1024 * 1024  # 200MB in bytes
-    if file.size > max_size:
-        raise ValidationError(f'Il file video è troppo grande. Massimo {max_size // (1024*1024)}MB permessi.')
-    
-    # Check file extension
-    valid_extensions = ['.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.mkv']
-    file_extension = os.path.splitext(file.name)[1].lower()
-    if file_extension not in valid_extensions:
-        raise ValidationError(f'Formato file non supportato. Estensioni permesse: {", ".join(valid_extensions)}')
-    
-    # Check MIME type
-    valid_mime_types = [
-        'video/mp4',
-        'video/avi',
-        'video/quicktime',
-        'video/x-msvideo',
-        'video/x-flv',
-        'video/webm',
-        'video/x-matroska'
-    ]
-    
-    if hasattr(file, 'content_type') and file.content_type:
-        if not any(file.content_type.startswith(mime) for mime in valid_mime_types):
-            raise ValidationError(f'Tipo MIME non supportato: {file.content_type}')
+
+    validate_video_metadata(file.name, file.size, getattr(file, 'content_type', None))
@@ -2,6 +2,7 @@ from rest_framework import generics, status, viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters as drf_filters
@@ -11,8 +12,11 @@ import logging
 
 from users.permissions import IsAdminOrApprovedTeacherOrReadOnly, IsTeacher
 from courses.models import Course
-from courses.serializers import CourseSerializer
+from courses.search import CourseSearchFilter
+from core.conditional import conditional_get, course_last_modified
+from courses.serializers import CourseCatalogSerializer, CourseSerializer
 from services.course_service import course_service
+from services.search_service import search_service
 from services.exceptions import CourseNotFoundError, TeoArtServiceException
 
 logger = logging.getLogger(__name__)
@@ -34,25 +38,33 @@ class CourseViewSet(viewsets.ModelViewSet):
 class CourseListCreateView(generics.ListCreateAPIView):
     serializer_class = CourseSerializer
     permission_classes = [IsAuthenticated, IsAdminOrApprovedTeacherOrReadOnly]
-    filter_backends = [DjangoFilterBackend, drf_filters.SearchFilter, drf_filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, CourseSearchFilter, drf_filters.OrderingFilter]
     filterset_fields = ['teacher', 'price_eur', 'category']
-    search_fields = ['title', 'description', 'teacher__username']
     ordering_fields = ['created_at', 'price_eur', 'student_count']
     ordering = ['-created_at']  # Default ordering by newest
 
+    def _expand_lessons(self):
+        return 'lessons' in self.request.GET.get('expand', '').split(',')
+
+    def get_serializer_class(self):
+        # Il catalogo usa la proiezione leggera, la creazione il serializer completo
+        if self.request.method == 'GET':
+            return CourseCatalogSerializer
+        return CourseSerializer
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand_lessons'] = self._expand_lessons()
+        return context
+
     def get_queryset(self):
         # Mostra solo corsi approvati per utenti non admin
         user = self.request.user
-        if user.is_staff or user.is_superuser:
-            # Admin può vedere tutti i corsi
-            queryset = Course.objects.all()
-        else:
-            # Altri utenti vedono solo corsi approvati
-            queryset = Course.objects.filter(is_approved=True)
-            
-        queryset = queryset.annotate(
-            student_count=models.Count('students')
-        ).prefetch_related('students', 'teacher', 'lessons')
+        queryset = course_service.get_catalog_queryset(
+            user=user,
+            include_unapproved=user.is_staff or user.is_superuser,
+            expand_lessons=self._expand_lessons(),
+        )
         
         # Filtro per categoria se specificato tramite query params
         category = self.request.GET.get('category')
@@ -107,6 +119,10 @@ class CourseDetailView(generics.RetrieveUpdateDestroyAPIView):
             logger.error(f"Error in get_object: {e}")
             raise
 
+    @conditional_get(course_last_modified)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def perform_update(self, serializer):
         try:
             if serializer.instance.teacher != self.request.user:
@@ -202,4 +218,38 @@ class CourseDetailAPIView(generics.RetrieveAPIView):
             return Response(
                 {'error': 'An error occurred while retrieving course details'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class CourseSearchView(APIView):
+    """
+    Ranked full-text search over courses and lessons with category facets
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), 100)
+        except ValueError:
+            limit = 20
+
+        try:
+            result = search_service.search_courses(
+                request.query_params.get('q', ''),
+                user=request.user,
+                category=request.query_params.get('category') or None,
+                limit=limit,
+            )
+        except TeoArtServiceException as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = CourseCatalogSerializer(result['results'], many=True, context={'request': request}).data
+        for course_data, course in zip(results, result['results']):
+            course_data['rank'] = round(course.search_rank, 4)
+
+        return Response({
+            'query': result['query'],
+            'count': result['total'],
+            'results': results,
+            'facets': result['facets'],
+        })
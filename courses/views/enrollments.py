@@ -435,9 +435,8 @@ class CourseEnrollmentView(APIView):
                     debug_messages.append("ℹ️ No discount absorption needed")
                 
                 # Invalidate student dashboard cache
-                from django.core.cache import cache
-                student_dashboard_cache_key = f'student_dashboard_{request.user.id}'
-                cache.delete(student_dashboard_cache_key)
+                from services.dashboard_service import dashboard_service
+                dashboard_service.invalidate(request.user.id, 'courses', 'lessons', 'balance')
                 debug_messages.append("🗑️ Student dashboard cache invalidated")
                 
                 debug_messages.append("🎉 Enrollment completed successfully!")
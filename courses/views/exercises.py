@@ -10,6 +10,7 @@ from django.db.models import Q
 from courses.models import Exercise, Lesson, Course, ExerciseSubmission, ExerciseReview
 from courses.serializers import ExerciseSerializer, ExerciseSubmissionSerializer
 from users.permissions import IsTeacher
+from services.enrollment_access_service import enrollment_access_service
 from django.utils import timezone
 from datetime import timedelta
 import random
@@ -129,7 +130,7 @@ class SubmitExerciseView(APIView):
         exercise = get_object_or_404(Exercise, id=exercise_id)
         course = exercise.lesson.course
 
-        if not course.students.filter(id=request.user.id).exists():
+        if not enrollment_access_service.is_enrolled(request.user, course):
             return Response({"error": "Non hai acquistato il corso associato a questo esercizio."}, status=status.HTTP_403_FORBIDDEN)
 
         if ExerciseSubmission.objects.filter(exercise=exercise, student=request.user).exists():
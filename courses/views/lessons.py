@@ -9,11 +9,25 @@ from rest_framework.generics import RetrieveAPIView
 from courses.models import Lesson, Course, LessonCompletion, CourseEnrollment
 from courses.serializers import LessonSerializer, LessonListSerializer
 from users.permissions import IsTeacher, IsAdminOrApprovedTeacherOrReadOnly
+from services.enrollment_access_service import enrollment_access_service
+from core.conditional import conditional_get, course_last_modified, lesson_last_modified
+
+
+def _is_enrolled(user, course):
+    """Cached enrollment check, confirmed in the database before a completion is written."""
+    if not enrollment_access_service.is_enrolled(user, course):
+        return False
+    if CourseEnrollment.objects.filter(student=user, course=course).exists():
+        return True
+    # The cached check was stale: the student has left the course
+    enrollment_access_service.invalidate(user.id)
+    return False
 
 
 class CourseLessonsView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    @conditional_get(course_last_modified)
     def get(self, request, course_id):
         course = get_object_or_404(Course, id=course_id)
         user = request.user
@@ -22,12 +36,8 @@ class CourseLessonsView(APIView):
         has_access = False
         
         if user.is_authenticated:
-            # Staff, superuser, and course teacher always have access
-            if user.is_staff or user.is_superuser or course.teacher == user:
-                has_access = True
-            # Students need to be enrolled in the course
-            elif course.is_approved and CourseEnrollment.objects.filter(student=user, course=course).exists():
-                has_access = True
+            # Staff, superuser and course teacher always have access, students need to be enrolled
+            has_access = enrollment_access_service.can_access_course(user, course)
         else:
             # Unauthenticated users can see lessons only if course is approved (for preview)
             has_access = course.is_approved
@@ -66,14 +76,14 @@ class LessonViewSet(viewsets.ModelViewSet):
         course = lesson.course
         if not course:
             return Response({"detail": "Lezione non associata a nessun corso."}, status=status.HTTP_400_BAD_REQUEST)
-        if request.user not in course.students.all():
+        if not _is_enrolled(request.user, course):
             return Response(
                 {"detail": "Non sei iscritto a questo corso."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
         # Registra il completamento della lezione per lo studente
-        completion, created = LessonCompletion.objects.get_or_create(student=request.user, lesson=lesson)
+        LessonCompletion.objects.get_or_create(student=request.user, lesson=lesson)
 
         # Import here to avoid circular imports
         try:
@@ -81,22 +91,15 @@ class LessonViewSet(viewsets.ModelViewSet):
             
             # The automated reward system will be triggered by the signal
             # But we can also check course completion here for immediate feedback
-            total_lessons = course.lessons.count()
-            completed_lessons = LessonCompletion.objects.filter(
-                student=request.user,
-                lesson__course=course
-            ).count()
+            enrollment = CourseEnrollment.objects.get(student=request.user, course=course)
+            total_lessons = enrollment.total_lessons
+            completed_lessons = enrollment.completed_lessons
             
-            if completed_lessons >= total_lessons:
+            if enrollment.all_lessons_completed:
                 # Mark course as completed and trigger completion bonus
-                enrollment, _ = CourseEnrollment.objects.get_or_create(
-                    student=request.user,
-                    course=course
-                )
-                
                 if not enrollment.completed:
                     enrollment.completed = True
-                    enrollment.save()
+                    enrollment.save(update_fields=['completed'])
                     
                     return Response({
                         "completed": True, 
@@ -181,6 +184,7 @@ class LessonDetailView(RetrieveAPIView):
     lookup_field = 'id'
     lookup_url_kwarg = 'lesson_id'
 
+    @conditional_get(lesson_last_modified, embeds_stream_urls=True)
     def get(self, request, *args, **kwargs):
         lesson = self.get_object()
         course = lesson.course
@@ -221,11 +225,13 @@ class MarkLessonCompleteView(APIView):
         course = lesson.course
         if not course:
             return Response({"detail": "Lezione non associata a nessun corso."}, status=status.HTTP_400_BAD_REQUEST)
-        if request.user not in course.students.all():
+        if not _is_enrolled(request.user, course):
             return Response({"detail": "Non sei iscritto a questo corso."}, status=status.HTTP_400_BAD_REQUEST)
         LessonCompletion.objects.get_or_create(student=request.user, lesson=lesson)
-        total = Lesson.objects.filter(course=course).count()
-        if lesson.order == total:
+        enrollment = CourseEnrollment.objects.only('completed_lessons', 'total_lessons').get(
+            student=request.user, course=course
+        )
+        if enrollment.all_lessons_completed:
             return Response({"completed": True, "detail": "Corso completato!"}, status=status.HTTP_200_OK)
         else:
             return Response({"completed": True, "detail": "Lezione segnata come completata."}, status=status.HTTP_200_OK)
@@ -0,0 +1,22 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from services.exceptions import TeoArtServiceException
+from services.video_stream_service import video_stream_service
+
+
+@require_safe
+def lesson_video_stream(request, lesson_id):
+    """
+    Serve a lesson video from a signed stream URL (``LessonSerializer.video_file_url``).
+
+    The access check happened when the URL was issued: this view only verifies
+    the signature, so seeks (Range requests) cost no database query. No
+    session or JWT is needed, as <video> elements cannot send an
+    Authorization header.
+    """
+    try:
+        name = video_stream_service.verify_token(lesson_id, request.GET.get('token'))
+        return video_stream_service.serve(request, name)
+    except TeoArtServiceException as e:
+        return JsonResponse({'error': e.message, 'code': e.code}, status=e.status_code)
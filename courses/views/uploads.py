@@ -0,0 +1,116 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from courses.models import Lesson
+from courses.serializers import LessonSerializer
+from services.exceptions import TeoArtServiceException
+from services.video_upload_service import video_upload_service
+from users.permissions import IsTeacher
+
+
+def _error_response(e: TeoArtServiceException, upload=None):
+    data = {'error': e.message, 'code': e.code}
+    offset = getattr(e, 'offset', None)
+    if offset is None and upload is not None:
+        offset = upload.received_bytes
+    headers = {}
+    if offset is not None:
+        data['offset'] = offset
+        headers['Upload-Offset'] = str(offset)
+    return Response(data, status=e.status_code, headers=headers)
+
+
+class LessonVideoUploadCreateView(APIView):
+    """
+    POST: start a chunked upload of the lesson video.
+
+    Body: filename, size (bytes), checksum (SHA-256 hex), content_type
+    """
+    permission_classes = [IsAuthenticated, IsTeacher]
+
+    def post(self, request, lesson_id):
+        lesson = get_object_or_404(Lesson, id=lesson_id)
+        try:
+            size = int(request.data.get('size') or 0)
+        except (TypeError, ValueError):
+            return Response({'error': "Dimensione non valida"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            upload = video_upload_service.create_upload(
+                request.user,
+                lesson,
+                filename=request.data.get('filename'),
+                total_size=size,
+                checksum_sha256=request.data.get('checksum'),
+                content_type=request.data.get('content_type', ''),
+            )
+        except TeoArtServiceException as e:
+            return _error_response(e)
+        return Response(video_upload_service.get_status(upload), status=status.HTTP_201_CREATED)
+
+
+class LessonVideoUploadDetailView(APIView):
+    """
+    GET: upload status and offset to resume from.
+    PUT: raw chunk bytes at the ``Upload-Offset`` header offset.
+    DELETE: abort the upload.
+
+    The PUT body is read from the request stream, never through request.data,
+    so it is neither parsed nor buffered in memory.
+    """
+    permission_classes = [IsAuthenticated, IsTeacher]
+
+    def get(self, request, lesson_id, upload_id):
+        try:
+            upload = video_upload_service.get_upload(upload_id, request.user, lesson_id)
+        except TeoArtServiceException as e:
+            return _error_response(e)
+        return Response(
+            video_upload_service.get_status(upload),
+            headers={'Upload-Offset': str(upload.received_bytes), 'Cache-Control': 'no-store'}
+        )
+
+    def put(self, request, lesson_id, upload_id):
+        upload = None
+        try:
+            upload = video_upload_service.get_upload(upload_id, request.user, lesson_id)
+            try:
+                offset = int(request.headers['Upload-Offset'])
+                length = int(request.headers['Content-Length'])
+            except (KeyError, ValueError):
+                return Response(
+                    {'error': "Header Upload-Offset e Content-Length obbligatori"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            new_offset = video_upload_service.write_chunk(upload, offset, request.stream, length)
+        except TeoArtServiceException as e:
+            return _error_response(e, upload)
+        return Response(
+            {'offset': new_offset, 'total_size': upload.total_size},
+            headers={'Upload-Offset': str(new_offset)}
+        )
+
+    def delete(self, request, lesson_id, upload_id):
+        try:
+            upload = video_upload_service.get_upload(upload_id, request.user, lesson_id)
+            video_upload_service.abort_upload(upload)
+        except TeoArtServiceException as e:
+            return _error_response(e)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class LessonVideoUploadCompleteView(APIView):
+    """POST: verify the checksum and attach the uploaded video to the lesson."""
+    permission_classes = [IsAuthenticated, IsTeacher]
+
+    def post(self, request, lesson_id, upload_id):
+        upload = None
+        try:
+            upload = video_upload_service.get_upload(upload_id, request.user, lesson_id)
+            lesson = video_upload_service.complete_upload(upload)
+        except TeoArtServiceException as e:
+            return _error_response(e, upload)
+        return Response(LessonSerializer(lesson, context={'request': request}).data)
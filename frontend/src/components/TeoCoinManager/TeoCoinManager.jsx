@@ -501,7 +501,10 @@ const TeoCoinManager = ({ open, onClose, userBalance = 0 }) => {
 
       if (response.ok && data.success) {
         // SUCCESS - same as BurnDepositInterface
-        showAlert(`🎉 Successfully deposited ${burnAmount} TEO to your platform balance! TX: ${txHash.substring(0, 10)}...`, 'success');
+        // pending: the burn is credited by the chain indexer once confirmed
+        showAlert(data.pending
+          ? `⏳ ${data.message}. TX: ${txHash.substring(0, 10)}...`
+          : `🎉 Successfully deposited ${burnAmount} TEO to your platform balance! TX: ${txHash.substring(0, 10)}...`, 'success');
         setBurnAmount('');
         
         // Force multiple balance refreshes to ensure database sync
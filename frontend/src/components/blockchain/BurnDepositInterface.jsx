@@ -250,7 +250,10 @@ const BurnDepositInterface = ({ onTransactionComplete }) => {
       const data = response.data;
 
       if (data && data.success) {
-        setSuccess(`🎉 Successfully deposited ${burnAmount} TEO to your platform balance! TX: ${txHash.substring(0, 10)}...`);
+        // pending: the burn is credited by the chain indexer once confirmed
+        setSuccess(data.pending
+          ? `⏳ ${data.message}. TX: ${txHash.substring(0, 10)}...`
+          : `🎉 Successfully deposited ${burnAmount} TEO to your platform balance! TX: ${txHash.substring(0, 10)}...`);
         setBurnAmount('');
         setShowModal(false);
         
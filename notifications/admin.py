@@ -1,8 +1,24 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, NotificationArchive, EmailOutbox
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ('user', 'notification_type', 'message', 'read', 'created_at')
     list_filter = ('notification_type', 'read', 'created_at')
     search_fields = ('user__username', 'message')
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ('user', 'notification_type', 'message', 'created_at', 'archived_at')
+    list_filter = ('notification_type', 'archived_at')
+    search_fields = ('user__username',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('to_email', 'subject', 'category', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'category')
+    search_fields = ('to_email', 'subject')
+    raw_id_fields = ('user',)
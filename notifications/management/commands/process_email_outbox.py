@@ -0,0 +1,50 @@
+"""
+Management command to deliver queued emails from the outbox
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from services.email_outbox_service import email_outbox_service
+
+
+class Command(BaseCommand):
+    help = 'Send pending emails from the outbox in batches over one SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Maximum emails per batch (default: EMAIL_OUTBOX_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running as a worker, polling the outbox'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds between polls when running with --loop'
+        )
+
+    def handle(self, *args, **options):
+        released = email_outbox_service.release_stuck_emails()
+        if released:
+            self.stdout.write(self.style.WARNING(f'♻️ Released {released} stuck emails'))
+
+        while True:
+            result = email_outbox_service.process_outbox(batch_size=options['batch_size'])
+            if result['claimed'] or not options['loop']:
+                self.stdout.write(
+                    f"📧 Sent: {result['sent']}, retried: {result['retried']}, failed: {result['failed']}"
+                    + (' (rate limited)' if result['rate_limited'] else '')
+                )
+
+            if not options['loop']:
+                break
+            # Drain the backlog quickly, poll slowly when idle
+            if not result['claimed']:
+                time.sleep(options['interval'])
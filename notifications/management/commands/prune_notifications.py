@@ -0,0 +1,82 @@
+"""
+Management command to compact and prune old read notifications
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.exceptions import TeoArtServiceException
+from services.notification_retention_service import notification_retention_service
+
+
+class Command(BaseCommand):
+    help = 'Archive or delete read notifications older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Retention window in days (default: NOTIFICATION_RETENTION_DAYS)'
+        )
+        parser.add_argument(
+            '--mode',
+            choices=notification_retention_service.RETENTION_MODES,
+            help='archive or delete (default: NOTIFICATION_RETENTION_MODE)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Rows processed per transaction (default: NOTIFICATION_RETENTION_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--max-batches',
+            type=int,
+            help='Stop after this many prune batches'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be processed without actually doing it'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running as a worker'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=3600.0,
+            help='Seconds between runs with --loop'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                result = notification_retention_service.run_retention(
+                    retention_days=options['days'],
+                    mode=options['mode'],
+                    batch_size=options['batch_size'],
+                    max_batches=options['max_batches'],
+                    dry_run=options['dry_run'],
+                )
+            except TeoArtServiceException as e:
+                raise CommandError(str(e))
+
+            if result['compacted'] or result['pruned'] or not options['loop']:
+                self._report(result)
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def _report(self, result):
+        prefix = '🔍 DRY RUN - ' if result['dry_run'] else ''
+        self.stdout.write(f"📅 Cutoff: {result['cutoff']} (mode: {result['mode']})")
+        self.stdout.write(
+            f"{prefix}🗜️ Compacted {result['compacted']} notifications into {result['digests_created']} digests"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"{prefix}✅ Pruned {result['pruned']} notifications in {result['batches']} batches")
+        )
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_link'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(db_index=True)),
+                ('message', models.TextField()),
+                ('notification_type', models.CharField(choices=[('lesson_purchased', 'Acquisto Lezione'), ('course_purchased', 'Acquisto Corso'), ('course_sold', 'Corso Venduto'), ('lesson_sold', 'Lezione Venduta'), ('exercise_graded', 'Esercizio Valutato'), ('review_assigned', 'Esercizio da valutare'), ('review_completed', 'Review Completata'), ('review_expired', 'Review scaduta'), ('review_replaced', 'Reviewer rimpiazzato'), ('course_completed', 'Corso Completato'), ('teacher_approved', 'Teacher approvato'), ('teacher_rejected', 'Teacher rifiutato'), ('course_approved', 'Corso approvato'), ('course_rejected', 'Corso rifiutato'), ('teocoins_earned', 'TeoCoins Guadagnati'), ('teocoins_spent', 'TeoCoins Spesi'), ('reward_earned', 'Premio Ottenuto'), ('bonus_received', 'Bonus Ricevuto'), ('teocoin_discount_pending', 'TeoCoin Discount - Teacher Decision Required'), ('teocoin_discount_accepted', 'TeoCoin Discount - Accepted by Teacher'), ('teocoin_discount_rejected', 'TeoCoin Discount - Rejected by Teacher'), ('teocoin_discount_expired', 'TeoCoin Discount - Expired (Auto-Rejected)'), ('new_course_published', 'Nuovo Corso Pubblicato'), ('new_lesson_added', 'Nuova Lezione Aggiunta'), ('course_updated', 'Corso Aggiornato'), ('achievement_unlocked', 'Achievement Sbloccato'), ('level_up', 'Livello Aumentato'), ('system_message', 'Messaggio di Sistema'), ('welcome_message', 'Messaggio di Benvenuto'), ('notification_digest', 'Riepilogo Notifiche')], max_length=30)),
+                ('related_object_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('link', models.CharField(blank=True, max_length=255, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Notifica Archiviata',
+                'verbose_name_plural': 'Notifiche Archiviate',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('lesson_purchased', 'Acquisto Lezione'), ('course_purchased', 'Acquisto Corso'), ('course_sold', 'Corso Venduto'), ('lesson_sold', 'Lezione Venduta'), ('exercise_graded', 'Esercizio Valutato'), ('review_assigned', 'Esercizio da valutare'), ('review_completed', 'Review Completata'), ('review_expired', 'Review scaduta'), ('review_replaced', 'Reviewer rimpiazzato'), ('course_completed', 'Corso Completato'), ('teacher_approved', 'Teacher approvato'), ('teacher_rejected', 'Teacher rifiutato'), ('course_approved', 'Corso approvato'), ('course_rejected', 'Corso rifiutato'), ('teocoins_earned', 'TeoCoins Guadagnati'), ('teocoins_spent', 'TeoCoins Spesi'), ('reward_earned', 'Premio Ottenuto'), ('bonus_received', 'Bonus Ricevuto'), ('teocoin_discount_pending', 'TeoCoin Discount - Teacher Decision Required'), ('teocoin_discount_accepted', 'TeoCoin Discount - Accepted by Teacher'), ('teocoin_discount_rejected', 'TeoCoin Discount - Rejected by Teacher'), ('teocoin_discount_expired', 'TeoCoin Discount - Expired (Auto-Rejected)'), ('new_course_published', 'Nuovo Corso Pubblicato'), ('new_lesson_added', 'Nuova Lezione Aggiunta'), ('course_updated', 'Corso Aggiornato'), ('achievement_unlocked', 'Achievement Sbloccato'), ('level_up', 'Livello Aumentato'), ('system_message', 'Messaggio di Sistema'), ('welcome_message', 'Messaggio di Benvenuto'), ('notification_digest', 'Riepilogo Notifiche')], max_length=30),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'read'], name='notif_user_read_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at'], name='notif_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['read', 'created_at'], name='notif_read_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationarchive',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='notificationarchive',
+            index=models.Index(fields=['user', '-created_at'], name='notif_arch_user_created_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from users.models import User
 
 class Notification(models.Model):
@@ -45,6 +46,7 @@ class Notification(models.Model):
         ('level_up', 'Livello Aumentato'),
         ('system_message', 'Messaggio di Sistema'),
         ('welcome_message', 'Messaggio di Benvenuto'),
+        ('notification_digest', 'Riepilogo Notifiche'),
     )
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
@@ -58,4 +60,84 @@ class Notification(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Notifica"
-        verbose_name_plural = "Notifiche"
\ No newline at end of file
+        verbose_name_plural = "Notifiche"
+        indexes = [
+            models.Index(fields=['user', 'read'], name='notif_user_read_idx'),
+            models.Index(fields=['user', '-created_at'], name='notif_user_created_idx'),
+            models.Index(fields=['read', 'created_at'], name='notif_read_created_idx'),
+        ]
+
+
+class NotificationArchive(models.Model):
+    """
+    Cold storage for read notifications pruned by the retention job.
+
+    Keeps the original payload and timestamps so support/admin can still
+    look up old history without it weighing on the live notification table.
+    """
+    original_id = models.BigIntegerField(db_index=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications')
+    message = models.TextField()
+    notification_type = models.CharField(max_length=30, choices=Notification.NOTIFICATION_TYPES)
+    related_object_id = models.PositiveIntegerField(null=True, blank=True)
+    link = models.CharField(max_length=255, null=True, blank=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Notifica Archiviata"
+        verbose_name_plural = "Notifiche Archiviate"
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notif_arch_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.notification_type} ({self.created_at:%Y-%m-%d})"
+
+
+class EmailOutbox(models.Model):
+    """
+    Outgoing email queued by request handlers and delivered by the outbox worker.
+
+    Views never talk to SMTP directly: they enqueue a row here and
+    ``process_email_outbox`` sends pending rows in batches over one connection.
+    """
+    CATEGORY_CHOICES = (
+        ('transactional', 'Transazionale'),  # verification, security: always sent
+        ('notification', 'Notifica'),        # respects UserSettings.email_notifications
+        ('marketing', 'Marketing'),          # respects UserSettings.marketing_emails
+    )
+    STATUS_CHOICES = (
+        ('pending', 'In attesa'),
+        ('sending', 'In invio'),
+        ('sent', 'Inviata'),
+        ('failed', 'Fallita'),
+        ('skipped', 'Saltata (preferenze utente)'),
+    )
+
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='queued_emails')
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255, blank=True)
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='notification')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "Email in Uscita"
+        verbose_name_plural = "Email in Uscita"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='email_outbox_due_idx'),
+            models.Index(fields=['status', 'sent_at'], name='email_outbox_sent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email} - {self.subject} ({self.status})"
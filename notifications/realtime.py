@@ -0,0 +1,180 @@
+"""
+Real-time event broker for server-push delivery.
+
+Events (new notifications, balance changes, teacher-choice updates) are
+published per user from synchronous code (signals, services) and consumed by
+the Server-Sent Events stream in ``notifications.stream_views``.
+
+Two backends are available, selected with ``NOTIFICATION_PUSH_BACKEND``:
+
+- ``memory``: in-process fan-out, suitable for dev/tests or a single ASGI worker
+- ``redis``: Redis pub/sub, required when running more than one worker process
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, AsyncIterator, Dict, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+EVENT_NOTIFICATION = 'notification'
+EVENT_BALANCE = 'balance'
+EVENT_TEACHER_CHOICE = 'teacher_choice'
+
+
+def _channel_name(user_id: int) -> str:
+    return f"notifications:user:{user_id}"
+
+
+class InMemoryEventBroker:
+    """Fan-out of events to the asyncio queues of the subscribers in this process."""
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[int, set] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, user_id: int, payload: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._put, queue, payload)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, payload: str) -> None:
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Slow consumer: drop the event, the client resyncs on reconnect
+            logger.warning("Dropping real-time event for slow subscriber")
+
+    async def subscribe(self, user_id: int) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        entry = (asyncio.get_running_loop(), queue)
+
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(entry)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            with self._lock:
+                user_subscribers = self._subscribers.get(user_id)
+                if user_subscribers is not None:
+                    user_subscribers.discard(entry)
+                    if not user_subscribers:
+                        del self._subscribers[user_id]
+
+
+class RedisEventBroker:
+    """Redis pub/sub backend so events reach subscribers in every worker."""
+
+    def __init__(self, url: str):
+        import redis
+
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, user_id: int, payload: str) -> None:
+        self._client.publish(_channel_name(user_id), payload)
+
+    async def subscribe(self, user_id: int) -> AsyncIterator[str]:
+        import redis.asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(_channel_name(user_id))
+        try:
+            async for message in pubsub.listen():
+                if message.get('type') != 'message':
+                    continue
+                data = message['data']
+                yield data.decode() if isinstance(data, bytes) else data
+        finally:
+            await pubsub.unsubscribe(_channel_name(user_id))
+            await pubsub.close()
+            await client.close()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the configured broker, created on first use."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = getattr(settings, 'NOTIFICATION_PUSH_BACKEND', 'memory')
+                if backend == 'redis':
+                    _broker = RedisEventBroker(settings.NOTIFICATION_PUSH_REDIS_URL)
+                else:
+                    _broker = InMemoryEventBroker()
+    return _broker
+
+
+def reset_broker() -> None:
+    """Drop the cached broker (used by tests after changing settings)."""
+    global _broker
+    with _broker_lock:
+        _broker = None
+
+
+def encode_event(event_type: str, data: Dict[str, Any]) -> str:
+    return json.dumps({
+        'event': event_type,
+        'timestamp': timezone.now().isoformat(),
+        'data': data,
+    }, cls=DjangoJSONEncoder)
+
+
+def publish_event(user_id: int, event_type: str, data: Dict[str, Any], on_commit: bool = True) -> None:
+    """
+    Push an event to every open stream of a user.
+
+    Args:
+        user_id: Recipient user ID
+        event_type: One of EVENT_NOTIFICATION, EVENT_BALANCE, EVENT_TEACHER_CHOICE
+        data: JSON-serializable payload
+        on_commit: Defer publishing until the current transaction commits
+    """
+    if not getattr(settings, 'NOTIFICATION_PUSH_ENABLED', True):
+        return
+
+    payload = encode_event(event_type, data)
+
+    def _publish():
+        try:
+            get_broker().publish(user_id, payload)
+        except Exception as e:
+            # Push is best effort: clients still resync through the REST endpoints
+            logger.error(f"Real-time publish failed for user {user_id}: {e}")
+
+    if on_commit:
+        transaction.on_commit(_publish)
+    else:
+        _publish()
+
+
+def format_sse(payload: str, event_id: Optional[int] = None) -> str:
+    """Format a broker payload as a Server-Sent Events frame."""
+    try:
+        event_type = json.loads(payload).get('event', 'message')
+    except (TypeError, ValueError):
+        event_type = 'message'
+
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {payload}")
+    return "\n".join(lines) + "\n\n"
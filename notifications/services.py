@@ -8,13 +8,13 @@ Sends notifications to teachers and students about discount requests and decisio
 import logging
 from typing import Dict, Optional
 from django.conf import settings
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils import timezone
 from datetime import timedelta
 
 from notifications.models import Notification
 from users.models import User
+from services.email_outbox_service import email_outbox_service
 
 logger = logging.getLogger(__name__)
 
@@ -320,17 +320,18 @@ class TeoCoinDiscountNotificationService:
             html_message = render_to_string('emails/teacher_discount_decision.html', context)
             plain_message = render_to_string('emails/teacher_discount_decision.txt', context)
             
-            send_mail(
+            # Delivered by the outbox worker, the discount request doesn't wait on SMTP
+            email_outbox_service.queue_email(
+                to_email=teacher.email,
                 subject=subject,
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[teacher.email],
-                html_message=html_message,
-                fail_silently=False
+                body=plain_message,
+                html_body=html_message,
+                user=teacher,
+                category='notification'
             )
             
         except Exception as e:
-            self.logger.error(f"Failed to send teacher email: {e}")
+            self.logger.error(f"Failed to queue teacher email: {e}")
     
     def _send_urgent_email(self, teacher: User, course_title: str, minutes_remaining: int):
         """Send urgent timeout warning email"""
@@ -346,16 +347,16 @@ class TeoCoinDiscountNotificationService:
                 f"If you don't choose, you'll automatically receive full EUR commission."
             )
             
-            send_mail(
+            email_outbox_service.queue_email(
+                to_email=teacher.email,
                 subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[teacher.email],
-                fail_silently=False
+                body=message,
+                user=teacher,
+                category='notification'
             )
             
         except Exception as e:
-            self.logger.error(f"Failed to send urgent email: {e}")
+            self.logger.error(f"Failed to queue urgent email: {e}")
 
 
 # Singleton instance
@@ -0,0 +1,52 @@
+"""
+Push database changes to the users' real-time notification streams
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from blockchain.models import DBTeoCoinBalance
+from rewards.models import TeacherDiscountAbsorption
+from .models import Notification
+from .realtime import EVENT_BALANCE, EVENT_NOTIFICATION, EVENT_TEACHER_CHOICE, publish_event
+
+
+@receiver(post_save, sender=Notification)
+def push_new_notification(sender, instance, created, **kwargs):
+    """Deliver newly created notifications (digest rows are history, not news)"""
+    if not created or instance.read:
+        return
+
+    publish_event(instance.user_id, EVENT_NOTIFICATION, {
+        'id': instance.id,
+        'message': instance.message,
+        'notification_type': instance.notification_type,
+        'related_object_id': instance.related_object_id,
+        'link': instance.link,
+        'read': instance.read,
+        'created_at': instance.created_at,
+    })
+
+
+@receiver(post_save, sender=DBTeoCoinBalance)
+def push_balance_change(sender, instance, **kwargs):
+    """Deliver the new TeoCoin balance after every balance update"""
+    publish_event(instance.user_id, EVENT_BALANCE, {
+        'available_balance': instance.available_balance,
+        'staked_balance': instance.staked_balance,
+        'pending_withdrawal': instance.pending_withdrawal,
+        'total_balance': instance.total_balance,
+    })
+
+
+@receiver(post_save, sender=TeacherDiscountAbsorption)
+def push_teacher_choice_update(sender, instance, created, **kwargs):
+    """Deliver new discount-absorption opportunities and decisions to the teacher"""
+    publish_event(instance.teacher_id, EVENT_TEACHER_CHOICE, {
+        'absorption_id': instance.id,
+        'course_id': instance.course_id,
+        'status': instance.status,
+        'created': created,
+        'expires_at': instance.expires_at,
+        'decided_at': instance.decided_at,
+    })
@@ -0,0 +1,101 @@
+"""
+Server-Sent Events stream for real-time notifications.
+
+Replaces client polling of the notification list / unread-count endpoints:
+the frontend opens one ``EventSource`` per tab and receives ``notification``,
+``balance`` and ``teacher_choice`` events as they happen.
+
+The view is async so an open stream does not hold a thread; serve it through
+the ASGI entry point (``schoolplatform.asgi``) in production.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import Notification
+from .realtime import encode_event, format_sse, get_broker
+
+logger = logging.getLogger(__name__)
+
+
+def _get_user_id(request):
+    """
+    Authenticate the stream with a JWT access token.
+
+    EventSource cannot send custom headers, so the token may also be passed
+    as the ``token`` query parameter.
+    """
+    raw_token = request.GET.get('token')
+    if not raw_token:
+        header = request.headers.get('Authorization', '')
+        if header.startswith('Bearer '):
+            raw_token = header.split(' ', 1)[1]
+    if not raw_token:
+        return None
+
+    try:
+        token = AccessToken(raw_token)
+    except TokenError:
+        return None
+    return token.get(settings.SIMPLE_JWT.get('USER_ID_CLAIM', 'user_id'))
+
+
+async def _event_stream(user_id):
+    heartbeat = getattr(settings, 'NOTIFICATION_STREAM_HEARTBEAT', 15)
+    max_duration = getattr(settings, 'NOTIFICATION_STREAM_MAX_DURATION', 300)
+    deadline = time.monotonic() + max_duration
+
+    # Tell EventSource how fast to reconnect once the stream is recycled
+    yield "retry: 3000\n\n"
+
+    unread_count = await sync_to_async(
+        Notification.objects.filter(user_id=user_id, read=False).count
+    )()
+    yield format_sse(encode_event('ready', {'unread_count': unread_count}))
+
+    subscription = get_broker().subscribe(user_id).__aiter__()
+    next_event = None
+    event_id = 0
+    try:
+        while time.monotonic() < deadline:
+            if next_event is None:
+                next_event = asyncio.ensure_future(subscription.__anext__())
+            done, _ = await asyncio.wait({next_event}, timeout=heartbeat)
+            if not done:
+                yield ": keepalive\n\n"
+                continue
+
+            payload = next_event.result()
+            next_event = None
+            event_id += 1
+            yield format_sse(payload, event_id)
+    finally:
+        if next_event is not None:
+            next_event.cancel()
+            with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+                await next_event
+        await subscription.aclose()
+
+
+async def notification_stream(request):
+    """GET /api/v1/notifications/stream/ - Server-Sent Events for the current user"""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+
+    user_id = _get_user_id(request)
+    if user_id is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided or are invalid'}, status=401)
+
+    response = StreamingHttpResponse(_event_stream(user_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Disable proxy buffering so events are flushed immediately through nginx
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,108 @@
+"""
+Tests for the real-time notification push channel
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import AccessToken
+
+from notifications.models import Notification
+from notifications.realtime import InMemoryEventBroker, format_sse, get_broker, reset_broker
+
+User = get_user_model()
+
+
+class InMemoryEventBrokerTestCase(TestCase):
+    """Test cases for the in-process broker"""
+
+    def test_publish_reaches_only_the_target_user(self):
+        """Events are delivered to the subscribers of the recipient only"""
+        broker = InMemoryEventBroker()
+
+        async def scenario():
+            first = broker.subscribe(1).__aiter__()
+            other = broker.subscribe(2).__aiter__()
+            first_task = asyncio.ensure_future(first.__anext__())
+            other_task = asyncio.ensure_future(other.__anext__())
+            await asyncio.sleep(0)
+
+            broker.publish(1, 'hello')
+            received = await asyncio.wait_for(first_task, timeout=1)
+            await asyncio.sleep(0)
+            self.assertFalse(other_task.done())
+
+            other_task.cancel()
+            await first.aclose()
+            return received
+
+        self.assertEqual(asyncio.run(scenario()), 'hello')
+        self.assertEqual(broker._subscribers.get(1), None)
+
+    def test_format_sse(self):
+        """Payloads are framed with their event name"""
+        frame = format_sse(json.dumps({'event': 'balance', 'data': {}}), event_id=3)
+
+        self.assertTrue(frame.startswith('id: 3\nevent: balance\ndata: '))
+        self.assertTrue(frame.endswith('\n\n'))
+
+
+@override_settings(NOTIFICATION_PUSH_BACKEND='memory', NOTIFICATION_STREAM_MAX_DURATION=0)
+class NotificationPushTestCase(TestCase):
+    """Test cases for signals and the SSE endpoint"""
+
+    def setUp(self):
+        reset_broker()
+        self.user = User.objects.create_user(
+            username='student',
+            email='student@test.com',
+            password='testpass',
+            role='student'
+        )
+
+    def tearDown(self):
+        reset_broker()
+
+    def test_new_notification_is_published_on_commit(self):
+        """Creating a notification publishes a 'notification' event after commit"""
+        published = []
+        get_broker().publish = lambda user_id, payload: published.append((user_id, json.loads(payload)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(
+                user=self.user,
+                message='Nuovo corso',
+                notification_type='new_course_published'
+            )
+
+        self.assertEqual(len(published), 1)
+        user_id, payload = published[0]
+        self.assertEqual(user_id, self.user.id)
+        self.assertEqual(payload['event'], 'notification')
+        self.assertEqual(payload['data']['message'], 'Nuovo corso')
+
+    def test_stream_requires_token(self):
+        """Anonymous clients get a 401"""
+        response = self.client.get('/api/v1/notifications/stream/')
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_sends_initial_unread_count(self):
+        """The stream opens with a 'ready' event carrying the unread count"""
+        Notification.objects.create(user=self.user, message='x', notification_type='system_message')
+        token = str(AccessToken.for_user(self.user))
+
+        async def read_stream():
+            response = await self.async_client.get('/api/v1/notifications/stream/', {'token': token})
+            chunks = [chunk async for chunk in response.streaming_content]
+            return response, b''.join(chunks).decode()
+
+        # async_to_sync keeps thread-sensitive ORM calls on the test's connection
+        response, body = async_to_sync(read_stream)()
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertIn('event: ready', body)
+        self.assertIn('"unread_count": 1', body)
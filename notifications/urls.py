@@ -7,9 +7,11 @@ from .views import (
     NotificationUnreadCountView
 )
 from django.urls import path
+from .stream_views import notification_stream
 
 urlpatterns = [
     path('notifications/', NotificationListView.as_view(), name='notification-list'),
+    path('notifications/stream/', notification_stream, name='notification-stream'),
     path('notifications/unread-count/', NotificationUnreadCountView.as_view(), name='notification-unread-count'),
     path('notifications/<int:notification_id>/read/', NotificationMarkReadView.as_view(), name='notification-mark-read'),
     path('notifications/<int:notification_id>/', NotificationDeleteView.as_view(), name='notification-delete'),
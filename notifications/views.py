@@ -142,10 +142,20 @@ class NotificationMarkAllReadView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        """Mark all user notifications as read"""
+        """Mark all user notifications as read (optionally only `ids` or a `notification_type`)"""
+        notification_ids = request.data.get('ids')
+        notification_type = request.data.get('notification_type')
+        
+        if notification_ids is not None and not isinstance(notification_ids, list):
+            return Response({'error': "'ids' deve essere una lista"}, status=status.HTTP_400_BAD_REQUEST)
+        
         try:
             # Use NotificationService
-            result = notification_service.mark_all_notifications_as_read(request.user.id)
+            result = notification_service.mark_all_notifications_as_read(
+                request.user.id,
+                notification_ids=notification_ids,
+                notification_type=notification_type
+            )
             
             return Response({
                 'message': 'Tutte le notifiche sono state marcate come lette',
@@ -170,25 +180,18 @@ class NotificationClearAllView(APIView):
     def delete(self, request):
         """Delete all user notifications"""
         try:
-            # Get count first using service (get all notifications)
-            notifications_data = notification_service.get_user_notifications(request.user.id)
-            total_count = len(notifications_data)
-            
-            # Delete all notifications (we'll implement batch delete in the future)
-            # For now, use direct DB operation as fallback since service doesn't have bulk delete
-            deleted_count = Notification.objects.filter(user=request.user).count()
-            Notification.objects.filter(user=request.user).delete()
+            # Use NotificationService (single bulk DELETE)
+            result = notification_service.clear_notifications(request.user.id)
             
             return Response({
-                'message': f'{deleted_count} notifiche sono state eliminate'
+                'message': f"{result['deleted_count']} notifiche sono state eliminate"
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
             logger.warning(f"NotificationClearAllView service failed, falling back to old logic: {str(e)}")
             # Fallback to old logic
             try:
-                count = Notification.objects.filter(user=request.user).count()
-                Notification.objects.filter(user=request.user).delete()
+                count, _ = Notification.objects.filter(user=request.user).delete()
                 return Response({
                     'message': f'{count} notifiche sono state eliminate'
                 }, status=status.HTTP_200_OK)
@@ -5,8 +5,11 @@ from rest_framework import status
 from django.db.models import Count, Sum, Q
 from django.utils import timezone
 from datetime import timedelta
+from core.streaming import streaming_response
 from rewards.models import BlockchainTransaction
 from rewards.serializers import BlockchainTransactionSerializer
+from services.exceptions import TeoArtServiceException
+from services.export_service import export_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -166,3 +169,32 @@ def admin_user_transactions(request, user_id):
             {'error': 'Errore nel recuperare le transazioni utente'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def admin_export(request, dataset, file_format, compressed=None):
+    """
+    Export in streaming di ledger, iscrizioni o prelievi (CSV/NDJSON, .gz opzionale)
+
+    Filtri: ``since``/``until`` (data o datetime ISO) e i filtri del dataset
+    (es. ``user_id``, ``status``), vedi services/export_service.py
+    """
+    try:
+        filters = {
+            key: export_service.parse_boundary(value) if key in ('since', 'until') else value
+            for key, value in request.GET.items()
+        }
+        chunks = export_service.stream(dataset, file_format, filters, compress=bool(compressed))
+    except (TeoArtServiceException, ValueError) as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    filename = f"{dataset}_{timezone.now():%Y%m%d_%H%M%S}.{file_format}{compressed or ''}"
+    content_type = 'application/gzip' if compressed else export_service.FORMATS[file_format]
+    # Pulled chunk by chunk under ASGI too, never built in memory
+    response = streaming_response(request, chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    # Stream straight to the client instead of buffering the whole export in nginx
+    response['X-Accel-Buffering'] = 'no'
+    logger.info(f"Admin {request.user.id} exporting {dataset} as {file_format}{compressed or ''}")
+    return response
@@ -15,6 +15,7 @@ from users.models import User
 from courses.models import Course, Lesson, LessonCompletion, CourseEnrollment
 from rewards.models import TokenBalance, BlockchainTransaction
 from notifications.models import Notification
+from services.registry import lazy_service
 
 logger = logging.getLogger(__name__)
 
@@ -132,23 +133,14 @@ class AutomatedRewardSystem:
         Check if student completed all lessons and award course completion bonus
         """
         try:
-            total_lessons = course.lessons.count()
-            completed_lessons = LessonCompletion.objects.filter(
-                student=student,
-                lesson__course=course
-            ).count()
+            # Constant time: counters are maintained by courses.signals
+            enrollment = CourseEnrollment.objects.filter(student=student, course=course).first()
 
-            if total_lessons > 0 and completed_lessons >= total_lessons:
+            if enrollment and enrollment.all_lessons_completed:
                 # Student completed all lessons
-                enrollment, created = CourseEnrollment.objects.get_or_create(
-                    student=student,
-                    course=course,
-                    defaults={'completed': True}
-                )
-                
                 if not enrollment.completed:
                     enrollment.completed = True
-                    enrollment.save()
+                    enrollment.save(update_fields=['completed'])
                     
                     # Award completion bonus
                     self._award_course_completion_bonus(student, course)
@@ -388,5 +380,5 @@ class AutomatedRewardSystem:
         }
 
 
-# Initialize global reward system instance
-reward_system = AutomatedRewardSystem()
+# Global reward system instance, built on first use
+reward_system = lazy_service('reward_system', AutomatedRewardSystem)
@@ -0,0 +1,64 @@
+"""
+Management command to roll up teacher payouts into TeacherPayoutSummary
+"""
+
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.teacher_payout_service import teacher_payout_service
+
+
+class Command(BaseCommand):
+    help = 'Close finished weekly/monthly periods into teacher payout summaries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period-type',
+            choices=teacher_payout_service.PERIOD_TYPES,
+            help='Only close this period type (default: all)'
+        )
+        parser.add_argument(
+            '--regenerate',
+            metavar='YYYY-MM-DD',
+            help='Recompute the period containing this day instead of closing new ones'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running as a worker, closing periods as they finish'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=3600.0,
+            help='Seconds between runs with --loop'
+        )
+
+    def handle(self, *args, **options):
+        period_types = [options['period_type']] if options['period_type'] else teacher_payout_service.PERIOD_TYPES
+
+        if options['regenerate']:
+            try:
+                day = date.fromisoformat(options['regenerate'])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['regenerate']}")
+            for period_type in period_types:
+                summaries = teacher_payout_service.generate_period(period_type, day)
+                self.stdout.write(self.style.SUCCESS(
+                    f"✅ Regenerated {period_type} period of {day}: {len(summaries)} teachers"
+                ))
+            return
+
+        while True:
+            for period_type in period_types:
+                if not options['loop']:
+                    self.stdout.write(f"🔄 Closing {period_type} payout periods...")
+                closed = teacher_payout_service.close_periods(period_type)
+                if closed or not options['loop']:
+                    self.stdout.write(self.style.SUCCESS(f"✅ Closed {closed} {period_type} periods"))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
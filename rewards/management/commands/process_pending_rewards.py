@@ -4,6 +4,7 @@ Management command to process pending reward transactions
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from rewards.models import BlockchainTransaction
+from services.mint_settlement_service import mint_settlement_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,13 @@ class Command(BaseCommand):
                     failed += 1
                     continue
                 
+                # Minted with the wallet's other credits by the next settlement
+                if mint_settlement_service.enabled:
+                    mint_settlement_service.queue_reward(tx)
+                    self.stdout.write(self.style.SUCCESS("🪙 Queued for the next mint settlement"))
+                    processed += 1
+                    continue
+                
                 # Mint tokens to user's wallet using TeoCoinService
                 description = f"{tx.transaction_type.replace('_', ' ').title()} - {tx.notes}"
                 
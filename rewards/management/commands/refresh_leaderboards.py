@@ -0,0 +1,54 @@
+"""
+Management command to refresh the materialized reward leaderboards
+
+The leaderboard cursor starts at zero, so the first refresh after the
+``rewards.0004_leaderboards`` migration backfills every board from the whole
+ledger. ``--rebuild`` drops the boards and replays the ledger again.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from services.leaderboard_service import leaderboard_service
+
+
+class Command(BaseCommand):
+    help = 'Apply new reward transactions to the leaderboard tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Drop all leaderboards and replay the whole ledger'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running as a worker, refreshing periodically'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60.0,
+            help='Seconds between refreshes when running with --loop'
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            self.stdout.write("🔄 Rebuilding leaderboards from the ledger...")
+            self._report(leaderboard_service.rebuild())
+        elif not options['loop']:
+            self.stdout.write("🔄 Refreshing leaderboards...")
+            self._report(leaderboard_service.refresh())
+
+        while options['loop']:
+            result = leaderboard_service.refresh()
+            if result['transactions']:
+                self._report(result)
+            time.sleep(options['interval'])
+
+    def _report(self, result):
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Applied {result['transactions']} transactions, re-ranked {result['boards']} boards"
+        ))
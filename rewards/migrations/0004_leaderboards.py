@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:08
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_search_index'),
+        ('rewards', '0003_teacherpayoutsummary_teacherdiscountabsorption'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(default='default', max_length=50, unique=True)),
+                ('last_transaction_id', models.BigIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'rewards_leaderboard_state',
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('all_time', 'All Time'), ('monthly', 'Monthly'), ('weekly', 'Weekly'), ('course', 'Per Course')], max_length=10)),
+                ('period_key', models.CharField(max_length=20)),
+                ('total_rewards', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('reward_count', models.PositiveIntegerField(default=0)),
+                ('rank', models.PositiveIntegerField(db_index=True, default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='courses.course')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'rewards_leaderboard_entry',
+                'ordering': ['period', 'period_key', 'rank'],
+                'indexes': [models.Index(fields=['period', 'period_key', 'rank'], name='leaderboard_rank_idx')],
+                'unique_together': {('period', 'period_key', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rewards', '0004_leaderboards'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teacherpayoutsummary',
+            index=models.Index(fields=['period_type', 'period_start'], name='payout_summary_period_idx'),
+        ),
+    ]
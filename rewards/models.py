@@ -410,6 +410,61 @@ class TeacherPayoutSummary(models.Model):
         db_table = 'rewards_teacher_payout_summary'
         unique_together = ['teacher', 'period_start', 'period_end', 'period_type']
         ordering = ['-period_start']
+        indexes = [
+            # Admin overview of one period (see services/teacher_payout_service.py)
+            models.Index(fields=['period_type', 'period_start'], name='payout_summary_period_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.teacher.username} - {self.period_type} {self.period_start} to {self.period_end}"
\ No newline at end of file
+        return f"{self.teacher.username} - {self.period_type} {self.period_start} to {self.period_end}"
+
+class LeaderboardEntry(models.Model):
+    """
+    Precomputed reward ranking of a user on one leaderboard.
+
+    A leaderboard is identified by ``period`` and ``period_key`` ('all' for
+    all-time, '2025-07' monthly, '2025-W28' weekly, the course id for course
+    boards). Rows are maintained incrementally from DBTeoCoinTransaction by
+    services.leaderboard_service.
+    """
+    PERIOD_CHOICES = [
+        ('all_time', 'All Time'),
+        ('monthly', 'Monthly'),
+        ('weekly', 'Weekly'),
+        ('course', 'Per Course'),
+    ]
+
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    period_key = models.CharField(max_length=20)
+    course = models.ForeignKey('courses.Course', null=True, blank=True, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_entries')
+
+    total_rewards = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0'))
+    reward_count = models.PositiveIntegerField(default=0)
+    rank = models.PositiveIntegerField(default=0, db_index=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'rewards_leaderboard_entry'
+        unique_together = ['period', 'period_key', 'user']
+        ordering = ['period', 'period_key', 'rank']
+        indexes = [
+            models.Index(fields=['period', 'period_key', 'rank'], name='leaderboard_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.user.username} ({self.period} {self.period_key})"
+
+
+class LeaderboardState(models.Model):
+    """High-water mark of the ledger rows already applied to the leaderboards."""
+    name = models.CharField(max_length=50, unique=True, default='default')
+    last_transaction_id = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'rewards_leaderboard_state'
+
+    def __str__(self):
+        return f"Leaderboard state {self.name}: up to transaction {self.last_transaction_id}"
@@ -117,7 +117,14 @@ def auto_process_reward_transaction(sender, instance, created, **kwargs):
             instance.error_message = 'User has no wallet address'
             instance.save(update_fields=['status', 'error_message'])
             return
-        
+
+        # Minted together with the wallet's other credits by the next settlement
+        from services.mint_settlement_service import mint_settlement_service
+        if mint_settlement_service.enabled:
+            mint_settlement_service.queue_reward(instance)
+            logger.info(f"Queued reward transaction {instance.id} for settlement")
+            return
+
         # Mint tokens to user's wallet
         description = f"{instance.transaction_type.replace('_', ' ').title()} - {instance.notes}"
         
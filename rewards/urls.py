@@ -1,4 +1,4 @@
-from django.urls import path
+from django.urls import path, re_path
 from .views import (
     TransactionHistoryView,
 )
@@ -14,7 +14,8 @@ from .admin_views import (
     admin_transactions_list,
     admin_transactions_stats,
     admin_retry_transaction,
-    admin_user_transactions
+    admin_user_transactions,
+    admin_export
 )
 
 app_name = 'rewards'
@@ -28,6 +29,8 @@ urlpatterns = [
     path('admin/transactions/stats/', admin_transactions_stats, name='admin-transactions-stats'),
     path('admin/transactions/<int:transaction_id>/retry/', admin_retry_transaction, name='admin-retry-transaction'),
     path('admin/users/<int:user_id>/transactions/', admin_user_transactions, name='admin-user-transactions'),
+    # Streaming exports, e.g. admin/exports/transactions.csv.gz?since=2025-01-01
+    re_path(r'^admin/exports/(?P<dataset>\w+)\.(?P<file_format>csv|ndjson)(?P<compressed>\.gz)?$', admin_export, name='admin-export'),
     
     # RewardService-based endpoints (new)
     path('rewards/complete-lesson/', trigger_lesson_completion_reward, name='complete-lesson'),
@@ -11,6 +11,8 @@ from ..automation import AutomatedRewardSystem
 
 # Service imports
 from services.reward_service import reward_service
+from services.leaderboard_service import leaderboard_service
+from core.db_routing import replica_reads
 from services.exceptions import TeoArtServiceException, UserNotFoundError, CourseNotFoundError
 
 import logging
@@ -275,13 +277,24 @@ def get_reward_leaderboard(request):
         if limit < 1 or limit > 100:
             return Response({"error": "Limit must be between 1 and 100"}, status=status.HTTP_400_BAD_REQUEST)
         
+        period = request.query_params.get('period', 'all_time')
+        course_id = request.query_params.get('course_id')
+        if course_id is not None and not course_id.isdigit():
+            return Response({"error": "course_id must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        course_id = int(course_id) if course_id else None
+        
         try:
-            # Use RewardService for getting leaderboard
-            leaderboard = reward_service.get_reward_leaderboard(limit=limit)
+            with replica_reads(request.user):
+                # Use RewardService for getting leaderboard
+                leaderboard = reward_service.get_reward_leaderboard(limit=limit, period=period, course_id=course_id)
+                # Requesting user's own position, a direct lookup on the rank table
+                me = leaderboard_service.get_user_rank(request.user.id, period=period, course_id=course_id)
             
             return Response({
                 "message": "Reward leaderboard retrieved successfully",
                 "leaderboard": leaderboard,
+                "period": period,
+                "me": me,
                 "success": True
             }, status=status.HTTP_200_OK)
                 
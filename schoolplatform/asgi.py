@@ -3,6 +3,10 @@ ASGI config for schoolplatform project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Long-lived endpoints such as the notification event stream
+(``/api/v1/notifications/stream/``) are async views and should be served
+through this entry point.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -11,6 +15,6 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'schoolplatform.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', os.getenv('DJANGO_SETTINGS_MODULE', 'schoolplatform.settings.prod'))
 
 application = get_asgi_application()
@@ -17,6 +17,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # full-text search / trigram lookups (no-op on SQLite)
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
@@ -46,6 +47,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # 'core.middleware.AutoJWTFromSessionMiddleware',  # RIMOSSO: causava problemi con logout e duplicava funzionalità JWT
+    'core.middleware.ReplicaStickinessMiddleware',
     'core.middleware.APITimingMiddleware',
     'core.middleware.GlobalErrorHandlingMiddleware',
     'core.middleware.APITimingMiddleware',
@@ -162,3 +164,142 @@ TEOCOIN_SYSTEM = os.getenv('TEOCOIN_SYSTEM', 'database')  # 'database' or 'block
 # Reward System Configuration
 REWARD_SYSTEM_BACKEND = 'services.db_teocoin_service.DBTeoCoinService'
 
+
+# Notification retention (see services/notification_retention_service.py, run `manage.py prune_notifications --loop`)
+NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', '90'))
+NOTIFICATION_RETENTION_MODE = os.getenv('NOTIFICATION_RETENTION_MODE', 'archive')  # 'archive' or 'delete'
+NOTIFICATION_RETENTION_BATCH_SIZE = int(os.getenv('NOTIFICATION_RETENTION_BATCH_SIZE', '1000'))
+# High-volume types compacted into a single digest row per user instead of being archived one by one
+NOTIFICATION_DIGEST_TYPES = ['teocoins_earned', 'reward_earned', 'bonus_received', 'review_assigned']
+NOTIFICATION_DIGEST_MIN_COUNT = int(os.getenv('NOTIFICATION_DIGEST_MIN_COUNT', '5'))
+
+# Real-time notification push (Server-Sent Events, see notifications/stream_views.py)
+NOTIFICATION_PUSH_ENABLED = os.getenv('NOTIFICATION_PUSH_ENABLED', 'True').lower() == 'true'
+NOTIFICATION_PUSH_BACKEND = os.getenv('NOTIFICATION_PUSH_BACKEND', 'memory')  # 'memory' or 'redis'
+NOTIFICATION_PUSH_REDIS_URL = os.getenv('NOTIFICATION_PUSH_REDIS_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/2'))
+NOTIFICATION_STREAM_HEARTBEAT = 15  # seconds between keepalive comments
+NOTIFICATION_STREAM_MAX_DURATION = 300  # seconds before the stream is recycled (EventSource reconnects)
+
+# Email outbox (see services/email_outbox_service.py, run `manage.py process_email_outbox --loop`)
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '50'))
+EMAIL_OUTBOX_RATE_LIMIT_PER_MINUTE = int(os.getenv('EMAIL_OUTBOX_RATE_LIMIT_PER_MINUTE', '100'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = 60  # backoff: 1m, 2m, 4m, 8m...
+
+# Cached per-user set of enrolled course ids (see services/enrollment_access_service.py)
+ENROLLMENT_ACCESS_CACHE_TIMEOUT = int(os.getenv('ENROLLMENT_ACCESS_CACHE_TIMEOUT', '3600'))
+
+# Full-text course search (see courses/search.py, rebuild with `manage.py rebuild_search_index`)
+SEARCH_TEXT_CONFIG = 'italian'  # PostgreSQL text search configuration
+SEARCH_MAX_RESULTS = int(os.getenv('SEARCH_MAX_RESULTS', '200'))
+
+# Materialized reward leaderboards (see services/leaderboard_service.py, run `manage.py refresh_leaderboards`)
+LEADERBOARD_REWARD_TYPES = [
+    'earned', 'bonus', 'lesson_reward', 'exercise_completion',
+    'review_completion', 'course_purchase_bonus', 'course_completion_bonus',
+]
+LEADERBOARD_REFRESH_BATCH_SIZE = int(os.getenv('LEADERBOARD_REFRESH_BATCH_SIZE', '5000'))
+LEADERBOARD_SAFETY_LAG_SECONDS = int(os.getenv('LEADERBOARD_SAFETY_LAG_SECONDS', '60'))  # skip rows that may still be committing
+
+# Teacher payout summaries (see services/teacher_payout_service.py, run `manage.py close_payout_periods --loop`)
+TEACHER_PAYOUT_CLOSE_GRACE_HOURS = int(os.getenv('TEACHER_PAYOUT_CLOSE_GRACE_HOURS', '48'))  # > 24h absorption decision window
+TEACHER_PAYOUT_TEO_TYPES = ['earned', 'bonus', 'discount_absorption']
+
+# Admin changelists over large tables (see core/admin_performance.py)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv('ADMIN_ESTIMATED_COUNT_THRESHOLD', '10000'))  # rows before planner estimates replace COUNT(*)
+
+# Streaming exports (see services/export_service.py, `manage.py export_data`)
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '2000'))  # rows fetched per server-side cursor round trip
+
+# Student dashboard fragments (see services/dashboard_service.py), TTLs in seconds
+DASHBOARD_FRAGMENT_TTLS = {
+    'courses': 600,
+    'lessons': 600,
+    'progress': 600,
+    'balance': 120,
+    'chain_balance': int(os.getenv('DASHBOARD_CHAIN_BALANCE_TTL', '300')),  # one RPC call per refresh
+    'notifications': 120,
+    'activity': 300,
+}
+DASHBOARD_BUILD_WAIT_SECONDS = 2.0  # wait for a concurrent build before building locally
+DASHBOARD_FRAGMENT_TIMEOUTS = {
+    'chain_balance': float(os.getenv('DASHBOARD_CHAIN_BALANCE_TIMEOUT', '2.0')),  # RPC: fall back to "0" rather than hold the page
+}
+
+# Concurrent fragments in aggregate endpoints (see core/parallel.py)
+PARALLEL_FRAGMENTS_ENABLED = os.getenv('PARALLEL_FRAGMENTS_ENABLED', 'True').lower() == 'true'
+PARALLEL_FRAGMENT_WORKERS = int(os.getenv('PARALLEL_FRAGMENT_WORKERS', '8'))  # per process; each busy worker holds a DB connection
+PARALLEL_FRAGMENT_TIMEOUT = float(os.getenv('PARALLEL_FRAGMENT_TIMEOUT', '5.0'))
+
+# Read replica for analytics, stats and exports (see core/db_routing.py)
+DATABASE_ROUTERS = ['core.db_routing.ReplicaRouter']
+DATABASE_REPLICA_ALIAS = None  # set by the environment settings when a replica is configured
+DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv('DATABASE_REPLICA_STICKY_SECONDS', '10'))  # > replication lag
+
+# Chunked lesson video uploads (see services/video_upload_service.py)
+VIDEO_UPLOAD_MAX_SIZE = int(os.getenv('VIDEO_UPLOAD_MAX_SIZE', str(200 * 1024 * 1024)))
+VIDEO_UPLOAD_CHUNK_SIZE = int(os.getenv('VIDEO_UPLOAD_CHUNK_SIZE', str(8 * 1024 * 1024)))  # max bytes per PUT
+VIDEO_UPLOAD_READ_SIZE = 1024 * 1024  # bytes read from the request stream per write
+VIDEO_UPLOAD_TEMP_DIR = os.getenv('VIDEO_UPLOAD_TEMP_DIR') or os.path.join(MEDIA_ROOT, 'chunked_uploads')  # shared by all web workers
+VIDEO_UPLOAD_EXPIRY_HOURS = int(os.getenv('VIDEO_UPLOAD_EXPIRY_HOURS', '24'))  # idle uploads expired by the expire_video_uploads --loop worker
+VIDEO_UPLOAD_LOCK_SECONDS = 300
+
+# Lesson video streaming (see services/video_stream_service.py)
+VIDEO_STREAM_URL_TTL = int(os.getenv('VIDEO_STREAM_URL_TTL', str(4 * 3600)))  # signed URL lifetime, covers a viewing session
+VIDEO_STREAM_X_ACCEL = os.getenv('VIDEO_STREAM_X_ACCEL', 'False').lower() == 'true'  # nginx serves the bytes (nginx.conf)
+VIDEO_STREAM_X_ACCEL_PREFIX = '/protected-media/'  # internal nginx location aliasing MEDIA_ROOT
+VIDEO_STREAM_BLOCK_SIZE = 256 * 1024  # bytes per read when Django serves ranges itself
+
+# Resized cover/avatar variants (see services/image_derivative_service.py, run `manage.py generate_image_derivatives`)
+IMAGE_DERIVATIVE_WIDTHS = {
+    'course_cover': [320, 640, 960, 1280],
+    'avatar': [64, 128, 256],
+}
+IMAGE_DERIVATIVE_CATALOG_WIDTH = 640  # cover_image_url of catalog cards
+IMAGE_DERIVATIVE_QUALITY = int(os.getenv('IMAGE_DERIVATIVE_QUALITY', '80'))
+IMAGE_DERIVATIVE_BATCH_SIZE = 50
+
+# Content-addressed media storage: identical uploads are stored once (see core/storage.py, `manage.py media_blobs --gc --loop` collects unreferenced blobs)
+STORAGES = {
+    'default': {'BACKEND': 'core.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+MEDIA_BLOB_DIR = '.blobs'  # under MEDIA_ROOT, same file system as the uploads (hard links)
+MEDIA_BLOB_GC_GRACE_SECONDS = int(os.getenv('MEDIA_BLOB_GC_GRACE_SECONDS', '3600'))  # unreferenced blobs younger than this are kept
+MEDIA_BLOB_INGEST_EXCLUDE = ['chunked_uploads']  # in-progress files skipped by `media_blobs --ingest`
+
+# Gas oracle: cached fee market and gas limits for platform transactions (see services/gas_oracle_service.py)
+GAS_ORACLE_BLOCKS = 20  # blocks sampled by eth_feeHistory
+GAS_ORACLE_PERCENTILES = [10, 50, 90]  # priority fee percentiles for slow/standard/fast
+GAS_ORACLE_MAX_AGE = int(os.getenv('GAS_ORACLE_MAX_AGE', '60'))  # older snapshots are refreshed inline by one caller at a time
+GAS_ORACLE_REFRESH_LOCK_SECONDS = 10  # inline refresh lock, bounds a stuck refresher
+GAS_ORACLE_STALE_SECONDS = 600  # a snapshot this old is still used if the RPC node is unreachable
+GAS_ORACLE_MIN_PRIORITY_FEE_GWEI = int(os.getenv('GAS_ORACLE_MIN_PRIORITY_FEE_GWEI', '25'))  # Polygon minimum tip
+GAS_ORACLE_MAX_FEE_GWEI = int(os.getenv('GAS_ORACLE_MAX_FEE_GWEI', '50'))  # spending cap per unit of gas
+GAS_ORACLE_FALLBACK_GAS_PRICE_GWEI = 30  # no fee data at all
+GAS_ORACLE_ESTIMATE_BUFFER = 1.5  # unused gas is not charged
+GAS_ORACLE_ESTIMATE_TTL = 24 * 3600
+
+# On-chain event indexer for burn deposits (see services/chain_indexer_service.py, run `manage.py index_chain_events --loop`)
+CHAIN_INDEXER_CONFIRMATIONS = int(os.getenv('CHAIN_INDEXER_CONFIRMATIONS', '32'))  # ~1 minute on Polygon
+CHAIN_INDEXER_REORG_REWIND = 64  # blocks re-indexed when the last indexed block was reorganized away
+CHAIN_INDEXER_BATCH_BLOCKS = int(os.getenv('CHAIN_INDEXER_BATCH_BLOCKS', '1000'))  # eth_getLogs range, within public RPC limits
+CHAIN_INDEXER_MAX_BATCHES = 20  # per run
+CHAIN_INDEXER_START_BLOCK = int(os.getenv('CHAIN_INDEXER_START_BLOCK', '0'))  # 0: start CHAIN_INDEXER_INITIAL_LOOKBACK blocks back
+CHAIN_INDEXER_INITIAL_LOOKBACK = 10000
+CHAIN_INDEXER_CLAIM_TIMEOUT_MINUTES = 60  # claims without a confirmed burn are rejected after this
+CHAIN_INDEXER_CLAIM_BATCH_SIZE = 200
+
+# Coalesced minting: rewards and withdrawals are minted in periodic per-wallet settlements (see services/mint_settlement_service.py, run `manage.py settle_mints --loop`)
+MINT_SETTLEMENT_ENABLED = os.getenv('MINT_SETTLEMENT_ENABLED', 'true').lower() == 'true'
+MINT_SETTLEMENT_THRESHOLD_TEO = int(os.getenv('MINT_SETTLEMENT_THRESHOLD_TEO', '100'))  # a wallet owed this much is settled at the next run
+MINT_SETTLEMENT_MAX_DELAY_SECONDS = int(os.getenv('MINT_SETTLEMENT_MAX_DELAY_SECONDS', '300'))  # longest a credit waits (the settle_mints --loop worker runs every 30s)
+MINT_SETTLEMENT_MULTICALL = os.getenv('MINT_SETTLEMENT_MULTICALL', 'false').lower() == 'true'  # token supports thirdweb multicall(bytes[])
+MINT_SETTLEMENT_MULTICALL_SIZE = 50  # wallets per multicall transaction
+MINT_SETTLEMENT_BATCH_SIZE = 500  # credits per run
+MINT_SETTLEMENT_RECEIPT_TIMEOUT = 120  # seconds a run waits for receipts; later runs pick up the rest
+MINT_SETTLEMENT_MAX_ATTEMPTS = 3  # failed settlements are retried, then the ledger rows fail
+MINT_SETTLEMENT_CONFIRMATIONS = 12  # blocks a settlement's nonce must be buried under another transaction before it counts as dropped
+
+# RPC requests time out with the chain_balance dashboard fragment, so a hung node does not pile up worker threads
+WEB3_RPC_TIMEOUT = float(os.getenv('WEB3_RPC_TIMEOUT', str(DASHBOARD_FRAGMENT_TIMEOUTS['chain_balance'])))
@@ -15,6 +15,16 @@ DATABASES = {
     }
 }
 
+# Local read replica: DEV_REPLICA_DB=db.replica.sqlite3 (a copy of db.sqlite3)
+if os.getenv('DEV_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / os.getenv('DEV_REPLICA_DB'),
+        'OPTIONS': {'timeout': 20},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICA_ALIAS = 'replica'
+
 
 # Email backend for dev
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
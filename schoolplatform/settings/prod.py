@@ -17,6 +17,41 @@ DATABASES = {
     'default': dj_database_url.config(conn_max_age=600, ssl_require=True)
 }
 
+# Optional read replica for analytics, stats and exports
+if os.getenv('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = dj_database_url.parse(
+        os.getenv('DATABASE_REPLICA_URL'), conn_max_age=600, ssl_require=True
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICA_ALIAS = 'replica'
+
+
+# Shared cache: per-process L1 in front of Redis, so invalidations reach every worker
+# (see core/cache_backends.py, `manage.py cache_stats`)
+REDIS_CACHE_URL = os.getenv('REDIS_CACHE_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/1'))
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache_backends.TwoTierCache',
+        'LOCATION': 'shared',
+        'OPTIONS': {
+            'L1_MAX_ENTRIES': int(os.getenv('CACHE_L1_MAX_ENTRIES', '2000')),
+            'L1_TIMEOUT': int(os.getenv('CACHE_L1_TIMEOUT', '10')),  # staleness bound if an invalidation is lost
+            'INVALIDATION': 'redis',
+            'INVALIDATION_URL': REDIS_CACHE_URL,
+        },
+    },
+    'shared': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': REDIS_CACHE_URL,
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'SOCKET_CONNECT_TIMEOUT': 2,
+            'SOCKET_TIMEOUT': 2,
+        },
+    },
+}
+
 
 # Email backend for prod
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -44,6 +79,9 @@ if not STRIPE_SECRET_KEY:
 USE_DB_TEOCOIN_SYSTEM = True  # Force DB system in production
 TEOCOIN_SYSTEM = 'database'   # Use database, not blockchain for internal operations
 
+# Real-time push: several gunicorn/ASGI workers need a shared pub/sub backend
+NOTIFICATION_PUSH_BACKEND = os.getenv('NOTIFICATION_PUSH_BACKEND', 'redis')
+
 # Sentry (only prod)
 import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
@@ -143,7 +143,7 @@ Group=www-data
 WorkingDirectory=$PROJECT_DIR
 Environment="PATH=$VENV_DIR/bin"
 EnvironmentFile=$PROJECT_DIR/.env
-ExecStart=$VENV_DIR/bin/gunicorn --workers 3 --bind unix:$PROJECT_DIR/schoolplatform.sock schoolplatform.wsgi:application
+ExecStart=$VENV_DIR/bin/gunicorn --workers 3 -k uvicorn.workers.UvicornWorker --bind unix:$PROJECT_DIR/schoolplatform.sock schoolplatform.asgi:application
 Restart=always
 
 [Install]
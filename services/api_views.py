@@ -11,6 +11,7 @@ from rest_framework import status
 from django.contrib.auth import get_user_model
 
 from services.hybrid_teocoin_service import hybrid_teocoin_service
+from services.teacher_payout_service import teacher_payout_service
 
 User = get_user_model()
 
@@ -32,12 +33,17 @@ def earnings_history(request):
             limit=limit
         )
         
-        return Response({
+        data = {
             'success': True,
             'transactions': transactions,
             'count': len(transactions),
             'message': 'Transaction history retrieved successfully'
-        }, status=status.HTTP_200_OK)
+        }
+        if getattr(request.user, 'role', None) == 'teacher':
+            # Earnings totals come from the payout summaries
+            data['earnings'] = teacher_payout_service.get_teacher_earnings(request.user)
+
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
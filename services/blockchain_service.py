@@ -15,6 +15,7 @@ import time
 import uuid
 
 from services.base import TransactionalService
+from services.registry import lazy_service
 from services.exceptions import (
     TeoArtServiceException,
     WalletNotFoundError,
@@ -318,5 +319,5 @@ class BlockchainService(TransactionalService):
             self.log_error(f"Error updating cached balance for user {user.id}: {str(e)}")
 
 
-# Singleton instance for easy access
-blockchain_service = BlockchainService()
+# Singleton instance for easy access, built on first use
+blockchain_service = lazy_service('blockchain_service', BlockchainService)
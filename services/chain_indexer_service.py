@@ -0,0 +1,269 @@
+"""
+Chain Indexer Service - Confirmed TeoCoin Transfer Events in the Database
+
+Burn deposits used to be verified on demand: every claim fetched the receipt
+and transaction from the RPC node and decoded its logs inside the request.
+Instead, ``index`` follows the TeoCoin contract with ``eth_getLogs`` in
+batches of ``CHAIN_INDEXER_BATCH_BLOCKS`` and stores every ``Transfer`` log
+(mints, transfers, burns) as a ``TeoCoinTransferEvent``:
+
+- only blocks ``CHAIN_INDEXER_CONFIRMATIONS`` deep are indexed, so indexed
+  events are final in practice
+- the cursor remembers the hash of the last indexed block; if the chain no
+  longer has it (a reorg deeper than the confirmation depth) the indexer
+  rewinds ``CHAIN_INDEXER_REORG_REWIND`` blocks and indexes them again
+
+Deposits are ``BurnDepositClaim`` rows: ``claim_deposit`` records the claim
+and credits it right away when the burn is already indexed; otherwise the
+indexer credits it once the burn is confirmed. Claim checks and status
+lookups are local queries. Each burn event can be credited once.
+
+Run ``manage.py index_chain_events --loop`` (or ``core.tasks.index_chain_events``).
+"""
+
+import re
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from web3 import Web3
+
+from blockchain.models import BurnDepositClaim, ChainIndexerCursor, DBTeoCoinTransaction, TeoCoinTransferEvent
+from services.base import BaseService
+from services.db_teocoin_service import db_teocoin_service
+from services.exceptions import TeoArtServiceException
+
+ZERO_ADDRESS = '0x' + '0' * 40
+TRANSFER_TOPIC = Web3.to_hex(Web3.keccak(text='Transfer(address,address,uint256)'))
+TX_HASH_RE = re.compile(r'^0x[0-9a-f]{64}$')
+AMOUNT_TOLERANCE = Decimal('0.000001')
+
+
+def _hex(value) -> str:
+    return value.lower() if isinstance(value, str) else Web3.to_hex(value)
+
+
+class ChainIndexerService(BaseService):
+    """
+    Service indexing confirmed TeoCoin transfers and crediting burn deposits.
+    """
+
+    @property
+    def confirmations(self) -> int:
+        return getattr(settings, 'CHAIN_INDEXER_CONFIRMATIONS', 32)
+
+    def _chain(self, chain):
+        if chain is not None:
+            return chain
+        from blockchain.blockchain import teocoin_service
+        return teocoin_service
+
+    # Indexing
+
+    def index(self, chain=None, max_batches: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Index confirmed Transfer logs since the cursor, then settle pending claims.
+
+        ``chain`` provides ``w3`` and ``contract`` (default: the TeoCoin service).
+        """
+        chain = self._chain(chain)
+        w3 = chain.w3
+        batch_blocks = getattr(settings, 'CHAIN_INDEXER_BATCH_BLOCKS', 1000)
+        max_batches = max_batches or getattr(settings, 'CHAIN_INDEXER_MAX_BATCHES', 20)
+
+        head = w3.eth.block_number - self.confirmations
+        cursor = self._cursor(chain, head)
+        result = {'events': 0, 'batches': 0, 'rewound': self._check_reorg(w3, cursor)}
+
+        while cursor.last_block < head and result['batches'] < max_batches:
+            start = cursor.last_block + 1
+            end = min(start + batch_blocks - 1, head)
+            logs = w3.eth.get_logs({
+                'address': chain.contract.address,
+                'fromBlock': start,
+                'toBlock': end,
+                'topics': [TRANSFER_TOPIC],
+            })
+            events = [self._event(chain.contract, log) for log in logs]
+            end_hash = _hex(w3.eth.get_block(end)['hash'])
+
+            with transaction.atomic():
+                TeoCoinTransferEvent.objects.bulk_create(events, ignore_conflicts=True)
+                cursor.last_block, cursor.last_block_hash = end, end_hash
+                cursor.save(update_fields=['last_block', 'last_block_hash', 'updated_at'])
+            result['events'] += len(events)
+            result['batches'] += 1
+
+        result['last_block'] = cursor.last_block
+        result['caught_up'] = cursor.last_block >= head
+        result['claims'] = self.process_claims(expire=result['caught_up'])
+        if result['events'] or result['rewound']:
+            self.log_info(f"Indexed {result['events']} transfers up to block {cursor.last_block}")
+        return result
+
+    def _cursor(self, chain, head: int) -> ChainIndexerCursor:
+        start_block = getattr(settings, 'CHAIN_INDEXER_START_BLOCK', 0) or max(
+            head - getattr(settings, 'CHAIN_INDEXER_INITIAL_LOOKBACK', 10000), 0
+        )
+        cursor, _ = ChainIndexerCursor.objects.get_or_create(
+            name=f'teocoin_transfers:{chain.contract.address.lower()}',
+            defaults={'last_block': start_block - 1},
+        )
+        return cursor
+
+    def _check_reorg(self, w3, cursor: ChainIndexerCursor) -> int:
+        """Rewind the cursor if its last block was reorganized away; returns the blocks rewound."""
+        if not cursor.last_block_hash:
+            return 0
+        if _hex(w3.eth.get_block(cursor.last_block)['hash']) == cursor.last_block_hash:
+            return 0
+
+        rewind = getattr(settings, 'CHAIN_INDEXER_REORG_REWIND', 2 * self.confirmations)
+        rewind_to = max(cursor.last_block - rewind, -1)
+        replaced = TeoCoinTransferEvent.objects.filter(block_number__gt=rewind_to)
+        credited = replaced.filter(deposit_claim__isnull=False).count()
+        if credited:
+            self.log_error(f"Reorg below block {cursor.last_block} touches {credited} credited burn deposits: review them")
+        replaced.filter(deposit_claim__isnull=True).delete()
+
+        self.log_error(f"Block {cursor.last_block} was reorganized, re-indexing from block {rewind_to + 1}")
+        cursor.last_block, cursor.last_block_hash = rewind_to, ''
+        cursor.save(update_fields=['last_block', 'last_block_hash', 'updated_at'])
+        return rewind
+
+    def _event(self, contract, log) -> TeoCoinTransferEvent:
+        data = contract.events.Transfer().process_log(log)
+        from_address, to_address = data['args']['from'].lower(), data['args']['to'].lower()
+        value = int(data['args']['value'])
+        if from_address == ZERO_ADDRESS:
+            kind = 'mint'
+        elif to_address == ZERO_ADDRESS:
+            kind = 'burn'
+        else:
+            kind = 'transfer'
+        return TeoCoinTransferEvent(
+            tx_hash=_hex(data['transactionHash']),
+            log_index=data['logIndex'],
+            block_number=data['blockNumber'],
+            block_hash=_hex(data['blockHash']),
+            from_address=from_address,
+            to_address=to_address,
+            kind=kind,
+            value_wei=str(value),
+            amount=Decimal(value) / Decimal(10 ** 18),
+        )
+
+    # Burn deposits
+
+    def claim_deposit(self, user, tx_hash: str, amount: Decimal, metamask_address: str) -> BurnDepositClaim:
+        """
+        Record a burn deposit claim and credit it if the burn is already indexed.
+
+        Raises:
+            TeoArtServiceException: invalid input (400) or transaction already claimed (409)
+        """
+        tx_hash = (tx_hash or '').lower()
+        if not TX_HASH_RE.match(tx_hash):
+            raise TeoArtServiceException('Invalid transaction hash', code='invalid_tx_hash', status_code=400)
+        if not Web3.is_address(metamask_address or ''):
+            raise TeoArtServiceException('Invalid MetaMask address', code='invalid_address', status_code=400)
+
+        existing = BurnDepositClaim.objects.filter(tx_hash=tx_hash).first()
+        if existing is not None:
+            if existing.user_id != user.pk or existing.status == 'credited':
+                raise TeoArtServiceException('Transaction already processed', code='already_processed', status_code=409)
+            return existing
+        # Deposits credited before claims existed
+        if DBTeoCoinTransaction.objects.filter(blockchain_tx_hash__iexact=tx_hash, transaction_type='deposit').exists():
+            raise TeoArtServiceException('Transaction already processed', code='already_processed', status_code=409)
+
+        try:
+            claim = BurnDepositClaim.objects.create(
+                user=user, tx_hash=tx_hash, metamask_address=metamask_address.lower(), amount=amount
+            )
+        except IntegrityError:
+            raise TeoArtServiceException('Transaction already processed', code='already_processed', status_code=409)
+
+        self._settle([claim], expire=False)
+        claim.refresh_from_db()
+        return claim
+
+    def process_claims(self, expire: bool = True) -> Dict[str, int]:
+        """
+        Credit pending claims whose burn is indexed. With ``expire``, claims
+        still without a burn after ``CHAIN_INDEXER_CLAIM_TIMEOUT_MINUTES`` are
+        rejected (only when the indexer is caught up).
+        """
+        batch_size = getattr(settings, 'CHAIN_INDEXER_CLAIM_BATCH_SIZE', 200)
+        claims = list(BurnDepositClaim.objects.filter(status='pending').order_by('created_at')[:batch_size])
+        return self._settle(claims, expire)
+
+    def _settle(self, claims: List[BurnDepositClaim], expire: bool) -> Dict[str, int]:
+        result = {'credited': 0, 'rejected': 0}
+        burns: Dict[str, List[TeoCoinTransferEvent]] = {}
+        for event in TeoCoinTransferEvent.objects.filter(
+            tx_hash__in=[claim.tx_hash for claim in claims], kind='burn', deposit_claim__isnull=True
+        ):
+            burns.setdefault(event.tx_hash, []).append(event)
+        timeout = timezone.now() - timezone.timedelta(
+            minutes=getattr(settings, 'CHAIN_INDEXER_CLAIM_TIMEOUT_MINUTES', 60)
+        )
+
+        for claim in claims:
+            events = burns.get(claim.tx_hash)
+            if events:
+                event = next((e for e in events if self._matches(claim, e)), None)
+                if event is not None and self._credit(claim, event):
+                    result['credited'] += 1
+                elif event is None:
+                    self._reject(claim, self._mismatch(claim, events[0]))
+                    result['rejected'] += 1
+            elif expire and claim.created_at < timeout:
+                self._reject(claim, 'No confirmed burn found for this transaction')
+                result['rejected'] += 1
+        return result
+
+    def _matches(self, claim: BurnDepositClaim, event: TeoCoinTransferEvent) -> bool:
+        return event.from_address == claim.metamask_address and abs(event.amount - claim.amount) <= AMOUNT_TOLERANCE
+
+    def _mismatch(self, claim: BurnDepositClaim, event: TeoCoinTransferEvent) -> str:
+        if event.from_address != claim.metamask_address:
+            return 'Transaction sender does not match provided address'
+        return f'Burned amount {event.amount.normalize()} does not match expected {claim.amount}'
+
+    def _credit(self, claim: BurnDepositClaim, event: TeoCoinTransferEvent) -> bool:
+        try:
+            with transaction.atomic():
+                claim = BurnDepositClaim.objects.select_for_update().get(pk=claim.pk)
+                if claim.status != 'pending':
+                    return False
+                credit = db_teocoin_service.credit_user(
+                    user=claim.user,
+                    amount=claim.amount,
+                    transaction_type='deposit',
+                    description=f'Burn deposit: {claim.tx_hash[:10]}...',
+                    metadata={'transaction_hash': claim.tx_hash, 'block_number': event.block_number},
+                )
+                if not credit.get('success'):
+                    raise TeoArtServiceException(f"Credit failed: {credit.get('error')}")
+                claim.status = 'credited'
+                claim.event = event
+                claim.deposit_transaction_id = credit['transaction_id']
+                claim.credited_at = timezone.now()
+                claim.save(update_fields=['status', 'event', 'deposit_transaction', 'credited_at'])
+        except (IntegrityError, TeoArtServiceException) as e:
+            self.log_error(f"Burn deposit {claim.tx_hash} not credited: {e}")
+            return False
+
+        self.log_info(f"Credited burn deposit {claim.tx_hash}: {claim.amount} TEO to user {claim.user_id}")
+        return True
+
+    def _reject(self, claim: BurnDepositClaim, error: str) -> None:
+        BurnDepositClaim.objects.filter(pk=claim.pk, status='pending').update(status='rejected', error=error)
+        self.log_info(f"Burn deposit {claim.tx_hash} rejected: {error}")
+
+
+# Singleton instance
+chain_indexer_service = ChainIndexerService()
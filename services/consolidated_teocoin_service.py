@@ -16,6 +16,10 @@ from typing import Optional, Dict, Any
 from web3 import Web3
 from django.conf import settings
 
+from blockchain.web3_provider import make_web3
+from services.gas_oracle_service import gas_oracle_service
+from services.registry import lazy_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,7 +44,7 @@ class ConsolidatedTeoCoinService:
             raise ValueError("TEOCOIN_CONTRACT_ADDRESS must be configured")
         
         # Initialize Web3
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        self.w3 = make_web3(self.rpc_url)
         
         # Add PoA middleware for Polygon
         try:
@@ -49,9 +53,8 @@ class ConsolidatedTeoCoinService:
         except ImportError:
             logger.warning("Could not load PoA middleware")
         
-        # Verify connection
-        if not self.w3.is_connected():
-            raise ConnectionError("Failed to connect to Polygon Amoy network")
+        # No connection check: the service is built lazily on first use and
+        # RPC errors surface from the call that needs the network.
         
         # Load contract ABI
         self._load_contract()
@@ -102,31 +105,28 @@ class ConsolidatedTeoCoinService:
             amount_wei = Web3.to_wei(amount, 'ether')
             checksum_to = Web3.to_checksum_address(to_address)
             
-            # Get gas price
-            gas_price = self._get_gas_price()
+            # Cached fees and gas limit
+            fee_params = gas_oracle_service.get_fee_params(self.w3)
+            nonce = self.w3.eth.get_transaction_count(admin_account.address, 'pending')
             
             # Build transaction (try both mint and mintTo functions)
             try:
                 # Try mint function first
-                transaction = self.contract.functions.mint(
-                    checksum_to,
-                    amount_wei
-                ).build_transaction({
+                mint_function = self.contract.functions.mint(checksum_to, amount_wei)
+                transaction = mint_function.build_transaction({
                     'from': admin_account.address,
-                    'gas': 150000,
-                    'gasPrice': gas_price,
-                    'nonce': self.w3.eth.get_transaction_count(admin_account.address, 'pending'),
+                    'gas': gas_oracle_service.estimate_gas(mint_function, {'from': admin_account.address}, 150000),
+                    'nonce': nonce,
+                    **fee_params,
                 })
             except Exception:
                 # Fallback to mintTo function
-                transaction = self.contract.functions.mintTo(
-                    checksum_to,
-                    amount_wei
-                ).build_transaction({
+                mint_function = self.contract.functions.mintTo(checksum_to, amount_wei)
+                transaction = mint_function.build_transaction({
                     'from': admin_account.address,
-                    'gas': 150000,
-                    'gasPrice': gas_price,
-                    'nonce': self.w3.eth.get_transaction_count(admin_account.address, 'pending'),
+                    'gas': gas_oracle_service.estimate_gas(mint_function, {'from': admin_account.address}, 150000),
+                    'nonce': nonce,
+                    **fee_params,
                 })
             
             # Sign and send
@@ -233,62 +233,53 @@ class ConsolidatedTeoCoinService:
         }
     
     def _get_gas_price(self) -> int:
-        """Get optimized gas price for the network."""
-        try:
-            gas_price = self.w3.eth.gas_price
-            # Add 10% buffer
-            gas_price = int(gas_price * 1.1)
-            
-            # Set reasonable limits
-            min_gas_price = self.w3.to_wei('25', 'gwei')
-            max_gas_price = self.w3.to_wei('50', 'gwei')
-            
-            if gas_price < min_gas_price:
-                gas_price = min_gas_price
-            elif gas_price > max_gas_price:
-                gas_price = max_gas_price
-                
-            return gas_price
-        except:
-            return self.w3.to_wei('30', 'gwei')
+        """Get optimized gas price for the network (cached by the gas oracle)."""
+        return gas_oracle_service.get_gas_price(self.w3)
 
 
-# Global service instance
-try:
-    consolidated_teocoin_service = ConsolidatedTeoCoinService()
-    logger.info("✅ ConsolidatedTeoCoinService initialized successfully")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize ConsolidatedTeoCoinService: {e}")
-    # Create a fallback dummy service to prevent import errors
-    class DummyTeoCoinService:
-        def __init__(self):
-            self.w3 = None
-            
-        def mint_tokens(self, *args, **kwargs):
-            logger.error("TeoCoin service not available - mint_tokens failed")
-            return None
-            
-        def get_balance(self, *args, **kwargs):
-            logger.error("TeoCoin service not available - get_balance failed")
-            return Decimal('0')
-            
-        def get_transaction_receipt(self, *args, **kwargs):
-            logger.error("TeoCoin service not available - get_transaction_receipt failed")
-            return None
-            
-        def validate_address(self, *args, **kwargs):
-            logger.error("TeoCoin service not available - validate_address failed")
-            return False
-            
-        def get_token_info(self, *args, **kwargs):
-            logger.error("TeoCoin service not available - get_token_info failed")
-            return {}
-            
-        def get_reward_pool_info(self, *args, **kwargs):
-            logger.error("TeoCoin service not available - get_reward_pool_info failed")
-            return {}
-    
-    consolidated_teocoin_service = DummyTeoCoinService()
+class DummyTeoCoinService:
+    """Fallback used when the blockchain service cannot be configured."""
+
+    def __init__(self):
+        self.w3 = None
+
+    def mint_tokens(self, *args, **kwargs):
+        logger.error("TeoCoin service not available - mint_tokens failed")
+        return None
+
+    def get_balance(self, *args, **kwargs):
+        logger.error("TeoCoin service not available - get_balance failed")
+        return Decimal('0')
+
+    def get_transaction_receipt(self, *args, **kwargs):
+        logger.error("TeoCoin service not available - get_transaction_receipt failed")
+        return None
+
+    def validate_address(self, *args, **kwargs):
+        logger.error("TeoCoin service not available - validate_address failed")
+        return False
+
+    def get_token_info(self, *args, **kwargs):
+        logger.error("TeoCoin service not available - get_token_info failed")
+        return {}
+
+    def get_reward_pool_info(self, *args, **kwargs):
+        logger.error("TeoCoin service not available - get_reward_pool_info failed")
+        return {}
+
+
+def _build_teocoin_service():
+    try:
+        service = ConsolidatedTeoCoinService()
+        logger.info("✅ ConsolidatedTeoCoinService initialized successfully")
+        return service
+    except Exception as e:
+        logger.error(f"❌ Failed to initialize ConsolidatedTeoCoinService: {e}")
+        return DummyTeoCoinService()
+
+
+# Global service instance, built on first use
+consolidated_teocoin_service = lazy_service('consolidated_teocoin_service', _build_teocoin_service)
 
 
 # Legacy compatibility - this will be the main service
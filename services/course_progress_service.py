@@ -0,0 +1,86 @@
+"""
+Course Progress Service - Denormalized Per-Enrollment Progress
+
+``CourseEnrollment.completed_lessons`` and ``total_lessons`` are kept up to
+date incrementally by the signals in ``courses.signals``, so reading progress
+or detecting course completion is a column read instead of two ``count()``
+queries. ``rebuild`` recomputes the counters from scratch and backs the
+``rebuild_course_progress`` repair command.
+
+A lesson belongs to a course through ``Lesson.course``, the same relation
+``LessonCompletion`` is counted against.
+"""
+
+from typing import Optional
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from courses.models import CourseEnrollment, Lesson, LessonCompletion
+from services.base import BaseService
+
+
+class CourseProgressService(BaseService):
+    """
+    Service maintaining the progress counters of course enrollments.
+    """
+
+    def record_completion(self, student_id: int, course_id: int, delta: int = 1) -> Optional[CourseEnrollment]:
+        """
+        Atomically add ``delta`` completed lessons to an enrollment.
+
+        Args:
+            student_id: Student user ID
+            course_id: Course ID
+            delta: +1 when a lesson is completed, -1 when a completion is removed
+
+        Returns:
+            The refreshed enrollment, or None if the student is not enrolled
+        """
+        enrollments = CourseEnrollment.objects.filter(student_id=student_id, course_id=course_id)
+        updated = enrollments.update(completed_lessons=Greatest(F('completed_lessons') + delta, Value(0)))
+        if not updated:
+            return None
+        return enrollments.only('id', 'completed_lessons', 'total_lessons', 'completed').first()
+
+    def refresh_course_totals(self, course_id: int) -> int:
+        """
+        Set ``total_lessons`` on every enrollment of a course after lessons changed.
+
+        Returns:
+            Number of enrollments updated
+        """
+        total = Lesson.objects.filter(course_id=course_id).count()
+        return CourseEnrollment.objects.filter(course_id=course_id).update(total_lessons=total)
+
+    def rebuild(self, queryset=None) -> int:
+        """
+        Recompute both counters from LessonCompletion and Lesson in one UPDATE.
+
+        Args:
+            queryset: Enrollments to rebuild (all enrollments by default)
+
+        Returns:
+            Number of enrollments updated
+        """
+        if queryset is None:
+            queryset = CourseEnrollment.objects.all()
+
+        completed = LessonCompletion.objects.filter(
+            student_id=OuterRef('student_id'),
+            lesson__course_id=OuterRef('course_id')
+        ).order_by().values('student_id').annotate(n=Count('*')).values('n')
+        total = Lesson.objects.filter(
+            course_id=OuterRef('course_id')
+        ).order_by().values('course_id').annotate(n=Count('*')).values('n')
+
+        updated = queryset.update(
+            completed_lessons=Coalesce(Subquery(completed, output_field=IntegerField()), Value(0)),
+            total_lessons=Coalesce(Subquery(total, output_field=IntegerField()), Value(0)),
+        )
+        self.log_info(f"Rebuilt progress counters for {updated} enrollments")
+        return updated
+
+
+# Singleton instance for easy access
+course_progress_service = CourseProgressService()
@@ -8,6 +8,10 @@ purchase workflows, and progress tracking.
 from typing import Dict, List, Optional, Any
 from decimal import Decimal
 from django.contrib.auth import get_user_model
+from django.db.models import (
+    BooleanField, Count, Exists, IntegerField, OuterRef, Prefetch, Subquery, Sum, Value,
+)
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from courses.models import Course, CourseEnrollment, Lesson, LessonCompletion
@@ -29,6 +33,56 @@ class CourseService(TransactionalService):
     progress tracking, and course-related business logic.
     """
     
+    def get_catalog_queryset(self, user=None, include_unapproved: bool = False, expand_lessons: bool = False):
+        """
+        Build the course catalog read model.
+
+        Lesson/student counts, total duration and the user's enrollment flag
+        are annotated with correlated subqueries, so the whole catalog is one
+        query (plus one prefetch when lessons are expanded) regardless of the
+        number of courses or enrollments.
+
+        Args:
+            user: User instance (optional, used for ``is_enrolled``)
+            include_unapproved: Include courses pending approval (admin views)
+            expand_lessons: Prefetch the lesson list of each course
+
+        Returns:
+            Annotated Course queryset
+        """
+        courses = Course.objects.all() if include_unapproved else Course.objects.filter(is_approved=True)
+
+        lessons = Lesson.objects.filter(course_id=OuterRef('pk')).order_by().values('course_id')
+        enrollments = CourseEnrollment.objects.filter(course_id=OuterRef('pk')).order_by().values('course_id')
+
+        courses = courses.select_related('teacher').annotate(
+            lesson_count=Coalesce(
+                Subquery(lessons.annotate(n=Count('*')).values('n'), output_field=IntegerField()), Value(0)
+            ),
+            total_duration=Coalesce(
+                Subquery(lessons.annotate(n=Sum('duration')).values('n'), output_field=IntegerField()), Value(0)
+            ),
+            student_count=Coalesce(
+                Subquery(enrollments.annotate(n=Count('*')).values('n'), output_field=IntegerField()), Value(0)
+            ),
+        )
+
+        if user is not None and user.is_authenticated:
+            courses = courses.annotate(is_enrolled=Exists(
+                CourseEnrollment.objects.filter(course_id=OuterRef('pk'), student_id=user.pk)
+            ))
+        else:
+            courses = courses.annotate(is_enrolled=Value(False, output_field=BooleanField()))
+
+        if expand_lessons:
+            courses = courses.prefetch_related(Prefetch(
+                'lessons_in_course',
+                queryset=Lesson.objects.annotate(exercises_count=Count('exercises')).order_by('order', 'id'),
+                to_attr='catalog_lessons'
+            ))
+
+        return courses
+
     def get_available_courses(self, user=None) -> List[Dict[str, Any]]:
         """
         Get list of available courses for a user.
@@ -42,34 +96,25 @@ class CourseService(TransactionalService):
         try:
             self.log_info("Retrieving available courses")
             
-            # Get approved courses
-            courses = Course.objects.filter(
-                is_approved=True
-            ).select_related('teacher')
+            # Approved courses with counts and enrollment flag in a single query
+            courses = self.get_catalog_queryset(user=user)
             
             course_list = []
             for course in courses:
-                # Check if user is enrolled (if user provided)
-                is_enrolled = False
-                if user:
-                    is_enrolled = CourseEnrollment.objects.filter(
-                        student=user, 
-                        course=course
-                    ).exists()
-                
                 course_data = {
                     'id': course.id,
                     'title': course.title,
                     'description': course.description,
-                    'price': float(course.price),
+                    'price': float(course.price_eur),
                     'category': course.category,
                     'cover_image': course.cover_image.url if course.cover_image else None,
                     'creator': {
                         'id': course.teacher.id,
                         'username': course.teacher.username,
                     },
-                    'is_enrolled': is_enrolled,
-                    'lesson_count': course.lessons_in_course.count(),
+                    'is_enrolled': course.is_enrolled,
+                    'lesson_count': course.lesson_count,
+                    'student_count': course.student_count,
                     'created_at': course.created_at.isoformat(),
                 }
                 course_list.append(course_data)
@@ -274,17 +319,8 @@ class CourseService(TransactionalService):
             raise TeoArtServiceException(f"Error retrieving enrollments: {str(e)}")
     
     def _calculate_course_progress(self, enrollment: CourseEnrollment) -> int:
-        """Calculate progress percentage for a course enrollment."""
-        total_lessons = enrollment.course.lessons_in_course.count()
-        if total_lessons == 0:
-            return 0
-        
-        completed_lessons = LessonCompletion.objects.filter(
-            student=enrollment.student,
-            lesson__course=enrollment.course
-        ).count()
-        
-        return int((completed_lessons / total_lessons) * 100)
+        """Progress percentage for a course enrollment, read from its counters."""
+        return int(enrollment.progress_percentage)
     
     def _is_lesson_completed(self, lesson, user) -> bool:
         """Check if a lesson is completed by a user."""
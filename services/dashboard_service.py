@@ -0,0 +1,233 @@
+"""
+Dashboard Service - Cached Dashboard Composition
+
+Student dashboards are assembled from independently cached fragments:
+
+- ``courses``: enrolled courses with progress (enrollment counters)
+- ``lessons``: lessons of the enrolled courses (legacy dashboard)
+- ``progress``: UserProgress summary
+- ``balance``: DB TeoCoin balance
+- ``chain_balance``: on-chain wallet balance (RPC, longest TTL)
+- ``notifications``: latest unread and latest overall notifications, unread count
+- ``activity``: recent transactions and lesson completions
+
+Each fragment has its own TTL (``DASHBOARD_FRAGMENT_TTLS``) and is
+invalidated by the signals in ``core.cache_signals``. A warm dashboard is a
+single ``cache.get_many``; missing fragments are rebuilt concurrently
+(``core.parallel``) and single-flight, so a burst of requests after an
+invalidation builds each fragment once. A fragment that fails or exceeds its
+timeout (``DASHBOARD_FRAGMENT_TIMEOUTS``) is served from ``FALLBACKS`` and is
+not cached.
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from courses.models import CourseEnrollment, Lesson, LessonCompletion
+from courses.serializers import CourseSerializer, LessonSerializer
+from core.serializers import BlockchainTransactionSerializer
+from notifications.models import Notification
+from notifications.serializers import NotificationSerializer
+from rewards.models import BlockchainTransaction
+from core.parallel import run_parallel
+from services.base import BaseService
+from services.db_teocoin_service import db_teocoin_service
+from services.exceptions import TeoArtServiceException
+from users.models import UserProgress
+from users.serializers import UserProgressSerializer
+
+# Minimum available balance for a withdrawal
+MIN_WITHDRAWAL_BALANCE = 10.0
+
+
+class DashboardService(BaseService):
+    """
+    Service composing dashboards from cached fragments.
+    """
+
+    CACHE_KEY = 'dashboard_{user_id}_{fragment}'
+    # Served when a fragment fails or times out
+    FALLBACKS = {
+        'courses': list,
+        'lessons': list,
+        'progress': dict,
+        'balance': lambda: {
+            'available': '0.00', 'staked': '0.00', 'pending_withdrawal': '0.00', 'total': '0.00', 'can_withdraw': False
+        },
+        'chain_balance': "0",
+        'notifications': lambda: {'unread': [], 'unread_count': 0, 'recent': []},
+        'activity': lambda: {'transactions': [], 'completions': []},
+    }
+    FRAGMENTS = list(FALLBACKS)
+
+    def __init__(self):
+        super().__init__()
+        self.ttls = settings.DASHBOARD_FRAGMENT_TTLS
+        # How long another request may build a fragment before we build it ourselves
+        self.build_wait = getattr(settings, 'DASHBOARD_BUILD_WAIT_SECONDS', 2.0)
+        self.timeouts = getattr(settings, 'DASHBOARD_FRAGMENT_TIMEOUTS', {})
+
+    def get_fragments(self, user, fragments: Iterable[str], request=None) -> Dict[str, Any]:
+        """
+        Get dashboard fragments for a user.
+
+        Args:
+            user: User instance
+            fragments: Fragment names
+            request: Current request, required by the course serializer
+
+        Returns:
+            Dict of fragment name -> fragment data
+        """
+        return self.get_fragments_with_status(user, fragments, request)[0]
+
+    def get_fragments_with_status(self, user, fragments: Iterable[str], request=None) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Like get_fragments, also returning the names of fragments served from
+        their fallback.
+        """
+        fragments = list(fragments)
+        unknown = set(fragments) - set(self.FRAGMENTS)
+        if unknown:
+            raise TeoArtServiceException(f"Unknown dashboard fragments: {sorted(unknown)}")
+
+        keys = {name: self._key(user.pk, name) for name in fragments}
+        cached = cache.get_many(list(keys.values()))
+
+        missing = {
+            name: (lambda name=name, key=key: self._build_single_flight(name, key, user, request))
+            for name, key in keys.items() if key not in cached
+        }
+        built, degraded = run_parallel(missing, timeouts=self.timeouts, fallbacks=self.FALLBACKS)
+        if degraded:
+            self.log_error(f"Dashboard fragments degraded for user {user.pk}: {degraded}")
+
+        return {name: cached[key] if key in cached else built[name] for name, key in keys.items()}, degraded
+
+    def build_fragment(self, name: str, user, request=None) -> Any:
+        """Build a fragment from the database, bypassing the cache."""
+        return getattr(self, f'_build_{name}')(user, request)
+
+    def invalidate(self, user_id: int, *fragments: str) -> None:
+        """
+        Drop cached fragments of a user (all of them by default).
+
+        Deleted now and again after commit, so a rebuild racing the writing
+        transaction cannot keep stale data cached.
+        """
+        keys = [self._key(user_id, name) for name in (fragments or self.FRAGMENTS)]
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+    def invalidate_many(self, user_ids: Iterable[int], *fragments: str) -> None:
+        """Drop cached fragments of several users at once."""
+        keys = [self._key(user_id, name) for user_id in user_ids for name in (fragments or self.FRAGMENTS)]
+        if keys:
+            cache.delete_many(keys)
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+    # ========== PRIVATE METHODS ==========
+
+    def _key(self, user_id: int, fragment: str) -> str:
+        return self.CACHE_KEY.format(user_id=user_id, fragment=fragment)
+
+    def _build_single_flight(self, name: str, key: str, user, request) -> Any:
+        lock_key = f'{key}_lock'
+        if cache.add(lock_key, 1, timeout=max(int(self.build_wait * 5), 10)):
+            try:
+                value = self.build_fragment(name, user, request)
+                cache.set(key, value, self.ttls[name])
+                return value
+            finally:
+                cache.delete(lock_key)
+
+        # Another request is building this fragment: wait for its result
+        deadline = time.monotonic() + self.build_wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = cache.get(key)
+            if value is not None:
+                return value
+        self.log_info(f"Timed out waiting for fragment {key}, building it locally")
+        return self.build_fragment(name, user, request)
+
+    def _build_courses(self, user, request) -> List[Dict[str, Any]]:
+        enrollments = CourseEnrollment.objects.filter(
+            student=user, course__is_approved=True
+        ).select_related('course', 'course__teacher').prefetch_related(
+            'course__lessons', 'course__lessons__course', 'course__students'
+        ).order_by('-enrolled_at')
+
+        courses = []
+        for enrollment in enrollments:
+            course_data = CourseSerializer(enrollment.course, context={'request': request}).data
+            course_data['progress'] = {
+                'total_lessons': enrollment.total_lessons,
+                'completed_lessons': enrollment.completed_lessons,
+                'percentage': enrollment.progress_percentage,
+            }
+            courses.append(course_data)
+        return courses
+
+    def _build_lessons(self, user, request) -> List[Dict[str, Any]]:
+        # Lessons of the courses the student is enrolled in
+        lessons = Lesson.objects.filter(
+            course__enrollments__student=user
+        ).select_related('teacher', 'course').order_by('course_id', 'order')
+        return LessonSerializer(lessons, many=True, context={'request': request}).data
+
+    def _build_progress(self, user, request) -> Dict[str, Any]:
+        user_progress, _ = UserProgress.objects.get_or_create(user=user)
+        return UserProgressSerializer(user_progress, context={'request': request}).data
+
+    def _build_balance(self, user, request) -> Dict[str, Any]:
+        balance = db_teocoin_service.get_user_balance(user)
+        return {
+            'available': str(balance['available_balance']),
+            'staked': str(balance['staked_balance']),
+            'pending_withdrawal': str(balance['pending_withdrawal']),
+            'total': str(balance['total_balance']),
+            'can_withdraw': float(balance['available_balance']) >= MIN_WITHDRAWAL_BALANCE,
+        }
+
+    def _build_chain_balance(self, user, request) -> str:
+        if not user.wallet_address:
+            return "0"
+        from blockchain.blockchain import teocoin_service
+        return str(teocoin_service.get_balance(user.wallet_address))
+
+    def _build_notifications(self, user, request) -> Dict[str, Any]:
+        notifications = Notification.objects.filter(user=user).order_by('-created_at')
+        unread = notifications.filter(read=False)
+        return {
+            'unread': NotificationSerializer(unread[:10], many=True).data,
+            'unread_count': unread.count(),
+            'recent': NotificationSerializer(notifications[:5], many=True).data,
+        }
+
+    def _build_activity(self, user, request) -> Dict[str, Any]:
+        transactions = BlockchainTransaction.objects.filter(user=user).order_by('-created_at')[:10]
+        completions = LessonCompletion.objects.filter(
+            student=user
+        ).select_related('lesson', 'lesson__course').order_by('-completed_at')[:5]
+        return {
+            'transactions': BlockchainTransactionSerializer(transactions, many=True).data,
+            'completions': [
+                {
+                    'id': completion.pk,
+                    'type': 'lesson_completed',
+                    'title': completion.lesson.title,
+                    'course_title': completion.lesson.course.title if completion.lesson.course else None,
+                    'date': completion.completed_at,
+                }
+                for completion in completions
+            ],
+        }
+
+
+# Singleton instance for easy access
+dashboard_service = DashboardService()
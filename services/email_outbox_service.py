@@ -0,0 +1,227 @@
+"""
+Email Outbox Service - Asynchronous, Batched Email Delivery
+
+Request handlers enqueue emails with ``queue_email`` and return immediately;
+``process_outbox`` (run by the ``process_email_outbox`` command or the
+periodic task) delivers due emails in batches over a single SMTP connection,
+respecting per-user preferences, a global rate limit and retrying failures
+with exponential backoff.
+"""
+
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from notifications.models import EmailOutbox
+from services.base import TransactionalService
+from services.exceptions import TeoArtServiceException
+
+
+class EmailOutboxService(TransactionalService):
+    """
+    Service for queueing and delivering outgoing emails.
+    """
+
+    # UserSettings flag that must be enabled for each category (None = always send)
+    CATEGORY_PREFERENCES = {
+        'transactional': None,
+        'notification': 'email_notifications',
+        'marketing': 'marketing_emails',
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.batch_size = getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+        self.rate_limit_per_minute = getattr(settings, 'EMAIL_OUTBOX_RATE_LIMIT_PER_MINUTE', 100)
+        self.max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+        self.retry_base_seconds = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_SECONDS', 60)
+
+    def queue_email(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        html_body: str = '',
+        user=None,
+        category: str = 'notification',
+        from_email: Optional[str] = None
+    ) -> EmailOutbox:
+        """
+        Queue an email for asynchronous delivery.
+
+        Emails the user opted out of are stored as 'skipped' so the decision
+        is auditable, and never reach SMTP.
+
+        Args:
+            to_email: Recipient address
+            subject: Email subject
+            body: Plain text body
+            html_body: Optional HTML alternative
+            user: Optional recipient User (used for preference checks)
+            category: 'transactional', 'notification' or 'marketing'
+            from_email: Sender, defaults to DEFAULT_FROM_EMAIL
+
+        Returns:
+            The created EmailOutbox row
+
+        Raises:
+            TeoArtServiceException: If the category is unknown
+        """
+        if category not in self.CATEGORY_PREFERENCES:
+            raise TeoArtServiceException(
+                f"Invalid email category: {category}. Must be one of: {list(self.CATEGORY_PREFERENCES)}"
+            )
+
+        status = 'pending' if self._user_allows(user, category) else 'skipped'
+        email = EmailOutbox.objects.create(
+            user=user,
+            to_email=to_email,
+            subject=subject[:255],
+            body=body,
+            html_body=html_body or '',
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            category=category,
+            status=status,
+        )
+
+        self.log_info(f"Queued email {email.id} to {to_email} ({category}, {status})")
+        return email
+
+    def process_outbox(self, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Deliver one batch of due emails over a single SMTP connection.
+
+        Args:
+            batch_size: Maximum emails to send in this run
+
+        Returns:
+            Dict with sent/retried/failed counts
+        """
+        batch_size = batch_size or self.batch_size
+        budget = min(batch_size, self._remaining_rate_budget())
+        if budget <= 0:
+            self.log_info("Email rate limit reached, skipping this run")
+            return {'claimed': 0, 'sent': 0, 'retried': 0, 'failed': 0, 'rate_limited': True}
+
+        emails = self._claim_due_emails(budget)
+        result = {'claimed': len(emails), 'sent': 0, 'retried': 0, 'failed': 0, 'rate_limited': False}
+        if not emails:
+            return result
+
+        smtp = get_connection(fail_silently=False)
+        try:
+            smtp.open()
+        except Exception as e:
+            # SMTP unreachable: release the whole batch for a later retry
+            self.log_error(f"Could not open SMTP connection: {e}")
+            for email in emails:
+                result[self._mark_failed(email, e)] += 1
+            return result
+
+        try:
+            for email in emails:
+                try:
+                    smtp.send_messages([self._build_message(email, smtp)])
+                except Exception as e:
+                    self.log_error(f"Email {email.id} to {email.to_email} failed: {e}")
+                    result[self._mark_failed(email, e)] += 1
+                    continue
+
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.attempts += 1
+                email.last_error = ''
+                email.save(update_fields=['status', 'sent_at', 'attempts', 'last_error'])
+                result['sent'] += 1
+        finally:
+            smtp.close()
+
+        self.log_info(
+            f"Outbox batch: {result['sent']} sent, {result['retried']} retried, {result['failed']} failed"
+        )
+        return result
+
+    def release_stuck_emails(self, older_than_minutes: int = 15) -> int:
+        """Put back to 'pending' emails left in 'sending' by a crashed worker."""
+        cutoff = timezone.now() - timedelta(minutes=older_than_minutes)
+        return EmailOutbox.objects.filter(status='sending', next_attempt_at__lt=cutoff).update(status='pending')
+
+    # ========== PRIVATE METHODS ==========
+
+    def _user_allows(self, user, category: str) -> bool:
+        preference = self.CATEGORY_PREFERENCES[category]
+        if user is None or preference is None:
+            return True
+
+        from users.models import UserSettings
+
+        user_settings = UserSettings.objects.filter(user=user).only(preference).first()
+        # No settings row yet means the model defaults apply
+        if user_settings is None:
+            return UserSettings._meta.get_field(preference).default
+        return getattr(user_settings, preference)
+
+    def _remaining_rate_budget(self) -> int:
+        if not self.rate_limit_per_minute:
+            return self.batch_size
+        sent_last_minute = EmailOutbox.objects.filter(
+            status='sent',
+            sent_at__gte=timezone.now() - timedelta(minutes=1)
+        ).count()
+        return max(0, self.rate_limit_per_minute - sent_last_minute)
+
+    def _claim_due_emails(self, limit: int) -> List[EmailOutbox]:
+        """Atomically move due emails to 'sending' so concurrent workers never share rows."""
+        with transaction.atomic():
+            queryset = EmailOutbox.objects.filter(
+                status='pending',
+                next_attempt_at__lte=timezone.now()
+            ).order_by('next_attempt_at', 'id')
+            if db_connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+
+            emails = list(queryset[:limit])
+            if emails:
+                EmailOutbox.objects.filter(id__in=[email.id for email in emails]).update(
+                    status='sending',
+                    next_attempt_at=timezone.now()
+                )
+        return emails
+
+    def _build_message(self, email: EmailOutbox, smtp) -> EmailMultiAlternatives:
+        message = EmailMultiAlternatives(
+            subject=email.subject,
+            body=email.body,
+            from_email=email.from_email or settings.DEFAULT_FROM_EMAIL,
+            to=[email.to_email],
+            connection=smtp,
+        )
+        if email.html_body:
+            message.attach_alternative(email.html_body, 'text/html')
+        return message
+
+    def _mark_failed(self, email: EmailOutbox, error: Exception) -> str:
+        """Schedule a retry with exponential backoff, or give up after max attempts."""
+        email.attempts += 1
+        email.last_error = str(error)[:2000]
+
+        if email.attempts >= self.max_attempts:
+            email.status = 'failed'
+            outcome = 'failed'
+        else:
+            email.status = 'pending'
+            email.next_attempt_at = timezone.now() + timedelta(
+                seconds=self.retry_base_seconds * (2 ** (email.attempts - 1))
+            )
+            outcome = 'retried'
+
+        email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+        return outcome
+
+
+# Singleton instance for easy access
+email_outbox_service = EmailOutboxService()
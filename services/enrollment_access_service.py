@@ -0,0 +1,99 @@
+"""
+Enrollment Access Service - Single Source of Truth for Course Access
+
+Every lesson, exercise and course view asks the same question: "is this user
+enrolled in this course?". The answer is served from a cached per-user set of
+enrolled course ids built from ``CourseEnrollment``, so a check is one cache
+lookup (and at most one indexed query on a miss) instead of loading all the
+students of a course.
+
+The cached set is invalidated by the enrollment signals in
+``core.cache_signals``.
+"""
+
+from typing import FrozenSet, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from courses.models import CourseEnrollment
+from services.base import BaseService
+
+
+class EnrollmentAccessService(BaseService):
+    """
+    Service answering course enrollment and access questions.
+    """
+
+    CACHE_KEY = 'enrolled_course_ids_{user_id}'
+
+    def __init__(self):
+        super().__init__()
+        self.cache_timeout = getattr(settings, 'ENROLLMENT_ACCESS_CACHE_TIMEOUT', 3600)
+
+    def get_enrolled_course_ids(self, user_id: Optional[int]) -> FrozenSet[int]:
+        """
+        Get the ids of the courses a user is enrolled in.
+
+        Args:
+            user_id: User ID (None for anonymous users)
+
+        Returns:
+            Frozen set of course ids
+        """
+        if not user_id:
+            return frozenset()
+
+        cache_key = self.CACHE_KEY.format(user_id=user_id)
+        course_ids = cache.get(cache_key)
+        if course_ids is None:
+            course_ids = frozenset(
+                CourseEnrollment.objects.filter(student_id=user_id).values_list('course_id', flat=True)
+            )
+            cache.set(cache_key, course_ids, self.cache_timeout)
+        return course_ids
+
+    def is_enrolled(self, user, course) -> bool:
+        """
+        Check whether a user is enrolled in a course.
+
+        Args:
+            user: User instance (anonymous users are never enrolled)
+            course: Course instance or course id
+
+        Returns:
+            True if a CourseEnrollment exists for the pair
+        """
+        if user is None or not user.is_authenticated:
+            return False
+        course_id = getattr(course, 'pk', course)
+        return course_id in self.get_enrolled_course_ids(user.pk)
+
+    def can_access_course(self, user, course) -> bool:
+        """
+        Check whether a user may access the content of a course.
+
+        Staff, superusers and the course teacher always have access; students
+        need an enrollment in an approved course.
+        """
+        if user is None or not user.is_authenticated:
+            return False
+        if user.is_staff or user.is_superuser or course.teacher_id == user.pk:
+            return True
+        return course.is_approved and self.is_enrolled(user, course)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drop the cached course ids of a user.
+
+        The key is deleted immediately and again after commit, so a request
+        racing the enrolling transaction cannot re-cache the old set.
+        """
+        cache_key = self.CACHE_KEY.format(user_id=user_id)
+        cache.delete(cache_key)
+        transaction.on_commit(lambda: cache.delete(cache_key))
+
+
+# Singleton instance for easy access
+enrollment_access_service = EnrollmentAccessService()
@@ -0,0 +1,228 @@
+"""
+Export Service - Streaming Data Exports
+
+Exports the TeoCoin ledger, course enrollments and withdrawal requests as CSV
+or NDJSON, optionally gzip-compressed. Rows are read with
+``values_list().iterator(chunk_size=...)`` (a server-side cursor on
+PostgreSQL) and encoded one at a time, so memory use does not depend on the
+size of the export. The output generators feed the admin export endpoint
+(``core.streaming.streaming_response``, so ASGI does not buffer them) and
+files in the ``export_data`` command.
+
+Exports read from the read replica when one is configured
+(``core.db_routing``).
+"""
+
+import csv
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import router
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from blockchain.models import DBTeoCoinTransaction, TeoCoinWithdrawalRequest
+from core.db_routing import replica_reads
+from courses.models import CourseEnrollment
+from services.base import BaseService
+from services.exceptions import TeoArtServiceException
+
+# dataset -> (model, date field, [(column, lookup)], {query param: lookup})
+DATASETS: Dict[str, Tuple[Any, str, List[Tuple[str, str]], Dict[str, str]]] = {
+    'transactions': (DBTeoCoinTransaction, 'created_at', [
+        ('id', 'id'),
+        ('user_id', 'user_id'),
+        ('username', 'user__username'),
+        ('email', 'user__email'),
+        ('transaction_type', 'transaction_type'),
+        ('amount', 'amount'),
+        ('description', 'description'),
+        ('course_id', 'course_id'),
+        ('related_user_id', 'related_user_id'),
+        ('blockchain_tx_hash', 'blockchain_tx_hash'),
+        ('created_at', 'created_at'),
+    ], {'user_id': 'user_id', 'transaction_type': 'transaction_type', 'course_id': 'course_id'}),
+    'enrollments': (CourseEnrollment, 'enrolled_at', [
+        ('id', 'id'),
+        ('student_id', 'student_id'),
+        ('student_email', 'student__email'),
+        ('course_id', 'course_id'),
+        ('course_title', 'course__title'),
+        ('teacher_id', 'course__teacher_id'),
+        ('payment_method', 'payment_method'),
+        ('amount_paid_eur', 'amount_paid_eur'),
+        ('amount_paid_teocoin', 'amount_paid_teocoin'),
+        ('original_price_eur', 'original_price_eur'),
+        ('discount_amount_eur', 'discount_amount_eur'),
+        ('teocoin_reward_given', 'teocoin_reward_given'),
+        ('enrolled_at', 'enrolled_at'),
+        ('completed', 'completed'),
+        ('completed_at', 'completed_at'),
+    ], {'student_id': 'student_id', 'course_id': 'course_id', 'payment_method': 'payment_method'}),
+    'withdrawals': (TeoCoinWithdrawalRequest, 'created_at', [
+        ('id', 'id'),
+        ('user_id', 'user_id'),
+        ('email', 'user__email'),
+        ('amount', 'amount'),
+        ('metamask_address', 'metamask_address'),
+        ('status', 'status'),
+        ('transaction_hash', 'transaction_hash'),
+        ('gas_used', 'gas_used'),
+        ('gas_cost_eur', 'gas_cost_eur'),
+        ('error_message', 'error_message'),
+        ('created_at', 'created_at'),
+        ('processed_at', 'processed_at'),
+        ('completed_at', 'completed_at'),
+    ], {'user_id': 'user_id', 'status': 'status'}),
+}
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class _LineBuffer:
+    """File-like object for csv.writer that hands back each written line."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class ExportService(BaseService):
+    """
+    Service streaming large exports.
+    """
+
+    DATASETS = DATASETS
+    FORMATS = FORMATS
+
+    def __init__(self):
+        super().__init__()
+        self.chunk_size = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+    def stream(
+        self,
+        dataset: str,
+        file_format: str = 'csv',
+        filters: Optional[Dict[str, Any]] = None,
+        compress: bool = False
+    ) -> Iterator[bytes]:
+        """
+        Stream an export.
+
+        Args:
+            dataset: 'transactions', 'enrollments' or 'withdrawals'
+            file_format: 'csv' or 'ndjson'
+            filters: Optional 'since'/'until' datetimes plus the dataset's
+                filter parameters (e.g. 'user_id', 'status')
+            compress: gzip the output
+
+        Returns:
+            Generator of encoded chunks
+
+        Raises:
+            TeoArtServiceException: On unknown dataset, format or filter
+        """
+        if file_format not in FORMATS:
+            raise TeoArtServiceException(f"Invalid export format: {file_format}", status_code=400)
+        columns, rows = self._rows(dataset, filters or {})
+        encoder = self._csv_lines if file_format == 'csv' else self._ndjson_lines
+        chunks = self._batched(encoder(columns, rows))
+        return self._gzip(chunks) if compress else chunks
+
+    def write(self, output, dataset: str, file_format: str = 'csv',
+              filters: Optional[Dict[str, Any]] = None, compress: bool = False) -> int:
+        """Write an export to a binary file object, returns the number of bytes written."""
+        written = 0
+        for chunk in self.stream(dataset, file_format, filters, compress):
+            output.write(chunk)
+            written += len(chunk)
+        self.log_info(f"Exported {dataset} as {file_format}: {written} bytes")
+        return written
+
+    def parse_boundary(self, value: str) -> datetime:
+        """Parse a 'since'/'until' ISO date or datetime (naive values use the current timezone)."""
+        parsed = parse_datetime(value) or parse_date(value)
+        if parsed is None:
+            raise TeoArtServiceException(f"Invalid date: {value}", status_code=400)
+        if not isinstance(parsed, datetime):
+            parsed = datetime.combine(parsed, datetime.min.time())
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+    # ========== PRIVATE METHODS ==========
+
+    def _rows(self, dataset: str, filters: Dict[str, Any]) -> Tuple[List[str], Iterable[tuple]]:
+        if dataset not in DATASETS:
+            raise TeoArtServiceException(
+                f"Invalid dataset: {dataset}. Must be one of: {list(DATASETS)}", status_code=400
+            )
+        model, date_field, columns, allowed_filters = DATASETS[dataset]
+
+        # Bind the alias now: the rows are read lazily, after the caller returns
+        with replica_reads():
+            queryset = model.objects.using(router.db_for_read(model))
+        for key, value in filters.items():
+            if value in (None, ''):
+                continue
+            if key == 'since':
+                queryset = queryset.filter(**{f'{date_field}__gte': value})
+            elif key == 'until':
+                queryset = queryset.filter(**{f'{date_field}__lt': value})
+            elif key in allowed_filters:
+                queryset = queryset.filter(**{allowed_filters[key]: value})
+            else:
+                raise TeoArtServiceException(f"Invalid filter for {dataset}: {key}", status_code=400)
+
+        # Primary key order: stable and served by the primary key index
+        rows = queryset.order_by('pk').values_list(*[lookup for _, lookup in columns]).iterator(
+            chunk_size=self.chunk_size
+        )
+        return [name for name, _ in columns], rows
+
+    def _csv_lines(self, columns: List[str], rows: Iterable[tuple]) -> Iterator[str]:
+        writer = csv.writer(_LineBuffer())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([self._format_value(value) for value in row])
+
+    def _ndjson_lines(self, columns: List[str], rows: Iterable[tuple]) -> Iterator[str]:
+        for row in rows:
+            record = {name: self._format_value(value, empty=None) for name, value in zip(columns, row)}
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+
+    def _format_value(self, value, empty=''):
+        if value is None:
+            return empty
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, (int, float, str)):
+            return value
+        return str(value)
+
+    def _batched(self, lines: Iterator[str]) -> Iterator[bytes]:
+        """Group lines into ~64KB chunks: fewer, larger writes to the socket."""
+        buffer, size = [], 0
+        for line in lines:
+            buffer.append(line)
+            size += len(line)
+            if size >= 65536:
+                yield ''.join(buffer).encode('utf-8')
+                buffer, size = [], 0
+        if buffer:
+            yield ''.join(buffer).encode('utf-8')
+
+    def _gzip(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+# Singleton instance for easy access
+export_service = ExportService()
@@ -0,0 +1,192 @@
+"""
+Gas Oracle Service - Cached Fee and Gas Limit Estimation
+
+Every platform transaction (mints for withdrawals, discount settlements)
+used to ask the RPC node for ``eth_gasPrice`` and often ``eth_estimateGas``
+right before signing. This service answers both from the cache:
+
+- Fees: ``refresh`` samples ``eth_feeHistory`` over the last
+  ``GAS_ORACLE_BLOCKS`` blocks and caches the next block's base fee and the
+  slow/standard/fast priority fees (reward percentiles ``GAS_ORACLE_PERCENTILES``).
+  A signing path finding the snapshot older than ``GAS_ORACLE_MAX_AGE``
+  refreshes it inline; a cache lock lets one caller refresh while the others
+  keep using the previous snapshot. Nodes without EIP-1559 fall back to a
+  buffered ``eth_gasPrice``.
+- Gas limits: ``estimate_gas`` caches the estimate per contract method,
+  scaled by ``GAS_ORACLE_ESTIMATE_BUFFER``. Unused gas is not charged, so a
+  generous limit costs nothing and covers argument-dependent variations
+  (e.g. a first mint to a new holder).
+
+``get_fee_params`` returns the fee fields to merge into ``build_transaction``.
+Fees are clamped between ``GAS_ORACLE_MIN_PRIORITY_FEE_GWEI`` (Polygon's
+minimum tip) and the ``GAS_ORACLE_MAX_FEE_GWEI`` spending cap; a bumped
+request the cap leaves unchanged raises ``BlockchainTransactionError``.
+"""
+
+import hashlib
+import statistics
+import time
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from web3 import Web3
+
+from services.base import BaseService
+from services.exceptions import BlockchainTransactionError
+
+SPEEDS = ('slow', 'standard', 'fast')
+
+
+class GasOracleService(BaseService):
+    """
+    Service caching fee market data and per-method gas estimates.
+    """
+
+    FEES_KEY = 'gas_oracle_fees:{node}'
+    REFRESH_LOCK_KEY = 'gas_oracle_refresh_lock:{node}'
+    ESTIMATE_KEY = 'gas_oracle_estimate:{node}:{address}:{method}'
+
+    def _gwei(self, name: str, default) -> int:
+        return Web3.to_wei(getattr(settings, name, default), 'gwei')
+
+    def _node(self, w3) -> str:
+        endpoint = getattr(w3.provider, 'endpoint_uri', None) or w3.provider.__class__.__name__
+        return hashlib.sha1(str(endpoint).encode()).hexdigest()[:12]
+
+    # Fees
+
+    def refresh(self, w3) -> Dict[str, Any]:
+        """Sample the fee market and cache the snapshot."""
+        percentiles = getattr(settings, 'GAS_ORACLE_PERCENTILES', [10, 50, 90])
+        try:
+            history = w3.eth.fee_history(getattr(settings, 'GAS_ORACLE_BLOCKS', 20), 'latest', percentiles)
+            base_fee = int(history['baseFeePerGas'][-1])  # next block
+            rewards = [row for row in history.get('reward') or [] if row]
+        except Exception as e:
+            self.log_info(f"eth_feeHistory unavailable, using eth_gasPrice: {e}")
+            base_fee, rewards = 0, []
+
+        if base_fee and rewards:
+            snapshot = {
+                'eip1559': True,
+                'base_fee': base_fee,
+                'priority_fees': {
+                    speed: int(statistics.median(row[i] for row in rewards))
+                    for i, speed in enumerate(SPEEDS)
+                },
+            }
+        else:
+            snapshot = {'eip1559': False, 'gas_price': int(w3.eth.gas_price)}
+        snapshot['fetched_at'] = time.time()
+
+        cache.set(self.FEES_KEY.format(node=self._node(w3)), snapshot,
+                  getattr(settings, 'GAS_ORACLE_STALE_SECONDS', 600))
+        return snapshot
+
+    def get_fees(self, w3) -> Optional[Dict[str, Any]]:
+        """
+        Cached fee snapshot, refreshed inline when older than ``GAS_ORACLE_MAX_AGE``.
+
+        Only the caller holding the refresh lock samples the node; the others
+        use the stale snapshot meanwhile. A stale snapshot is also used if the
+        refresh fails; None when there is no data at all.
+        """
+        node = self._node(w3)
+        snapshot = cache.get(self.FEES_KEY.format(node=node))
+        if snapshot and time.time() - snapshot['fetched_at'] < getattr(settings, 'GAS_ORACLE_MAX_AGE', 60):
+            return snapshot
+
+        lock_key = self.REFRESH_LOCK_KEY.format(node=node)
+        locked = cache.add(lock_key, True, getattr(settings, 'GAS_ORACLE_REFRESH_LOCK_SECONDS', 10))
+        if not locked and snapshot:
+            return snapshot
+        try:
+            return self.refresh(w3)
+        except Exception as e:
+            self.log_error(f"Gas fee refresh failed: {e}")
+            return snapshot
+        finally:
+            if locked:
+                # Never release a lock another caller holds (cold cache: everybody refreshes)
+                cache.delete(lock_key)
+
+    def get_fee_params(self, w3, speed: str = 'standard', bump: float = 1.0) -> Dict[str, int]:
+        """
+        Fee fields for ``build_transaction``; ``bump`` raises them for
+        replacement attempts.
+
+        Raises BlockchainTransactionError when ``bump`` cannot raise the fees
+        because they are already at ``GAS_ORACLE_MAX_FEE_GWEI``.
+        """
+        snapshot = self.get_fees(w3)
+        params = self._fee_params(w3, snapshot, speed, bump)
+        if bump > 1 and params == self._fee_params(w3, snapshot, speed, 1.0):
+            self.log_error(f"Fees already at GAS_ORACLE_MAX_FEE_GWEI, a {bump:.2f}x bump leaves them unchanged: {params}")
+            raise BlockchainTransactionError(
+                "Gas fees are capped by GAS_ORACLE_MAX_FEE_GWEI and cannot be raised",
+                "GAS_FEE_CAP_REACHED",
+            )
+        return params
+
+    def _fee_params(self, w3, snapshot: Optional[Dict[str, Any]], speed: str, bump: float) -> Dict[str, int]:
+        min_tip = self._gwei('GAS_ORACLE_MIN_PRIORITY_FEE_GWEI', 25)
+        max_fee = self._gwei('GAS_ORACLE_MAX_FEE_GWEI', 50)
+
+        if snapshot and snapshot['eip1559']:
+            tip = int(max(snapshot['priority_fees'][speed], min_tip) * bump)
+            fee_cap = int((2 * snapshot['base_fee'] + tip) * bump)  # survives ~6 full blocks of base fee growth
+            tip = min(tip, max_fee)
+            return {'maxFeePerGas': max(min(fee_cap, max_fee), tip), 'maxPriorityFeePerGas': tip}
+
+        return {'gasPrice': self.get_gas_price(w3, snapshot, bump)}
+
+    def get_gas_price(self, w3, snapshot: Optional[Dict[str, Any]] = None, bump: float = 1.0) -> int:
+        """Single gas price in wei (legacy transactions, cost estimates)."""
+        if snapshot is None:
+            snapshot = self.get_fees(w3)
+        min_price = self._gwei('GAS_ORACLE_MIN_PRIORITY_FEE_GWEI', 25)
+        max_price = self._gwei('GAS_ORACLE_MAX_FEE_GWEI', 50)
+
+        if not snapshot:
+            price = self._gwei('GAS_ORACLE_FALLBACK_GAS_PRICE_GWEI', 30)
+        elif snapshot['eip1559']:
+            price = snapshot['base_fee'] + max(snapshot['priority_fees']['standard'], min_price)
+        else:
+            price = int(snapshot['gas_price'] * 1.1)  # 10% buffer for reliability
+        return min(max(int(price * bump), min_price), max_price)
+
+    # Gas limits
+
+    def _estimate_key(self, function_call) -> str:
+        return self.ESTIMATE_KEY.format(
+            node=self._node(function_call.w3),
+            address=str(function_call.address).lower(),
+            method=function_call.fn_name,
+        )
+
+    def estimate_gas(self, function_call, transaction: Dict[str, Any], default: int) -> int:
+        """
+        Gas limit for ``function_call`` from the per-method cache, estimated
+        (and cached) on a miss. ``default`` is used when estimation fails.
+        """
+        key = self._estimate_key(function_call)
+        gas = cache.get(key)
+        if gas is not None:
+            return gas
+        try:
+            estimate = function_call.estimate_gas(transaction)
+        except Exception as e:
+            self.log_error(f"Gas estimation for {function_call.fn_name} failed, using {default}: {e}")
+            return default
+        gas = int(estimate * getattr(settings, 'GAS_ORACLE_ESTIMATE_BUFFER', 1.5))
+        cache.set(key, gas, getattr(settings, 'GAS_ORACLE_ESTIMATE_TTL', 24 * 3600))
+        return gas
+
+    def invalidate_estimate(self, function_call) -> None:
+        """Forget the cached limit of a method, e.g. after an out-of-gas failure or a contract upgrade."""
+        cache.delete(self._estimate_key(function_call))
+
+
+# Singleton instance
+gas_oracle_service = GasOracleService()
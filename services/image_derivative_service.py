@@ -0,0 +1,207 @@
+"""
+Image Derivative Service - Resized Variants of Course Covers and Avatars
+
+Course covers and avatars are uploaded at any size but shown as catalog
+cards and thumbnails. For each uploaded image this service generates
+resized WebP and JPEG variants at the ``IMAGE_DERIVATIVE_WIDTHS`` of its
+target, so pages download an image close to the size they display.
+
+Pipeline:
+
+1. ``mark_pending`` (post_save signals in ``courses.signals`` and
+   ``users.signals``) flags the new source image in the ``*_variants`` JSON
+   field of the model.
+2. ``process_pending`` (``core.tasks.generate_image_derivatives`` or
+   ``manage.py generate_image_derivatives``) renders the variants with
+   Pillow outside the request.
+3. Serializers read the stored names via ``get_srcset``/``get_url``,
+   without queries. Until variants are ready they fall back to the original.
+
+Variants are stored under names derived from the SHA-256 of the source bytes
+(``derived/<target>/<hash[:2]>/<hash>-<width>w.<ext>``): re-processing or
+uploading the same image twice reuses the existing files, and the names can
+be cached forever.
+"""
+
+import hashlib
+import io
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from courses.models import Course
+from services.base import BaseService
+from users.models import User
+
+# target -> (model, image field, variants field)
+TARGETS = {
+    'course_cover': (Course, 'cover_image', 'cover_image_variants'),
+    'avatar': (User, 'avatar', 'avatar_variants'),
+}
+
+# variant format -> Pillow format, in <picture> source order
+FORMATS = {
+    'webp': 'WEBP',
+    'jpeg': 'JPEG',
+}
+
+
+class ImageDerivativeService(BaseService):
+    """
+    Service generating and resolving resized image variants.
+    """
+
+    @property
+    def widths(self) -> Dict[str, List[int]]:
+        return getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', {
+            'course_cover': [320, 640, 960, 1280],
+            'avatar': [64, 128, 256],
+        })
+
+    def mark_pending(self, target: str, instance, update_fields=None) -> None:
+        """Flag a new or removed source image of ``instance``; called after save."""
+        model, image_field, variants_field = TARGETS[target]
+        if update_fields is not None and image_field not in update_fields:
+            return
+        name = getattr(instance, image_field).name or ''
+        variants = getattr(instance, variants_field) or {}
+        if variants.get('source', '') == name:
+            return
+
+        new_variants = {'source': name, 'status': 'pending'} if name else {}
+        model.objects.filter(pk=instance.pk).update(**{variants_field: new_variants})
+        setattr(instance, variants_field, new_variants)
+
+    def process_pending(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """Generate the variants of pending images, oldest first."""
+        batch_size = batch_size or getattr(settings, 'IMAGE_DERIVATIVE_BATCH_SIZE', 50)
+        result = {'processed': 0, 'failed': 0}
+        for target, (model, image_field, variants_field) in TARGETS.items():
+            pending = model.objects.filter(**{f'{variants_field}__status': 'pending'}).order_by('pk')
+            for instance in pending.only('pk', image_field, variants_field)[:batch_size]:
+                if self.generate(target, instance):
+                    result['processed'] += 1
+                else:
+                    result['failed'] += 1
+        return result
+
+    def mark_all_pending(self) -> int:
+        """Queue every image again (backfill after changing widths or formats)."""
+        count = 0
+        for target, (model, image_field, variants_field) in TARGETS.items():
+            images = model.objects.exclude(**{f'{image_field}__isnull': True}).exclude(**{image_field: ''})
+            for instance in images.only('pk', image_field).iterator():
+                model.objects.filter(pk=instance.pk).update(
+                    **{variants_field: {'source': getattr(instance, image_field).name, 'status': 'pending'}}
+                )
+                count += 1
+        return count
+
+    def generate(self, target: str, instance) -> bool:
+        """
+        Render and store the variants of ``instance``'s image.
+
+        The result is only saved if the source image did not change in the
+        meantime; a newer upload is already pending on its own.
+        """
+        model, image_field, variants_field = TARGETS[target]
+        field_file = getattr(instance, image_field)
+        source = field_file.name
+        if not source:
+            model.objects.filter(pk=instance.pk).update(**{variants_field: {}})
+            return False
+
+        try:
+            with field_file.storage.open(source, 'rb') as f:
+                data = f.read()
+            variants = self._render(target, data, field_file.storage)
+            variants.update({'source': source, 'status': 'ready'})
+        except Exception as e:
+            self.log_error(f"Derivatives for {target} {instance.pk} ({source}) failed: {e}")
+            variants = {'source': source, 'status': 'failed', 'error': str(e)[:200]}
+
+        model.objects.filter(pk=instance.pk, **{image_field: source}).update(**{variants_field: variants})
+        setattr(instance, variants_field, variants)
+        return variants['status'] == 'ready'
+
+    def get_srcset(self, instance, target: str, request=None) -> Optional[Dict[str, str]]:
+        """
+        ``{'webp': 'url 320w, url 640w, ...', 'jpeg': ...}`` for ``<picture>``/``<img srcset>``,
+        or None while the variants of the current image are not ready.
+        """
+        variants = self._ready_variants(instance, target)
+        if not variants:
+            return None
+        storage = getattr(instance, TARGETS[target][1]).storage
+        return {
+            fmt: ', '.join(
+                f"{self._absolute(storage.url(name), request)} {width}w"
+                for width, name in sorted(names.items(), key=lambda item: int(item[0]))
+            )
+            for fmt, names in variants['formats'].items()
+        }
+
+    def get_url(self, instance, target: str, width: int, request=None, fmt: str = 'jpeg') -> Optional[str]:
+        """URL of the smallest variant at least ``width`` wide, falling back to the original image."""
+        field_file = getattr(instance, TARGETS[target][1])
+        if not field_file:
+            return None
+
+        variants = self._ready_variants(instance, target)
+        if variants and variants['formats'].get(fmt):
+            names = sorted(variants['formats'][fmt].items(), key=lambda item: int(item[0]))
+            name = next((n for w, n in names if int(w) >= width), names[-1][1])
+            return self._absolute(field_file.storage.url(name), request)
+        return self._absolute(field_file.url, request)
+
+    def _ready_variants(self, instance, target: str) -> Optional[Dict[str, Any]]:
+        _, image_field, variants_field = TARGETS[target]
+        variants = getattr(instance, variants_field) or {}
+        if variants.get('status') != 'ready' or variants.get('source') != getattr(instance, image_field).name:
+            return None
+        return variants
+
+    def _render(self, target: str, data: bytes, storage) -> Dict[str, Any]:
+        digest = hashlib.sha256(data).hexdigest()
+        quality = getattr(settings, 'IMAGE_DERIVATIVE_QUALITY', 80)
+
+        image = Image.open(io.BytesIO(data))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        # Never upscale: images narrower than every width get one variant at their own size
+        widths = [w for w in self.widths[target] if w <= image.width] or [image.width]
+        formats: Dict[str, Dict[str, str]] = {fmt: {} for fmt in FORMATS}
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for fmt, pil_format in FORMATS.items():
+                name = f'derived/{target}/{digest[:2]}/{digest}-{width}w.{fmt}'
+                if not storage.exists(name):
+                    name = storage.save(name, ContentFile(self._encode(resized, pil_format, quality)))
+                formats[fmt][str(width)] = name
+
+        return {'hash': digest, 'width': image.width, 'height': image.height, 'formats': formats}
+
+    def _encode(self, image: Image.Image, pil_format: str, quality: int) -> bytes:
+        buffer = io.BytesIO()
+        if pil_format == 'JPEG':
+            if image.mode == 'RGBA':
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            image.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+        else:
+            image.save(buffer, 'WEBP', quality=quality, method=4)
+        return buffer.getvalue()
+
+    def _absolute(self, url: str, request) -> str:
+        return request.build_absolute_uri(url) if request is not None else url
+
+
+# Singleton instance
+image_derivative_service = ImageDerivativeService()
@@ -0,0 +1,241 @@
+"""
+Leaderboard Service - Precomputed Reward Rankings
+
+Reward rankings are materialized in ``LeaderboardEntry`` (all-time, monthly,
+weekly and per course) and refreshed incrementally from the
+``DBTeoCoinTransaction`` ledger: each refresh applies only the rows after the
+stored high-water mark and re-ranks the boards they touched. Reading a
+leaderboard or a user's rank is a single indexed query.
+
+Run ``manage.py refresh_leaderboards --loop``; starting from an empty cursor,
+its first refresh backfills the boards from the whole ledger.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from blockchain.models import DBTeoCoinTransaction
+from rewards.models import LeaderboardEntry, LeaderboardState
+from services.base import TransactionalService
+from services.exceptions import TeoArtServiceException
+
+# (period, period_key, course_id)
+BoardKey = Tuple[str, str, Optional[int]]
+
+
+class LeaderboardService(TransactionalService):
+    """
+    Service maintaining and serving the reward leaderboards.
+    """
+
+    PERIODS = [choice[0] for choice in LeaderboardEntry.PERIOD_CHOICES]
+
+    def __init__(self):
+        super().__init__()
+        self.reward_types = getattr(settings, 'LEADERBOARD_REWARD_TYPES', [
+            'earned', 'bonus', 'lesson_reward', 'exercise_completion',
+            'review_completion', 'course_purchase_bonus', 'course_completion_bonus',
+        ])
+        self.batch_size = getattr(settings, 'LEADERBOARD_REFRESH_BATCH_SIZE', 5000)
+        # Ledger rows younger than this are left for the next run, so rows from
+        # transactions that commit out of id order are not skipped
+        self.safety_lag = timedelta(seconds=getattr(settings, 'LEADERBOARD_SAFETY_LAG_SECONDS', 60))
+
+    # ========== READS ==========
+
+    def get_leaderboard(
+        self,
+        period: str = 'all_time',
+        limit: int = 10,
+        course_id: Optional[int] = None,
+        period_key: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the top of a leaderboard.
+
+        Args:
+            period: 'all_time', 'monthly', 'weekly' or 'course'
+            limit: Number of entries to return
+            course_id: Course ID (required for period='course')
+            period_key: Explicit period ('2025-07', '2025-W28'), current one by default
+
+        Returns:
+            List of ranked entries
+        """
+        period_key = self._resolve_period_key(period, course_id, period_key)
+        entries = LeaderboardEntry.objects.filter(
+            period=period, period_key=period_key
+        ).select_related('user').order_by('rank', 'user_id')[:limit]
+        return [self._serialize(entry) for entry in entries]
+
+    def get_user_rank(
+        self,
+        user_id: int,
+        period: str = 'all_time',
+        course_id: Optional[int] = None,
+        period_key: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a user's entry on a leaderboard, or None if they have no rewards in it."""
+        period_key = self._resolve_period_key(period, course_id, period_key)
+        entry = LeaderboardEntry.objects.filter(
+            period=period, period_key=period_key, user_id=user_id
+        ).select_related('user').first()
+        return self._serialize(entry) if entry else None
+
+    # ========== REFRESH ==========
+
+    def refresh(self, max_batches: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Apply new ledger rows to the leaderboards.
+
+        Args:
+            max_batches: Stop after this many batches of ``batch_size`` rows
+
+        Returns:
+            Dict with processed transaction and re-ranked board counts
+        """
+        result = {'transactions': 0, 'boards': 0, 'batches': 0}
+        while max_batches is None or result['batches'] < max_batches:
+            processed, boards = self._refresh_batch()
+            if not processed:
+                break
+            result['transactions'] += processed
+            result['boards'] += boards
+            result['batches'] += 1
+
+        self.log_info(
+            f"Leaderboard refresh: {result['transactions']} transactions, {result['boards']} boards re-ranked"
+        )
+        return result
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Drop every leaderboard and replay the whole ledger."""
+        with transaction.atomic():
+            LeaderboardEntry.objects.all().delete()
+            LeaderboardState.objects.update_or_create(
+                name='default', defaults={'last_transaction_id': 0, 'refreshed_at': None}
+            )
+        return self.refresh()
+
+    # ========== PRIVATE METHODS ==========
+
+    def _refresh_batch(self) -> Tuple[int, int]:
+        with transaction.atomic():
+            # Row lock: concurrent refreshes serialize instead of double counting
+            state, _ = LeaderboardState.objects.select_for_update().get_or_create(name='default')
+            rows = list(DBTeoCoinTransaction.objects.filter(
+                id__gt=state.last_transaction_id,
+                created_at__lte=timezone.now() - self.safety_lag,
+            ).order_by('id').values(
+                'id', 'user_id', 'course_id', 'transaction_type', 'amount', 'created_at'
+            )[:self.batch_size])
+            if not rows:
+                return 0, 0
+
+            deltas: Dict[BoardKey, Dict[int, List]] = defaultdict(lambda: defaultdict(lambda: [Decimal('0'), 0]))
+            for row in rows:
+                if row['transaction_type'] not in self.reward_types or row['amount'] <= 0:
+                    continue
+                for board in self._boards_for(row):
+                    delta = deltas[board][row['user_id']]
+                    delta[0] += row['amount']
+                    delta[1] += 1
+
+            for board, user_deltas in deltas.items():
+                self._apply_deltas(board, user_deltas)
+                self._rerank(board)
+
+            state.last_transaction_id = rows[-1]['id']
+            state.refreshed_at = timezone.now()
+            state.save(update_fields=['last_transaction_id', 'refreshed_at'])
+        return len(rows), len(deltas)
+
+    def _boards_for(self, row) -> List[BoardKey]:
+        created_at = timezone.localtime(row['created_at'])
+        iso_year, iso_week, _ = created_at.isocalendar()
+        boards = [
+            ('all_time', 'all', None),
+            ('monthly', created_at.strftime('%Y-%m'), None),
+            ('weekly', f"{iso_year}-W{iso_week:02d}", None),
+        ]
+        if row['course_id']:
+            boards.append(('course', str(row['course_id']), row['course_id']))
+        return boards
+
+    def _apply_deltas(self, board: BoardKey, user_deltas: Dict[int, List]) -> None:
+        period, period_key, course_id = board
+        existing = {
+            entry.user_id: entry
+            for entry in LeaderboardEntry.objects.filter(
+                period=period, period_key=period_key, user_id__in=list(user_deltas)
+            )
+        }
+
+        to_create, to_update = [], []
+        for user_id, (amount, count) in user_deltas.items():
+            entry = existing.get(user_id)
+            if entry is None:
+                to_create.append(LeaderboardEntry(
+                    period=period, period_key=period_key, course_id=course_id,
+                    user_id=user_id, total_rewards=amount, reward_count=count
+                ))
+            else:
+                entry.total_rewards += amount
+                entry.reward_count += count
+                to_update.append(entry)
+
+        LeaderboardEntry.objects.bulk_create(to_create)
+        LeaderboardEntry.objects.bulk_update(to_update, ['total_rewards', 'reward_count'])
+
+    def _rerank(self, board: BoardKey) -> None:
+        """Competition ranking (1, 2, 2, 4) of one board, ties broken by user id."""
+        period, period_key, _ = board
+        entries = list(LeaderboardEntry.objects.filter(
+            period=period, period_key=period_key
+        ).order_by('-total_rewards', 'user_id').only('id', 'total_rewards', 'rank'))
+
+        changed = []
+        previous_total, rank = None, 0
+        for position, entry in enumerate(entries, 1):
+            if entry.total_rewards != previous_total:
+                rank, previous_total = position, entry.total_rewards
+            if entry.rank != rank:
+                entry.rank = rank
+                changed.append(entry)
+        LeaderboardEntry.objects.bulk_update(changed, ['rank'], batch_size=1000)
+
+    def _resolve_period_key(self, period: str, course_id: Optional[int], period_key: Optional[str]) -> str:
+        if period not in self.PERIODS:
+            raise TeoArtServiceException(f"Invalid leaderboard period: {period}. Must be one of: {self.PERIODS}")
+        if period == 'course':
+            if not course_id:
+                raise TeoArtServiceException("course_id is required for the course leaderboard")
+            return str(course_id)
+        if period_key:
+            return period_key
+        if period == 'all_time':
+            return 'all'
+        return self._boards_for({'created_at': timezone.now(), 'course_id': None})[
+            1 if period == 'monthly' else 2
+        ][1]
+
+    def _serialize(self, entry: LeaderboardEntry) -> Dict[str, Any]:
+        user = entry.user
+        return {
+            'rank': entry.rank,
+            'user_id': user.id,
+            'username': user.username,
+            'full_name': f"{user.first_name} {user.last_name}".strip() or user.username,
+            'total_rewards': float(entry.total_rewards),
+            'reward_count': entry.reward_count,
+        }
+
+
+# Singleton instance for easy access
+leaderboard_service = LeaderboardService()
@@ -0,0 +1,376 @@
+"""
+Mint Settlement Service - Coalesced On-Chain Minting
+
+Rewards, withdrawals and payment bonuses used to send one ``mint``
+transaction each, paying gas and waiting for a confirmation per event.
+Instead they are queued as ``PendingMint`` credits (``enqueue``,
+``queue_withdrawal``, ``queue_reward``) and ``settle`` mints them in bulk:
+
+- credits are summed per wallet: one ``mint`` per wallet or, with
+  ``MINT_SETTLEMENT_MULTICALL``, one ``multicall`` of ``mintTo`` calls per
+  ``MINT_SETTLEMENT_MULTICALL_SIZE`` wallets (thirdweb TokenERC20 tokens)
+- a wallet is settled once its pending total reaches
+  ``MINT_SETTLEMENT_THRESHOLD_TEO`` or its oldest credit has waited
+  ``MINT_SETTLEMENT_MAX_DELAY_SECONDS``
+- the transactions of a run are sent back to back with consecutive nonces
+  and their receipts awaited together; receipts not in yet are picked up by
+  the next run
+- on confirmation each credit's ledger row (withdrawal request, reward
+  transaction) is completed with the settlement's transaction hash
+- credits of a failed settlement are retried by later runs, up to
+  ``MINT_SETTLEMENT_MAX_ATTEMPTS`` times, then their ledger rows fail
+
+Run ``manage.py settle_mints --loop`` (or ``core.tasks.settle_pending_mints``).
+"""
+
+import json
+import os
+import time
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from web3 import Web3
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+from blockchain.models import DBTeoCoinBalance, MintSettlement, PendingMint, TeoCoinWithdrawalRequest
+from services.base import BaseService
+from services.exceptions import TeoArtServiceException
+from services.gas_oracle_service import gas_oracle_service
+
+LOCK_KEY = 'mint_settlement:lock'
+
+
+class MintSettlementService(BaseService):
+    """
+    Service queueing on-chain credits and minting them in aggregated settlements.
+    """
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, 'MINT_SETTLEMENT_ENABLED', True)
+
+    def _chain(self, chain):
+        if chain is not None:
+            return chain
+        from blockchain.blockchain import teocoin_service
+        return teocoin_service
+
+    # Queueing
+
+    def enqueue(self, wallet_address: str, amount, source: str, object_id='', user=None) -> PendingMint:
+        """
+        Queue ``amount`` TEO for ``wallet_address``. A ledger row
+        (``source``, ``object_id``) is queued once.
+
+        Raises:
+            TeoArtServiceException: invalid address or amount (400)
+        """
+        if not Web3.is_address(wallet_address or ''):
+            raise TeoArtServiceException('Invalid wallet address', code='invalid_address', status_code=400)
+        amount = Decimal(str(amount))
+        if amount <= 0:
+            raise TeoArtServiceException('Mint amount must be positive', code='invalid_amount', status_code=400)
+
+        object_id = str(object_id or '')
+        if object_id:
+            existing = PendingMint.objects.filter(source=source, object_id=object_id).first()
+            if existing is not None:
+                return existing
+        try:
+            credit = PendingMint.objects.create(
+                user=user, wallet_address=wallet_address.lower(), amount=amount, source=source, object_id=object_id
+            )
+        except IntegrityError:
+            return PendingMint.objects.get(source=source, object_id=object_id)
+
+        self.log_info(f"Queued {amount} TEO {source} mint to {credit.wallet_address}")
+        return credit
+
+    def queue_withdrawal(self, withdrawal: TeoCoinWithdrawalRequest) -> PendingMint:
+        """Queue the mint of a withdrawal request, which is processing until settled."""
+        with transaction.atomic():
+            credit = self.enqueue(
+                withdrawal.metamask_address, withdrawal.amount, 'withdrawal', withdrawal.pk, withdrawal.user
+            )
+            withdrawal.status = 'processing'
+            withdrawal.processed_at = timezone.now()
+            withdrawal.save(update_fields=['status', 'processed_at'])
+        return credit
+
+    def queue_reward(self, reward) -> PendingMint:
+        """Queue the mint of a pending ``BlockchainTransaction`` reward to its user's wallet."""
+        return self.enqueue(reward.user.wallet_address, reward.amount, 'reward', reward.pk, reward.user)
+
+    # Settlement
+
+    def settle(self, chain=None, force: bool = False) -> Dict[str, Any]:
+        """
+        Confirm earlier settlements, then mint the credits of every due
+        wallet (every wallet with ``force``).
+
+        ``chain`` provides ``w3``, ``contract`` and ``admin_private_key``
+        (default: the TeoCoin service).
+        """
+        result = {'submitted': 0, 'confirmed': 0, 'failed': 0, 'wallets': 0, 'credits': 0}
+        timeout = getattr(settings, 'MINT_SETTLEMENT_RECEIPT_TIMEOUT', 120)
+        # The receipts of a run share one deadline, so a run lasts about `timeout`
+        # plus signing and sending; the token keeps an overrunning run from
+        # releasing the lock of the run that took over after it expired
+        token = uuid.uuid4().hex
+        if not cache.add(LOCK_KEY, token, timeout * 2):
+            result['skipped'] = 'Another settlement is running'
+            return result
+
+        try:
+            chain = self._chain(chain)
+            if not chain.admin_private_key:
+                raise TeoArtServiceException('Admin private key not configured', code='no_minter_key')
+            account = chain.w3.eth.account.from_key(chain.admin_private_key)
+
+            self._check_submitted(chain.w3, account.address, result)
+            settlements = self._claim_due(force, result)
+            sent = self._submit(chain, account, settlements, result)
+            deadline = time.monotonic() + timeout
+            for settlement in sent:
+                try:
+                    receipt = chain.w3.eth.wait_for_transaction_receipt(
+                        settlement.tx_hash, timeout=max(deadline - time.monotonic(), 0.1)
+                    )
+                except TimeExhausted:
+                    continue
+                self._finish(settlement, receipt, result)
+        finally:
+            if cache.get(LOCK_KEY) == token:
+                cache.delete(LOCK_KEY)
+
+        if result['submitted'] or result['confirmed'] or result['failed']:
+            self.log_info(
+                f"Settlement: {result['credits']} credits for {result['wallets']} wallets in "
+                f"{result['submitted']} transactions, {result['confirmed']} confirmed, {result['failed']} failed"
+            )
+        return result
+
+    def _claim_due(self, force: bool, result: Dict[str, Any]) -> List[MintSettlement]:
+        """Group the pending credits of due wallets into settlements."""
+        threshold = Decimal(str(getattr(settings, 'MINT_SETTLEMENT_THRESHOLD_TEO', 100)))
+        oldest_allowed = timezone.now() - timezone.timedelta(
+            seconds=getattr(settings, 'MINT_SETTLEMENT_MAX_DELAY_SECONDS', 300)
+        )
+        batch_size = getattr(settings, 'MINT_SETTLEMENT_BATCH_SIZE', 500)
+        per_tx = getattr(settings, 'MINT_SETTLEMENT_MULTICALL_SIZE', 50) if getattr(
+            settings, 'MINT_SETTLEMENT_MULTICALL', False
+        ) else 1
+
+        with transaction.atomic():
+            wallets: Dict[str, List[PendingMint]] = {}
+            for credit in PendingMint.objects.select_for_update().filter(status='pending')[:batch_size]:
+                wallets.setdefault(credit.wallet_address, []).append(credit)
+            due = [
+                credits for credits in wallets.values()
+                if force
+                or sum(c.amount for c in credits) >= threshold
+                or min(c.created_at for c in credits) <= oldest_allowed
+            ]
+
+            settlements = []
+            for start in range(0, len(due), per_tx):
+                group = due[start:start + per_tx]
+                credits = [credit for credits in group for credit in credits]
+                settlement = MintSettlement.objects.create(
+                    wallet_count=len(group), amount=sum(c.amount for c in credits)
+                )
+                PendingMint.objects.filter(pk__in=[c.pk for c in credits]).update(
+                    status='submitted', settlement=settlement
+                )
+                settlements.append(settlement)
+                result['wallets'] += len(group)
+                result['credits'] += len(credits)
+        return settlements
+
+    def _mint_calls(self, chain, settlement: MintSettlement):
+        """A single-wallet ``mint`` call (the gas reference) and the (wallet, wei) pairs of a settlement."""
+        totals: Dict[str, Decimal] = {}
+        for credit in settlement.credits.all():
+            totals[credit.wallet_address] = totals.get(credit.wallet_address, Decimal('0')) + credit.amount
+        mints = [(Web3.to_checksum_address(wallet), Web3.to_wei(amount, 'ether')) for wallet, amount in totals.items()]
+        mint = chain.contract.functions.mint(*mints[0])
+        return mint, mints
+
+    def _multicall(self, chain, mints):
+        with open(os.path.join(settings.BASE_DIR, 'blockchain', 'abi', 'teoCoin2_ABI.json')) as f:
+            abi = [item for item in json.load(f) if item.get('name') in ('mintTo', 'multicall')]
+        token = chain.w3.eth.contract(address=chain.contract.address, abi=abi)
+        return token.functions.multicall([token.encode_abi('mintTo', args=list(mint)) for mint in mints])
+
+    def _submit(self, chain, account, settlements: List[MintSettlement], result: Dict[str, Any]) -> List[MintSettlement]:
+        """
+        Sign and send the settlements with consecutive nonces; returns the
+        ones the node accepted.
+
+        The hash and nonce are saved before broadcasting. A send error does
+        not fail the settlement, as the node may have accepted the transaction
+        anyway: ``_check_submitted`` settles it from the receipt or, once its
+        nonce is taken by another transaction, retries its credits.
+        """
+        if not settlements:
+            return []
+        w3 = chain.w3
+        nonce = w3.eth.get_transaction_count(account.address, 'pending')
+        fees = gas_oracle_service.get_fee_params(w3)
+        sent = []
+
+        for settlement in settlements:
+            try:
+                mint, mints = self._mint_calls(chain, settlement)
+                gas = gas_oracle_service.estimate_gas(mint, {'from': account.address}, 150000)
+                function = mint if len(mints) == 1 else self._multicall(chain, mints)
+                tx = function.build_transaction({
+                    'from': account.address,
+                    'gas': gas * len(mints),
+                    'nonce': nonce,
+                    **fees,
+                })
+                signed = account.sign_transaction(tx)
+            except Exception as e:
+                # Nothing was broadcast
+                self._fail(settlement, f'Could not build transaction: {e}')
+                result['failed'] += 1
+                continue
+
+            settlement.tx_hash, settlement.nonce = Web3.to_hex(signed.hash), nonce
+            settlement.save(update_fields=['tx_hash', 'nonce'])
+            nonce += 1
+            result['submitted'] += 1
+            try:
+                w3.eth.send_raw_transaction(signed.raw_transaction)
+            except Exception as e:
+                self.log_error(f"Sending settlement {settlement.tx_hash} failed, checking it later: {e}")
+                settlement.error = f'Send failed: {e}'
+                settlement.save(update_fields=['error'])
+                continue
+            sent.append(settlement)
+        return sent
+
+    def _check_submitted(self, w3, address: str, result: Dict[str, Any]) -> None:
+        """
+        Finish settlements whose receipt arrived after their run gave up
+        waiting, and fail the ones whose nonce went to another transaction.
+
+        A nonce only counts as taken once it is ``MINT_SETTLEMENT_CONFIRMATIONS``
+        blocks deep, and the receipt is asked for again before failing, so a
+        lagging or load-balanced node cannot make a mined settlement look dropped.
+        """
+        submitted = list(MintSettlement.objects.filter(status='submitted').order_by('nonce'))
+        if not submitted:
+            return
+        depth = getattr(settings, 'MINT_SETTLEMENT_CONFIRMATIONS', 12)
+        buried_nonce = w3.eth.get_transaction_count(address, max(w3.eth.block_number - depth, 0))
+        for settlement in submitted:
+            if not settlement.tx_hash:
+                # Interrupted between claiming and signing: nothing was broadcast
+                self._fail(settlement, 'Settlement was not sent')
+                result['failed'] += 1
+                continue
+            receipt = self._receipt(w3, settlement.tx_hash)
+            if receipt is None and settlement.nonce < buried_nonce:
+                receipt = self._receipt(w3, settlement.tx_hash)
+                if receipt is None:
+                    # The nonce was used by another transaction: this one will never be mined
+                    self._fail(settlement, 'Transaction was dropped')
+                    result['failed'] += 1
+                    continue
+            if receipt is not None:
+                self._finish(settlement, receipt, result)
+
+    def _receipt(self, w3, tx_hash: str):
+        try:
+            return w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+
+    def _finish(self, settlement: MintSettlement, receipt, result: Dict[str, Any]) -> None:
+        if receipt['status'] != 1:
+            self._fail(settlement, f'Transaction reverted: {settlement.tx_hash}')
+            result['failed'] += 1
+            return
+
+        now = timezone.now()
+        with transaction.atomic():
+            settlement.status = 'confirmed'
+            settlement.gas_used = receipt['gasUsed']
+            settlement.block_number = receipt['blockNumber']
+            settlement.confirmed_at = now
+            settlement.save(update_fields=['status', 'gas_used', 'block_number', 'confirmed_at'])
+            for credit in settlement.credits.select_for_update():
+                self._complete_ledger_row(credit, settlement)
+            settlement.credits.update(status='settled', settled_at=now, error='')
+        result['confirmed'] += 1
+
+    def _fail(self, settlement: MintSettlement, error: str) -> None:
+        """Mark a settlement failed; its credits are retried or, out of attempts, fail their ledger rows."""
+        max_attempts = getattr(settings, 'MINT_SETTLEMENT_MAX_ATTEMPTS', 3)
+        self.log_error(f"Settlement {settlement.tx_hash or settlement.pk} failed: {error}")
+        with transaction.atomic():
+            settlement.status, settlement.error = 'failed', error
+            settlement.save(update_fields=['status', 'error'])
+            for credit in settlement.credits.select_for_update():
+                credit.attempts += 1
+                credit.error = error
+                if credit.attempts >= max_attempts:
+                    credit.status = 'failed'
+                    self._fail_ledger_row(credit, error)
+                else:
+                    credit.status, credit.settlement = 'pending', None
+                credit.save(update_fields=['attempts', 'error', 'status', 'settlement'])
+
+    # Ledger rows
+
+    def _complete_ledger_row(self, credit: PendingMint, settlement: MintSettlement) -> None:
+        if not credit.object_id:
+            return
+        now = timezone.now()
+        if credit.source == 'withdrawal':
+            withdrawal = TeoCoinWithdrawalRequest.objects.filter(pk=credit.object_id).first()
+            if withdrawal is None or withdrawal.status == 'completed':
+                return
+            withdrawal.status = 'completed'
+            withdrawal.transaction_hash = settlement.tx_hash
+            withdrawal.gas_used = settlement.gas_used
+            withdrawal.completed_at = now
+            withdrawal.save(update_fields=['status', 'transaction_hash', 'gas_used', 'completed_at'])
+            balance = DBTeoCoinBalance.objects.select_for_update().filter(user=withdrawal.user).first()
+            if balance is not None:
+                balance.pending_withdrawal -= withdrawal.amount
+                balance.save()
+        elif credit.source == 'reward':
+            from rewards.models import BlockchainTransaction
+            BlockchainTransaction.objects.filter(pk=credit.object_id).exclude(status='completed').update(
+                status='completed',
+                transaction_hash=settlement.tx_hash,
+                to_address=Web3.to_checksum_address(credit.wallet_address),
+                block_number=settlement.block_number,
+                confirmed_at=now,
+            )
+
+    def _fail_ledger_row(self, credit: PendingMint, error: str) -> None:
+        if not credit.object_id:
+            return
+        if credit.source == 'withdrawal':
+            # Withdrawals stay failed and refundable through cancellation
+            TeoCoinWithdrawalRequest.objects.filter(pk=credit.object_id, status='processing').update(
+                status='failed', error_message=error, retry_count=credit.attempts
+            )
+        elif credit.source == 'reward':
+            from rewards.models import BlockchainTransaction
+            BlockchainTransaction.objects.filter(pk=credit.object_id, status='pending').update(
+                status='failed', error_message=error
+            )
+
+
+# Singleton instance
+mint_settlement_service = MintSettlementService()
@@ -0,0 +1,214 @@
+"""
+Notification Retention Service - Pruning and Compaction of Notification History
+
+Nothing else ever removes rows from the notification table, and reward, review
+and discount signals keep adding to it. This service keeps it bounded:
+
+- read notifications of high-volume types (e.g. ``teocoins_earned``) older than
+  the retention window are compacted into one digest row per user/type
+- every other read notification older than the window is moved to
+  ``NotificationArchive`` (or deleted, depending on configuration)
+
+All work is done in bounded batches so a single run never holds long locks.
+"""
+
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from notifications.models import Notification, NotificationArchive
+from services.base import TransactionalService
+from services.exceptions import TeoArtServiceException
+
+
+class NotificationRetentionService(TransactionalService):
+    """
+    Service for archiving, deleting and compacting old read notifications.
+
+    Unread notifications are never touched, regardless of their age.
+    """
+
+    RETENTION_MODES = ('archive', 'delete')
+
+    def __init__(self):
+        super().__init__()
+        self.retention_days = getattr(settings, 'NOTIFICATION_RETENTION_DAYS', 90)
+        self.mode = getattr(settings, 'NOTIFICATION_RETENTION_MODE', 'archive')
+        self.batch_size = getattr(settings, 'NOTIFICATION_RETENTION_BATCH_SIZE', 1000)
+        self.digest_types = list(getattr(settings, 'NOTIFICATION_DIGEST_TYPES', []))
+        self.digest_min_count = getattr(settings, 'NOTIFICATION_DIGEST_MIN_COUNT', 5)
+
+    def run_retention(
+        self,
+        retention_days: Optional[int] = None,
+        mode: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Compact and prune read notifications older than the retention window.
+
+        Args:
+            retention_days: Age in days after which read notifications are pruned
+            mode: 'archive' to move rows to NotificationArchive, 'delete' to drop them
+            batch_size: Maximum rows touched per transaction
+            max_batches: Optional cap on prune batches for this run
+            dry_run: If True, only count what would be processed
+
+        Returns:
+            Dict with counts of compacted, digested and pruned notifications
+
+        Raises:
+            TeoArtServiceException: If the mode or batch size are invalid
+        """
+        retention_days = self.retention_days if retention_days is None else retention_days
+        mode = mode or self.mode
+        batch_size = batch_size or self.batch_size
+
+        if mode not in self.RETENTION_MODES:
+            raise TeoArtServiceException(
+                f"Invalid retention mode: {mode}. Must be one of: {list(self.RETENTION_MODES)}"
+            )
+        if batch_size <= 0:
+            raise TeoArtServiceException(f"Invalid batch size: {batch_size}")
+
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        eligible = Notification.objects.filter(read=True, created_at__lt=cutoff)
+
+        # Snapshot the upper id so rows becoming eligible mid-run wait for the next run
+        max_id = eligible.aggregate(max_id=Max('id'))['max_id']
+        if max_id is None:
+            self.log_info("No notifications eligible for retention")
+            return self._build_result(cutoff, mode, dry_run)
+
+        eligible = eligible.filter(id__lte=max_id)
+
+        if dry_run:
+            groups = self._get_digest_groups(eligible)
+            compacted = sum(group['total'] for group in groups)
+            return self._build_result(
+                cutoff, mode, dry_run,
+                digests_created=len(groups),
+                compacted=compacted,
+                pruned=eligible.count() - compacted,
+            )
+
+        digests_created, compacted = self._compact_digest_types(eligible, batch_size)
+        pruned, batches = self._prune(eligible, mode, batch_size, max_batches)
+
+        self.log_info(
+            f"Retention completed: {digests_created} digests ({compacted} rows compacted), "
+            f"{pruned} rows {mode}d in {batches} batches"
+        )
+        return self._build_result(
+            cutoff, mode, dry_run,
+            digests_created=digests_created,
+            compacted=compacted,
+            pruned=pruned,
+            batches=batches,
+        )
+
+    # ========== PRIVATE METHODS ==========
+
+    def _get_digest_groups(self, eligible) -> List[Dict[str, Any]]:
+        """Return per user/type aggregates large enough to be compacted."""
+        if not self.digest_types:
+            return []
+
+        return list(
+            eligible.filter(notification_type__in=self.digest_types)
+            .values('user_id', 'notification_type')
+            .annotate(total=Count('id'), first_at=Min('created_at'), last_at=Max('created_at'))
+            .filter(total__gte=self.digest_min_count)
+            .order_by('user_id', 'notification_type')
+        )
+
+    def _compact_digest_types(self, eligible, batch_size: int):
+        """Replace high-volume notification groups with a single digest row each."""
+        type_labels = dict(Notification.NOTIFICATION_TYPES)
+        digests_created = 0
+        compacted = 0
+
+        for group in self._get_digest_groups(eligible):
+            label = type_labels.get(group['notification_type'], group['notification_type'])
+            message = (
+                f"Riepilogo: {group['total']} notifiche '{label}' "
+                f"dal {group['first_at']:%d/%m/%Y} al {group['last_at']:%d/%m/%Y}"
+            )
+            group_qs = eligible.filter(
+                user_id=group['user_id'],
+                notification_type=group['notification_type'],
+            )
+
+            # Digest and deletes commit together: a failure never leaves a digest beside its originals
+            with transaction.atomic():
+                Notification.objects.create(
+                    user_id=group['user_id'],
+                    message=message,
+                    notification_type='notification_digest',
+                    read=True,
+                )
+                group_compacted = 0
+                while True:
+                    ids = list(group_qs.values_list('id', flat=True)[:batch_size])
+                    if not ids:
+                        break
+                    deleted, _ = Notification.objects.filter(id__in=ids).delete()
+                    group_compacted += deleted
+
+            digests_created += 1
+            compacted += group_compacted
+
+        return digests_created, compacted
+
+    def _prune(self, eligible, mode: str, batch_size: int, max_batches: Optional[int]):
+        """Archive or delete the remaining eligible rows in bounded batches."""
+        # Digest rows created during this run have ids above the snapshot, so they are never pruned here
+        pruned = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            with transaction.atomic():
+                rows = list(eligible.order_by('id')[:batch_size])
+                if not rows:
+                    break
+
+                if mode == 'archive':
+                    NotificationArchive.objects.bulk_create([
+                        NotificationArchive(
+                            original_id=row.id,
+                            user_id=row.user_id,
+                            message=row.message,
+                            notification_type=row.notification_type,
+                            related_object_id=row.related_object_id,
+                            link=row.link,
+                            created_at=row.created_at,
+                        )
+                        for row in rows
+                    ])
+
+                deleted, _ = Notification.objects.filter(id__in=[row.id for row in rows]).delete()
+                pruned += deleted
+                batches += 1
+
+        return pruned, batches
+
+    def _build_result(self, cutoff, mode: str, dry_run: bool, **counts) -> Dict[str, Any]:
+        return {
+            'cutoff': cutoff.isoformat(),
+            'mode': mode,
+            'dry_run': dry_run,
+            'digests_created': counts.get('digests_created', 0),
+            'compacted': counts.get('compacted', 0),
+            'pruned': counts.get('pruned', 0),
+            'batches': counts.get('batches', 0),
+        }
+
+
+# Singleton instance for easy access
+notification_retention_service = NotificationRetentionService()
@@ -11,11 +11,12 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.conf import settings
 from django.db.models import Q
-import json
 import logging
 
 from notifications.models import Notification
+from notifications.realtime import EVENT_TEACHER_CHOICE, publish_event
 from services.base import TransactionalService
+from services.email_outbox_service import email_outbox_service
 from services.exceptions import (
     TeoArtServiceException,
     UserNotFoundError,
@@ -196,21 +197,37 @@ class NotificationService(TransactionalService):
             self.log_error(f"Error marking notification {notification_id} as read: {str(e)}")
             raise TeoArtServiceException(f"Error marking notification as read: {str(e)}")
     
-    def mark_all_notifications_as_read(self, user_id: int) -> Dict[str, Any]:
+    def mark_all_notifications_as_read(
+        self,
+        user_id: int,
+        notification_ids: Optional[List[int]] = None,
+        notification_type: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Mark all notifications as read for a user.
+        Mark all (or a subset of) notifications as read for a user.
+        
+        Runs as a single UPDATE on the (user, read) index, without loading rows.
         
         Args:
             user_id: ID of the user
+            notification_ids: Optional list of notification IDs to restrict the update
+            notification_type: Optional notification type to restrict the update
             
         Returns:
             Dict containing count of updated notifications
         """
-        def _mark_all_read_operation():
-            updated_count = Notification.objects.filter(
-                user_id=user_id,
-                read=False
-            ).update(read=True)
+        try:
+            queryset = Notification.objects.filter(user_id=user_id, read=False)
+            if notification_ids is not None:
+                queryset = queryset.filter(id__in=notification_ids)
+            if notification_type:
+                queryset = queryset.filter(notification_type=notification_type)
+            
+            updated_count = queryset.update(read=True)
+            if updated_count:
+                # A bulk update sends no post_save: drop the cached dashboard fragment here
+                from services.dashboard_service import dashboard_service
+                dashboard_service.invalidate(user_id, 'notifications')
             
             self.log_info(f"Marked {updated_count} notifications as read for user {user_id}")
             
@@ -219,9 +236,6 @@ class NotificationService(TransactionalService):
                 'updated_count': updated_count,
                 'updated_at': timezone.now().isoformat(),
             }
-        
-        try:
-            return self.execute_in_transaction(_mark_all_read_operation)
         except Exception as e:
             self.log_error(f"Error marking all notifications as read for user {user_id}: {str(e)}")
             raise TeoArtServiceException(f"Error marking all notifications as read: {str(e)}")
@@ -296,6 +310,29 @@ class NotificationService(TransactionalService):
             self.log_error(f"Error deleting notification {notification_id}: {str(e)}")
             raise TeoArtServiceException(f"Error deleting notification: {str(e)}")
 
+    def clear_notifications(self, user_id: int) -> Dict[str, Any]:
+        """
+        Delete all notifications of a user.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            Dict containing count of deleted notifications
+        """
+        try:
+            deleted_count, _ = Notification.objects.filter(user_id=user_id).delete()
+            self.log_info(f"Deleted {deleted_count} notifications for user {user_id}")
+            
+            return {
+                'user_id': user_id,
+                'deleted_count': deleted_count,
+                'deleted_at': timezone.now().isoformat(),
+            }
+        except Exception as e:
+            self.log_error(f"Error clearing notifications for user {user_id}: {str(e)}")
+            raise TeoArtServiceException(f"Error clearing notifications: {str(e)}")
+
     def send_real_time_notification(
         self, 
         user: User, 
@@ -353,8 +390,6 @@ class NotificationService(TransactionalService):
         """Send email notification for urgent requests"""
         try:
             if notification_type == 'discount_request':
-                from django.core.mail import send_mail
-                
                 subject = f"🔔 Student Discount Request - {data.get('course_title', 'Unknown Course')}"
                 message = f"""
 Hello {user.first_name or user.email},
@@ -377,37 +412,29 @@ Best regards,
 SchoolPlatform Team
                 """
                 
-                send_mail(
+                # Queued for the outbox worker instead of blocking on SMTP
+                email_outbox_service.queue_email(
+                    to_email=user.email,
                     subject=subject,
-                    message=message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[user.email],
-                    fail_silently=True
+                    body=message,
+                    user=user,
+                    category='notification'
                 )
                 
-                logger.info(f"Email notification sent to {user.email}")
+                logger.info(f"Email notification queued for {user.email}")
                 
         except Exception as e:
             logger.error(f"Email notification failed for {user.email}: {e}")
     
     def _send_websocket_notification(self, user: User, notification_type: str, data: Dict[str, Any]) -> None:
-        """Send WebSocket notification for real-time updates"""
+        """Push the request details to the user's open notification streams"""
         try:
-            # In a production environment, this would integrate with:
-            # - Django Channels for WebSocket support
-            # - Redis for real-time messaging
-            # - Push notification services
-            
-            websocket_data = {
-                'type': notification_type,
-                'user_id': user.id,
-                'timestamp': timezone.now().isoformat(),
-                'data': data
-            }
-            
-            # For now, just log the WebSocket data
-            # In production, send to WebSocket channel
-            logger.info(f"WebSocket notification prepared for {user.email}: {json.dumps(websocket_data, indent=2)}")
+            # The DB notification itself is pushed by notifications.signals;
+            # here we only forward the richer teacher-choice payload.
+            publish_event(user.id, EVENT_TEACHER_CHOICE, {
+                'notification_type': notification_type,
+                **data
+            })
             
         except Exception as e:
             logger.error(f"WebSocket notification failed for {user.email}: {e}")
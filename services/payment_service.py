@@ -14,6 +14,8 @@ import uuid
 import logging
 
 from .base import TransactionalService
+from .registry import lazy_service
+from .mint_settlement_service import mint_settlement_service
 from .exceptions import (
     TeoArtServiceException, 
     UserNotFoundError, 
@@ -218,7 +220,12 @@ class PaymentService(TransactionalService):
             if course.teocoin_reward > 0:
                 try:
                     from blockchain.views import teocoin_service
-                    if user.wallet_address:
+                    if user.wallet_address and mint_settlement_service.enabled:
+                        # Minted with the wallet's other credits by the next settlement
+                        self._queue_course_reward(user, course, 'Hybrid payment')
+                        teocoin_reward_given = course.teocoin_reward
+                        reward_status = 'queued'
+                    elif user.wallet_address:
                         try:
                             mint_result = teocoin_service.mint_tokens(
                                 user.wallet_address,
@@ -739,6 +746,20 @@ class PaymentService(TransactionalService):
             self.log_error(f"Failed to get course sales stats: {str(e)}")
             raise
     
+    def _queue_course_reward(self, user, course, label: str) -> BlockchainTransaction:
+        """Record a course reward and queue its mint for settlement"""
+        reward_tx = BlockchainTransaction.objects.create(
+            user=user,
+            transaction_type='reward',
+            amount=course.teocoin_reward,
+            status='pending',
+            related_object_id=str(course.id),
+            notes=f"{label} reward for course: {course.title}"
+        )
+        mint_settlement_service.queue_reward(reward_tx)
+        self.log_info(f"🪙 TeoCoin reward queued: {course.teocoin_reward} TEO for {user.username}")
+        return reward_tx
+    
     def _get_user_balance(self, wallet_address: str) -> Decimal:
         """Get user's TeoCoins balance"""
         try:
@@ -1131,7 +1152,12 @@ class PaymentService(TransactionalService):
                 try:
                     from blockchain.views import teocoin_service
                     
-                    if user.wallet_address:
+                    if user.wallet_address and mint_settlement_service.enabled:
+                        # Minted with the wallet's other credits by the next settlement
+                        self._queue_course_reward(user, course, 'Fiat payment')
+                        teocoin_reward_given = course.teocoin_reward
+                        reward_status = 'queued'
+                    elif user.wallet_address:
                         # User has wallet - give rewards immediately
                         try:
                             mint_result = teocoin_service.mint_tokens(
@@ -1370,5 +1396,5 @@ class PaymentService(TransactionalService):
         }
 
 
-# Global service instance
-payment_service = PaymentService()
+# Global service instance, built on first use
+payment_service = lazy_service('payment_service', PaymentService)
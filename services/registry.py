@@ -0,0 +1,103 @@
+"""
+Lazy Service Registry
+
+Services that set up blockchain access (Web3 providers, contract ABIs read
+from disk, RPC calls) are not built at import time: each module exposes a
+``LazyService`` proxy instead of an instance, and the service is built on
+first attribute access. Worker boot and management commands that never use
+the blockchain therefore do no Web3 setup and no network I/O.
+
+Usage::
+
+    # services/blockchain_service.py
+    blockchain_service = lazy_service('blockchain_service', BlockchainService)
+
+    # callers are unchanged
+    from services.blockchain_service import blockchain_service
+    blockchain_service.get_user_wallet_balance(user)
+
+``registry.built()`` lists the services instantiated so far (used by the
+import-time test) and ``registry.reset()`` drops instances, e.g. after
+changing settings in tests.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class LazyService:
+    """
+    Proxy for a service instance built on first use.
+
+    Attribute reads, writes and deletes (including ``mock.patch.object``)
+    are forwarded to the instance.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _get_instance(self) -> Any:
+        instance = object.__getattribute__(self, '_instance')
+        if instance is None:
+            with object.__getattribute__(self, '_lock'):
+                instance = object.__getattribute__(self, '_instance')
+                if instance is None:
+                    instance = object.__getattribute__(self, '_factory')()
+                    object.__setattr__(self, '_instance', instance)
+        return instance
+
+    def _is_built(self) -> bool:
+        return object.__getattribute__(self, '_instance') is not None
+
+    def _reset(self) -> None:
+        object.__setattr__(self, '_instance', None)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._get_instance(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._get_instance(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._get_instance(), attr)
+
+    def __repr__(self) -> str:
+        state = 'built' if self._is_built() else 'not built'
+        return f"<LazyService {object.__getattribute__(self, '_name')} ({state})>"
+
+
+class ServiceRegistry:
+    """Registry of the lazily built services."""
+
+    def __init__(self):
+        self._services: Dict[str, LazyService] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> LazyService:
+        service = LazyService(name, factory)
+        self._services[name] = service
+        return service
+
+    def get(self, name: str) -> Any:
+        """Return the built instance of a registered service."""
+        return self._services[name]._get_instance()
+
+    def built(self) -> List[str]:
+        """Names of the services instantiated so far."""
+        return [name for name, service in self._services.items() if service._is_built()]
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Drop built instances (all of them by default); they are rebuilt on next use."""
+        for service_name, service in self._services.items():
+            if name is None or service_name == name:
+                service._reset()
+
+
+registry = ServiceRegistry()
+
+
+def lazy_service(name: str, factory: Callable[[], Any]) -> LazyService:
+    """Register a service built on first use and return its proxy."""
+    return registry.register(name, factory)
@@ -15,6 +15,8 @@ from django.db.models import Sum, Count, Q
 import logging
 
 from .base import TransactionalService
+from .enrollment_access_service import enrollment_access_service
+from .leaderboard_service import leaderboard_service
 from .exceptions import (
     TeoArtServiceException, 
     UserNotFoundError, 
@@ -22,7 +24,7 @@ from .exceptions import (
 )
 
 # Models
-from courses.models import Course, Lesson, LessonCompletion
+from courses.models import Course, CourseEnrollment, Lesson, LessonCompletion
 from rewards.models import BlockchainTransaction, TokenBalance
 from notifications.models import Notification
 
@@ -92,7 +94,7 @@ class RewardService(TransactionalService):
                 raise TeoArtServiceException(f"Lesson {lesson_id} does not belong to course {course_id}")
             
             # Check if user is enrolled in course
-            if not course.students.filter(id=user_id).exists():
+            if not enrollment_access_service.is_enrolled(user, course):
                 raise TeoArtServiceException("User is not enrolled in this course")
             
             # Check if lesson completion already exists
@@ -361,40 +363,22 @@ class RewardService(TransactionalService):
     
     def get_reward_leaderboard(
         self,
-        limit: int = 10
+        limit: int = 10,
+        period: str = 'all_time',
+        course_id: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Get reward leaderboard showing top earners.
         
+        Served from the precomputed tables maintained by LeaderboardService.
+        
         Args:
             limit: Number of top users to return
+            period: 'all_time', 'monthly', 'weekly' or 'course'
+            course_id: Course ID for the per-course leaderboard
         """
         try:
-            # Get users with their total rewards
-            user_rewards = BlockchainTransaction.objects.filter(
-                transaction_type__in=['lesson_reward', 'course_completion_bonus'],
-                status='completed'
-            ).values('user').annotate(
-                total_rewards=Sum('amount'),
-                reward_count=Count('id')
-            ).order_by('-total_rewards')[:limit]
-            
-            leaderboard = []
-            for i, entry in enumerate(user_rewards, 1):
-                try:
-                    user = User.objects.get(id=entry['user'])
-                    leaderboard.append({
-                        'rank': i,
-                        'user_id': user.id,
-                        'username': user.username,
-                        'full_name': f"{user.first_name} {user.last_name}".strip() or user.username,
-                        'total_rewards': float(entry['total_rewards']),
-                        'reward_count': entry['reward_count']
-                    })
-                except User.DoesNotExist:
-                    continue
-            
-            return leaderboard
+            return leaderboard_service.get_leaderboard(period=period, limit=limit, course_id=course_id)
             
         except Exception as e:
             self.log_error(f"Failed to get reward leaderboard: {str(e)}")
@@ -409,16 +393,10 @@ class RewardService(TransactionalService):
     
     def _check_course_completion(self, user: User, course: Course) -> bool:
         """Check if user has completed all lessons in a course"""
-        total_lessons = course.lessons_in_course.count()
-        if total_lessons == 0:
-            return False
-        
-        completed_lessons = LessonCompletion.objects.filter(
-            student=user,
-            lesson__course=course
-        ).count()
-        
-        return completed_lessons >= total_lessons
+        enrollment = CourseEnrollment.objects.filter(student=user, course=course).only(
+            'completed_lessons', 'total_lessons'
+        ).first()
+        return bool(enrollment and enrollment.all_lessons_completed)
     
     def _get_user_balance(self, user: User) -> Decimal:
         """Get user's current TeoCoin balance"""
@@ -0,0 +1,91 @@
+"""
+Search Service - Ranked Full-Text Course Search
+
+Resolves a query through the search index in ``courses.search`` (PostgreSQL
+tsvector/trigram or SQLite FTS5) and returns ranked catalog entries with
+category facets. The index lookup is bounded by ``SEARCH_MAX_RESULTS``, so
+latency does not grow with the size of the catalog.
+"""
+
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db.models import Count
+
+from courses.models import Course
+from courses.search import get_search_backend
+from services.base import BaseService
+from services.course_service import course_service
+from services.exceptions import TeoArtServiceException
+
+
+class SearchService(BaseService):
+    """
+    Service for searching the course catalog.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.max_results = getattr(settings, 'SEARCH_MAX_RESULTS', 200)
+
+    def search_courses(
+        self,
+        query: str,
+        user=None,
+        category: Optional[str] = None,
+        limit: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Search approved courses by course and lesson text.
+
+        Args:
+            query: Free text query
+            user: User instance (optional, used for ``is_enrolled``)
+            category: Optional category facet to filter on
+            limit: Maximum number of results returned
+
+        Returns:
+            Dict with ranked ``results`` (catalog Course objects with a
+            ``search_rank`` attribute), ``total`` and ``facets``
+
+        Raises:
+            TeoArtServiceException: If the query is empty
+        """
+        query = (query or '').strip()
+        if not query:
+            raise TeoArtServiceException("Search query is required")
+
+        ranks = get_search_backend().match(query, self.max_results)
+        matching = Course.objects.filter(id__in=list(ranks), is_approved=True)
+
+        category_labels = dict(Course.CATEGORY_CHOICES)
+        facets = [
+            {'value': row['category'], 'label': category_labels.get(row['category'], row['category']), 'count': row['count']}
+            for row in matching.values('category').annotate(count=Count('id')).order_by('-count', 'category')
+        ]
+
+        courses = course_service.get_catalog_queryset(user=user).filter(id__in=list(ranks))
+        if category:
+            courses = courses.filter(category=category)
+
+        results = sorted(courses, key=lambda course: ranks[course.id], reverse=True)
+        for course in results:
+            course.search_rank = ranks[course.id]
+
+        self.log_info(f"Search '{query}' matched {len(results)} courses")
+        return {
+            'query': query,
+            'total': len(results),
+            'results': results[:limit],
+            'facets': {'category': facets},
+        }
+
+    def rebuild_index(self) -> int:
+        """Rebuild the whole search index, returns the number of indexed rows."""
+        indexed = get_search_backend().rebuild()
+        self.log_info(f"Rebuilt search index with {indexed} entries")
+        return indexed
+
+
+# Singleton instance for easy access
+search_service = SearchService()
@@ -0,0 +1,341 @@
+"""
+Teacher Payout Service - Periodic Earnings Roll-Up
+
+Closes weekly and monthly periods into ``TeacherPayoutSummary`` rows, one per
+teacher with activity in the period. Each period is rolled up with three
+grouped aggregate queries (paid enrollments, decided discount absorptions and
+TeoCoin ledger credits) instead of per-teacher recomputation, and periods are
+closed incrementally: only periods after the last closed one are generated.
+
+A period is closed once its end is older than ``TEACHER_PAYOUT_CLOSE_GRACE_HOURS``,
+so every discount absorption created in it has been decided or expired.
+Teacher and admin payout dashboards read the stored rows; the still-open
+current period is computed on demand.
+"""
+
+import calendar
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.utils import timezone
+
+from blockchain.models import DBTeoCoinTransaction
+from courses.models import CourseEnrollment
+from rewards.models import TeacherDiscountAbsorption, TeacherPayoutSummary
+from services.base import BaseService
+from services.exceptions import TeoArtServiceException
+from users.models import TeacherProfile
+
+ZERO = Decimal('0')
+
+
+class TeacherPayoutService(BaseService):
+    """
+    Service generating and serving teacher payout summaries.
+    """
+
+    PERIOD_TYPES = ['weekly', 'monthly']
+    # Enrollments that are sales (free and admin-granted ones are not)
+    PAID_METHODS = ['fiat', 'teocoin', 'teocoin_discount']
+    # Platform commission when a teacher has no TeacherProfile (Bronze tier)
+    DEFAULT_COMMISSION_RATE = Decimal('50.00')
+    DECIMAL_FIELDS = [
+        'total_eur_earned', 'total_teo_earned', 'eur_from_standard_sales',
+        'eur_from_absorbed_discounts', 'teo_from_absorbed_discounts',
+    ]
+    COUNT_FIELDS = ['total_discounts_absorbed', 'total_transactions']
+
+    def __init__(self):
+        super().__init__()
+        self.close_grace = timedelta(hours=getattr(settings, 'TEACHER_PAYOUT_CLOSE_GRACE_HOURS', 48))
+        self.teo_types = getattr(settings, 'TEACHER_PAYOUT_TEO_TYPES', ['earned', 'bonus', 'discount_absorption'])
+
+    # ========== GENERATION ==========
+
+    def close_periods(self, period_type: str, now: Optional[datetime] = None) -> int:
+        """
+        Generate summaries for every closable period after the last closed one.
+
+        Args:
+            period_type: 'weekly' or 'monthly'
+            now: Reference time (defaults to now)
+
+        Returns:
+            Number of periods closed
+        """
+        self._validate_period_type(period_type)
+        now = now or timezone.now()
+
+        last_end = TeacherPayoutSummary.objects.filter(period_type=period_type).aggregate(
+            last=Max('period_end')
+        )['last']
+        cursor = last_end + timedelta(days=1) if last_end else self._first_activity_date()
+        if cursor is None:
+            return 0
+
+        closed = 0
+        start, end = self.period_bounds(period_type, cursor)
+        while self._period_range(start, end)[1] + self.close_grace <= now:
+            self.generate_period(period_type, start)
+            closed += 1
+            start, end = self.period_bounds(period_type, end + timedelta(days=1))
+
+        self.log_info(f"Closed {closed} {period_type} payout periods")
+        return closed
+
+    def generate_period(self, period_type: str, day: date, teacher_id: Optional[int] = None,
+                        save: bool = True) -> List[TeacherPayoutSummary]:
+        """
+        Roll up the period containing ``day``.
+
+        Args:
+            period_type: 'weekly' or 'monthly'
+            day: Any day of the period
+            teacher_id: Restrict the roll-up to one teacher
+            save: Replace the stored rows of the period (ignored with ``teacher_id``)
+
+        Returns:
+            One summary per teacher with activity in the period
+        """
+        self._validate_period_type(period_type)
+        start, end = self.period_bounds(period_type, day)
+        totals = self._aggregate(*self._period_range(start, end), teacher_id=teacher_id)
+
+        summaries = self._summaries(totals, period_type=period_type, period_start=start, period_end=end)
+
+        if save and teacher_id is None:
+            with transaction.atomic():
+                TeacherPayoutSummary.objects.filter(
+                    period_type=period_type, period_start=start, period_end=end
+                ).delete()
+                TeacherPayoutSummary.objects.bulk_create(summaries)
+        return summaries
+
+    # ========== READS ==========
+
+    def get_teacher_summaries(self, teacher, period_type: str = 'monthly', limit: int = 12,
+                              include_current: bool = True) -> List[Dict[str, Any]]:
+        """
+        Get a teacher's latest payout periods, newest first.
+
+        Args:
+            teacher: Teacher user
+            period_type: 'weekly' or 'monthly'
+            limit: Number of closed periods to return
+            include_current: Prepend the periods not closed yet, computed live
+        """
+        self._validate_period_type(period_type)
+        results = []
+        if include_current:
+            for start in self._open_starts(period_type):
+                results.append(self._serialize(self._live_summary(teacher, period_type, start), is_closed=False))
+
+        closed = TeacherPayoutSummary.objects.filter(
+            teacher=teacher, period_type=period_type
+        ).order_by('-period_start')[:limit]
+        results.extend(self._serialize(summary) for summary in closed)
+        return results
+
+    def get_teacher_earnings(self, teacher) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a teacher's earnings today, this month, this year and overall.
+
+        Closed monthly summaries are summed in one query; the open months and
+        today are rolled up live.
+
+        Returns:
+            Dict of 'daily', 'monthly', 'yearly' and 'all_time' -> summary fields
+        """
+        today = timezone.localdate()
+        month_start, _ = self.period_bounds('monthly', today)
+        open_months = [self._live_summary(teacher, 'monthly', start) for start in self._open_starts('monthly')]
+        daily = self._summaries(
+            self._aggregate(*self._period_range(today, today), teacher_id=teacher.pk),
+            period_type='monthly', period_start=today, period_end=today
+        )
+
+        fields = self.DECIMAL_FIELDS + self.COUNT_FIELDS
+        closed = TeacherPayoutSummary.objects.filter(teacher=teacher, period_type='monthly').aggregate(
+            **{f'all_time__{field}': Sum(field) for field in fields},
+            **{f'yearly__{field}': Sum(field, filter=Q(period_start__year=today.year)) for field in fields},
+        )
+        periods = {
+            'daily': daily,
+            'monthly': [s for s in open_months if s.period_start == month_start],
+            'yearly': [s for s in open_months if s.period_start.year == today.year],
+            'all_time': open_months,
+        }
+        earnings = {}
+        for name, live in periods.items():
+            earnings[name] = {}
+            for field in fields:
+                total = sum((getattr(summary, field) for summary in live), closed.get(f'{name}__{field}') or 0)
+                earnings[name][field] = str(total) if field in self.DECIMAL_FIELDS else total
+        return earnings
+
+    def get_period_overview(self, period_type: str = 'monthly', period_start: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Get every teacher's summary for one closed period plus platform totals.
+
+        Args:
+            period_type: 'weekly' or 'monthly'
+            period_start: Start of the period (latest closed period by default)
+        """
+        self._validate_period_type(period_type)
+        summaries = TeacherPayoutSummary.objects.filter(period_type=period_type)
+        if period_start is None:
+            period_start = summaries.aggregate(latest=Max('period_start'))['latest']
+            if period_start is None:
+                return {'period_type': period_type, 'period_start': None, 'totals': {}, 'teachers': []}
+
+        rows = list(summaries.filter(period_start=period_start).select_related('teacher').order_by('-total_eur_earned'))
+        totals = {field: str(sum((getattr(row, field) for row in rows), ZERO)) for field in self.DECIMAL_FIELDS}
+        totals.update({field: sum(getattr(row, field) for row in rows) for field in self.COUNT_FIELDS})
+        return {
+            'period_type': period_type,
+            'period_start': period_start.isoformat(),
+            'period_end': rows[0].period_end.isoformat() if rows else None,
+            'totals': totals,
+            'teachers': [
+                dict(self._serialize(row), teacher_id=row.teacher_id, teacher_username=row.teacher.username)
+                for row in rows
+            ],
+        }
+
+    # ========== HELPERS ==========
+
+    @staticmethod
+    def period_bounds(period_type: str, day: date) -> Tuple[date, date]:
+        """First and last day of the weekly (Monday-Sunday) or monthly period containing ``day``."""
+        if period_type == 'weekly':
+            start = day - timedelta(days=day.weekday())
+            return start, start + timedelta(days=6)
+        start = day.replace(day=1)
+        return start, day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+    def _open_starts(self, period_type: str) -> List[date]:
+        """Periods not closed yet: the current one, plus the previous one during the grace window."""
+        current_start, _ = self.period_bounds(period_type, timezone.localdate())
+        previous_start, _ = self.period_bounds(period_type, current_start - timedelta(days=1))
+        last_end = TeacherPayoutSummary.objects.filter(period_type=period_type).aggregate(
+            last=Max('period_end')
+        )['last']
+        if last_end is None or last_end < previous_start:
+            return [current_start, previous_start]
+        return [current_start]
+
+    def _live_summary(self, teacher, period_type: str, start: date) -> TeacherPayoutSummary:
+        summaries = self.generate_period(period_type, start, teacher_id=teacher.pk, save=False)
+        if summaries:
+            return summaries[0]
+        _, end = self.period_bounds(period_type, start)
+        return TeacherPayoutSummary(teacher=teacher, period_type=period_type, period_start=start, period_end=end)
+
+    def _period_range(self, start: date, end: date) -> Tuple[datetime, datetime]:
+        tz = timezone.get_current_timezone()
+        return (
+            timezone.make_aware(datetime.combine(start, time.min), tz),
+            timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+        )
+
+    def _aggregate(self, since: datetime, until: datetime, teacher_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """Per-teacher totals of one period: one grouped query per source."""
+        totals: Dict[int, Dict[str, Any]] = {}
+
+        def row(teacher):
+            return totals.setdefault(teacher, {
+                'sales': 0, 'fiat_eur': ZERO, 'absorbed': 0, 'absorbed_eur': ZERO,
+                'absorbed_teo': ZERO, 'eur_preferred': ZERO, 'teo': ZERO,
+            })
+
+        enrollments = CourseEnrollment.objects.filter(
+            enrolled_at__gte=since, enrolled_at__lt=until, payment_method__in=self.PAID_METHODS
+        )
+        absorptions = TeacherDiscountAbsorption.objects.filter(
+            created_at__gte=since, created_at__lt=until
+        ).exclude(status='pending')
+        credits = DBTeoCoinTransaction.objects.filter(
+            created_at__gte=since, created_at__lt=until, user__role='teacher',
+            transaction_type__in=self.teo_types, amount__gt=0
+        )
+        if teacher_id is not None:
+            enrollments = enrollments.filter(course__teacher_id=teacher_id)
+            absorptions = absorptions.filter(teacher_id=teacher_id)
+            credits = credits.filter(user_id=teacher_id)
+
+        for entry in enrollments.values('course__teacher').annotate(
+            sales=Count('id'),
+            fiat_eur=Sum('amount_paid_eur', filter=Q(payment_method='fiat')),
+        ).order_by():
+            totals_row = row(entry['course__teacher'])
+            totals_row['sales'] = entry['sales']
+            totals_row['fiat_eur'] = entry['fiat_eur'] or ZERO
+
+        absorbed = Q(status='absorbed')
+        for entry in absorptions.values('teacher').annotate(
+            absorbed=Count('id', filter=absorbed),
+            absorbed_eur=Sum('final_teacher_eur', filter=absorbed),
+            absorbed_teo=Sum('final_teacher_teo', filter=absorbed),
+            eur_preferred=Sum('final_teacher_eur', filter=~absorbed),
+        ).order_by():
+            totals_row = row(entry['teacher'])
+            for key in ['absorbed', 'absorbed_eur', 'absorbed_teo', 'eur_preferred']:
+                totals_row[key] = entry[key] or totals_row[key]
+
+        for entry in credits.values('user').annotate(teo=Sum('amount')).order_by():
+            row(entry['user'])['teo'] = entry['teo']
+
+        return totals
+
+    def _summaries(self, totals: Dict[int, Dict[str, Any]], **period) -> List[TeacherPayoutSummary]:
+        """Unsaved summaries of ``_aggregate`` totals, teacher shares applied."""
+        rates = dict(TeacherProfile.objects.filter(user_id__in=list(totals)).values_list('user_id', 'commission_rate'))
+        summaries = []
+        for teacher, row in totals.items():
+            teacher_share = (Decimal('100') - rates.get(teacher, self.DEFAULT_COMMISSION_RATE)) / Decimal('100')
+            standard_eur = (row['fiat_eur'] * teacher_share + row['eur_preferred']).quantize(Decimal('0.01'))
+            summaries.append(TeacherPayoutSummary(
+                teacher_id=teacher,
+                total_eur_earned=standard_eur + row['absorbed_eur'],
+                total_teo_earned=row['teo'],
+                total_discounts_absorbed=row['absorbed'],
+                total_transactions=row['sales'],
+                eur_from_standard_sales=standard_eur,
+                eur_from_absorbed_discounts=row['absorbed_eur'],
+                teo_from_absorbed_discounts=row['absorbed_teo'],
+                **period
+            ))
+        return summaries
+
+    def _first_activity_date(self) -> Optional[date]:
+        dates = [
+            CourseEnrollment.objects.filter(payment_method__in=self.PAID_METHODS).aggregate(first=Min('enrolled_at'))['first'],
+            TeacherDiscountAbsorption.objects.aggregate(first=Min('created_at'))['first'],
+            DBTeoCoinTransaction.objects.filter(
+                user__role='teacher', transaction_type__in=self.teo_types
+            ).aggregate(first=Min('created_at'))['first'],
+        ]
+        dates = [timezone.localtime(value).date() for value in dates if value]
+        return min(dates, default=None)
+
+    def _validate_period_type(self, period_type: str) -> None:
+        if period_type not in self.PERIOD_TYPES:
+            raise TeoArtServiceException(f"Invalid period type: {period_type}. Must be one of: {self.PERIOD_TYPES}")
+
+    def _serialize(self, summary: TeacherPayoutSummary, is_closed: bool = True) -> Dict[str, Any]:
+        data = {
+            'period_type': summary.period_type,
+            'period_start': summary.period_start.isoformat(),
+            'period_end': summary.period_end.isoformat(),
+            'is_closed': is_closed,
+        }
+        data.update({field: str(getattr(summary, field)) for field in self.DECIMAL_FIELDS})
+        data.update({field: getattr(summary, field) for field in self.COUNT_FIELDS})
+        return data
+
+# Singleton instance for easy access
+teacher_payout_service = TeacherPayoutService()
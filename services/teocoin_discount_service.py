@@ -27,6 +27,8 @@ from django.utils import timezone
 from blockchain.blockchain import TeoCoinService
 from notifications.services import teocoin_notification_service
 from users.models import User
+from services.gas_oracle_service import gas_oracle_service
+from services.registry import lazy_service
 
 
 class DiscountStatus(Enum):
@@ -917,7 +919,7 @@ class TeoCoinDiscountService:
                 'from': self.platform_account.address,
                 'nonce': self.w3.eth.get_transaction_count(self.platform_account.address),
                 'gas': 500000,  # Reasonable gas limit
-                'gasPrice': self.w3.eth.gas_price,
+                **gas_oracle_service.get_fee_params(self.w3),
             })
             
             # Sign transaction
@@ -1081,5 +1083,5 @@ class TeoCoinDiscountService:
             raise ValueError(f"Request ID extraction failed: {e}")
 
 
-# Singleton instance
-teocoin_discount_service = TeoCoinDiscountService()
+# Singleton instance, built on first use
+teocoin_discount_service = lazy_service('teocoin_discount_service', TeoCoinDiscountService)
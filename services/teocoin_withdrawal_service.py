@@ -21,6 +21,9 @@ from web3 import Web3
 from web3.exceptions import TransactionNotFound, BlockNotFound
 
 from services.db_teocoin_service import db_teocoin_service
+from blockchain.web3_provider import make_web3
+from services.gas_oracle_service import gas_oracle_service
+from services.registry import lazy_service
 from blockchain.models import TeoCoinWithdrawalRequest, DBTeoCoinBalance
 
 User = get_user_model()
@@ -61,7 +64,7 @@ class TeoCoinWithdrawalService:
         
         if self.polygon_rpc_url:
             try:
-                self.web3 = Web3(Web3.HTTPProvider(self.polygon_rpc_url))
+                self.web3 = make_web3(self.polygon_rpc_url)
                 self._load_contract()
             except Exception as e:
                 logger.warning(f"Could not initialize Web3 connection: {e}")
@@ -805,13 +808,9 @@ class TeoCoinWithdrawalService:
                     'error': 'Contract does not have mint or mintTo function'
                 }
             
-            # Estimate gas
-            try:
-                gas_estimate = mint_function.estimate_gas({'from': platform_address_checksum})
-                logger.info(f"⛽ Estimated gas: {gas_estimate}")
-            except Exception as gas_error:
-                logger.error(f"Gas estimation failed: {gas_error}")
-                gas_estimate = 200000  # Default gas limit
+            # Gas limit from the per-method cache (estimated once per contract method)
+            gas_estimate = gas_oracle_service.estimate_gas(mint_function, {'from': platform_address_checksum}, 200000)
+            logger.info(f"⛽ Gas limit: {gas_estimate}")
             
             # Get private key from settings
             private_key = getattr(settings, 'PLATFORM_PRIVATE_KEY', None)
@@ -832,8 +831,8 @@ class TeoCoinWithdrawalService:
             transaction = mint_function.build_transaction({
                 'from': platform_address_checksum,
                 'gas': gas_estimate,
-                'gasPrice': self.web3.eth.gas_price,
                 'nonce': nonce,
+                **gas_oracle_service.get_fee_params(self.web3),
             })
             
             # Sign transaction
@@ -873,5 +872,5 @@ class TeoCoinWithdrawalService:
             }
 
 
-# Singleton instance
-teocoin_withdrawal_service = TeoCoinWithdrawalService()
+# Singleton instance, built on first use
+teocoin_withdrawal_service = lazy_service('teocoin_withdrawal_service', TeoCoinWithdrawalService)
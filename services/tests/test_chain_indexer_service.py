@@ -0,0 +1,217 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from eth_abi import encode
+from hexbytes import HexBytes
+from rest_framework.test import APIClient
+from web3 import Web3
+from web3.datastructures import AttributeDict
+
+from blockchain.models import BurnDepositClaim, DBTeoCoinBalance, TeoCoinTransferEvent
+from blockchain.teocoin_abi import TEOCOIN_ABI
+from services.chain_indexer_service import TRANSFER_TOPIC, ZERO_ADDRESS, chain_indexer_service
+from services.exceptions import TeoArtServiceException
+from users.models import User
+
+CONTRACT = '0x20D6656A31297ab3b8A87291Ed562D4228Be9ff8'
+ALICE = '0x' + 'a1' * 20
+BOB = '0x' + 'b0' * 20
+
+
+def _topic(address):
+    return HexBytes(b'\0' * 12 + bytes.fromhex(address[2:]))
+
+
+class FakeChain:
+    """Blocks and Transfer logs served through a mocked ``w3.eth``."""
+
+    def __init__(self):
+        self.contract = Web3().eth.contract(address=CONTRACT, abi=TEOCOIN_ABI)
+        self.logs = []
+        self.fork = 0
+        self.height = 0
+        self.w3 = mock.Mock()
+        self.w3.eth.get_logs.side_effect = self._get_logs
+        self.w3.eth.get_block.side_effect = lambda number: {'hash': self.block_hash(number)}
+
+    def block_hash(self, number):
+        return HexBytes(Web3.keccak(text=f'{self.fork}-{number}'))
+
+    def mine(self, blocks=1):
+        self.height += blocks
+        self.w3.eth.block_number = self.height
+
+    def transfer(self, sender, receiver, amount, block=None):
+        block = block or self.height
+        tx_hash = HexBytes(Web3.keccak(text=f'{self.fork}-{len(self.logs)}'))
+        self.logs.append(AttributeDict({
+            'address': CONTRACT,
+            'topics': [HexBytes(TRANSFER_TOPIC), _topic(sender), _topic(receiver)],
+            'data': HexBytes(encode(['uint256'], [Web3.to_wei(amount, 'ether')])),
+            'blockNumber': block,
+            'blockHash': self.block_hash(block),
+            'transactionHash': tx_hash,
+            'transactionIndex': 0,
+            'logIndex': 0,
+            'removed': False,
+        }))
+        return Web3.to_hex(tx_hash)
+
+    def _get_logs(self, params):
+        assert params['topics'] == [TRANSFER_TOPIC]
+        return [log for log in self.logs if params['fromBlock'] <= log['blockNumber'] <= params['toBlock']]
+
+
+@override_settings(
+    CHAIN_INDEXER_CONFIRMATIONS=3, CHAIN_INDEXER_BATCH_BLOCKS=10, CHAIN_INDEXER_START_BLOCK=1,
+    CHAIN_INDEXER_REORG_REWIND=6, CHAIN_INDEXER_CLAIM_TIMEOUT_MINUTES=60,
+)
+class ChainIndexerServiceTest(TestCase):
+    def setUp(self):
+        self.chain = FakeChain()
+        self.user = User.objects.create_user(
+            username='burner', email='burner@example.com', password='pass', role='student'
+        )
+        self.other = User.objects.create_user(
+            username='other', email='other@example.com', password='pass', role='student'
+        )
+
+    def _index(self):
+        return chain_indexer_service.index(self.chain)
+
+    def test_indexes_confirmed_blocks_in_batches(self):
+        self.chain.mine(5)
+        self.chain.transfer(ZERO_ADDRESS, ALICE, 100, block=2)
+        self.chain.transfer(ALICE, BOB, 10, block=4)
+        self.chain.mine(20)
+        self.chain.transfer(ALICE, ZERO_ADDRESS, 5)
+
+        result = self._index()
+        self.assertEqual((result['events'], result['batches'], result['last_block']), (2, 3, 22))
+        self.assertEqual(
+            list(TeoCoinTransferEvent.objects.order_by('block_number').values_list('kind', 'amount')),
+            [('mint', Decimal('100')), ('transfer', Decimal('10'))],
+        )
+
+        # The burn is indexed once it has enough confirmations
+        self.chain.mine(3)
+        self.assertEqual(self._index()['events'], 1)
+        burn = TeoCoinTransferEvent.objects.get(kind='burn')
+        self.assertEqual((burn.from_address, burn.value_wei), (ALICE, str(5 * 10 ** 18)))
+
+    def test_claim_waits_for_confirmation_then_is_credited(self):
+        self.chain.mine(5)
+        tx_hash = self.chain.transfer(ALICE, ZERO_ADDRESS, 25)
+        self._index()
+
+        claim = chain_indexer_service.claim_deposit(self.user, tx_hash, Decimal('25'), Web3.to_checksum_address(ALICE))
+        self.assertEqual(claim.status, 'pending')
+
+        self.chain.mine(3)
+        self.assertEqual(self._index()['claims'], {'credited': 1, 'rejected': 0})
+        claim.refresh_from_db()
+        self.assertEqual(claim.status, 'credited')
+        self.assertEqual(DBTeoCoinBalance.objects.get(user=self.user).available_balance, Decimal('25'))
+
+        # Credited once, whoever claims it again
+        for user in (self.user, self.other):
+            with self.assertRaises(TeoArtServiceException) as ctx:
+                chain_indexer_service.claim_deposit(user, tx_hash, Decimal('25'), ALICE)
+            self.assertEqual(ctx.exception.status_code, 409)
+
+    def test_mismatching_claims_are_rejected(self):
+        self.chain.mine(5)
+        tx_hash = self.chain.transfer(ALICE, ZERO_ADDRESS, 25)
+        self.chain.mine(3)
+        self._index()
+
+        claim = chain_indexer_service.claim_deposit(self.user, tx_hash, Decimal('30'), ALICE)
+        self.assertEqual(claim.status, 'rejected')
+        self.assertIn('does not match', claim.error)
+        self.assertFalse(DBTeoCoinBalance.objects.filter(user=self.user).exists())
+
+        other_tx = '0x' + '34' * 32
+        TeoCoinTransferEvent.objects.create(
+            tx_hash=other_tx, log_index=0, block_number=2, block_hash='0x0', from_address=ALICE,
+            to_address=ZERO_ADDRESS, kind='burn', value_wei=str(10 ** 18), amount=Decimal('1'),
+        )
+        claim = chain_indexer_service.claim_deposit(self.user, other_tx, Decimal('1'), BOB)
+        self.assertEqual(claim.error, 'Transaction sender does not match provided address')
+
+    def test_unconfirmed_claims_expire_once_caught_up(self):
+        self.chain.mine(10)
+        claim = chain_indexer_service.claim_deposit(self.user, '0x' + '12' * 32, Decimal('5'), ALICE)
+        BurnDepositClaim.objects.filter(pk=claim.pk).update(created_at=timezone.now() - timedelta(hours=2))
+
+        self.assertEqual(self._index()['claims']['rejected'], 1)
+        claim.refresh_from_db()
+        self.assertEqual(claim.status, 'rejected')
+
+    def test_reorg_rewinds_and_reindexes(self):
+        self.chain.mine(10)
+        self.chain.transfer(ALICE, BOB, 1, block=6)
+        self.chain.mine(3)
+        self._index()
+        self.assertEqual(TeoCoinTransferEvent.objects.count(), 1)
+
+        # Blocks from 5 on are replaced by a fork with a different transfer
+        self.chain.fork = 1
+        self.chain.logs = []
+        self.chain.transfer(ALICE, BOB, 2, block=7)
+        result = self._index()
+
+        self.assertEqual(result['rewound'], 6)
+        self.assertEqual(list(TeoCoinTransferEvent.objects.values_list('amount', 'block_number')), [(Decimal('2'), 7)])
+
+
+@override_settings(CHAIN_INDEXER_CONFIRMATIONS=3, CHAIN_INDEXER_START_BLOCK=1)
+class BurnDepositViewTest(TestCase):
+    def setUp(self):
+        self.chain = FakeChain()
+        self.user = User.objects.create_user(
+            username='viewburner', email='viewburner@example.com', password='pass', role='student'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _post(self, tx_hash, amount='3'):
+        return self.client.post('/api/v1/teocoin/burn-deposit/', {
+            'transaction_hash': tx_hash, 'amount': amount, 'metamask_address': ALICE,
+        }, format='json')
+
+    def test_deposit_flow_without_rpc_calls(self):
+        self.chain.mine(5)
+        tx_hash = self.chain.transfer(ALICE, ZERO_ADDRESS, 3)
+
+        response = self._post(tx_hash)
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.data['pending'])
+        status_url = f'/api/v1/teocoin/burn-deposit/status/{tx_hash}/'
+        self.assertFalse(self.client.get(status_url).data['processed'])
+
+        self.chain.mine(3)
+        chain_indexer_service.index(self.chain)
+        response = self.client.get(status_url)
+        self.assertTrue(response.data['processed'])
+        self.assertEqual(response.data['amount'], '3.00')
+
+        response = self._post(tx_hash)
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(response.data['already_processed'])
+
+    def test_confirmed_burn_is_credited_immediately(self):
+        self.chain.mine(5)
+        tx_hash = self.chain.transfer(ALICE, ZERO_ADDRESS, 3)
+        self.chain.mine(3)
+        chain_indexer_service.index(self.chain)
+
+        with mock.patch('blockchain.blockchain.teocoin_service') as service:
+            response = self._post(tx_hash)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['new_balance'], '3.00')
+        self.assertFalse(service.mock_calls)
+
+        self.assertEqual(self._post('0x1234').status_code, 400)
@@ -0,0 +1,110 @@
+"""
+Tests for Course Progress Service
+"""
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from courses.models import Course, CourseEnrollment, Lesson, LessonCompletion
+from services.course_progress_service import CourseProgressService
+
+User = get_user_model()
+
+
+class CourseProgressServiceTestCase(TestCase):
+    """Test cases for the denormalized enrollment progress counters"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.teacher = User.objects.create_user(
+            username='teacher',
+            email='teacher@test.com',
+            password='testpass',
+            role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='student',
+            email='student@test.com',
+            password='testpass',
+            role='student'
+        )
+        self.course = Course.objects.create(
+            title='Test Course',
+            description='Test course description',
+            teacher=self.teacher,
+            price_eur=0,
+            is_approved=True
+        )
+        self.lessons = [self._create_lesson(order) for order in (1, 2)]
+        self.service = CourseProgressService()
+
+    def _create_lesson(self, order, course=None):
+        return Lesson.objects.create(
+            title=f'Lesson {order}',
+            content='Content',
+            teacher=self.teacher,
+            course=course or self.course,
+            duration=10,
+            order=order
+        )
+
+    def _enrollment(self):
+        return CourseEnrollment.objects.get(student=self.student, course=self.course)
+
+    def test_new_enrollment_starts_with_lesson_count(self):
+        """Enrolling sets total_lessons, also through course.students.add()"""
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+        self.assertEqual(self._enrollment().total_lessons, 2)
+
+        other_student = User.objects.create_user(
+            username='student2', email='student2@test.com', password='testpass', role='student'
+        )
+        self.course.students.add(other_student)
+        enrollment = CourseEnrollment.objects.get(student=other_student, course=self.course)
+        self.assertEqual(enrollment.total_lessons, 2)
+
+    def test_completions_update_counters(self):
+        """Creating and deleting completions moves completed_lessons"""
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+
+        completion = LessonCompletion.objects.create(student=self.student, lesson=self.lessons[0])
+        self.assertEqual(self._enrollment().completed_lessons, 1)
+        self.assertEqual(self._enrollment().progress_percentage, 50)
+
+        LessonCompletion.objects.create(student=self.student, lesson=self.lessons[1])
+        self.assertTrue(self._enrollment().all_lessons_completed)
+
+        completion.delete()
+        self.assertEqual(self._enrollment().completed_lessons, 1)
+
+    def test_lesson_changes_update_totals(self):
+        """Adding, moving and deleting lessons keeps total_lessons in sync"""
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+        other_course = Course.objects.create(
+            title='Other Course', description='Other', teacher=self.teacher, price_eur=0, is_approved=True
+        )
+
+        lesson = self._create_lesson(3)
+        self.assertEqual(self._enrollment().total_lessons, 3)
+
+        lesson.course = other_course
+        lesson.save()
+        self.assertEqual(self._enrollment().total_lessons, 2)
+
+        self.lessons[0].delete()
+        self.assertEqual(self._enrollment().total_lessons, 1)
+
+    def test_rebuild_command_repairs_counters(self):
+        """The repair command recomputes drifted counters"""
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+        LessonCompletion.objects.create(student=self.student, lesson=self.lessons[0])
+        CourseEnrollment.objects.update(completed_lessons=7, total_lessons=0)
+
+        call_command('rebuild_course_progress', stdout=StringIO())
+
+        enrollment = self._enrollment()
+        self.assertEqual(enrollment.completed_lessons, 1)
+        self.assertEqual(enrollment.total_lessons, 2)
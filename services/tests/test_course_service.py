@@ -6,6 +6,7 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from decimal import Decimal
+from rest_framework.test import APIClient
 
 from courses.models import Course, CourseEnrollment, Lesson, LessonCompletion
 from services.course_service import course_service
@@ -263,3 +264,78 @@ class CourseServiceTestCase(TestCase):
         
         # Test with no user
         self.assertFalse(course_service._is_lesson_completed(self.lesson1, None))
+
+
+class CourseCatalogTestCase(TestCase):
+    """Test cases for the course catalog read model"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.teacher = User.objects.create_user(
+            username='teacher1',
+            email='teacher@test.com',
+            password='testpass',
+            role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='student1',
+            email='student@test.com',
+            password='testpass',
+            role='student'
+        )
+        self.courses = []
+        for i in range(5):
+            course = Course.objects.create(
+                title=f'Course {i}',
+                description='A test course',
+                price_eur=Decimal('20.00'),
+                category='disegno',
+                teacher=self.teacher,
+                is_approved=True
+            )
+            for order in (1, 2):
+                Lesson.objects.create(
+                    title=f'Lesson {order}',
+                    content='Content',
+                    course=course,
+                    duration=10,
+                    order=order,
+                    teacher=self.teacher
+                )
+            self.courses.append(course)
+        CourseEnrollment.objects.create(student=self.student, course=self.courses[0])
+
+    def test_catalog_annotations(self):
+        """Counts and enrollment flag come from annotations"""
+        courses = {c.id: c for c in course_service.get_catalog_queryset(user=self.student)}
+
+        enrolled = courses[self.courses[0].id]
+        self.assertEqual(enrolled.lesson_count, 2)
+        self.assertEqual(enrolled.total_duration, 20)
+        self.assertEqual(enrolled.student_count, 1)
+        self.assertTrue(enrolled.is_enrolled)
+        self.assertFalse(courses[self.courses[1].id].is_enrolled)
+
+    def test_get_available_courses_query_count(self):
+        """The catalog does not issue queries per course"""
+        with self.assertNumQueries(1):
+            courses = course_service.get_available_courses(user=self.student)
+
+        self.assertEqual(len(courses), 5)
+
+    def test_catalog_endpoint_is_lean(self):
+        """The list endpoint omits lessons and students unless expanded"""
+        client = APIClient()
+        client.force_authenticate(self.student)
+
+        with self.assertNumQueries(1):
+            response = client.get('/api/v1/courses/')
+        self.assertEqual(response.status_code, 200)
+        course_data = response.json()[0]
+        self.assertNotIn('students', course_data)
+        self.assertNotIn('lessons', course_data)
+        self.assertEqual(course_data['lesson_count'], 2)
+
+        with self.assertNumQueries(2):
+            response = client.get('/api/v1/courses/', {'expand': 'lessons'})
+        self.assertEqual(len(response.json()[0]['lessons']), 2)
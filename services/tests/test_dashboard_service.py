@@ -0,0 +1,140 @@
+"""
+Tests for Dashboard Service
+"""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient, APIRequestFactory
+
+from courses.models import Course, CourseEnrollment
+from notifications.models import Notification
+from services.dashboard_service import DashboardService
+from services.db_teocoin_service import db_teocoin_service
+from services.exceptions import TeoArtServiceException
+
+User = get_user_model()
+
+
+class DashboardServiceTestCase(TestCase):
+    """Test cases for cached dashboard composition"""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.service = DashboardService()
+        self.teacher = User.objects.create_user(
+            username='teacher',
+            email='teacher@test.com',
+            password='testpass',
+            role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='student',
+            email='student@test.com',
+            password='testpass',
+            role='student'
+        )
+        self.course = Course.objects.create(
+            title='Acquerello',
+            description='Corso di acquerello',
+            teacher=self.teacher,
+            price_eur=Decimal('50.00'),
+            is_approved=True
+        )
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+        self.request = APIRequestFactory().get('/api/v1/dashboard/student/')
+        self.request.user = self.student
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_warm_dashboard_is_one_multi_get(self):
+        """Once built, fragments come from a single cache round trip"""
+        fragments = ['courses', 'activity', 'notifications', 'balance', 'progress']
+        cold = self.service.get_fragments(self.student, fragments, self.request)
+        self.assertEqual([course['id'] for course in cold['courses']], [self.course.id])
+
+        with patch('services.dashboard_service.cache.get_many', wraps=cache.get_many) as get_many, \
+                patch.object(self.service, 'build_fragment') as build_fragment:
+            with self.assertNumQueries(0):
+                warm = self.service.get_fragments(self.student, fragments, self.request)
+
+        self.assertEqual(get_many.call_count, 1)
+        build_fragment.assert_not_called()
+        self.assertEqual(warm, cold)
+
+    def test_invalidation_rebuilds_only_affected_fragment(self):
+        """Signals drop the fragments a write affects"""
+        before = self.service.get_fragments(self.student, ['notifications', 'courses'], self.request)
+
+        Notification.objects.create(user=self.student, message='Ciao', notification_type='reward_earned')
+
+        keys = [self.service._key(self.student.pk, name) for name in ('notifications', 'courses')]
+        self.assertEqual(list(cache.get_many(keys)), [keys[1]])
+        after = self.service.get_fragments(self.student, ['notifications'], self.request)
+        self.assertEqual(after['notifications']['unread_count'], before['notifications']['unread_count'] + 1)
+
+    def test_bulk_writes_invalidate_fragments(self):
+        """Enrollments drop the lessons fragment, marking all notifications read drops the notifications one"""
+        from services.notification_service import notification_service
+
+        Notification.objects.create(user=self.student, message='Ciao', notification_type='reward_earned')
+        self.service.get_fragments(self.student, ['notifications', 'lessons'], self.request)
+
+        notification_service.mark_all_notifications_as_read(self.student.pk)
+        CourseEnrollment.objects.create(
+            student=self.student,
+            course=Course.objects.create(title='Olio', description='Corso di olio', teacher=self.teacher, price_eur=Decimal('20.00'))
+        )
+
+        keys = [self.service._key(self.student.pk, name) for name in ('notifications', 'lessons')]
+        self.assertEqual(cache.get_many(keys), {})
+        self.assertEqual(self.service.get_fragments(self.student, ['notifications'])['notifications']['unread_count'], 0)
+
+    def test_balance_fragment_follows_ledger(self):
+        """Balance writes invalidate the balance fragment"""
+        self.assertEqual(self.service.get_fragments(self.student, ['balance'])['balance']['available'], '0.00')
+
+        db_teocoin_service.add_balance(self.student, Decimal('25.00'), 'bonus', 'Bonus')
+
+        balance = self.service.get_fragments(self.student, ['balance'])['balance']
+        self.assertEqual(Decimal(balance['available']), Decimal('25.00'))
+        self.assertTrue(balance['can_withdraw'])
+
+    def test_concurrent_build_waits_for_result(self):
+        """A request that loses the build lock uses the winner's result"""
+        key = self.service._key(self.student.pk, 'progress')
+        cache.add(f'{key}_lock', 1)
+        cache.set(key, {'cached': True})
+
+        self.assertEqual(self.service._build_single_flight('progress', key, self.student, None), {'cached': True})
+
+    def test_unknown_fragment(self):
+        """Unknown fragment names are rejected"""
+        with self.assertRaises(TeoArtServiceException):
+            self.service.get_fragments(self.student, ['wallet'])
+
+    def test_endpoints_share_fragments(self):
+        """The three student dashboard endpoints are served from the same fragments"""
+        client = APIClient()
+        client.force_authenticate(user=self.student)
+
+        dashboard = client.get('/api/v1/dashboard/student/')
+        self.assertEqual(dashboard.status_code, 200)
+        self.assertEqual([course['id'] for course in dashboard.data['courses']], [self.course.id])
+        self.assertIn('teocoin_balance', dashboard.data)
+
+        batch = client.get('/api/v1/api/student/batch-data/')
+        self.assertEqual(batch.status_code, 200)
+        self.assertEqual(batch.data['courses'], dashboard.data['courses'])
+        self.assertEqual(batch.data['summary']['total_courses'], 1)
+
+        data = client.get('/api/v1/dashboard/data/')
+        self.assertEqual(data.status_code, 200)
+        self.assertEqual(data.data['user']['username'], 'student')
+        self.assertEqual(data.data['transactions'], dashboard.data['recent_transactions'])
+        self.assertEqual(data.data['lessons'], [])
@@ -0,0 +1,98 @@
+"""
+Tests for Email Outbox Service
+"""
+
+from unittest.mock import patch
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from notifications.models import EmailOutbox
+from services.email_outbox_service import EmailOutboxService
+from services.exceptions import TeoArtServiceException
+from users.models import UserSettings
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    EMAIL_OUTBOX_BATCH_SIZE=10,
+    EMAIL_OUTBOX_RATE_LIMIT_PER_MINUTE=3,
+    EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+)
+class EmailOutboxServiceTestCase(TestCase):
+    """Test cases for EmailOutboxService"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username='teacher',
+            email='teacher@test.com',
+            password='testpass',
+            role='teacher'
+        )
+        self.service = EmailOutboxService()
+
+    def test_queue_email_does_not_send(self):
+        """Queueing only stores the email"""
+        email = self.service.queue_email('teacher@test.com', 'Subject', 'Body', user=self.user)
+
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_queue_respects_user_preferences(self):
+        """Notification emails are skipped when the user disabled them"""
+        UserSettings.objects.update_or_create(user=self.user, defaults={'email_notifications': False})
+
+        skipped = self.service.queue_email('teacher@test.com', 'Subject', 'Body', user=self.user)
+        transactional = self.service.queue_email(
+            'teacher@test.com', 'Verify', 'Body', user=self.user, category='transactional'
+        )
+
+        self.assertEqual(skipped.status, 'skipped')
+        self.assertEqual(transactional.status, 'pending')
+
+    def test_invalid_category(self):
+        """Unknown categories are rejected"""
+        with self.assertRaises(TeoArtServiceException):
+            self.service.queue_email('teacher@test.com', 'Subject', 'Body', category='spam')
+
+    def test_process_outbox_sends_batch_with_rate_limit(self):
+        """Due emails are sent up to the per-minute rate limit"""
+        for i in range(5):
+            self.service.queue_email(f'user{i}@test.com', f'Subject {i}', 'Body', html_body='<p>Body</p>')
+
+        result = self.service.process_outbox()
+
+        self.assertEqual(result['sent'], 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(EmailOutbox.objects.filter(status='sent').count(), 3)
+        self.assertEqual(EmailOutbox.objects.filter(status='pending').count(), 2)
+
+        # Budget for this minute is exhausted
+        self.assertTrue(self.service.process_outbox()['rate_limited'])
+
+    def test_failed_send_is_retried_with_backoff_then_failed(self):
+        """Failures are rescheduled, then marked failed after max attempts"""
+        email = self.service.queue_email('teacher@test.com', 'Subject', 'Body')
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('boom')):
+            result = self.service.process_outbox()
+
+        self.assertEqual(result['retried'], 1)
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'pending')
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+        EmailOutbox.objects.filter(id=email.id).update(next_attempt_at=timezone.now())
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('boom')):
+            result = self.service.process_outbox()
+
+        self.assertEqual(result['failed'], 1)
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'failed')
+        self.assertEqual(email.attempts, 2)
+        self.assertIn('boom', email.last_error)
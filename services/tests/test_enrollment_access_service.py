@@ -0,0 +1,130 @@
+"""
+Tests for Enrollment Access Service
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import TestCase
+from unittest.mock import patch
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseEnrollment, Lesson, LessonCompletion
+from services.enrollment_access_service import EnrollmentAccessService
+
+User = get_user_model()
+
+
+class EnrollmentAccessServiceTestCase(TestCase):
+    """Test cases for EnrollmentAccessService"""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.teacher = User.objects.create_user(
+            username='teacher',
+            email='teacher@test.com',
+            password='testpass',
+            role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='student',
+            email='student@test.com',
+            password='testpass',
+            role='student'
+        )
+        self.course = Course.objects.create(
+            title='Test Course',
+            description='Test course description',
+            teacher=self.teacher,
+            price_eur=50,
+            is_approved=True
+        )
+        self.other_course = Course.objects.create(
+            title='Other Course',
+            description='Other course description',
+            teacher=self.teacher,
+            price_eur=50,
+            is_approved=True
+        )
+        self.service = EnrollmentAccessService()
+
+    def test_enrolled_ids_are_cached(self):
+        """Repeated checks hit the cache, not the database"""
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+
+        self.assertTrue(self.service.is_enrolled(self.student, self.course))
+        with self.assertNumQueries(0):
+            self.assertTrue(self.service.is_enrolled(self.student, self.course.id))
+            self.assertFalse(self.service.is_enrolled(self.student, self.other_course))
+
+    def test_enrollment_changes_invalidate_cache(self):
+        """Creating or deleting an enrollment is reflected immediately"""
+        self.assertFalse(self.service.is_enrolled(self.student, self.course))
+
+        enrollment = CourseEnrollment.objects.create(student=self.student, course=self.course)
+        self.assertTrue(self.service.is_enrolled(self.student, self.course))
+
+        enrollment.delete()
+        self.assertFalse(self.service.is_enrolled(self.student, self.course))
+
+    def test_m2m_add_invalidates_cache(self):
+        """Enrolling through course.students is reflected immediately"""
+        self.assertFalse(self.service.is_enrolled(self.student, self.course))
+
+        self.course.students.add(self.student)
+        self.assertTrue(self.service.is_enrolled(self.student, self.course))
+
+        self.course.students.clear()
+        self.assertFalse(self.service.is_enrolled(self.student, self.course))
+
+    def test_can_access_course(self):
+        """Teacher always has access, students need an approved enrollment"""
+        self.assertTrue(self.service.can_access_course(self.teacher, self.course))
+        self.assertFalse(self.service.can_access_course(self.student, self.course))
+        self.assertFalse(self.service.can_access_course(AnonymousUser(), self.course))
+
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+        self.assertTrue(self.service.can_access_course(self.student, self.course))
+
+        Course.objects.filter(id=self.course.id).update(is_approved=False)
+        self.course.refresh_from_db()
+        self.assertFalse(self.service.can_access_course(self.student, self.course))
+
+    def test_mark_lesson_complete_requires_enrollment(self):
+        """The lesson completion endpoint uses the enrollment check"""
+        lesson = Lesson.objects.create(
+            title='Lesson 1',
+            content='Content',
+            teacher=self.teacher,
+            course=self.course,
+            duration=10,
+            order=1
+        )
+        client = APIClient()
+        client.force_authenticate(self.student)
+        url = f'/api/v1/lessons/{lesson.id}/mark_complete/'
+
+        self.assertEqual(client.post(url).status_code, 400)
+
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+        self.assertEqual(client.post(url).status_code, 200)
+
+    def test_mark_lesson_complete_with_stale_enrollment_cache(self):
+        """A cached enrollment that no longer exists is refused before any completion is written"""
+        lesson = Lesson.objects.create(
+            title='Lesson 1',
+            content='Content',
+            teacher=self.teacher,
+            course=self.course,
+            duration=10,
+            order=1
+        )
+        client = APIClient()
+        client.force_authenticate(self.student)
+
+        with patch('services.enrollment_access_service.enrollment_access_service.is_enrolled', return_value=True):
+            response = client.post(f'/api/v1/lessons/{lesson.id}/mark_complete/')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(LessonCompletion.objects.filter(student=self.student, lesson=lesson).exists())
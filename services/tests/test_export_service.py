@@ -0,0 +1,133 @@
+"""
+Tests for Export Service
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import warnings
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import AsyncClient, TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from blockchain.models import DBTeoCoinTransaction
+from services.exceptions import TeoArtServiceException
+from services.export_service import ExportService
+
+User = get_user_model()
+
+
+class ExportServiceTestCase(TestCase):
+    """Test cases for streaming exports"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.service = ExportService()
+        self.service.chunk_size = 2
+        self.student = User.objects.create_user(
+            username='student',
+            email='student@test.com',
+            password='testpass',
+            role='student'
+        )
+        self.transactions = [
+            DBTeoCoinTransaction.objects.create(
+                user=self.student,
+                transaction_type='earned' if i % 2 else 'bonus',
+                amount=Decimal(f'{i}.50'),
+                description=f'reward, "n. {i}"'
+            )
+            for i in range(5)
+        ]
+
+    def test_csv_export(self):
+        """CSV has a header and one quoted row per transaction"""
+        content = b''.join(self.service.stream('transactions', 'csv')).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['id'], str(self.transactions[0].id))
+        self.assertEqual(rows[0]['amount'], '0.50')
+        self.assertEqual(rows[0]['description'], 'reward, "n. 0"')
+        self.assertEqual(rows[0]['course_id'], '')
+
+    def test_ndjson_export_with_filter(self):
+        """NDJSON emits one JSON object per line, filtered"""
+        content = b''.join(self.service.stream('transactions', 'ndjson', {'transaction_type': 'earned'})).decode()
+        records = [json.loads(line) for line in content.splitlines()]
+
+        self.assertEqual([record['id'] for record in records], [self.transactions[1].id, self.transactions[3].id])
+        self.assertEqual(records[0]['email'], 'student@test.com')
+        self.assertIsNone(records[0]['course_id'])
+
+    def test_gzip_export(self):
+        """Compressed output is a valid gzip stream"""
+        compressed = b''.join(self.service.stream('transactions', 'csv', compress=True))
+        content = gzip.decompress(compressed).decode()
+
+        self.assertEqual(len(content.splitlines()), 6)
+
+    def test_invalid_requests(self):
+        """Unknown datasets, formats and filters are rejected before streaming"""
+        with self.assertRaises(TeoArtServiceException):
+            self.service.stream('users', 'csv')
+        with self.assertRaises(TeoArtServiceException):
+            self.service.stream('transactions', 'xlsx')
+        with self.assertRaises(TeoArtServiceException):
+            self.service.stream('withdrawals', 'csv', {'transaction_type': 'earned'})
+
+    def test_export_endpoint(self):
+        """Admins download a streamed attachment, others are refused"""
+        client = APIClient()
+        client.force_authenticate(user=self.student)
+        self.assertEqual(client.get('/api/v1/admin/exports/transactions.csv').status_code, 403)
+
+        admin = User.objects.create_user(
+            username='admin', email='admin@test.com', password='testpass', role='admin', is_staff=True
+        )
+        client.force_authenticate(user=admin)
+        response = client.get('/api/v1/admin/exports/transactions.ndjson.gz', {'since': '2000-01-01'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('.ndjson.gz', response['Content-Disposition'])
+        content = gzip.decompress(b''.join(response.streaming_content)).decode()
+        self.assertEqual(len(content.splitlines()), 5)
+
+        response = client.get('/api/v1/admin/exports/transactions.csv', {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_export_endpoint_streams_under_asgi(self):
+        """Under ASGI the export is pulled chunk by chunk instead of built in memory"""
+        admin = await User.objects.acreate(username='admin', email='admin@test.com', role='admin', is_staff=True)
+        token = (await sync_to_async(RefreshToken.for_user)(admin)).access_token
+        response = await AsyncClient().get(
+            '/api/v1/admin/exports/transactions.csv', headers={'Authorization': f'Bearer {token}'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            content = b''.join([chunk async for chunk in response]).decode()
+        self.assertEqual(len(content.splitlines()), 6)
+
+    def test_export_command(self):
+        """The command writes the export to a file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ledger.csv')
+            call_command('export_data', 'transactions', '--output', path, '--filter', 'transaction_type=bonus',
+                         stdout=io.StringIO())
+            with open(path) as export_file:
+                rows = list(csv.DictReader(export_file))
+
+        self.assertEqual(len(rows), 3)
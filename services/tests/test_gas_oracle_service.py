@@ -0,0 +1,118 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from web3 import Web3
+
+from services.exceptions import BlockchainTransactionError
+from services.gas_oracle_service import gas_oracle_service
+
+
+def gwei(value):
+    return Web3.to_wei(value, 'gwei')
+
+
+def _w3(base_fee=gwei(10), rewards=None, endpoint='http://node-a'):
+    w3 = mock.Mock()
+    w3.provider.endpoint_uri = endpoint
+    w3.eth.fee_history.return_value = {
+        'baseFeePerGas': [gwei(9), gwei(9), base_fee],
+        'reward': rewards if rewards is not None else [
+            [gwei(26), gwei(30), gwei(40)],
+            [gwei(27), gwei(32), gwei(45)],
+        ],
+    }
+    w3.eth.gas_price = gwei(20)
+    return w3
+
+
+def _function(w3, name='mint', estimate=50000):
+    function = mock.Mock()
+    function.w3, function.address, function.fn_name = w3, '0xAbC', name
+    function.estimate_gas.return_value = estimate
+    return function
+
+
+@override_settings(GAS_ORACLE_MAX_AGE=60, GAS_ORACLE_MIN_PRIORITY_FEE_GWEI=25, GAS_ORACLE_MAX_FEE_GWEI=100)
+class GasOracleServiceTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_fee_history_is_sampled_once_and_cached(self):
+        w3 = _w3()
+        params = gas_oracle_service.get_fee_params(w3)
+        self.assertEqual(params, {'maxPriorityFeePerGas': gwei(31), 'maxFeePerGas': gwei(51)})
+
+        for _ in range(5):
+            gas_oracle_service.get_fee_params(w3, speed='fast')
+        w3.eth.fee_history.assert_called_once()
+        self.assertEqual(gas_oracle_service.get_fee_params(w3, speed='fast')['maxPriorityFeePerGas'], gwei(42.5))
+
+        # Snapshots are per node
+        other = _w3(endpoint='http://node-b')
+        gas_oracle_service.get_fee_params(other)
+        other.eth.fee_history.assert_called_once()
+
+    def test_stale_snapshot_is_refreshed_and_kept_when_node_fails(self):
+        w3 = _w3()
+        gas_oracle_service.get_fees(w3)
+        with self.settings(GAS_ORACLE_MAX_AGE=0):
+            w3.eth.fee_history.side_effect = ConnectionError('down')
+            type(w3.eth).gas_price = mock.PropertyMock(side_effect=ConnectionError('down'))
+            self.assertTrue(gas_oracle_service.get_fees(w3)['eip1559'])
+        self.assertEqual(w3.eth.fee_history.call_count, 2)
+
+    def test_clamps_and_bump(self):
+        low = gas_oracle_service.get_fee_params(_w3(rewards=[[1, 1, 1]], endpoint='http://low'))
+        self.assertEqual(low['maxPriorityFeePerGas'], gwei(25))
+
+        high = gas_oracle_service.get_fee_params(_w3(base_fee=gwei(500), endpoint='http://high'))
+        self.assertEqual(high['maxFeePerGas'], gwei(100))
+
+        bumped = gas_oracle_service.get_fee_params(_w3(), bump=1.2)
+        self.assertGreater(bumped['maxPriorityFeePerGas'], gwei(31))
+
+    def test_bump_at_the_fee_cap_raises(self):
+        w3 = _w3(base_fee=gwei(500), rewards=[[gwei(100)] * 3])
+        self.assertEqual(gas_oracle_service.get_fee_params(w3),
+                         {'maxFeePerGas': gwei(100), 'maxPriorityFeePerGas': gwei(100)})
+        with self.assertRaises(BlockchainTransactionError):
+            gas_oracle_service.get_fee_params(w3, bump=1.2)
+
+    def test_only_one_caller_refreshes_a_stale_snapshot(self):
+        w3 = _w3()
+        gas_oracle_service.get_fees(w3)
+        cache.add(gas_oracle_service.REFRESH_LOCK_KEY.format(node=gas_oracle_service._node(w3)), True)
+        with self.settings(GAS_ORACLE_MAX_AGE=0):
+            self.assertTrue(gas_oracle_service.get_fees(w3)['eip1559'])
+        w3.eth.fee_history.assert_called_once()
+
+    def test_cold_cache_refresh_keeps_another_callers_lock(self):
+        w3 = _w3()
+        lock_key = gas_oracle_service.REFRESH_LOCK_KEY.format(node=gas_oracle_service._node(w3))
+        cache.add(lock_key, True)
+        self.assertTrue(gas_oracle_service.get_fees(w3)['eip1559'])
+        self.assertTrue(cache.get(lock_key))
+
+    def test_legacy_node_uses_buffered_gas_price(self):
+        w3 = _w3()
+        w3.eth.fee_history.side_effect = ValueError('method not found')
+        self.assertEqual(gas_oracle_service.get_fee_params(w3), {'gasPrice': gwei(25)})
+        w3.eth.gas_price = gwei(40)
+        cache.clear()
+        self.assertEqual(gas_oracle_service.get_gas_price(w3), gwei(44))
+
+    def test_gas_estimates_are_cached_per_method(self):
+        w3 = _w3()
+        mint = _function(w3)
+        self.assertEqual(gas_oracle_service.estimate_gas(mint, {'from': '0x1'}, 200000), 75000)
+        self.assertEqual(gas_oracle_service.estimate_gas(_function(w3), {'from': '0x1'}, 200000), 75000)
+        mint.estimate_gas.assert_called_once()
+
+        failing = _function(w3, name='mintTo')
+        failing.estimate_gas.side_effect = ValueError('revert')
+        self.assertEqual(gas_oracle_service.estimate_gas(failing, {}, 200000), 200000)
+
+        gas_oracle_service.invalidate_estimate(mint)
+        gas_oracle_service.estimate_gas(mint, {}, 200000)
+        self.assertEqual(mint.estimate_gas.call_count, 2)
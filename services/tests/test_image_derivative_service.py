@@ -0,0 +1,119 @@
+import io
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIRequestFactory
+
+from courses.models import Course
+from courses.serializers import CourseCatalogSerializer
+from services.image_derivative_service import image_derivative_service
+from users.models import User
+from users.serializers import UserSerializer
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix='image-derivative-test-')
+
+
+def _image(width, height, fmt='PNG', mode='RGB'):
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), (200, 80, 40) if mode == 'RGB' else (200, 80, 40, 128)).save(buffer, fmt)
+    return ContentFile(buffer.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageDerivativeServiceTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username='iteacher', email='iteacher@example.com', password='pass', role='teacher'
+        )
+        self.course = Course.objects.create(
+            title='Pittura', description='d', teacher=self.teacher, price_eur=10, is_approved=True
+        )
+        self.request = APIRequestFactory().get('/')
+        self.request.user = self.teacher
+
+    def _catalog(self, course):
+        course.refresh_from_db()
+        course.is_enrolled = False
+        course.lesson_count = course.student_count = course.total_duration = 0
+        return CourseCatalogSerializer(course, context={'request': self.request}).data
+
+    def test_upload_queues_and_worker_generates_variants(self):
+        self.course.cover_image.save('cover.png', _image(2000, 1000))
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.cover_image_variants['status'], 'pending')
+
+        # Original served until the variants exist
+        data = self._catalog(self.course)
+        self.assertTrue(data['cover_image_url'].endswith(self.course.cover_image.url))
+        self.assertIsNone(data['cover_image_srcset'])
+
+        self.assertEqual(image_derivative_service.process_pending(), {'processed': 1, 'failed': 0})
+
+        self.course.refresh_from_db()
+        variants = self.course.cover_image_variants
+        self.assertEqual(variants['status'], 'ready')
+        self.assertEqual(sorted(variants['formats']['webp'], key=int), ['320', '640', '960', '1280'])
+        name = variants['formats']['webp']['320']
+        self.assertTrue(name.startswith(f"derived/course_cover/{variants['hash'][:2]}/{variants['hash']}-320w"))
+        with default_storage.open(name) as f:
+            image = Image.open(f)
+            self.assertEqual((image.format, image.size), ('WEBP', (320, 160)))
+
+        data = self._catalog(self.course)
+        self.assertTrue(data['cover_image_url'].endswith(variants['formats']['jpeg']['640']))
+        self.assertIn(' 320w, ', data['cover_image_srcset']['webp'])
+        self.assertTrue(data['cover_image_srcset']['jpeg'].endswith(' 1280w'))
+
+    def test_small_images_are_not_upscaled(self):
+        self.course.cover_image.save('small.png', _image(200, 100, mode='RGBA'))
+        image_derivative_service.process_pending()
+        self.course.refresh_from_db()
+        self.assertEqual(list(self.course.cover_image_variants['formats']['jpeg']), ['200'])
+
+    def test_new_upload_invalidates_variants_and_same_content_is_reused(self):
+        self.course.cover_image.save('cover.png', _image(800, 400))
+        image_derivative_service.process_pending()
+        self.course.refresh_from_db()
+        first = self.course.cover_image_variants
+
+        other = Course.objects.create(
+            title='Scultura', description='d', teacher=self.teacher, price_eur=10, is_approved=True
+        )
+        other.cover_image.save('copy.png', _image(800, 400))
+        image_derivative_service.process_pending()
+        other.refresh_from_db()
+        self.assertEqual(other.cover_image_variants['formats'], first['formats'])
+
+        self.course.cover_image.save('new.png', _image(900, 300))
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.cover_image_variants['status'], 'pending')
+        self.assertIsNone(self._catalog(self.course)['cover_image_srcset'])
+
+    def test_avatar_srcset_and_command(self):
+        self.teacher.avatar.save('me.jpg', _image(500, 500, fmt='JPEG'))
+        out = io.StringIO()
+        call_command('generate_image_derivatives', stdout=out)
+        self.assertIn('Processed: 1', out.getvalue())
+
+        self.teacher.refresh_from_db()
+        srcset = UserSerializer(self.teacher, context={'request': self.request}).data['avatar_srcset']
+        self.assertEqual(srcset['webp'].count('w,'), 2)
+
+    def test_unrelated_saves_do_not_requeue(self):
+        self.teacher.avatar.save('me.jpg', _image(100, 100, fmt='JPEG'))
+        image_derivative_service.process_pending()
+        self.teacher.refresh_from_db()
+        self.teacher.bio = 'Pittore'
+        self.teacher.save()
+        self.teacher.refresh_from_db()
+        self.assertEqual(self.teacher.avatar_variants['status'], 'ready')
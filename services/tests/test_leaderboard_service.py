@@ -0,0 +1,190 @@
+"""
+Tests for Leaderboard Service
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from blockchain.models import DBTeoCoinTransaction
+from courses.models import Course
+from rewards.models import LeaderboardEntry, LeaderboardState
+from services.exceptions import TeoArtServiceException
+from services.leaderboard_service import LeaderboardService
+from services.reward_service import reward_service
+
+User = get_user_model()
+
+
+@override_settings(LEADERBOARD_SAFETY_LAG_SECONDS=0)
+class LeaderboardServiceTestCase(TestCase):
+    """Test cases for the materialized reward leaderboards"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.service = LeaderboardService()
+        self.teacher = User.objects.create_user(
+            username='teacher',
+            email='teacher@test.com',
+            password='testpass',
+            role='teacher'
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f'student{i}',
+                email=f'student{i}@test.com',
+                password='testpass',
+                role='student'
+            )
+            for i in range(3)
+        ]
+        self.course = Course.objects.create(
+            title='Test Course',
+            description='Test course description',
+            teacher=self.teacher,
+            price_eur=0,
+            is_approved=True
+        )
+
+    def _reward(self, user, amount, transaction_type='earned', course=None, created_at=None):
+        tx = DBTeoCoinTransaction.objects.create(
+            user=user,
+            transaction_type=transaction_type,
+            amount=Decimal(amount),
+            description='test reward',
+            course=course
+        )
+        if created_at:
+            DBTeoCoinTransaction.objects.filter(pk=tx.pk).update(created_at=created_at)
+        return tx
+
+    def test_refresh_ranks_all_time_board(self):
+        """Totals are aggregated per user and ranked by competition ranking"""
+        first, second, third = self.students
+        self._reward(first, '10.00')
+        self._reward(first, '5.00', 'lesson_reward')
+        self._reward(second, '15.00')
+        self._reward(third, '8.00')
+
+        self.service.refresh()
+        leaderboard = self.service.get_leaderboard(limit=10)
+
+        self.assertEqual([row['user_id'] for row in leaderboard], [first.id, second.id, third.id])
+        self.assertEqual([row['rank'] for row in leaderboard], [1, 1, 3])
+        self.assertEqual(leaderboard[0]['total_rewards'], 15.0)
+        self.assertEqual(leaderboard[0]['reward_count'], 2)
+
+    def test_refresh_is_incremental(self):
+        """A second refresh applies only rows after the cursor"""
+        first, second, _ = self.students
+        self._reward(first, '10.00')
+        self.assertEqual(self.service.refresh()['transactions'], 1)
+
+        self._reward(second, '20.00')
+        result = self.service.refresh()
+
+        self.assertEqual(result['transactions'], 1)
+        self.assertEqual(self.service.refresh()['transactions'], 0)
+        self.assertEqual(self.service.get_user_rank(second.id)['rank'], 1)
+        self.assertEqual(self.service.get_user_rank(first.id)['rank'], 2)
+        self.assertEqual(self.service.get_user_rank(first.id)['total_rewards'], 10.0)
+
+    def test_non_reward_transactions_are_ignored(self):
+        """Spending, staking and negative amounts never reach the boards"""
+        first = self.students[0]
+        self._reward(first, '10.00')
+        self._reward(first, '50.00', 'staked')
+        self._reward(first, '-3.00', 'spent_discount')
+
+        self.service.refresh()
+
+        self.assertEqual(self.service.get_user_rank(first.id)['total_rewards'], 10.0)
+        self.assertEqual(LeaderboardState.objects.get().last_transaction_id, DBTeoCoinTransaction.objects.latest('id').id)
+
+    def test_period_and_course_boards(self):
+        """Rewards land on the month, ISO week and course boards of their timestamp"""
+        first, second, _ = self.students
+        created_at = timezone.make_aware(datetime(2025, 3, 5, 12, 0))
+        self._reward(first, '7.00', course=self.course, created_at=created_at)
+        self._reward(second, '4.00', created_at=created_at)
+
+        self.service.refresh()
+
+        monthly = self.service.get_leaderboard('monthly', period_key='2025-03')
+        weekly = self.service.get_leaderboard('weekly', period_key='2025-W10')
+        per_course = self.service.get_leaderboard('course', course_id=self.course.id)
+        self.assertEqual([row['user_id'] for row in monthly], [first.id, second.id])
+        self.assertEqual([row['user_id'] for row in weekly], [first.id, second.id])
+        self.assertEqual([row['user_id'] for row in per_course], [first.id])
+        self.assertEqual(self.service.get_leaderboard('monthly'), [])
+
+    def test_rebuild_matches_incremental_refresh(self):
+        """Replaying the ledger yields the same boards"""
+        for i, student in enumerate(self.students):
+            self._reward(student, str(i + 1), course=self.course)
+        self.service.refresh()
+        before = sorted(LeaderboardEntry.objects.values_list('period', 'period_key', 'user_id', 'total_rewards', 'rank'))
+
+        self.service.rebuild()
+        after = sorted(LeaderboardEntry.objects.values_list('period', 'period_key', 'user_id', 'total_rewards', 'rank'))
+
+        self.assertEqual(before, after)
+
+    def test_reward_service_leaderboard(self):
+        """RewardService serves the all-time board"""
+        first, second, _ = self.students
+        self._reward(first, '10.00', 'lesson_reward')
+        self._reward(first, '5.00', 'course_completion_bonus')
+        self._reward(second, '8.00', 'lesson_reward')
+        self.service.refresh()
+
+        leaderboard = reward_service.get_reward_leaderboard(limit=5)
+
+        self.assertEqual(len(leaderboard), 2)
+        self.assertEqual(leaderboard[0]['rank'], 1)
+        self.assertEqual(leaderboard[0]['user_id'], first.id)
+        self.assertEqual(leaderboard[0]['username'], first.username)
+        self.assertEqual(leaderboard[0]['total_rewards'], 15.0)
+        self.assertEqual(leaderboard[0]['reward_count'], 2)
+        self.assertEqual(leaderboard[1]['rank'], 2)
+        self.assertEqual(leaderboard[1]['user_id'], second.id)
+        self.assertEqual(leaderboard[1]['total_rewards'], 8.0)
+        self.assertEqual(leaderboard[1]['reward_count'], 1)
+
+    def test_get_leaderboard_is_single_query(self):
+        """Serving a board is one query regardless of its size"""
+        for i, student in enumerate(self.students):
+            self._reward(student, str(i + 1))
+        self.service.refresh()
+
+        with self.assertNumQueries(1):
+            self.service.get_leaderboard(limit=10)
+
+    def test_invalid_period(self):
+        """Unknown periods and course boards without a course are rejected"""
+        with self.assertRaises(TeoArtServiceException):
+            self.service.get_leaderboard('yearly')
+        with self.assertRaises(TeoArtServiceException):
+            self.service.get_leaderboard('course')
+
+    def test_leaderboard_endpoint(self):
+        """The endpoint serves the board and the requesting user's rank"""
+        first, second, _ = self.students
+        self._reward(first, '3.00')
+        self._reward(second, '9.00')
+        self.service.refresh()
+
+        client = APIClient()
+        client.force_authenticate(user=first)
+        response = client.get('/api/v1/rewards/leaderboard/', {'limit': 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['user_id'] for row in response.data['leaderboard']], [second.id])
+        self.assertEqual(response.data['me']['rank'], 2)
+
+        response = client.get('/api/v1/rewards/leaderboard/', {'period': 'yearly'})
+        self.assertEqual(response.status_code, 400)
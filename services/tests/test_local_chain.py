@@ -0,0 +1,88 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from blockchain.models import BurnDepositClaim
+from blockchain.testing import local_teocoin_chain
+from users.models import User
+
+
+@override_settings(CHAIN_INDEXER_CONFIRMATIONS=3, CHAIN_INDEXER_START_BLOCK=1)
+class LocalChainTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_services_mint_and_withdraw_on_the_local_chain(self):
+        from blockchain.blockchain import teocoin_service
+        from services.teocoin_withdrawal_service import teocoin_withdrawal_service
+
+        with local_teocoin_chain() as chain:
+            alice, bob = chain.account('alice').address, chain.account('bob').address
+            self.assertIs(teocoin_service.w3.provider, chain.provider)
+
+            self.assertTrue(teocoin_service.mint_tokens(alice, Decimal('10')))
+            result = teocoin_withdrawal_service.mint_tokens_to_address(Decimal('2.5'), bob)
+            self.assertTrue(result['success'], result.get('error'))
+            self.assertEqual(result['gas_used'], 76000)
+
+            self.assertEqual(teocoin_service.get_balance(alice), Decimal('10'))
+            self.assertEqual(chain.balance_of(bob), Decimal('2.5'))
+            self.assertEqual(chain.total_supply, Web3.to_wei('12.5', 'ether'))
+
+            # Steady state: fees and gas limits come from the oracle caches
+            chain.rpc_calls.clear()
+            teocoin_service.mint_tokens(alice, Decimal('1'))
+            self.assertNotIn('eth_gasPrice', chain.rpc_calls)
+            self.assertNotIn('eth_estimateGas', chain.rpc_calls)
+            self.assertNotIn('eth_feeHistory', chain.rpc_calls)
+
+        # Leaving the block rebuilds the services for the configured node
+        self.assertIsNot(teocoin_service.w3.provider, chain.provider)
+
+    def test_transactions_are_checked_like_a_node(self):
+        with local_teocoin_chain() as chain:
+            alice = chain.account('alice')
+            tx_hash = chain.send(alice, 'mintTo', alice.address, 10)
+            self.assertEqual(chain.receipts[tx_hash]['status'], '0x0')
+            self.assertEqual(chain.nonces[alice.address.lower()], 1)
+
+            tx_hash = chain.send(alice, 'burn', 10)
+            self.assertEqual(chain.receipts[tx_hash]['status'], '0x0')
+
+            tx = chain.contract.functions.burn(0).build_transaction({
+                'from': alice.address, 'nonce': 0, 'gas': 100000, 'gasPrice': chain.base_fee, 'chainId': 80002,
+            })
+            with self.assertRaisesRegex(Web3RPCError, 'nonce too low'):
+                chain.w3.eth.send_raw_transaction(alice.sign_transaction(tx).raw_transaction)
+
+    def test_burn_deposit_is_indexed_and_credited(self):
+        from services.chain_indexer_service import chain_indexer_service
+
+        user = User.objects.create_user(
+            username='localburner', email='localburner@example.com', password='pass', role='student'
+        )
+        with local_teocoin_chain() as chain:
+            wallet = chain.account('localburner')
+            chain.send(chain.account('admin'), 'mintTo', wallet.address, Web3.to_wei(8, 'ether'))
+            tx_hash = chain.send(wallet, 'burn', Web3.to_wei(3, 'ether'))
+
+            claim = chain_indexer_service.claim_deposit(user, tx_hash, Decimal('3'), wallet.address)
+            self.assertEqual(claim.status, 'pending')
+
+            chain.mine(3)
+            self.assertEqual(chain_indexer_service.index()['claims']['credited'], 1)
+            self.assertEqual(BurnDepositClaim.objects.get(tx_hash=tx_hash).status, 'credited')
+            self.assertEqual(chain.balance_of(wallet.address), Decimal('5'))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_chain', mints=3, withdrawals=2, deposits=2, stdout=out)
+        output = out.getvalue()
+        for flow in ('mint', 'withdrawal', 'deposit'):
+            self.assertIn(f'📊 {flow}:', output)
+        self.assertFalse(User.objects.filter(username__startswith='benchmark-').exists())
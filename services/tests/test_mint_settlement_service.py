@@ -0,0 +1,175 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from blockchain.models import DBTeoCoinBalance, MintSettlement, PendingMint, TeoCoinWithdrawalRequest
+from blockchain.testing import RPCError, local_teocoin_chain
+from rewards.models import BlockchainTransaction
+from services.mint_settlement_service import LOCK_KEY, mint_settlement_service
+from users.models import User
+
+
+@override_settings(MINT_SETTLEMENT_THRESHOLD_TEO=100, MINT_SETTLEMENT_MAX_DELAY_SECONDS=300, MINT_SETTLEMENT_MAX_ATTEMPTS=2)
+class MintSettlementServiceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create_user(
+                username=f'settler{i}', email=f'settler{i}@example.com', password='pass', role='student'
+            )
+            for i in range(3)
+        ]
+
+    def _reward(self, user, amount):
+        # Reward transactions are queued by the post_save signal
+        return BlockchainTransaction.objects.create(
+            user=user, transaction_type='exercise_reward', amount=Decimal(amount), status='pending', notes='test'
+        )
+
+    def _withdrawal(self, user, amount):
+        DBTeoCoinBalance.objects.create(user=user, pending_withdrawal=Decimal(amount))
+        withdrawal = TeoCoinWithdrawalRequest.objects.create(
+            user=user, amount=Decimal(amount), metamask_address=user.wallet_address
+        )
+        mint_settlement_service.queue_withdrawal(withdrawal)
+        return withdrawal
+
+    def _queue(self, chain):
+        for user in self.users:
+            user.wallet_address = chain.account(user.username).address
+            user.save(update_fields=['wallet_address'])
+        rewards = [self._reward(user, '2.5') for user in self.users for _ in range(3)]
+        withdrawal = self._withdrawal(self.users[0], '10')
+        return rewards, withdrawal
+
+    def test_credits_are_minted_once_per_wallet(self):
+        with local_teocoin_chain() as chain:
+            rewards, withdrawal = self._queue(chain)
+            self.assertEqual(PendingMint.objects.filter(status='pending').count(), 10)
+            withdrawal.refresh_from_db()
+            self.assertEqual(withdrawal.status, 'processing')
+
+            # Nothing is due yet
+            self.assertEqual(mint_settlement_service.settle()['submitted'], 0)
+
+            chain.rpc_calls.clear()
+            result = mint_settlement_service.settle(force=True)
+            self.assertEqual((result['submitted'], result['confirmed'], result['credits']), (3, 3, 10))
+            self.assertEqual(chain.rpc_calls['eth_sendRawTransaction'], 3)
+
+            self.assertEqual(chain.balance_of(self.users[0].wallet_address), Decimal('17.5'))
+            self.assertEqual(chain.balance_of(self.users[1].wallet_address), Decimal('7.5'))
+
+        withdrawal.refresh_from_db()
+        self.assertEqual(withdrawal.status, 'completed')
+        self.assertEqual(DBTeoCoinBalance.objects.get(user=self.users[0]).pending_withdrawal, Decimal('0'))
+        settlement = MintSettlement.objects.get(tx_hash=withdrawal.transaction_hash)
+        self.assertEqual((settlement.status, settlement.amount), ('confirmed', Decimal('17.5')))
+        self.assertEqual(
+            set(BlockchainTransaction.objects.filter(user=self.users[0]).values_list('status', 'transaction_hash')),
+            {('completed', settlement.tx_hash)},
+        )
+        self.assertFalse(PendingMint.objects.exclude(status='settled').exists())
+
+    @override_settings(MINT_SETTLEMENT_MULTICALL=True, MINT_SETTLEMENT_MULTICALL_SIZE=2)
+    def test_multicall_batches_wallets(self):
+        with local_teocoin_chain() as chain:
+            self._queue(chain)
+            result = mint_settlement_service.settle(force=True)
+            self.assertEqual((result['submitted'], result['confirmed'], result['wallets']), (2, 2, 3))
+            self.assertEqual(chain.balance_of(self.users[2].wallet_address), Decimal('7.5'))
+            self.assertEqual(chain.total_supply, 32500000000000000000)
+
+    def test_threshold_and_delay_make_wallets_due(self):
+        with local_teocoin_chain() as chain:
+            rich, old, fresh = (chain.account(name).address for name in ('rich', 'old', 'fresh'))
+            mint_settlement_service.enqueue(rich, '60', 'reward')
+            mint_settlement_service.enqueue(rich, '40', 'reward')
+            PendingMint.objects.filter(pk=mint_settlement_service.enqueue(old, '1', 'reward').pk).update(
+                created_at=timezone.now() - timedelta(minutes=10)
+            )
+            mint_settlement_service.enqueue(fresh, '1', 'reward')
+
+            self.assertEqual(mint_settlement_service.settle()['wallets'], 2)
+            self.assertEqual(chain.balance_of(rich), Decimal('100'))
+            self.assertEqual(chain.balance_of(fresh), Decimal('0'))
+            self.assertEqual(PendingMint.objects.get(wallet_address=fresh.lower()).status, 'pending')
+
+    def test_failed_settlements_are_retried_then_fail_ledger_rows(self):
+        with local_teocoin_chain() as chain:
+            rewards, withdrawal = self._queue(chain)
+            chain.minters.clear()
+
+            result = mint_settlement_service.settle(force=True)
+            self.assertEqual((result['submitted'], result['failed']), (3, 3))
+            self.assertEqual(set(PendingMint.objects.values_list('status', 'attempts')), {('pending', 1)})
+
+            mint_settlement_service.settle(force=True)
+            self.assertEqual(set(PendingMint.objects.values_list('status', 'attempts')), {('failed', 2)})
+
+        withdrawal.refresh_from_db()
+        self.assertEqual(withdrawal.status, 'failed')
+        self.assertTrue(withdrawal.can_be_cancelled)
+        self.assertEqual(set(BlockchainTransaction.objects.values_list('status', flat=True)), {'failed'})
+
+    def test_send_errors_are_settled_from_the_receipt(self):
+        with local_teocoin_chain() as chain:
+            self._queue(chain)
+            accept = chain._rpc_eth_sendRawTransaction
+
+            def timeout_after_accepting(raw):
+                accept(raw)
+                raise RPCError('request timed out')
+
+            with mock.patch.object(chain, '_rpc_eth_sendRawTransaction', timeout_after_accepting):
+                result = mint_settlement_service.settle(force=True)
+            self.assertEqual((result['submitted'], result['confirmed'], result['failed']), (3, 0, 0))
+            self.assertEqual(set(MintSettlement.objects.values_list('status', flat=True)), {'submitted'})
+
+            # The next run finds the receipts instead of minting again
+            result = mint_settlement_service.settle(force=True)
+            self.assertEqual((result['submitted'], result['confirmed']), (0, 3))
+            self.assertEqual(chain.balance_of(self.users[0].wallet_address), Decimal('17.5'))
+            self.assertEqual(chain.total_supply, 32500000000000000000)
+
+    def test_unsent_settlements_are_retried_once_their_nonce_is_buried(self):
+        with local_teocoin_chain() as chain:
+            self._queue(chain)
+            with mock.patch.object(chain, '_rpc_eth_sendRawTransaction', side_effect=RPCError('connection reset')):
+                mint_settlement_service.settle(force=True)
+
+            # Other transactions take the nonces; until they are buried the settlements may still be mined
+            admin, other = chain.account('admin'), chain.account('other').address
+            for _ in range(3):
+                chain.send(admin, 'mintTo', other, 1)
+            self.assertEqual(mint_settlement_service.settle()['failed'], 0)
+
+            chain.mine(12)
+            result = mint_settlement_service.settle(force=True)
+            self.assertEqual((result['failed'], result['submitted'], result['confirmed']), (3, 3, 3))
+            self.assertEqual(chain.balance_of(self.users[0].wallet_address), Decimal('17.5'))
+            self.assertEqual(set(PendingMint.objects.values_list('status', 'attempts')), {('settled', 1)})
+
+    def test_lock_taken_over_by_another_run_is_kept(self):
+        claim_due = mint_settlement_service._claim_due
+
+        def expire_lock(*args):
+            cache.set(LOCK_KEY, 'next-run')
+            return claim_due(*args)
+
+        with local_teocoin_chain(), mock.patch.object(mint_settlement_service, '_claim_due', expire_lock):
+            mint_settlement_service.settle()
+        self.assertEqual(cache.get(LOCK_KEY), 'next-run')
+
+    def test_ledger_rows_are_queued_once(self):
+        user = self.users[0]
+        user.wallet_address = '0x' + 'ab' * 20
+        user.save(update_fields=['wallet_address'])
+        reward = self._reward(user, '1')
+
+        self.assertEqual(mint_settlement_service.queue_reward(reward), PendingMint.objects.get())
+        self.assertEqual(PendingMint.objects.count(), 1)
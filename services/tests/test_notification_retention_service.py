@@ -0,0 +1,144 @@
+"""
+Tests for Notification Retention Service
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from notifications.models import Notification, NotificationArchive
+from services.notification_retention_service import NotificationRetentionService
+from services.notification_service import notification_service
+from services.exceptions import TeoArtServiceException
+
+User = get_user_model()
+
+
+@override_settings(
+    NOTIFICATION_RETENTION_DAYS=30,
+    NOTIFICATION_RETENTION_MODE='archive',
+    NOTIFICATION_RETENTION_BATCH_SIZE=2,
+    NOTIFICATION_DIGEST_TYPES=['teocoins_earned'],
+    NOTIFICATION_DIGEST_MIN_COUNT=3,
+)
+class NotificationRetentionServiceTestCase(TestCase):
+    """Test cases for NotificationRetentionService"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username='student',
+            email='student@test.com',
+            password='testpass',
+            role='student'
+        )
+        self.service = NotificationRetentionService()
+        self.old_date = timezone.now() - timedelta(days=60)
+
+    def _create(self, notification_type='course_purchased', read=True, old=True, count=1):
+        ids = []
+        for i in range(count):
+            notification = Notification.objects.create(
+                user=self.user,
+                message=f"{notification_type} {i}",
+                notification_type=notification_type,
+                read=read
+            )
+            if old:
+                # created_at is auto_now_add, backdate it explicitly
+                Notification.objects.filter(id=notification.id).update(created_at=self.old_date)
+            ids.append(notification.id)
+        return ids
+
+    def test_archives_old_read_notifications_in_batches(self):
+        """Old read notifications are moved to the archive, others are kept"""
+        old_read = self._create(count=3)
+        old_unread = self._create(read=False)
+        recent_read = self._create(old=False)
+
+        result = self.service.run_retention()
+
+        self.assertEqual(result['pruned'], 3)
+        self.assertEqual(result['batches'], 2)
+        self.assertFalse(Notification.objects.filter(id__in=old_read).exists())
+        self.assertTrue(Notification.objects.filter(id__in=old_unread + recent_read).count() == 2)
+        self.assertEqual(
+            sorted(NotificationArchive.objects.values_list('original_id', flat=True)),
+            sorted(old_read)
+        )
+
+    def test_delete_mode_does_not_archive(self):
+        """Delete mode drops rows without archiving them"""
+        self._create(count=2)
+
+        result = self.service.run_retention(mode='delete')
+
+        self.assertEqual(result['pruned'], 2)
+        self.assertEqual(NotificationArchive.objects.count(), 0)
+
+    def test_high_volume_types_are_compacted_into_digest(self):
+        """Groups of digest types above the threshold become one digest row"""
+        self._create(notification_type='teocoins_earned', count=4)
+
+        result = self.service.run_retention()
+
+        self.assertEqual(result['digests_created'], 1)
+        self.assertEqual(result['compacted'], 4)
+        self.assertEqual(result['pruned'], 0)
+        digest = Notification.objects.get(user=self.user)
+        self.assertEqual(digest.notification_type, 'notification_digest')
+        self.assertTrue(digest.read)
+        self.assertIn('4 notifiche', digest.message)
+
+    def test_failed_compaction_leaves_no_digest(self):
+        """A digest is rolled back when its originals cannot be deleted"""
+        ids = self._create(notification_type='teocoins_earned', count=4)
+
+        with patch('django.db.models.query.QuerySet.delete', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.service.run_retention()
+
+        self.assertFalse(Notification.objects.filter(notification_type='notification_digest').exists())
+        self.assertEqual(Notification.objects.filter(id__in=ids).count(), 4)
+
+    def test_small_groups_are_archived_instead_of_compacted(self):
+        """Groups below the digest threshold follow the normal prune path"""
+        self._create(notification_type='teocoins_earned', count=2)
+
+        result = self.service.run_retention()
+
+        self.assertEqual(result['digests_created'], 0)
+        self.assertEqual(result['pruned'], 2)
+        self.assertEqual(NotificationArchive.objects.count(), 2)
+
+    def test_dry_run_changes_nothing(self):
+        """Dry run only reports counts"""
+        self._create(notification_type='teocoins_earned', count=3)
+        self._create(count=2)
+
+        result = self.service.run_retention(dry_run=True)
+
+        self.assertEqual(result['compacted'], 3)
+        self.assertEqual(result['pruned'], 2)
+        self.assertEqual(Notification.objects.count(), 5)
+
+    def test_invalid_mode(self):
+        """Unknown retention modes are rejected"""
+        with self.assertRaises(TeoArtServiceException):
+            self.service.run_retention(mode='truncate')
+
+    def test_bulk_mark_read_subset(self):
+        """Bulk mark-read can be restricted to a list of ids"""
+        ids = self._create(read=False, old=False, count=3)
+
+        result = notification_service.mark_all_notifications_as_read(
+            self.user.id,
+            notification_ids=ids[:2]
+        )
+
+        self.assertEqual(result['updated_count'], 2)
+        self.assertEqual(Notification.objects.filter(user=self.user, read=False).count(), 1)
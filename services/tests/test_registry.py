@@ -0,0 +1,112 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from services.registry import ServiceRegistry
+
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+
+# Generous enough for slow CI machines; a regression to import-time Web3
+# setup or RPC calls (seconds per service when the node is unreachable)
+# blows well past it.
+IMPORT_TIME_BUDGET_SECONDS = 15
+
+COLD_START_SCRIPT = '''
+import json, socket, sys, time
+
+connections = []
+
+def _no_network(self, address, *args, **kwargs):
+    connections.append(repr(address))
+    raise OSError('network disabled during cold start')
+
+socket.socket.connect = _no_network
+socket.socket.connect_ex = _no_network
+
+start = time.monotonic()
+import django
+django.setup()
+
+import io
+import schoolplatform.urls  # views and everything they import
+import blockchain.blockchain, rewards.automation
+import services.blockchain_service, services.consolidated_teocoin_service, services.payment_service
+import services.teocoin_discount_service, services.teocoin_withdrawal_service
+from django.core.management import call_command
+call_command('check', stdout=io.StringIO())
+elapsed = time.monotonic() - start
+
+from services.registry import registry
+print(json.dumps({'elapsed': elapsed, 'built': registry.built(), 'connections': connections}))
+'''
+
+
+class ColdStartTest(SimpleTestCase):
+    """Booting Django and importing every service must not build services or touch the network."""
+
+    def test_cold_start_is_lazy_and_offline(self):
+        env = dict(os.environ)
+        env.setdefault('DJANGO_SETTINGS_MODULE', 'schoolplatform.settings.dev')
+        result = subprocess.run(
+            [sys.executable, '-c', COLD_START_SCRIPT],
+            cwd=PROJECT_DIR, env=env, capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+
+        self.assertEqual(report['built'], [])
+        self.assertEqual(report['connections'], [])
+        self.assertLess(report['elapsed'], IMPORT_TIME_BUDGET_SECONDS)
+
+
+class _Service:
+    instances = 0
+
+    def __init__(self):
+        type(self).instances += 1
+        self.value = 1
+
+    def ping(self):
+        return 'pong'
+
+
+class LazyServiceTest(SimpleTestCase):
+    def setUp(self):
+        _Service.instances = 0
+        self.registry = ServiceRegistry()
+        self.service = self.registry.register('svc', _Service)
+
+    def test_built_on_first_use(self):
+        self.assertEqual(self.registry.built(), [])
+        self.assertEqual(self.service.ping(), 'pong')
+        self.assertEqual(self.service.value, 1)
+        self.assertEqual(self.registry.built(), ['svc'])
+        self.assertEqual(_Service.instances, 1)
+
+    def test_built_once_across_threads(self):
+        threads = [threading.Thread(target=self.service.ping) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(_Service.instances, 1)
+
+    def test_attribute_writes_and_patching(self):
+        self.service.value = 2
+        self.assertEqual(self.registry.get('svc').value, 2)
+        with patch.object(self.service, 'ping', return_value='patched'):
+            self.assertEqual(self.service.ping(), 'patched')
+        self.assertEqual(self.service.ping(), 'pong')
+
+    def test_reset_rebuilds(self):
+        self.service.ping()
+        self.registry.reset()
+        self.assertEqual(self.registry.built(), [])
+        self.service.ping()
+        self.assertEqual(_Service.instances, 2)
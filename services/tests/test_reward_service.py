@@ -409,57 +409,6 @@ class RewardServiceTestCase(TestCase):
         self.assertEqual(summary['summary']['total_rewards_earned'], 2.0)
         self.assertEqual(summary['summary']['total_transactions'], 1)
     
-    def test_get_reward_leaderboard(self):
-        """Test getting reward leaderboard"""
-        # Create another student
-        student2 = User.objects.create_user(
-            username='student2',
-            email='student2@test.com',
-            password='testpass',
-            role='student'
-        )
-        
-        # Create transactions for both students
-        BlockchainTransaction.objects.create(
-            user=self.student,
-            amount=Decimal('10.00'),
-            transaction_type='lesson_reward',
-            status='completed'
-        )
-        
-        BlockchainTransaction.objects.create(
-            user=self.student,
-            amount=Decimal('5.00'),
-            transaction_type='course_completion_bonus',
-            status='completed'
-        )
-        
-        BlockchainTransaction.objects.create(
-            user=student2,
-            amount=Decimal('8.00'),
-            transaction_type='lesson_reward',
-            status='completed'
-        )
-        
-        leaderboard = reward_service.get_reward_leaderboard(limit=5)
-        
-        self.assertEqual(len(leaderboard), 2)
-        
-        # Check first place (student with 15.00 total)
-        first_place = leaderboard[0]
-        self.assertEqual(first_place['rank'], 1)
-        self.assertEqual(first_place['user_id'], self.student.id)
-        self.assertEqual(first_place['username'], self.student.username)
-        self.assertEqual(first_place['total_rewards'], 15.0)
-        self.assertEqual(first_place['reward_count'], 2)
-        
-        # Check second place (student2 with 8.00 total)
-        second_place = leaderboard[1]
-        self.assertEqual(second_place['rank'], 2)
-        self.assertEqual(second_place['user_id'], student2.id)
-        self.assertEqual(second_place['total_rewards'], 8.0)
-        self.assertEqual(second_place['reward_count'], 1)
-    
     def test_calculate_lesson_reward(self):
         """Test lesson reward calculation"""
         reward = reward_service._calculate_lesson_reward(self.course, self.lesson1)
@@ -0,0 +1,110 @@
+"""
+Tests for Search Service
+"""
+
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from courses.models import Course, Lesson
+from services.exceptions import TeoArtServiceException
+from services.search_service import SearchService
+
+User = get_user_model()
+
+
+class SearchServiceTestCase(TestCase):
+    """Test cases for the course full-text search"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.teacher = User.objects.create_user(
+            username='maestra',
+            email='teacher@test.com',
+            password='testpass',
+            role='teacher'
+        )
+        self.watercolor = self._create_course('Acquerello per principianti', 'Tecniche di base', 'acquerello')
+        self.oil = self._create_course('Ritratto a olio', 'Luce e ombre nel ritratto', 'pittura-olio')
+        self.drawing = self._create_course('Disegno dal vero', 'Prospettiva e proporzioni', 'disegno')
+        Lesson.objects.create(
+            title='Velature',
+            content='Come stendere le velature di acquerello sul ritratto',
+            course=self.drawing,
+            teacher=self.teacher,
+            order=1
+        )
+        self.service = SearchService()
+
+    def _create_course(self, title, description, category):
+        return Course.objects.create(
+            title=title,
+            description=description,
+            category=category,
+            price_eur=Decimal('10.00'),
+            teacher=self.teacher,
+            is_approved=True
+        )
+
+    def test_ranked_results_include_lesson_matches(self):
+        """Course matches rank above courses matched through a lesson"""
+        result = self.service.search_courses('acquerello')
+
+        ids = [course.id for course in result['results']]
+        self.assertEqual(ids, [self.watercolor.id, self.drawing.id])
+
+    def test_prefix_match(self):
+        """Partial words match"""
+        result = self.service.search_courses('ritra')
+
+        self.assertEqual({c.id for c in result['results']}, {self.oil.id, self.drawing.id})
+
+    def test_category_facets(self):
+        """Facets count all matches, the category filter narrows results"""
+        result = self.service.search_courses('ritratto', category='disegno')
+
+        facets = {facet['value']: facet['count'] for facet in result['facets']['category']}
+        self.assertEqual(facets, {'pittura-olio': 1, 'disegno': 1})
+        self.assertEqual([c.id for c in result['results']], [self.drawing.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        """Saving and deleting keeps the index in sync"""
+        self.oil.title = 'Natura morta'
+        self.oil.description = 'Composizione'
+        self.oil.save()
+        self.assertEqual(self.service.search_courses('natura')['total'], 1)
+
+        self.oil.delete()
+        self.assertEqual(self.service.search_courses('natura')['total'], 0)
+
+    def test_rebuild_command(self):
+        """The rebuild command repopulates the index"""
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        self.assertEqual(self.service.search_courses('prospettiva')['total'], 1)
+
+    def test_empty_query_rejected(self):
+        """Empty queries are rejected"""
+        with self.assertRaises(TeoArtServiceException):
+            self.service.search_courses('  ')
+
+    def test_search_endpoint(self):
+        """The endpoint returns ranked results and facets"""
+        client = APIClient()
+        client.force_authenticate(self.teacher)
+
+        response = client.get('/api/v1/courses/search/', {'q': 'acquerello'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['results'][0]['id'], self.watercolor.id)
+        self.assertIn('rank', data['results'][0])
+        self.assertIn('category', data['facets'])
+
+        response = client.get('/api/v1/courses/', {'search': 'velature'})
+        self.assertEqual([c['id'] for c in response.json()], [self.drawing.id])
@@ -0,0 +1,213 @@
+"""
+Tests for Teacher Payout Service
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from blockchain.models import DBTeoCoinTransaction
+from courses.models import Course, CourseEnrollment
+from rewards.models import TeacherDiscountAbsorption, TeacherPayoutSummary
+from services.exceptions import TeoArtServiceException
+from services.teacher_payout_service import TeacherPayoutService
+
+User = get_user_model()
+
+
+class TeacherPayoutServiceTestCase(TestCase):
+    """Test cases for the teacher payout roll-up"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.service = TeacherPayoutService()
+        self.teacher = User.objects.create_user(
+            username='teacher',
+            email='teacher@test.com',
+            password='testpass',
+            role='teacher'
+        )
+        self.course = Course.objects.create(
+            title='Test Course',
+            description='Test course description',
+            teacher=self.teacher,
+            price_eur=Decimal('100.00'),
+            is_approved=True
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f'student{i}',
+                email=f'student{i}@test.com',
+                password='testpass',
+                role='student'
+            )
+            for i in range(3)
+        ]
+        # Wednesday 5 March 2025, noon
+        self.sale_time = timezone.make_aware(datetime(2025, 3, 5, 12, 0))
+
+    def _enroll(self, student, payment_method, amount_paid_eur=None):
+        enrollment = CourseEnrollment.objects.create(
+            student=student,
+            course=self.course,
+            payment_method=payment_method,
+            amount_paid_eur=amount_paid_eur
+        )
+        CourseEnrollment.objects.filter(pk=enrollment.pk).update(enrolled_at=self.sale_time)
+
+    def _absorption(self, student, status):
+        absorbed = status == 'absorbed'
+        absorption = TeacherDiscountAbsorption.objects.create(
+            teacher=self.teacher,
+            course=self.course,
+            student=student,
+            course_price_eur=Decimal('100.00'),
+            discount_percentage=10,
+            teo_used_by_student=Decimal('10.00'),
+            discount_amount_eur=Decimal('10.00'),
+            teacher_commission_rate=Decimal('50.00'),
+            option_a_teacher_eur=Decimal('50.00'),
+            option_a_platform_eur=Decimal('40.00'),
+            option_b_teacher_eur=Decimal('45.00'),
+            option_b_teacher_teo=Decimal('12.50'),
+            option_b_platform_eur=Decimal('45.00'),
+            status=status,
+            final_teacher_eur=Decimal('45.00') if absorbed else Decimal('50.00'),
+            final_teacher_teo=Decimal('12.50') if absorbed else Decimal('0'),
+        )
+        TeacherDiscountAbsorption.objects.filter(pk=absorption.pk).update(created_at=self.sale_time)
+
+    def _teo_credit(self, user, amount, transaction_type='discount_absorption'):
+        tx = DBTeoCoinTransaction.objects.create(
+            user=user,
+            transaction_type=transaction_type,
+            amount=Decimal(amount),
+            description='test credit'
+        )
+        DBTeoCoinTransaction.objects.filter(pk=tx.pk).update(created_at=self.sale_time)
+
+    def _create_march_activity(self):
+        self._enroll(self.students[0], 'fiat', Decimal('100.00'))
+        self._enroll(self.students[1], 'teocoin_discount', Decimal('90.00'))
+        self._enroll(self.students[2], 'teocoin_discount', Decimal('90.00'))
+        self._absorption(self.students[1], 'absorbed')
+        self._absorption(self.students[2], 'refused')
+        self._teo_credit(self.teacher, '12.50')
+        # Student rewards never count as teacher payouts
+        self._teo_credit(self.students[0], '5.00', 'earned')
+
+    def test_generate_period_rolls_up_sources(self):
+        """Enrollments, absorptions and ledger credits combine into one row per teacher"""
+        self._create_march_activity()
+
+        summaries = self.service.generate_period('monthly', date(2025, 3, 20))
+
+        self.assertEqual(len(summaries), 1)
+        summary = TeacherPayoutSummary.objects.get(teacher=self.teacher, period_type='monthly')
+        self.assertEqual(summary.period_start, date(2025, 3, 1))
+        self.assertEqual(summary.period_end, date(2025, 3, 31))
+        self.assertEqual(summary.total_transactions, 3)
+        self.assertEqual(summary.total_discounts_absorbed, 1)
+        # 50% of the fiat sale plus the EUR-preferred absorption
+        self.assertEqual(summary.eur_from_standard_sales, Decimal('100.00'))
+        self.assertEqual(summary.eur_from_absorbed_discounts, Decimal('45.00'))
+        self.assertEqual(summary.total_eur_earned, Decimal('145.00'))
+        self.assertEqual(summary.teo_from_absorbed_discounts, Decimal('12.50'))
+        self.assertEqual(summary.total_teo_earned, Decimal('12.50'))
+
+    def test_generate_period_is_idempotent(self):
+        """Regenerating a period replaces its rows"""
+        self._create_march_activity()
+        self.service.generate_period('weekly', date(2025, 3, 5))
+        self.service.generate_period('weekly', date(2025, 3, 5))
+
+        summary = TeacherPayoutSummary.objects.get(period_type='weekly')
+        self.assertEqual(summary.period_start, date(2025, 3, 3))
+        self.assertEqual(summary.period_end, date(2025, 3, 9))
+
+    def test_close_periods_is_incremental(self):
+        """Only periods past the grace window and after the last closed one are generated"""
+        self._create_march_activity()
+        now = timezone.make_aware(datetime(2025, 4, 1, 12, 0))
+
+        # March ended less than 48 hours ago
+        self.assertEqual(self.service.close_periods('monthly', now=now), 0)
+
+        now += timedelta(days=2)
+        self.assertEqual(self.service.close_periods('monthly', now=now), 1)
+        self.assertEqual(self.service.close_periods('monthly', now=now), 0)
+
+        later = timezone.make_aware(datetime(2025, 6, 10))
+        self.assertEqual(self.service.close_periods('monthly', now=later), 2)
+        self.assertEqual(TeacherPayoutSummary.objects.filter(period_type='monthly').count(), 1)
+
+    def test_get_period_overview(self):
+        """The admin overview reads stored rows and totals them"""
+        self._create_march_activity()
+        self.service.generate_period('monthly', date(2025, 3, 1))
+
+        overview = self.service.get_period_overview('monthly')
+
+        self.assertEqual(overview['period_start'], '2025-03-01')
+        self.assertEqual(overview['totals']['total_eur_earned'], '145.00')
+        self.assertEqual(overview['totals']['total_transactions'], 3)
+        self.assertEqual(overview['teachers'][0]['teacher_id'], self.teacher.id)
+
+    def test_teacher_summaries_include_open_period(self):
+        """The current period is computed live and flagged as not closed"""
+        self.sale_time = timezone.now()
+        self._enroll(self.students[0], 'fiat', Decimal('100.00'))
+
+        summaries = self.service.get_teacher_summaries(self.teacher, 'weekly')
+
+        self.assertFalse(summaries[0]['is_closed'])
+        self.assertEqual(summaries[0]['eur_from_standard_sales'], '50.00')
+        self.assertFalse(TeacherPayoutSummary.objects.exists())
+
+    def test_teacher_earnings_combine_closed_and_open_periods(self):
+        """Closed months are read from the stored rows, the open ones rolled up live"""
+        self._create_march_activity()
+        self.service.generate_period('monthly', date(2025, 3, 1))
+        self.sale_time = timezone.now()
+        CourseEnrollment.objects.filter(student=self.students[0]).delete()
+        self._enroll(self.students[0], 'fiat', Decimal('100.00'))
+
+        earnings = self.service.get_teacher_earnings(self.teacher)
+
+        self.assertEqual(earnings['daily']['total_eur_earned'], '50.00')
+        self.assertEqual(earnings['monthly']['total_eur_earned'], '50.00')
+        self.assertEqual(earnings['all_time']['total_eur_earned'], '195.00')
+        self.assertEqual(earnings['all_time']['total_transactions'], 4)
+
+        client = APIClient()
+        client.force_authenticate(user=self.teacher)
+        response = client.get('/api/v1/dashboard/teacher/')
+        self.assertEqual(response.data['sales']['daily'], '50.00')
+        self.assertEqual(response.data['stats']['total_earnings'], '195.00')
+
+    def test_invalid_period_type(self):
+        """Unknown period types are rejected"""
+        with self.assertRaises(TeoArtServiceException):
+            self.service.close_periods('yearly')
+
+    def test_payout_endpoints(self):
+        """Teachers read their own summaries, admins the period overview"""
+        self._create_march_activity()
+        self.service.generate_period('monthly', date(2025, 3, 1))
+        client = APIClient()
+
+        client.force_authenticate(user=self.teacher)
+        response = client.get('/api/v1/teocoin/teacher/payouts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('2025-03-01', [row['period_start'] for row in response.data['summaries']])
+        self.assertEqual(client.get('/api/v1/teocoin/admin/payouts/overview/').status_code, 403)
+
+        admin = User.objects.create_user(username='admin', email='admin@test.com', password='testpass', role='admin', is_staff=True)
+        client.force_authenticate(user=admin)
+        response = client.get('/api/v1/teocoin/admin/payouts/overview/', {'period_start': '2025-03-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totals']['total_discounts_absorbed'], 1)
@@ -0,0 +1,137 @@
+import shutil
+import tempfile
+import warnings
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from courses.models import Course, CourseEnrollment, Lesson
+from courses.serializers import LessonSerializer
+from services.video_stream_service import RangeNotSatisfiable, parse_range, video_stream_service
+from users.models import User
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix='video-stream-test-')
+
+
+class ParseRangeTest(SimpleTestCase):
+    def test_ranges(self):
+        self.assertIsNone(parse_range(None, 100))
+        self.assertEqual(parse_range('bytes=0-9', 100), (0, 9))
+        self.assertEqual(parse_range('bytes=90-', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=50-500', 100), (50, 99))
+        # Malformed and multi-range requests get the whole file
+        self.assertIsNone(parse_range('bytes=9-0', 100))
+        self.assertIsNone(parse_range('bytes=a-b', 100))
+        self.assertIsNone(parse_range('bytes=0-1,5-6', 100))
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range('bytes=100-', 100)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, VIDEO_STREAM_X_ACCEL=False)
+class VideoStreamServiceTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(
+            username='steacher', email='steacher@example.com', password='pass', role='teacher'
+        )
+        self.student = User.objects.create_user(
+            username='sstudent', email='sstudent@example.com', password='pass', role='student'
+        )
+        self.outsider = User.objects.create_user(
+            username='soutsider', email='soutsider@example.com', password='pass', role='student'
+        )
+        self.course = Course.objects.create(
+            title='Video', description='d', teacher=self.teacher, price_eur=10, is_approved=True
+        )
+        self.lesson = Lesson.objects.create(
+            title='L1', content='c', teacher=self.teacher, course=self.course, order=1
+        )
+        self.data = bytes(range(256)) * 40
+        self.lesson.video_file.save('lezione.mp4', ContentFile(self.data))
+        CourseEnrollment.objects.create(student=self.student, course=self.course)
+
+    def _serialized_url(self, user):
+        request = APIRequestFactory().get('/')
+        request.user = user
+        return LessonSerializer(self.lesson, context={'request': request}).data['video_file_url']
+
+    def _stream_url(self):
+        return video_stream_service.get_stream_url(self.student, self.lesson)
+
+    def test_url_only_for_users_with_access(self):
+        self.assertIn('/video/stream/?token=', self._serialized_url(self.student))
+        self.assertIsNotNone(self._serialized_url(self.teacher))
+        self.assertIsNone(self._serialized_url(self.outsider))
+
+    def test_full_and_range_requests(self):
+        url = self._stream_url()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        response = self.client.get(url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.data)}')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), self.data[100:200])
+
+        response = self.client.get(url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), self.data[-10:])
+
+        response = self.client.get(url, HTTP_RANGE=f'bytes={len(self.data)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.data)}')
+
+    @override_settings(VIDEO_STREAM_BLOCK_SIZE=1024)
+    async def test_ranges_stream_block_by_block_under_asgi(self):
+        url = await sync_to_async(self._stream_url)()
+        client = AsyncClient()
+
+        for headers, expected in [({}, self.data), ({'Range': 'bytes=0-'}, self.data),
+                                  ({'Range': 'bytes=100-2199'}, self.data[100:2200])]:
+            response = await client.get(url, headers=headers)
+            self.assertTrue(response.is_async)
+            self.assertEqual(response['Content-Length'], str(len(expected)))
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                chunks = [chunk async for chunk in response]
+            self.assertEqual(b''.join(chunks), expected)
+            self.assertLessEqual(max(map(len, chunks)), 1024)
+
+    def test_if_range_mismatch_sends_whole_file(self):
+        url = self._stream_url()
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        response = self.client.get(url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_or_foreign_tokens_are_rejected(self):
+        url = self._stream_url()
+        self.assertEqual(self.client.get(url + 'x').status_code, 403)
+
+        other = Lesson.objects.create(title='L2', content='c', teacher=self.teacher, course=self.course, order=2)
+        token = url.split('token=')[1]
+        response = self.client.get(f'/api/v1/lessons/{other.pk}/video/stream/?token={token}')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(VIDEO_STREAM_X_ACCEL=True)
+    def test_x_accel_redirect(self):
+        response = self.client.get(self._stream_url(), HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.lesson.video_file.name}')
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertEqual(response.content, b'')
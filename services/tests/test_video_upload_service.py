@@ -0,0 +1,169 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses.models import Course, Lesson, LessonVideoUpload
+from services.exceptions import TeoArtServiceException
+from services.video_upload_service import video_upload_service
+from users.models import User
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix='video-upload-test-')
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    VIDEO_UPLOAD_TEMP_DIR=os.path.join(MEDIA_ROOT, 'parts'),
+    VIDEO_UPLOAD_CHUNK_SIZE=1024,
+    VIDEO_UPLOAD_READ_SIZE=100,
+)
+class VideoUploadServiceTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username='vteacher', email='vteacher@example.com', password='pass', role='teacher'
+        )
+        course = Course.objects.create(
+            title='Video', description='d', teacher=self.teacher, price_eur=10, is_approved=True
+        )
+        self.lesson = Lesson.objects.create(
+            title='L1', content='c', teacher=self.teacher, course=course, order=1
+        )
+        self.data = os.urandom(2500)
+        self.checksum = hashlib.sha256(self.data).hexdigest()
+
+    def _create(self, checksum=None):
+        return video_upload_service.create_upload(
+            self.teacher, self.lesson, 'lezione.mp4', len(self.data), checksum or self.checksum, 'video/mp4'
+        )
+
+    def _put(self, upload, offset, length=1024):
+        body = self.data[offset:offset + length]
+        return video_upload_service.write_chunk(upload, offset, io.BytesIO(body), len(body))
+
+    def test_chunks_are_assembled_and_attached(self):
+        upload = self._create()
+        offset = 0
+        while offset < len(self.data):
+            offset = self._put(upload, offset)
+
+        lesson = video_upload_service.complete_upload(upload)
+
+        with lesson.video_file.open('rb') as f:
+            self.assertEqual(f.read(), self.data)
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, 'completed')
+        self.assertFalse(os.path.exists(video_upload_service.part_path(upload)))
+
+    def test_resume_after_interrupted_chunk(self):
+        upload = self._create()
+        self._put(upload, 0)
+
+        # Connection drops after 300 of 1024 bytes
+        with self.assertRaises(TeoArtServiceException) as ctx:
+            video_upload_service.write_chunk(upload, 1024, io.BytesIO(self.data[1024:1324]), 1024)
+        self.assertEqual(ctx.exception.code, 'chunk_interrupted')
+
+        upload = video_upload_service.get_upload(upload.pk, self.teacher)
+        self.assertEqual(upload.received_bytes, 1324)
+        with self.assertRaises(TeoArtServiceException) as ctx:
+            self._put(upload, 1024)
+        self.assertEqual(ctx.exception.status_code, 409)
+        self.assertEqual(ctx.exception.offset, 1324)
+
+        offset = 1324
+        while offset < len(self.data):
+            offset = self._put(upload, offset)
+        lesson = video_upload_service.complete_upload(upload)
+        with lesson.video_file.open('rb') as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_checksum_mismatch_fails_upload(self):
+        upload = self._create(checksum='0' * 64)
+        offset = 0
+        while offset < len(self.data):
+            offset = self._put(upload, offset)
+
+        with self.assertRaises(TeoArtServiceException) as ctx:
+            video_upload_service.complete_upload(upload)
+        self.assertEqual(ctx.exception.code, 'checksum_mismatch')
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, 'failed')
+        self.lesson.refresh_from_db()
+        self.assertFalse(self.lesson.video_file)
+
+    def test_incomplete_upload_cannot_complete(self):
+        upload = self._create()
+        self._put(upload, 0)
+        with self.assertRaises(TeoArtServiceException) as ctx:
+            video_upload_service.complete_upload(upload)
+        self.assertEqual(ctx.exception.code, 'upload_incomplete')
+
+    def test_rejects_invalid_metadata_and_other_teachers(self):
+        with self.assertRaises(TeoArtServiceException) as ctx:
+            video_upload_service.create_upload(self.teacher, self.lesson, 'virus.exe', 100, self.checksum)
+        self.assertEqual(ctx.exception.status_code, 400)
+
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass', role='teacher')
+        with self.assertRaises(TeoArtServiceException) as ctx:
+            video_upload_service.create_upload(other, self.lesson, 'a.mp4', 100, self.checksum)
+        self.assertEqual(ctx.exception.status_code, 403)
+
+    def test_expire_stale_uploads(self):
+        upload = self._create()
+        LessonVideoUpload.objects.filter(pk=upload.pk).update(updated_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(video_upload_service.expire_stale_uploads(), {'expired': 1})
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, 'expired')
+        self.assertFalse(os.path.exists(video_upload_service.part_path(upload)))
+
+    def test_expire_command(self):
+        upload = self._create()
+        LessonVideoUpload.objects.filter(pk=upload.pk).update(updated_at=timezone.now() - timedelta(days=2))
+
+        out = StringIO()
+        call_command('expire_video_uploads', stdout=out)
+        self.assertIn('Expired 1 stale uploads', out.getvalue())
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, 'expired')
+
+    def test_api_flow(self):
+        client = APIClient()
+        client.force_authenticate(self.teacher)
+        base = f'/api/v1/lessons/{self.lesson.pk}/video-uploads/'
+
+        response = client.post(base, {
+            'filename': 'lezione.mp4', 'size': len(self.data), 'checksum': self.checksum, 'content_type': 'video/mp4'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        url = f"{base}{response.data['upload_id']}/"
+
+        offset = 0
+        while offset < len(self.data):
+            chunk = self.data[offset:offset + 1024]
+            response = client.put(url, chunk, content_type='application/offset+octet-stream',
+                                  HTTP_UPLOAD_OFFSET=str(offset))
+            self.assertEqual(response.status_code, 200)
+            offset = int(response['Upload-Offset'])
+
+        response = client.put(url, b'x', content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET='0')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['offset'], len(self.data))
+
+        self.assertEqual(client.get(url).data['offset'], len(self.data))
+        response = client.post(f'{url}complete/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['video_file_url'])
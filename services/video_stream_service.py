@@ -0,0 +1,189 @@
+"""
+Video Stream Service - Authorized Lesson Video Delivery
+
+Lesson videos are not served from the public ``MEDIA_URL``. A user who may
+access the course gets a signed stream URL (``LessonSerializer.video_file_url``),
+checked once with the cached enrollment lookup. Requests to that URL carry no
+session and cost no query: the signature is verified and the file is handed
+off for delivery:
+
+- ``VIDEO_STREAM_X_ACCEL`` (nginx in front, see ``nginx.conf``): an empty
+  response with ``X-Accel-Redirect`` into the ``internal`` location
+  ``VIDEO_STREAM_X_ACCEL_PREFIX``; nginx serves the bytes and handles
+  ``Range``/206 and sendfile.
+- Storage without a local path (object storage): redirect to the storage
+  URL, which signed-URL backends (e.g. S3 query string auth) make temporary.
+- Otherwise Django serves the file itself with full ``Range``/206/416 and
+  ``If-Range`` support, streaming only the requested bytes block by block
+  (``core.streaming``, so ASGI workers do not buffer them either).
+
+Signed URLs expire after ``VIDEO_STREAM_URL_TTL`` seconds; the player keeps
+using the same URL for every seek during that time.
+"""
+
+import mimetypes
+import os
+from typing import Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core import signing
+from django.http import HttpResponse, HttpResponseRedirect
+from django.urls import reverse
+from django.utils.http import http_date
+
+from core.streaming import streaming_response
+from courses.models import Lesson
+from services.base import BaseService
+from services.enrollment_access_service import enrollment_access_service
+from services.exceptions import TeoArtServiceException
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a ``Range`` header into an inclusive (start, end) byte range.
+
+    Returns None when the whole file should be sent (no header, malformed or
+    multiple ranges, which a server may ignore); raises RangeNotSatisfiable
+    when the range starts past the end of the file.
+    """
+    if not header or not header.startswith('bytes='):
+        return None
+    spec = header[len('bytes='):].strip()
+    if ',' in spec:
+        return None
+    start_s, sep, end_s = spec.partition('-')
+    if not sep:
+        return None
+    try:
+        if not start_s:
+            suffix = int(end_s)
+            if suffix <= 0 or size == 0:
+                raise RangeNotSatisfiable()
+            return max(size - suffix, 0), size - 1
+        start = int(start_s)
+        end = int(end_s) if end_s else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class VideoStreamService(BaseService):
+    """
+    Service issuing and serving signed lesson video stream URLs.
+    """
+
+    SALT = 'courses.lesson_video_stream'
+
+    @property
+    def url_ttl(self) -> int:
+        return getattr(settings, 'VIDEO_STREAM_URL_TTL', 4 * 3600)
+
+    def can_stream(self, user, lesson: Lesson) -> bool:
+        if user is None or not user.is_authenticated:
+            return False
+        if lesson.course_id is None:
+            return user.is_staff or user.is_superuser or lesson.teacher_id == user.pk
+        return enrollment_access_service.can_access_course(user, lesson.course)
+
+    def get_stream_url(self, user, lesson: Lesson, request=None) -> Optional[str]:
+        """Signed stream URL for ``lesson``'s video, or None if the user may not watch it."""
+        if not lesson.video_file or not self.can_stream(user, lesson):
+            return None
+        token = signing.dumps({'lesson': lesson.pk, 'file': lesson.video_file.name}, salt=self.SALT)
+        url = f"{reverse('lesson-video-stream', args=[lesson.pk])}?{urlencode({'token': token})}"
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def verify_token(self, lesson_id: int, token: str) -> str:
+        """
+        Check a stream token and return the video file name it grants.
+
+        Raises:
+            TeoArtServiceException: expired (403) or invalid (403) token
+        """
+        try:
+            payload = signing.loads(token or '', salt=self.SALT, max_age=self.url_ttl)
+        except signing.SignatureExpired:
+            raise TeoArtServiceException("Link del video scaduto", code='stream_url_expired', status_code=403)
+        except signing.BadSignature:
+            raise TeoArtServiceException("Link del video non valido", code='stream_url_invalid', status_code=403)
+        if payload.get('lesson') != lesson_id or not payload.get('file'):
+            raise TeoArtServiceException("Link del video non valido", code='stream_url_invalid', status_code=403)
+        return payload['file']
+
+    def serve(self, request, name: str) -> HttpResponse:
+        """Response delivering the video file ``name`` for a verified stream request."""
+        storage = Lesson._meta.get_field('video_file').storage
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+        if getattr(settings, 'VIDEO_STREAM_X_ACCEL', False):
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = getattr(settings, 'VIDEO_STREAM_X_ACCEL_PREFIX', '/protected-media/') + quote(name)
+            response['Cache-Control'] = 'private, max-age=3600'
+            return response
+
+        try:
+            path = storage.path(name)
+        except NotImplementedError:
+            return HttpResponseRedirect(storage.url(name))
+
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise TeoArtServiceException("Video non trovato", code='video_not_found', status_code=404)
+        return self._range_response(request, path, stat, content_type)
+
+    def _range_response(self, request, path: str, stat: os.stat_result, content_type: str) -> HttpResponse:
+        size = stat.st_size
+        etag = f'"{size:x}-{int(stat.st_mtime):x}"'
+
+        byte_range = None
+        if_range = request.headers.get('If-Range')
+        if if_range is None or if_range == etag:
+            try:
+                byte_range = parse_range(request.headers.get('Range'), size)
+            except RangeNotSatisfiable:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                response['Accept-Ranges'] = 'bytes'
+                return response
+
+        if byte_range is None:
+            response = streaming_response(request, self._read_range(path, 0, size), content_type=content_type)
+            response['Content-Length'] = str(size)
+        else:
+            start, end = byte_range
+            response = streaming_response(
+                request, self._read_range(path, start, end - start + 1), status=206, content_type=content_type
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(end - start + 1)
+
+        response['Accept-Ranges'] = 'bytes'
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = 'private, max-age=3600'
+        return response
+
+    def _read_range(self, path: str, start: int, length: int):
+        block_size = getattr(settings, 'VIDEO_STREAM_BLOCK_SIZE', 256 * 1024)
+        with open(path, 'rb') as f:
+            f.seek(start)
+            while length > 0:
+                data = f.read(min(block_size, length))
+                if not data:
+                    break
+                length -= len(data)
+                yield data
+
+
+# Singleton instance
+video_stream_service = VideoStreamService()
@@ -0,0 +1,317 @@
+"""
+Video Upload Service - Chunked, Resumable Lesson Video Uploads
+
+Teachers upload lesson videos in chunks instead of one request body:
+
+1. ``create_upload`` declares filename, size and SHA-256 of the file.
+2. ``write_chunk`` appends a chunk at the given offset, reading the request
+   stream in ``VIDEO_UPLOAD_READ_SIZE`` pieces straight into a part file, so
+   worker memory stays flat whatever the file size.
+3. ``complete_upload`` verifies size and checksum and attaches the file to
+   ``Lesson.video_file``.
+
+After a dropped connection the client asks for the upload status and
+resumes from ``received_bytes``; a chunk at any other offset is rejected
+with 409 and the current offset. Part files live in
+``VIDEO_UPLOAD_TEMP_DIR`` (shared by all web workers) and stale uploads are
+removed by ``expire_stale_uploads`` (``manage.py expire_video_uploads --loop`` or
+``core.tasks.expire_video_uploads``).
+"""
+
+import hashlib
+import os
+import re
+from datetime import timedelta
+from typing import Any, BinaryIO, Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from courses.models import Lesson, LessonVideoUpload
+from courses.validators import validate_video_metadata
+from services.base import BaseService
+from services.exceptions import TeoArtServiceException
+
+CHECKSUM_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class _PartFile(File):
+    """Completed part file; FileSystemStorage moves it into place instead of copying."""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+class VideoUploadService(BaseService):
+    """
+    Service for chunked lesson video uploads.
+    """
+
+    LOCK_KEY = 'video_upload_lock_{upload_id}'
+
+    @property
+    def temp_dir(self) -> str:
+        return getattr(settings, 'VIDEO_UPLOAD_TEMP_DIR', None) or os.path.join(settings.MEDIA_ROOT, 'chunked_uploads')
+
+    @property
+    def chunk_size(self) -> int:
+        return getattr(settings, 'VIDEO_UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024)
+
+    def part_path(self, upload: LessonVideoUpload) -> str:
+        return os.path.join(self.temp_dir, f'{upload.pk}.part')
+
+    def get_upload(self, upload_id, user, lesson_id=None) -> LessonVideoUpload:
+        """Get an upload owned by ``user`` (staff can access any upload)."""
+        uploads = LessonVideoUpload.objects.select_related('lesson')
+        if lesson_id is not None:
+            uploads = uploads.filter(lesson_id=lesson_id)
+        if not user.is_staff:
+            uploads = uploads.filter(teacher=user)
+        try:
+            return uploads.get(pk=upload_id)
+        except LessonVideoUpload.DoesNotExist:
+            raise TeoArtServiceException("Upload non trovato", code='upload_not_found', status_code=404)
+
+    def get_status(self, upload: LessonVideoUpload) -> Dict[str, Any]:
+        return {
+            'upload_id': str(upload.pk),
+            'lesson_id': upload.lesson_id,
+            'filename': upload.filename,
+            'status': upload.status,
+            'offset': upload.received_bytes,
+            'total_size': upload.total_size,
+            'chunk_size': self.chunk_size,
+            'error': upload.error,
+        }
+
+    def create_upload(self, user, lesson: Lesson, filename: str, total_size: int,
+                      checksum_sha256: str, content_type: str = '') -> LessonVideoUpload:
+        """
+        Start a chunked upload for ``lesson``.
+
+        Raises:
+            TeoArtServiceException: not the lesson's teacher (403) or invalid metadata (400)
+        """
+        if lesson.teacher_id != user.pk and not user.is_staff:
+            raise TeoArtServiceException("Non sei il docente di questa lezione", code='not_lesson_teacher', status_code=403)
+
+        filename = os.path.basename(filename or '')
+        checksum_sha256 = (checksum_sha256 or '').lower()
+        if not filename or total_size <= 0:
+            raise TeoArtServiceException("Nome file e dimensione sono obbligatori", code='invalid_upload', status_code=400)
+        if not CHECKSUM_RE.match(checksum_sha256):
+            raise TeoArtServiceException("Checksum SHA-256 non valido", code='invalid_checksum', status_code=400)
+        try:
+            validate_video_metadata(filename, total_size, content_type)
+        except ValidationError as e:
+            raise TeoArtServiceException(' '.join(e.messages), code='invalid_video', status_code=400)
+
+        upload = LessonVideoUpload.objects.create(
+            lesson=lesson,
+            teacher=user,
+            filename=filename,
+            content_type=content_type or '',
+            total_size=total_size,
+            checksum_sha256=checksum_sha256,
+        )
+        os.makedirs(self.temp_dir, exist_ok=True)
+        open(self.part_path(upload), 'wb').close()
+
+        self.log_info(f"Video upload {upload.pk} started for lesson {lesson.pk}: {filename} ({total_size} bytes)")
+        return upload
+
+    def write_chunk(self, upload: LessonVideoUpload, offset: int, stream: BinaryIO, length: int) -> int:
+        """
+        Write ``length`` bytes read from ``stream`` at ``offset``.
+
+        The part file is truncated at ``offset`` first, discarding any partial
+        chunk left by a dropped connection. Returns the new offset.
+
+        Raises:
+            TeoArtServiceException: wrong offset or concurrent write (409),
+                invalid length or interrupted body (400)
+        """
+        self._check_uploading(upload)
+        if offset != upload.received_bytes:
+            raise self._offset_conflict(upload)
+        if length <= 0 or length > self.chunk_size or offset + length > upload.total_size:
+            raise TeoArtServiceException(
+                f"Dimensione del blocco non valida (massimo {self.chunk_size} byte, "
+                f"{upload.total_size - offset} rimanenti)",
+                code='invalid_chunk', status_code=400
+            )
+
+        with self._lock(upload):
+            upload.refresh_from_db(fields=['received_bytes', 'status'])
+            self._check_uploading(upload)
+            if offset != upload.received_bytes:
+                raise self._offset_conflict(upload)
+
+            written, interrupted = self._append(self.part_path(upload), offset, stream, length)
+            LessonVideoUpload.objects.filter(pk=upload.pk, received_bytes=offset).update(
+                received_bytes=offset + written, updated_at=timezone.now()
+            )
+            upload.received_bytes = offset + written
+
+        if interrupted:
+            raise TeoArtServiceException(
+                f"Blocco interrotto dopo {written} byte: riprendere dall'offset {upload.received_bytes}",
+                code='chunk_interrupted', status_code=400
+            )
+        return upload.received_bytes
+
+    def complete_upload(self, upload: LessonVideoUpload) -> Lesson:
+        """
+        Verify size and SHA-256 and attach the video to the lesson.
+
+        A checksum mismatch marks the upload as failed: the client must start
+        a new upload.
+        """
+        with self._lock(upload):
+            upload.refresh_from_db()
+            self._check_uploading(upload)
+            if upload.received_bytes != upload.total_size:
+                raise TeoArtServiceException(
+                    f"Upload incompleto: ricevuti {upload.received_bytes} di {upload.total_size} byte",
+                    code='upload_incomplete', status_code=409
+                )
+
+            path = self.part_path(upload)
+            checksum = self._sha256(path)
+            if checksum != upload.checksum_sha256:
+                self._fail(upload, f"Checksum non corrispondente: atteso {upload.checksum_sha256}, ricevuto {checksum}")
+                raise TeoArtServiceException(
+                    "Il checksum del file non corrisponde: ricaricare il video",
+                    code='checksum_mismatch', status_code=400
+                )
+
+            with transaction.atomic():
+                lesson = Lesson.objects.select_for_update().get(pk=upload.lesson_id)
+                previous = lesson.video_file.name if lesson.video_file else None
+                with open(path, 'rb') as part:
+                    part_file = _PartFile(part)
+                    part_file.content_sha256 = checksum  # verified above; saves ContentAddressedStorage a pass
+                    lesson.video_file.save(upload.filename, part_file, save=False)
+                lesson.save(update_fields=['video_file', 'updated_at'])
+
+                upload.status = 'completed'
+                upload.completed_at = timezone.now()
+                upload.save(update_fields=['status', 'completed_at', 'updated_at'])
+
+                if previous and previous != lesson.video_file.name:
+                    storage = lesson.video_file.storage
+                    transaction.on_commit(lambda: storage.delete(previous))
+
+        self._remove_part(upload)
+        self.log_info(f"Video upload {upload.pk} attached to lesson {lesson.pk} as {lesson.video_file.name}")
+        return lesson
+
+    def abort_upload(self, upload: LessonVideoUpload) -> None:
+        with self._lock(upload):
+            upload.refresh_from_db(fields=['status'])
+            self._check_uploading(upload)
+            self._fail(upload, "Annullato dall'utente")
+
+    def expire_stale_uploads(self) -> Dict[str, int]:
+        """Expire uploads idle for more than VIDEO_UPLOAD_EXPIRY_HOURS and remove their part files."""
+        cutoff = timezone.now() - timedelta(hours=getattr(settings, 'VIDEO_UPLOAD_EXPIRY_HOURS', 24))
+        expired = 0
+        for upload in LessonVideoUpload.objects.filter(status='uploading', updated_at__lt=cutoff).iterator():
+            updated = LessonVideoUpload.objects.filter(
+                pk=upload.pk, status='uploading', updated_at__lt=cutoff
+            ).update(status='expired', updated_at=timezone.now())
+            if updated:
+                self._remove_part(upload)
+                expired += 1
+
+        if expired:
+            self.log_info(f"Expired {expired} stale video uploads")
+        return {'expired': expired}
+
+    def _append(self, path: str, offset: int, stream: BinaryIO, length: int):
+        """Copy ``length`` bytes from ``stream`` to ``path`` at ``offset``; returns (written, interrupted)."""
+        read_size = getattr(settings, 'VIDEO_UPLOAD_READ_SIZE', 1024 * 1024)
+        written = 0
+        interrupted = False
+        with open(path, 'r+b') as part:
+            part.seek(offset)
+            part.truncate()
+            try:
+                while written < length:
+                    data = stream.read(min(read_size, length - written))
+                    if not data:
+                        interrupted = True
+                        break
+                    part.write(data)
+                    written += len(data)
+            except OSError as e:
+                # Client went away mid-chunk (UnreadablePostError is an OSError)
+                self.log_error(f"Chunk read interrupted after {written} bytes: {e}")
+                interrupted = True
+            part.flush()
+            os.fsync(part.fileno())
+        return written, interrupted
+
+    def _sha256(self, path: str) -> str:
+        read_size = getattr(settings, 'VIDEO_UPLOAD_READ_SIZE', 1024 * 1024)
+        digest = hashlib.sha256()
+        with open(path, 'rb') as part:
+            for data in iter(lambda: part.read(read_size), b''):
+                digest.update(data)
+        return digest.hexdigest()
+
+    def _lock(self, upload: LessonVideoUpload):
+        return _UploadLock(self.LOCK_KEY.format(upload_id=upload.pk))
+
+    def _check_uploading(self, upload: LessonVideoUpload) -> None:
+        if upload.status != 'uploading':
+            raise TeoArtServiceException(
+                f"Upload non attivo (stato: {upload.status})", code='upload_not_active', status_code=409
+            )
+
+    def _offset_conflict(self, upload: LessonVideoUpload) -> TeoArtServiceException:
+        exc = TeoArtServiceException(
+            f"Offset non valido: riprendere da {upload.received_bytes}", code='offset_mismatch', status_code=409
+        )
+        exc.offset = upload.received_bytes
+        return exc
+
+    def _fail(self, upload: LessonVideoUpload, error: str) -> None:
+        upload.status = 'failed'
+        upload.error = error
+        upload.save(update_fields=['status', 'error', 'updated_at'])
+        self._remove_part(upload)
+        self.log_error(f"Video upload {upload.pk} failed: {error}")
+
+    def _remove_part(self, upload: LessonVideoUpload) -> None:
+        try:
+            os.remove(self.part_path(upload))
+        except FileNotFoundError:
+            pass
+
+
+class _UploadLock:
+    """Cache lock serialising writes to one upload across workers."""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __enter__(self):
+        timeout = getattr(settings, 'VIDEO_UPLOAD_LOCK_SECONDS', 300)
+        if not cache.add(self.key, 1, timeout):
+            raise TeoArtServiceException(
+                "Un altro blocco è in caricamento per questo upload", code='upload_busy', status_code=409
+            )
+        return self
+
+    def __exit__(self, *exc):
+        cache.delete(self.key)
+        return False
+
+
+# Singleton instance
+video_upload_service = VideoUploadService()
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_teacherprofile_total_courses_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='avatar_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text="Versioni ridimensionate (WebP/JPEG) dell'avatar"),
+        ),
+    ]
@@ -1,6 +1,5 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
-from django.core.mail import send_mail
 from django.utils.crypto import get_random_string
 from django.contrib.auth.models import BaseUserManager
 from django.utils import timezone
@@ -48,6 +47,11 @@ class User(AbstractUser):
         upload_to='avatars/', blank=True, null=True,
         help_text="Immagine di profilo (opzionale)."
     )
+    # Maintained by services/image_derivative_service.py
+    avatar_variants = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text="Versioni ridimensionate (WebP/JPEG) dell'avatar"
+    )
     email = models.EmailField(unique=True)
     ROLE_CHOICES = (
         ('student', 'Studente'),
@@ -104,12 +108,15 @@ class User(AbstractUser):
     def send_verification_email(self):
         self.email_verification_token = get_random_string(50)
         self.save()
-        send_mail(
-            'Verifica il tuo account TeoArt',
-            f'Clicca per verificare: http://localhost:8000/auth/verify-email/{self.email_verification_token}/',
-            'noreply@teoart.it',
-            [self.email],
-            fail_silently=False,
+        # Imported here: the outbox model lives in notifications, which depends on users
+        from services.email_outbox_service import email_outbox_service
+        email_outbox_service.queue_email(
+            to_email=self.email,
+            subject='Verifica il tuo account TeoArt',
+            body=f'Clicca per verificare: http://localhost:8000/auth/verify-email/{self.email_verification_token}/',
+            user=self,
+            category='transactional',
+            from_email='noreply@teoart.it',
         )
 
     class Meta:
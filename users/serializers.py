@@ -4,21 +4,31 @@ from django.contrib.auth.password_validation import validate_password
 from django.db.models import Q, Count, Avg
 
 
-class UserSerializer(serializers.ModelSerializer):
+class AvatarSrcsetMixin:
+    """Adds ``avatar_srcset``: resized avatar variants (services/image_derivative_service.py)"""
+
+    def get_avatar_srcset(self, obj):
+        from services.image_derivative_service import image_derivative_service
+        return image_derivative_service.get_srcset(obj, 'avatar', self.context.get('request'))
+
+
+class UserSerializer(AvatarSrcsetMixin, serializers.ModelSerializer):
     role = serializers.ChoiceField(choices=User.ROLE_CHOICES, read_only=True)
+    avatar_srcset = serializers.SerializerMethodField()
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'phone', 'address', 'role', 'avatar', 'bio', 'profession', 'artistic_aspirations', 'wallet_address']
+        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'phone', 'address', 'role', 'avatar', 'avatar_srcset', 'bio', 'profession', 'artistic_aspirations', 'wallet_address']
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(AvatarSrcsetMixin, serializers.ModelSerializer):
     role = serializers.CharField(read_only=True)
     avatar = serializers.ImageField(required=False, allow_null=True)
+    avatar_srcset = serializers.SerializerMethodField()
     date_joined = serializers.DateTimeField(read_only=True)
     
     class Meta:
         model = User
-        fields = ['username', 'email', 'first_name', 'last_name', 'phone', 'address', 'role', 'avatar', 'bio', 'profession', 'artistic_aspirations', 'date_joined', 'wallet_address']
+        fields = ['username', 'email', 'first_name', 'last_name', 'phone', 'address', 'role', 'avatar', 'avatar_srcset', 'bio', 'profession', 'artistic_aspirations', 'date_joined', 'wallet_address']
 
 
 class UserSettingsSerializer(serializers.ModelSerializer):
@@ -80,3 +80,11 @@ def cleanup_teacher_profile(sender, instance, created, **kwargs):
                 logger.info(f"Removed TeacherProfile for {instance.email} (role changed to {instance.role})")
         except Exception as e:
             logger.error(f"Failed to remove TeacherProfile for {instance.email}: {e}")
+
+
+@receiver(post_save, sender=User)
+def queue_avatar_derivatives(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Queue resized avatar variants when a new avatar is uploaded"""
+    if not raw:
+        from services.image_derivative_service import image_derivative_service
+        image_derivative_service.mark_pending('avatar', instance, update_fields)